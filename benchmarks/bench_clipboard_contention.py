@@ -0,0 +1,111 @@
+"""Benchmark clipboard reliability while another application hammers it.
+
+Runs on the simulator platform. A simulated application holds the clipboard
+open for ``--duty`` of every ``--period-ms`` milliseconds (clipboard
+managers and remote desktop clients do this). Requests arrive at random
+moments and each is either:
+
+    direct  one attempt, as before: if the clipboard is busy the read or
+            write fails ("No text in clipboard, aborting")
+    worker  queued on ClipboardWorker, retried with exponential backoff
+            until its deadline
+
+For each duty cycle it reports the share of requests that succeeded, the
+p50/p99 latency in virtual milliseconds and the attempts per request.
+
+Usage:
+    python benchmarks/bench_clipboard_contention.py [--requests 500]
+        [--period-ms 50] [--duty 0,0.25,0.5,0.9] [--timeout 1.0]
+"""
+
+import argparse
+import random
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from customhk.backends import ClipboardBusy  # noqa: E402
+from customhk.backends.clipboard_worker import ClipboardWorker  # noqa: E402
+from customhk.backends.simulator import Simulator  # noqa: E402
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+def run(mode: str, duty: float, args: argparse.Namespace) -> Dict[str, Any]:
+    sim = Simulator(latencies={
+        'clipboard_get': args.access_ms / 1e3,
+        'clipboard_set': args.access_ms / 1e3,
+    }, record=False)
+    period = args.period_ms / 1e3
+    hold = period * duty
+    sim.clipboard.busy_when = lambda now: (now % period) < hold
+    sim.clipboard.text = 'copied text'
+
+    worker = ClipboardWorker(
+        sim.clipboard, {'timeout': args.timeout}, clock=sim.clock.now, sleep=sim.sleep
+    )
+    rng = random.Random(7)
+    latencies: List[float] = []
+    succeeded = 0
+    attempts_before = 0
+
+    for i in range(args.requests):
+        sim.clock.advance(rng.uniform(0, period * 3))
+        started = sim.clock.now()
+        writing = i % 2 == 1
+        if mode == 'direct':
+            attempts_before += 1
+            try:
+                if writing:
+                    ok = sim.clipboard.set_text('pasted')
+                else:
+                    ok = sim.clipboard.get_text() is not None
+            except ClipboardBusy:
+                ok = False
+        else:
+            ok = worker.set_text('pasted') if writing else worker.get_text() is not None
+        if ok:
+            succeeded += 1
+        latencies.append(sim.clock.now() - started)
+
+    worker.stop()
+    attempts = worker.get_stats()['attempts'] if mode == 'worker' else attempts_before
+    return {
+        'success': succeeded / args.requests,
+        'p50': percentile(latencies, 0.5) * 1000,
+        'p99': percentile(latencies, 0.99) * 1000,
+        'attempts': attempts / args.requests,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=500,
+                        help='Clipboard requests per run (alternating read and write)')
+    parser.add_argument('--period-ms', type=float, default=50.0,
+                        help='Period of the other application\'s clipboard access')
+    parser.add_argument('--duty', default='0,0.25,0.5,0.9',
+                        help='Comma separated shares of each period the clipboard is held')
+    parser.add_argument('--access-ms', type=float, default=0.5,
+                        help='Simulated cost of one successful clipboard access')
+    parser.add_argument('--timeout', type=float, default=1.0,
+                        help='Worker request deadline in seconds')
+    args = parser.parse_args()
+
+    print(f"{'duty':>5} {'mode':<7} {'success':>8} {'p50 ms':>8} {'p99 ms':>8} {'attempts':>9}")
+    for duty in (float(value) for value in args.duty.split(',')):
+        for mode in ('direct', 'worker'):
+            r = run(mode, duty, args)
+            print(f"{duty:>5.2f} {mode:<7} {r['success']:>8.1%} {r['p50']:>8.1f} {r['p99']:>8.1f} "
+                  f"{r['attempts']:>9.2f}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""Benchmark clipboard history inserts and lookups at 10k entries.
+
+Fills a ClipboardHistory with a synthetic mix of clipboard texts (mostly
+short snippets, some multi-kilobyte documents, some repeated copies) and
+reports:
+
+    add       microseconds per recorded copy
+    get(n)    microseconds to fetch the nth most recent entry
+    search    milliseconds for a substring search that hits a recent entry,
+              an old entry, or nothing (a full scan)
+
+plus the memory the history holds and how many entries were compressed,
+spilled or evicted. Runs once in memory only and once with a spill file.
+
+Usage:
+    python benchmarks/bench_clipboard_history.py [--entries 10000]
+        [--max-bytes 4194304] [--spill-bytes 67108864]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from customhk.utils.clipboard_history import ClipboardHistory  # noqa: E402
+
+
+WORDS = ('meeting', 'invoice', 'deploy', 'customer', 'review', 'budget',
+         'release', 'ticket', 'draft', 'schedule', 'report', 'server')
+
+
+def make_texts(count: int, seed: int = 1) -> List[str]:
+    rng = random.Random(seed)
+    texts: List[str] = []
+    for i in range(count):
+        roll = rng.random()
+        if roll < 0.1 and texts:
+            texts.append(rng.choice(texts[-200:]))  # copied again
+            continue
+        words = rng.randint(2, 30) if roll < 0.9 else rng.randint(800, 8000)
+        body = ' '.join(rng.choice(WORDS) for _ in range(words))
+        texts.append(f"#{i} {body}")
+    return texts
+
+
+def timed(func: Callable[[], Any], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def run(texts: List[str], args: argparse.Namespace, spill: Optional[Path]) -> Dict[str, Any]:
+    history = ClipboardHistory(
+        max_entries=args.entries,
+        max_bytes=args.max_bytes,
+        spill_file=spill,
+        spill_bytes=args.spill_bytes,
+    )
+
+    start = time.perf_counter()
+    for text in texts:
+        history.add(text)
+    add = (time.perf_counter() - start) / len(texts)
+
+    size = len(history)
+    result = {
+        'add_us': add * 1e6,
+        'get_us': {n: timed(lambda n=n: history.get(n), 200) * 1e6
+                   for n in (1, size // 10, size // 2, size - 1)},
+        'search_ms': {
+            'recent': timed(lambda: history.search(f"#{len(texts) - 5} ", 1), 20) * 1e3,
+            'old': timed(lambda: history.search(f"#{len(texts) - size + 5} ", 1), 5) * 1e3,
+            'miss': timed(lambda: history.search('no such text', 1), 5) * 1e3,
+        },
+        'compressed': sum(1 for entry in history.entries() if entry.compressed),
+        'stats': history.get_stats(),
+    }
+    history.close()
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--entries', type=int, default=10000,
+                        help='History size (max_entries)')
+    parser.add_argument('--max-bytes', type=int, default=4 * 1024 * 1024,
+                        help='Memory budget')
+    parser.add_argument('--spill-bytes', type=int, default=64 * 1024 * 1024,
+                        help='Spill file size')
+    args = parser.parse_args()
+
+    texts = make_texts(args.entries + args.entries // 5)
+    print(f"{len(texts)} copies, {sum(map(len, texts)) / 1e6:.1f} M characters\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode, spill in (('memory', None), ('spill', Path(tmp) / 'history.bin')):
+            result = run(texts, args, spill)
+            stats = result['stats']
+            print(f"[{mode}] {stats['entries']} entries, "
+                  f"{stats['memory_bytes'] / 1e6:.2f} MB in memory, "
+                  f"{stats['spilled_entries']} spilled, {result['compressed']} compressed, "
+                  f"{stats['evicted']} evicted, {stats['deduplicated']} deduplicated")
+            print(f"  add     {result['add_us']:8.1f} us")
+            for n, value in result['get_us'].items():
+                print(f"  get({n:<5}) {value:6.1f} us")
+            for kind, value in result['search_ms'].items():
+                print(f"  search {kind:<7} {value:6.2f} ms")
+            print()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""Benchmark cached clipboard reads and change notification.
+
+Runs on the simulator platform, where opening and reading the clipboard
+(``clipboard_get``) and reading its sequence number (``clipboard_seq``) are
+charged configurable virtual latencies.
+
+reads
+    Actions read the clipboard repeatedly while another application copies
+    something new every ``--change-every`` reads. "direct" opens the
+    clipboard every time (as ClipboardManager used to); "cached" goes
+    through ClipboardCache.
+
+watch
+    A subscriber (the clipboard history) follows ``--copies`` copies spread
+    over ``--seconds`` seconds. "poll text" reads the clipboard every
+    ``--poll-interval`` (the old history watcher), "poll seq" only checks
+    the sequence number, "events" reacts to change notifications.
+
+Both report clipboard opens, sequence checks and virtual time spent.
+
+Usage:
+    python benchmarks/bench_clipboard_reads.py [--reads 10000] [--change-every 100]
+        [--get-latency-us 500] [--seq-latency-us 1]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from customhk.backends.simulator import Simulator  # noqa: E402
+from customhk.utils.clipboard import ClipboardCache  # noqa: E402
+
+
+def make_simulator(args: argparse.Namespace) -> Simulator:
+    return Simulator(latencies={
+        'clipboard_get': args.get_latency_us / 1e6,
+        'clipboard_seq': args.seq_latency_us / 1e6,
+    }, record=False)
+
+
+def result(sim: Simulator, started: float, count: int) -> Dict[str, Any]:
+    return {
+        'opens': sim.counts['clipboard_get'],
+        'seq': sim.counts['clipboard_seq'],
+        'us_each': (sim.clock.now() - started) / count * 1e6 if count else 0.0,
+    }
+
+
+def reads(mode: str, args: argparse.Namespace) -> Dict[str, Any]:
+    sim = make_simulator(args)
+    read: Callable[[], Any] = (
+        sim.clipboard.get_text if mode == 'direct' else ClipboardCache(sim.clipboard).get_text
+    )
+    started = sim.clock.now()
+    for i in range(args.reads):
+        if i % args.change_every == 0:
+            sim.clipboard.text = f'copy {i}'
+        read()
+    return result(sim, started, args.reads)
+
+
+def watch(mode: str, args: argparse.Namespace) -> Dict[str, Any]:
+    sim = make_simulator(args)
+    received: List[str] = []
+    ticks = int(args.seconds / args.poll_interval)
+    copy_at = {int(i * ticks / args.copies) for i in range(args.copies)}
+
+    cache = ClipboardCache(sim.clipboard, use_events=(mode == 'events'))
+    if mode == 'poll text':
+        last = None
+        for tick in range(ticks):
+            if tick in copy_at:
+                sim.clipboard.text = f'copy {tick}'
+            text = sim.clipboard.get_text()
+            if text != last:
+                last = text
+                received.append(text)
+    else:
+        # Poll by hand in virtual time; the cache's own timer never fires
+        cache.poll_interval = 1e9
+        cache.subscribe(received.append)
+        for tick in range(ticks):
+            if tick in copy_at:
+                sim.clipboard.text = f'copy {tick}'
+            if not cache.event_driven:
+                cache.poll()
+        cache.stop()
+
+    if len(received) != args.copies:
+        raise AssertionError(f"{mode}: saw {len(received)} of {args.copies} copies")
+    return result(sim, 0.0, args.copies)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--reads', type=int, default=10000,
+                        help='Clipboard reads in the read workload')
+    parser.add_argument('--change-every', type=int, default=100,
+                        help='Reads between clipboard changes')
+    parser.add_argument('--copies', type=int, default=20,
+                        help='Copies in the watch workload')
+    parser.add_argument('--seconds', type=float, default=600.0,
+                        help='Duration of the watch workload')
+    parser.add_argument('--poll-interval', type=float, default=1.0,
+                        help='Seconds between polls')
+    parser.add_argument('--get-latency-us', type=float, default=500.0,
+                        help='Simulated cost of opening and reading the clipboard')
+    parser.add_argument('--seq-latency-us', type=float, default=1.0,
+                        help='Simulated cost of reading the sequence number')
+    args = parser.parse_args()
+
+    print(f"{'workload':<8} {'mode':<10} {'opens':>7} {'seq':>7} {'us each':>10}")
+    for mode in ('direct', 'cached'):
+        r = reads(mode, args)
+        print(f"{'reads':<8} {mode:<10} {r['opens']:>7} {r['seq']:>7} {r['us_each']:>10.1f}")
+    for mode in ('poll text', 'poll seq', 'events'):
+        r = watch(mode, args)
+        print(f"{'watch':<8} {mode:<10} {r['opens']:>7} {r['seq']:>7} {r['us_each']:>10.1f}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
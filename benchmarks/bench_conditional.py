@@ -0,0 +1,119 @@
+"""Benchmark conditional hotkey resolution against thousands of rules.
+
+Compares the compiled ConditionalMatcher with a naive per-rule check in the
+style of WindowManager.is_window_active (substring, then regex, then process
+name for every rule on every keypress).
+
+Usage:
+    python benchmarks/bench_conditional.py [--rules 10,100,1000,5000]
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from customhk.conditional import ConditionalMatcher  # noqa: E402
+
+
+CHORD = '<ctrl>+<shift>+s'
+
+
+def make_rules(count: int, seed: int = 1) -> List[Dict[str, Any]]:
+    """Build synthetic conditional rules for one chord.
+
+    Roughly a third each of literal titles, regex titles and process names.
+    """
+    rng = random.Random(seed)
+    rules = []
+    for i in range(count):
+        kind = i % 3
+        rule: Dict[str, Any] = {'key': CHORD, 'action': f'action_{i}'}
+        if kind == 0:
+            rule['window_title'] = f'Project {i} Workspace'
+        elif kind == 1:
+            rule['window_title'] = f'(Editor|Viewer) #{i}\\b'
+        else:
+            rule['process'] = f'tool{i}.exe'
+        if rng.random() < 0.1:
+            rule['process'] = f'tool{i}.exe'
+        rules.append(rule)
+    return rules
+
+
+def make_windows(count: int, samples: int, seed: int = 2) -> List[Tuple[str, str]]:
+    """Build foreground windows that hit early, late and no rules."""
+    rng = random.Random(seed)
+    windows = []
+    for _ in range(samples):
+        i = rng.randrange(count * 2)  # about half the lookups miss every rule
+        windows.append((f'Document - Project {i} Workspace - Editor #{i}', f'tool{i}.exe'))
+    return windows
+
+
+def naive_resolve(rules: List[Dict[str, Any]], title: str, process: str) -> Optional[str]:
+    """Per-rule matching as done before rules were compiled."""
+    for rule in rules:
+        pattern = rule.get('window_title')
+        wanted = rule.get('process')
+        if pattern:
+            ok = pattern.lower() in title.lower()
+            if not ok:
+                try:
+                    ok = bool(re.search(pattern, title, re.IGNORECASE))
+                except re.error:
+                    ok = False
+            if not ok:
+                continue
+        if wanted and wanted.lower() != process.lower():
+            continue
+        return rule['action']
+    return None
+
+
+def time_per_call(func, windows: List[Tuple[str, str]]) -> float:
+    """Return mean microseconds per call."""
+    start = time.perf_counter()
+    for title, process in windows:
+        func(title, process)
+    return (time.perf_counter() - start) / len(windows) * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rules', default='10,100,1000,5000',
+                        help='Comma separated rule counts')
+    parser.add_argument('--samples', type=int, default=2000,
+                        help='Lookups per measurement')
+    args = parser.parse_args()
+
+    print(f"{'rules':>7} {'compile ms':>11} {'compiled us':>12} {'naive us':>10} {'speedup':>8}")
+    for count in (int(n) for n in args.rules.split(',')):
+        rules = make_rules(count)
+        windows = make_windows(count, args.samples)
+
+        start = time.perf_counter()
+        matcher = ConditionalMatcher.compile(rules)
+        compile_ms = (time.perf_counter() - start) * 1000
+
+        # Both strategies must agree before their timings mean anything
+        for title, process in windows[:200]:
+            assert matcher.resolve(CHORD, title, process) == naive_resolve(rules, title, process)
+
+        compiled = time_per_call(lambda t, p: matcher.resolve(CHORD, t, p), windows)
+        naive_windows = windows[:max(50, args.samples // max(1, count // 10))]
+        naive = time_per_call(lambda t, p: naive_resolve(rules, t, p), naive_windows)
+
+        print(f"{count:>7} {compile_ms:>11.1f} {compiled:>12.1f} {naive:>10.1f} "
+              f"{naive / compiled:>7.1f}x")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
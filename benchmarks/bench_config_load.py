@@ -0,0 +1,125 @@
+"""Benchmark configuration loading with and without the compiled cache.
+
+Generates a large synthetic config (hundreds of global, conditional and
+sequence hotkeys plus a big free-form section) in a temporary directory and
+compares a cold YAML load with a load from the compiled cache, and the
+dotted-key lookup cost of ``Config.get``.
+
+Usage:
+    python benchmarks/bench_config_load.py [--hotkeys 500] [--repeat 20]
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from customhk.config import Config  # noqa: E402
+
+
+def make_config(hotkeys: int) -> dict:
+    """Build a synthetic configuration with ``hotkeys`` bindings of each kind."""
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    return {
+        'app': {'name': 'CustomHK', 'log_level': 'INFO', 'dispatch': {'workers': 2}},
+        'user': {'signature': 'Best regards,\nBench'},
+        'hotkeys': {
+            'leader': '<ctrl>+<space>',
+            'global': [
+                {'key': f'<ctrl>+<alt>+<shift>+{letters[i % 26]}{i}', 'action': f'action_{i}',
+                 'enabled': True, 'description': f'Global hotkey number {i}'}
+                for i in range(hotkeys)
+            ],
+            'sequences': [
+                {'keys': f'<leader>, {letters[i % 26]}, {letters[(i // 26) % 26]}',
+                 'action': f'action_{i}', 'description': f'Sequence {i}'}
+                for i in range(hotkeys)
+            ],
+        },
+        'hotkeys_conditional': [
+            {'key': '<ctrl>+<shift>+s', 'action': f'action_{i}',
+             'window_title': f'Project {i} - Editor', 'description': f'Rule {i}'}
+            for i in range(hotkeys)
+        ],
+        'actions': {
+            f'action_{i}': {'text': f'Snippet body {i} ' * 8, 'delay': 0.01}
+            for i in range(hotkeys)
+        },
+    }
+
+
+def time_load(path: Path, repeat: int, use_cache: bool) -> float:
+    """Return the median milliseconds to construct a Config."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        Config(path, use_cache=use_cache)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def time_get(config: Config, keys, rounds: int = 20000) -> float:
+    """Return mean nanoseconds per Config.get call."""
+    start = time.perf_counter()
+    for i in range(rounds):
+        config.get(keys[i % len(keys)])
+    return (time.perf_counter() - start) / rounds * 1e9
+
+
+def naive_get(data: dict, key: str):
+    """Dotted lookup as done before the index (split and walk every time)."""
+    value = data
+    for k in key.split('.'):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(k)
+        if value is None:
+            return None
+    return value
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--hotkeys', type=int, default=500,
+                        help='Bindings of each kind (global, conditional, sequence)')
+    parser.add_argument('--repeat', type=int, default=20, help='Loads per measurement')
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'config.yaml'
+        path.write_text(yaml.safe_dump(make_config(args.hotkeys), sort_keys=False),
+                        encoding='utf-8')
+        size_kb = path.stat().st_size / 1024
+
+        cold = time_load(path, args.repeat, use_cache=False)
+        warm_config = Config(path)  # writes the cache
+        cached = time_load(path, args.repeat, use_cache=True)
+
+        cache_kb = warm_config.cache.path.stat().st_size / 1024
+        keys = ['app.name', 'user.signature', 'hotkeys.leader', 'app.dispatch.workers',
+                'actions.action_1.text', 'missing.key.here']
+        indexed = time_get(warm_config, keys)
+        start = time.perf_counter()
+        for i in range(20000):
+            naive_get(warm_config.data, keys[i % len(keys)])
+        walked = (time.perf_counter() - start) / 20000 * 1e9
+
+    loader = 'libyaml' if hasattr(yaml, 'CSafeLoader') else 'pure Python'
+    print(f"config: {size_kb:.0f} KiB YAML ({loader} loader), cache {cache_kb:.0f} KiB")
+    print(f"  cold YAML load : {cold:8.2f} ms")
+    print(f"  cached load    : {cached:8.2f} ms  ({cold / cached:.1f}x faster)")
+    print(f"  Config.get     : {indexed:8.0f} ns  (split and walk: {walked:.0f} ns)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
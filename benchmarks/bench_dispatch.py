@@ -0,0 +1,327 @@
+"""Benchmark hotkey dispatch latency with synthetic key streams.
+
+Feeds chords through the real HotkeyManager dispatch path (chord lookup,
+conditional resolution against a static foreground window, ActionDispatcher
+queues and workers) into the real built-in actions and their Action.__call__
+wrappers. The keyboard controller and clipboard are recording stand-ins, so
+nothing is typed and the benchmark runs headless (pynput's dummy backend is
+selected unless PYNPUT_BACKEND is already set).
+
+Each scenario reports, in milliseconds:
+
+    hook   time spent in the listener callback (what blocks the OS hook)
+    start  enqueue -> action started on a worker
+    done   enqueue -> action finished
+
+plus completed actions per second and the number of dropped presses.
+
+Usage:
+    python benchmarks/bench_dispatch.py [--events 2000] [--rate 500]
+        [--event-cost-us 5] [--scenarios bindings-10,rules-1000,...]
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+os.environ.setdefault('PYNPUT_BACKEND', 'dummy')
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import yaml  # noqa: E402
+
+from customhk.config import Config  # noqa: E402
+from customhk.hotkey_manager import HotkeyManager  # noqa: E402
+from customhk.utils.clipboard import ClipboardManager  # noqa: E402
+from customhk.utils.window import WindowBackend, WindowManager  # noqa: E402
+
+
+CONDITIONAL_CHORD = '<ctrl>+<shift>+s'
+ACTIONS = ('type_signature', 'paste_formatted_notes', 'pretty_notes')
+MODIFIER_SETS = [
+    [m for bit, m in enumerate(('<ctrl>', '<alt>', '<shift>', '<cmd>')) if mask & (1 << bit)]
+    for mask in range(1, 16)
+]
+KEYS = ([chr(c) for c in range(ord('a'), ord('z') + 1)]
+        + [str(d) for d in range(10)]
+        + [f'<f{n}>' for n in range(1, 21)])
+
+
+class Scenario(NamedTuple):
+    name: str
+    bindings: int       # global hotkeys
+    rules: int          # conditional rules on CONDITIONAL_CHORD
+    workers: int        # dispatcher worker threads
+    feeders: int        # threads pressing hotkeys concurrently
+    event_cost_us: float  # simulated cost of each injected key event
+
+
+def default_scenarios(event_cost_us: float) -> List[Scenario]:
+    """Vary binding count, rule count and concurrent action load in turn."""
+    return [
+        Scenario('bindings-10', 10, 0, 2, 1, 0),
+        Scenario('bindings-100', 100, 0, 2, 1, 0),
+        Scenario('bindings-1000', 1000, 0, 2, 1, 0),
+        Scenario('rules-100', 10, 100, 2, 1, 0),
+        Scenario('rules-1000', 10, 1000, 2, 1, 0),
+        Scenario('load-1w', 100, 100, 1, 1, event_cost_us),
+        Scenario('load-2w', 100, 100, 2, 2, event_cost_us),
+        Scenario('load-4w', 100, 100, 4, 4, event_cost_us),
+    ]
+
+
+class RecordingController:
+    """Stand-in for pynput's Controller that records injected key events."""
+
+    def __init__(self, event_cost: float = 0.0):
+        self.event_cost = event_cost
+        self.events = 0
+        self._lock = threading.Lock()
+
+    def _inject(self) -> None:
+        with self._lock:
+            self.events += 1
+        if self.event_cost:
+            end = time.perf_counter() + self.event_cost
+            while time.perf_counter() < end:
+                pass
+
+    def press(self, key: Any) -> None:
+        self._inject()
+
+    def release(self, key: Any) -> None:
+        self._inject()
+
+    def type(self, text: str) -> None:
+        for _ in text:
+            self._inject()
+            self._inject()
+
+
+class RecordingClipboard(ClipboardManager):
+    """Clipboard stand-in holding a fixed block of notes."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.writes = 0
+
+    def get_text(self) -> Optional[str]:
+        return self.text
+
+    def set_text(self, text: str) -> bool:
+        self.text = text
+        self.writes += 1
+        return True
+
+
+class StaticWindowBackend(WindowBackend):
+    """A single foreground window that never changes."""
+
+    def __init__(self, title: str, image: str):
+        self.title = title
+        self.image = image
+
+    def foreground_window(self) -> int:
+        return 1
+
+    def window_title(self, hwnd: int) -> Optional[str]:
+        return self.title
+
+    def window_class(self, hwnd: int) -> Optional[str]:
+        return 'BenchWindow'
+
+    def window_pid(self, hwnd: int) -> int:
+        return 4242
+
+    def process_start_time(self, pid: int) -> Optional[int]:
+        return 1
+
+    def process_image(self, pid: int) -> Optional[str]:
+        return self.image
+
+
+def make_config(scenario: Scenario, directory: Path) -> Config:
+    """Write and load a configuration for a scenario."""
+    chords = []
+    for key in KEYS:
+        for modifiers in MODIFIER_SETS:
+            chord = '+'.join(modifiers + [key])
+            if chord != CONDITIONAL_CHORD:
+                chords.append(chord)
+    extra = 0
+    while len(chords) < scenario.bindings:
+        # Past single-key chords, fall back to two-key chords
+        chords.append(f'<ctrl>+<alt>+{KEYS[extra % len(KEYS)]}+{KEYS[-1 - extra // len(KEYS)]}')
+        extra += 1
+
+    rules = []
+    for i in range(scenario.rules):
+        rule: Dict[str, Any] = {'key': CONDITIONAL_CHORD, 'action': ACTIONS[i % len(ACTIONS)]}
+        if i % 3 == 0:
+            rule['window_title'] = f'Project {i} Workspace'
+        elif i % 3 == 1:
+            rule['window_title'] = f'(Editor|Viewer) #{i}\\b'
+        else:
+            rule['process'] = f'tool{i}.exe'
+        rules.append(rule)
+
+    data = {
+        'user': {'signature': 'Best regards,\nBenchmark User\nExample Corp'},
+        'app': {
+            'dispatch': {'workers': scenario.workers, 'queue_size': 32},
+            # Measure dispatch, not clipboard round trips
+            'injection': {'strategy': 'type'},
+        },
+        'hotkeys': {
+            'global': [
+                {'key': chord, 'action': ACTIONS[i % len(ACTIONS)]}
+                for i, chord in enumerate(chords[:scenario.bindings])
+            ],
+        },
+        'hotkeys_conditional': rules,
+    }
+    path = directory / f'{scenario.name}.yaml'
+    path.write_text(yaml.safe_dump(data), encoding='utf-8')
+    return Config(path, use_cache=False)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_scenario(scenario: Scenario, events: int, rate: float, directory: Path,
+                 seed: int = 1) -> Dict[str, Any]:
+    """Drive one scenario and collect latencies."""
+    config = make_config(scenario, directory)
+    controller = RecordingController(scenario.event_cost_us / 1e6)
+    manager = HotkeyManager(config, keyboard_controller=controller)
+
+    clipboard = RecordingClipboard('\n'.join(f'note line {i}' for i in range(8)))
+    for action in manager.action_instances.values():
+        if hasattr(action, 'clipboard'):
+            action.clipboard = clipboard
+
+    # The last rule of each kind is the one that matches, so the conditional
+    # chord always resolves through the whole rule set
+    last = max(0, scenario.rules - 1)
+    WindowManager.set_backend(
+        StaticWindowBackend(f'Notes - Project {last} Workspace', f'C:\\Tools\\tool{last}.exe'),
+        use_events=False
+    )
+
+    starts: List[float] = []
+    dones: List[float] = []
+    finished_at: List[float] = []
+    lock = threading.Lock()
+
+    def observe(name: str, trigger: Optional[str], enqueued: float, started: float,
+                finished: float) -> None:
+        with lock:
+            starts.append(started - enqueued)
+            dones.append(finished - enqueued)
+            finished_at.append(finished)
+
+    manager.dispatcher.observer = observe
+    # Do what HotkeyManager.start() does minus the OS listener (pynput's
+    # dummy backend cannot parse multi-modifier chords); presses are fed
+    # straight into the callbacks the listener would invoke.
+    manager._bindings = manager._build_bindings(manager.action_instances)
+    manager._generation += 1
+    triggers = manager._build_hotkey_map(manager._bindings, manager._generation)
+    manager.dispatcher.start()
+    global_chords = [chord for chord in triggers if chord != CONDITIONAL_CHORD]
+    hook_times: List[List[float]] = [[] for _ in range(scenario.feeders)]
+    per_feeder = events // scenario.feeders
+    began = time.perf_counter()
+
+    def feed(index: int) -> None:
+        rng = random.Random(seed + index)
+        stream = [
+            CONDITIONAL_CHORD if scenario.rules and rng.random() < 0.5
+            else rng.choice(global_chords)
+            for _ in range(per_feeder)
+        ]
+        times = hook_times[index]
+        for i, chord in enumerate(stream):
+            if rate:
+                delay = began + i / rate - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            t0 = time.perf_counter()
+            triggers[chord]()
+            times.append(time.perf_counter() - t0)
+
+    feeders = [threading.Thread(target=feed, args=(i,)) for i in range(scenario.feeders)]
+    for thread in feeders:
+        thread.start()
+    for thread in feeders:
+        thread.join()
+    manager.dispatcher.stop(timeout=30.0)
+    stats = manager.dispatcher.get_stats()
+
+    hooks = [t for times in hook_times for t in times]
+    elapsed = (max(finished_at) if finished_at else time.perf_counter()) - began
+    to_ms = 1000.0
+    return {
+        'scenario': scenario,
+        'hook': [percentile(hooks, 0.5) * to_ms, percentile(hooks, 0.99) * to_ms,
+                 max(hooks) * to_ms],
+        'start': [percentile(starts, 0.5) * to_ms, percentile(starts, 0.99) * to_ms,
+                  max(starts, default=0.0) * to_ms],
+        'done': [percentile(dones, 0.5) * to_ms, percentile(dones, 0.99) * to_ms,
+                 max(dones, default=0.0) * to_ms],
+        'throughput': len(dones) / elapsed if elapsed > 0 else 0.0,
+        'completed': stats['completed'],
+        'dropped': stats['dropped'],
+        'key_events': controller.events,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--events', type=int, default=2000,
+                        help='Hotkey presses per scenario')
+    parser.add_argument('--rate', type=float, default=500.0,
+                        help='Presses per second per feeder thread (0 = as fast as possible)')
+    parser.add_argument('--event-cost-us', type=float, default=5.0,
+                        help='Simulated cost of one injected key event in the load scenarios')
+    parser.add_argument('--scenarios', default='',
+                        help='Comma separated scenario names (default: all)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    scenarios = default_scenarios(args.event_cost_us)
+    if args.scenarios:
+        wanted = set(args.scenarios.split(','))
+        unknown = wanted - {s.name for s in scenarios}
+        if unknown:
+            parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+        scenarios = [s for s in scenarios if s.name in wanted]
+
+    print(f"{'scenario':<14} {'bind':>5} {'rules':>5} {'wrk':>3} {'feed':>4} "
+          f"{'hook p50/p99/max':>20} {'start p50/p99/max':>22} {'done p50/p99/max':>22} "
+          f"{'act/s':>7} {'drop':>5}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for scenario in scenarios:
+            result = run_scenario(scenario, args.events, args.rate, Path(tmp))
+            hook = '/'.join(f'{v:.3f}' for v in result['hook'])
+            start = '/'.join(f'{v:.2f}' for v in result['start'])
+            done = '/'.join(f'{v:.2f}' for v in result['done'])
+            print(f"{scenario.name:<14} {scenario.bindings:>5} {scenario.rules:>5} "
+                  f"{scenario.workers:>3} {scenario.feeders:>4} {hook:>20} {start:>22} "
+                  f"{done:>22} {result['throughput']:>7.0f} {result['dropped']:>5}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""Benchmark time-to-inject by text length for the type and paste strategies.
+
+Runs TextInjector against the in-memory simulator platform, so it is headless
+and deterministic: every key event and clipboard access advances a virtual
+clock by a configurable latency instead of touching the desktop. A simulated
+target application collects what it receives (typed characters, and the
+clipboard content when the paste chord arrives) so every run is checked for
+correct output and a restored clipboard.
+
+For each text length and strategy it reports, in milliseconds of virtual
+time:
+
+    inject  until the text has reached the application
+    total   including the wait before the clipboard is restored
+
+plus the number of key events and clipboard accesses, and the real time the
+injection code itself took.
+
+Usage:
+    python benchmarks/bench_injection.py [--lengths 10,100,1000,10000]
+        [--key-latency-us 500] [--clipboard-latency-ms 1] [--restore-delay 0.15]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from customhk.backends import KeyInjector  # noqa: E402
+from customhk.backends.simulator import Simulator  # noqa: E402
+from customhk.utils.injection import TextInjector, resolve_settings  # noqa: E402
+
+
+ORIGINAL_CLIPBOARD = 'text the user copied earlier'
+
+
+class TargetApplication(KeyInjector):
+    """Forwards key events to the simulator and collects what an app would see."""
+
+    def __init__(self, sim: Simulator):
+        self.sim = sim
+        self.held: List[str] = []
+        self.received: List[str] = []
+        self.inject_done = 0.0
+
+    def press(self, key: Any) -> None:
+        self.sim.keyboard.press(key)
+        if key.startswith('<') and len(key) > 1:
+            self.held.append(key)
+        elif '<ctrl>' in self.held and key == 'v':
+            self.received.append(self.sim.clipboard.text or '')
+        else:
+            self.received.append(key)
+        self.inject_done = self.sim.clock.now()
+
+    def release(self, key: Any) -> None:
+        self.sim.keyboard.release(key)
+        if key in self.held:
+            self.held.remove(key)
+        self.inject_done = self.sim.clock.now()
+
+
+def make_text(length: int) -> str:
+    words = 'the quick brown fox jumps over the lazy dog\n'
+    return (words * (length // len(words) + 1))[:length]
+
+
+def run(strategy: str, text: str, args: argparse.Namespace) -> Dict[str, Any]:
+    sim = Simulator(latencies={
+        'key_press': args.key_latency_us / 1e6,
+        'key_release': args.key_latency_us / 1e6,
+        'clipboard_get': args.clipboard_latency_ms / 1e3,
+        'clipboard_set': args.clipboard_latency_ms / 1e3,
+    }, record=False)
+    sim.clipboard.text = ORIGINAL_CLIPBOARD
+    target = TargetApplication(sim)
+    settings = resolve_settings({'restore_delay': args.restore_delay}, strategy)
+    injector = TextInjector(target, settings, platform=sim)
+
+    started = sim.clock.now()
+    wall = time.perf_counter()
+    used = injector.inject(text)
+    wall = time.perf_counter() - wall
+
+    if used != strategy:
+        raise AssertionError(f"{strategy}: injector fell back to {used}")
+    if ''.join(target.received) != text:
+        raise AssertionError(f"{strategy}: application received the wrong text")
+    if sim.clipboard.text != ORIGINAL_CLIPBOARD:
+        raise AssertionError(f"{strategy}: clipboard was not restored")
+
+    return {
+        'inject': (target.inject_done - started) * 1000,
+        'total': (sim.clock.now() - started) * 1000,
+        'keys': sim.counts['key_press'] + sim.counts['key_release'],
+        'clipboard': sim.counts['clipboard_get'] + sim.counts['clipboard_set'],
+        'wall': wall * 1000,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lengths', default='10,100,1000,10000',
+                        help='Comma separated text lengths in characters')
+    parser.add_argument('--key-latency-us', type=float, default=500.0,
+                        help='Simulated latency of one key press or release')
+    parser.add_argument('--clipboard-latency-ms', type=float, default=1.0,
+                        help='Simulated latency of one clipboard read or write')
+    parser.add_argument('--restore-delay', type=float, default=0.15,
+                        help='Seconds to wait before restoring the clipboard')
+    args = parser.parse_args()
+
+    lengths = [int(value) for value in args.lengths.split(',')]
+
+    print(f"{'chars':>7} {'strategy':<8} {'inject ms':>10} {'total ms':>10} "
+          f"{'keys':>7} {'clip':>5} {'wall ms':>8}")
+    for length in lengths:
+        text = make_text(length)
+        for strategy in ('type', 'paste'):
+            result = run(strategy, text, args)
+            print(f"{length:>7} {strategy:<8} {result['inject']:>10.1f} {result['total']:>10.1f} "
+                  f"{result['keys']:>7} {result['clipboard']:>5} {result['wall']:>8.2f}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
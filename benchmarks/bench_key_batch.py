@@ -0,0 +1,145 @@
+"""Benchmark key injection one call per event versus batched submission.
+
+Drives the simulator platform, where every call into the OS input queue
+(``key_submit``) and every key event are charged a configurable virtual
+latency, so the run is headless and deterministic. "before" injects the way
+KeyboardHelper used to, one press/release/type call per event with its own
+error handling; "batch" collects the same events in a KeyBatch and flushes
+them in one submission.
+
+For each workload it reports key events per second of virtual time, the
+number of OS submissions and the real time spent in the Python code.
+
+Usage:
+    python benchmarks/bench_key_batch.py [--repeat 200] [--submit-latency-us 20]
+        [--event-latency-us 1]
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from customhk.backends.simulator import Simulator  # noqa: E402
+from customhk.utils.keyboard import KeyBatch  # noqa: E402
+
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE = 'Best regards,\nBenchmark User\nExample Corp'
+NOTES = ''.join(f'- note line {i}\n' for i in range(64))
+
+
+def legacy_release(kb: Any, *keys: Any) -> None:
+    for key in keys:
+        try:
+            kb.release(key)
+        except Exception as e:
+            logger.warning(f"Failed to release key {key}: {e}")
+
+
+def legacy_tap(kb: Any, *keys: Any) -> None:
+    for key in keys:
+        try:
+            kb.press(key)
+            kb.release(key)
+        except Exception as e:
+            logger.error(f"Failed to press key {key}: {e}")
+
+
+def legacy_type(kb: Any, text: str) -> None:
+    try:
+        for char in text:
+            kb.press(char)
+            kb.release(char)
+    except Exception as e:
+        logger.error(f"Failed to type text: {e}")
+
+
+def pretty_notes_before(kb: Any) -> None:
+    legacy_release(kb, '<alt>')
+    legacy_tap(kb, '-')
+    legacy_tap(kb, '<up>', '<home>')
+    kb.press('<alt>')
+
+
+def pretty_notes_batch(kb: Any) -> None:
+    with KeyBatch(kb) as batch:
+        batch.release('<alt>')
+        batch.tap('-')
+        batch.tap('<up>', '<home>')
+        batch.press('<alt>')
+
+
+def typing_before(text: str) -> Callable[[Any], None]:
+    def run(kb: Any) -> None:
+        legacy_release(kb, '<alt>')
+        legacy_type(kb, text)
+    return run
+
+
+def typing_batch(text: str) -> Callable[[Any], None]:
+    def run(kb: Any) -> None:
+        KeyBatch(kb).release('<alt>').type(text).flush()
+    return run
+
+
+WORKLOADS: List[Tuple[str, Callable[[Any], None], Callable[[Any], None]]] = [
+    ('pretty_notes', pretty_notes_before, pretty_notes_batch),
+    ('signature', typing_before(SIGNATURE), typing_batch(SIGNATURE)),
+    ('notes-1k', typing_before(NOTES), typing_batch(NOTES)),
+]
+
+
+def measure(workload: Callable[[Any], None], repeat: int, args: argparse.Namespace,
+            timed: bool) -> Dict[str, Any]:
+    latencies = {
+        'key_submit': args.submit_latency_us / 1e6,
+        'key_press': args.event_latency_us / 1e6,
+        'key_release': args.event_latency_us / 1e6,
+    } if timed else None
+    sim = Simulator(latencies=latencies, record=False)
+    start_virtual = sim.clock.now()
+    start_wall = time.perf_counter()
+    for _ in range(repeat):
+        workload(sim.keyboard)
+    wall = time.perf_counter() - start_wall
+    virtual = sim.clock.now() - start_virtual
+    events = sim.counts['key_press'] + sim.counts['key_release']
+    return {
+        'events': events // repeat,
+        'submits': sim.counts['key_submit'] // repeat,
+        'events_per_s': events / virtual if virtual else 0.0,
+        'wall_us': wall / repeat * 1e6,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=200,
+                        help='Runs of each workload')
+    parser.add_argument('--submit-latency-us', type=float, default=20.0,
+                        help='Simulated cost of one call into the OS input queue')
+    parser.add_argument('--event-latency-us', type=float, default=1.0,
+                        help='Simulated cost of each key event within a call')
+    args = parser.parse_args()
+
+    print(f"{'workload':<14} {'mode':<7} {'events':>7} {'submits':>8} "
+          f"{'events/s':>11} {'py us/run':>10}")
+    for name, before, batch in WORKLOADS:
+        for mode, workload in (('before', before), ('batch', batch)):
+            result = measure(workload, args.repeat, args, timed=True)
+            # Python overhead without simulated latency
+            result['wall_us'] = measure(workload, args.repeat, args, timed=False)['wall_us']
+            print(f"{name:<14} {mode:<7} {result['events']:>7} {result['submits']:>8} "
+                  f"{result['events_per_s']:>11.0f} {result['wall_us']:>10.1f}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
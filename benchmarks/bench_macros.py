@@ -0,0 +1,185 @@
+"""Benchmark macro playback timing: sleeping per step versus compiled plans.
+
+Builds a macro of alternating key presses, typed text and short waits and
+plays it back in real time two ways:
+
+    sleep     the straightforward interpreter: one key call per event and a
+              time.sleep() per wait step, on a thread held for the whole
+              macro
+    engine    the compiled plan (customhk.macros): one batch per segment,
+              waits scheduled against deadlines on the shared timer thread
+
+For each it reports the elapsed time against the sum of the waits (the
+overrun is injection time plus accumulated timer lateness), the number of
+key submissions, and how long a dispatcher worker was held. The engine is
+also run with several macros at once to show they share one timer thread.
+
+Key injection goes to the simulator's keyboard with real-time latencies.
+
+Finally a synthetic recording of --events key events is measured: memory of
+the KeyLog against a list of per-event dicts, the size of its base64 form,
+and the time to decode and compile it and to build its playback segments.
+
+Usage:
+    python benchmarks/bench_macros.py [--segments 200] [--wait-ms 5]
+        [--concurrent 8] [--submit-latency-us 20] [--events 50000]
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from customhk.actions.macro import MacroAction  # noqa: E402
+from customhk.backends import Platform, set_platform  # noqa: E402
+from customhk.backends.simulator import Simulator  # noqa: E402
+from customhk.macros import KeyLog, compile_macro  # noqa: E402
+
+
+def make_steps(segments: int, wait: float) -> List[Dict[str, Any]]:
+    steps: List[Dict[str, Any]] = []
+    for i in range(segments):
+        steps.append({'type': 'key_press', 'key': 'ctrl+a'})
+        steps.append({'type': 'type_text', 'text': f'item {i}'})
+        steps.append({'type': 'key_press', 'key': 'enter'})
+        steps.append({'type': 'wait', 'duration': wait})
+    return steps
+
+
+def run_sleep(kb: Any, steps: List[Dict[str, Any]]) -> None:
+    for step in steps:
+        if step['type'] == 'wait':
+            time.sleep(step['duration'])
+        elif step['type'] == 'type_text':
+            for char in step['text']:
+                kb.press(char)
+                kb.release(char)
+        else:
+            keys = ['<ctrl>', 'a'] if step['key'] == 'ctrl+a' else ['<enter>']
+            for key in keys:
+                kb.press(key)
+            for key in reversed(keys):
+                kb.release(key)
+
+
+def run_engine(actions: List[MacroAction]) -> float:
+    """Start every macro and wait for all of them; return time in execute()."""
+    held = 0.0
+    for action in actions:
+        start = time.perf_counter()
+        action()
+        held += time.perf_counter() - start
+    while any(action.is_running() for action in actions):
+        time.sleep(0.001)
+    return held
+
+
+def bench_recording(count: int) -> None:
+    rng = random.Random(1)
+    keys = [chr(c) for c in range(ord('a'), ord('z') + 1)] + ['<shift>', '<enter>', '<space>']
+    events = []
+    for _ in range(count // 2):
+        key = rng.choice(keys)
+        events.append(('press', key, rng.uniform(0.03, 0.2)))
+        events.append(('release', key, rng.uniform(0.02, 0.08)))
+
+    tracemalloc.start()
+    dicts = [{'kind': kind, 'key': key, 'delay': delay} for kind, key, delay in events]
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    del dicts
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    log = KeyLog()
+    for kind, key, delay in events:
+        log.append(kind, key, delay)
+    log_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    text = log.encode()
+    start = time.perf_counter()
+    plan = compile_macro({'recording': text})
+    compile_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    segments = KeyLog.from_bytes(plan['recording']).segments(1.0)
+    segments_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    segments[len(segments) // 2]
+    access_us = (time.perf_counter() - start) * 1e6
+
+    print(f"\n{len(log)} recorded events ({log.duration / 60:.1f} min):")
+    print(f"  memory   KeyLog {log_bytes / 1024:8.1f} KiB   "
+          f"list of dicts {dict_bytes / 1024:8.1f} KiB")
+    print(f"  base64   {len(text) / 1024:.1f} KiB in the config file")
+    print(f"  decode and compile {compile_ms:.2f} ms, {len(segments)} playback segments in "
+          f"{segments_ms:.2f} ms, one segment {access_us:.1f} us")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--segments', type=int, default=200, help='Key/wait groups in the macro')
+    parser.add_argument('--wait-ms', type=float, default=5.0, help='Wait per group')
+    parser.add_argument('--concurrent', type=int, default=8, help='Macros run at once')
+    parser.add_argument('--submit-latency-us', type=float, default=20.0,
+                        help='Virtual cost of one OS submission, also spent in real time')
+    parser.add_argument('--events', type=int, default=50000,
+                        help='Events in the synthetic recording')
+    args = parser.parse_args()
+
+    sim = Simulator(
+        latencies={'key_submit': args.submit_latency_us / 1e6}, realtime=True, record=False
+    )
+    # Real clock and timer thread, simulated keyboard
+    set_platform(Platform(sim.keyboard, sim.events, sim.clipboard, sim.windows))
+
+    steps = make_steps(args.segments, args.wait_ms / 1000.0)
+    waits = args.segments * args.wait_ms / 1000.0
+
+    start = time.perf_counter()
+    plan = compile_macro({'steps': steps})
+    compile_ms = (time.perf_counter() - start) * 1000
+    print(f"{len(steps)} steps -> {len(plan['segments'])} batches, "
+          f"compiled in {compile_ms:.2f} ms; "
+          f"{waits:.3f} s of waits\n")
+
+    sim.counts.clear()
+    start = time.perf_counter()
+    run_sleep(sim.keyboard, steps)
+    elapsed = time.perf_counter() - start
+    print(f"  sleep   elapsed {elapsed:7.3f} s  overrun {(elapsed - waits) * 1000:8.1f} ms  "
+          f"submissions {sim.counts['key_submit']:6d}  worker held {elapsed:7.3f} s")
+
+    sim.counts.clear()
+    action = MacroAction({'macro': plan, 'name': 'bench'}, sim.keyboard)
+    start = time.perf_counter()
+    held = run_engine([action])
+    elapsed = time.perf_counter() - start
+    print(f"  engine  elapsed {elapsed:7.3f} s  overrun {(elapsed - waits) * 1000:8.1f} ms  "
+          f"submissions {sim.counts['key_submit']:6d}  worker held {held:7.3f} s")
+
+    actions = [MacroAction({'macro': plan, 'name': f'bench{i}'}, sim.keyboard)
+               for i in range(args.concurrent)]
+    threads = threading.active_count()
+    start = time.perf_counter()
+    peak = threads
+    for action in actions:
+        action()
+    while any(action.is_running() for action in actions):
+        peak = max(peak, threading.active_count())
+        time.sleep(0.001)
+    elapsed = time.perf_counter() - start
+    print(f"\n  {args.concurrent} macros at once: elapsed {elapsed:.3f} s, "
+          f"threads {threads} -> {peak} (the sleep interpreter would hold {args.concurrent})")
+
+    bench_recording(args.events)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
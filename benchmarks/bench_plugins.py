@@ -0,0 +1,121 @@
+"""Benchmark action discovery as the number of installed plugins grows.
+
+Generates a throwaway site directory with one distribution exposing N
+``customhk.actions`` entry points (one module per action), then measures in
+fresh interpreters:
+
+- eager:  importing every action module up front (the old registration
+          model, where ``customhk/actions/__init__.py`` imported everything)
+- scan:   building the registry from entry points with no cached manifest
+- cached: building the registry from the cached manifest
+
+Usage:
+    python benchmarks/bench_plugins.py [--plugins 10,100,500] [--runs 5]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PLUGIN_MODULE = '''
+from customhk.actions.base import Action
+
+TABLE = {{i: str(i) * 4 for i in range(200)}}
+
+
+class Plugin{index}Action(Action):
+    """Synthetic plugin action {index}."""
+
+    def execute(self) -> None:
+        self.kb.type(TABLE[{index} % 200])
+'''
+
+CHILD = r'''
+import json, sys, time
+sys.path[:0] = [{root!r}, {site!r}]
+from pathlib import Path
+start = time.perf_counter()
+if {mode!r} == 'eager':
+    import importlib
+    for i in range({count}):
+        importlib.import_module(f'benchplug.action_{{i}}')
+else:
+    import customhk.actions.discovery as discovery
+    from customhk.actions.registry import ActionRegistry
+    registry = ActionRegistry()
+    manifest = None if {mode!r} == 'scan' else Path({manifest!r})
+    for spec in discovery.discover_actions(manifest):
+        registry.declare(spec)
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({{'ms': elapsed, 'modules': len(sys.modules)}}))
+'''
+
+
+def make_site(site: Path, count: int) -> None:
+    """Create a distribution with ``count`` action plugins in ``site``."""
+    package = site / 'benchplug'
+    package.mkdir(parents=True)
+    (package / '__init__.py').write_text('')
+    for i in range(count):
+        (package / f'action_{i}.py').write_text(PLUGIN_MODULE.format(index=i))
+
+    dist_info = site / 'benchplug-1.0.dist-info'
+    dist_info.mkdir()
+    (dist_info / 'METADATA').write_text('Metadata-Version: 2.1\nName: benchplug\nVersion: 1.0\n')
+    lines = ['[customhk.actions]'] + [
+        f'plugin_{i} = benchplug.action_{i}:Plugin{i}Action [keyboard]' for i in range(count)
+    ]
+    (dist_info / 'entry_points.txt').write_text('\n'.join(lines) + '\n')
+
+
+def run(mode: str, site: Path, count: int, manifest: Path) -> dict:
+    """Run one fresh interpreter and return its measurement."""
+    code = CHILD.format(root=str(ROOT), site=str(site), mode=mode, count=count,
+                        manifest=str(manifest))
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip())
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--plugins', default='10,100,500', help='Comma separated plugin counts')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh processes per measurement')
+    args = parser.parse_args()
+
+    print(f"{'plugins':>8} {'eager ms':>9} {'scan ms':>8} {'cached ms':>10} {'eager mods':>11} "
+          f"{'cached mods':>12}")
+    for count in (int(n) for n in args.plugins.split(',')):
+        with tempfile.TemporaryDirectory() as tmp:
+            site = Path(tmp) / 'site'
+            manifest = Path(tmp) / 'manifest.json'
+            make_site(site, count)
+
+            # Warm up: byte-compile the plugins and write the manifest
+            run('eager', site, count, manifest)
+            run('cached', site, count, manifest)
+
+            results = {
+                mode: [run(mode, site, count, manifest) for _ in range(args.runs)]
+                for mode in ('eager', 'scan', 'cached')
+            }
+
+        def median(mode: str, key: str) -> float:
+            return statistics.median(r[key] for r in results[mode])
+
+        print(f"{count:>8} {median('eager', 'ms'):>9.1f} {median('scan', 'ms'):>8.1f} "
+              f"{median('cached', 'ms'):>10.1f} {median('eager', 'modules'):>11.0f} "
+              f"{median('cached', 'modules'):>12.0f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""Benchmark snippet matching per keystroke as the number of snippets grows.
+
+For each snippet count, the same synthetic typing (ordinary words with an
+abbreviation now and then) is matched two ways:
+
+    naive      after every keystroke, check whether the typed text ends
+               with each abbreviation
+    automaton  the compiled Aho-Corasick automaton (customhk.snippets), one
+               transition per keystroke
+
+Reports the cost per keystroke, the number of expansions (which must be
+equal), and for the automaton its compile time, state count and memory.
+
+Usage:
+    python benchmarks/bench_snippets.py [--counts 10,100,1000,10000] [--keys 20000]
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from customhk.snippets import SnippetMatcher, compile_snippets  # noqa: E402
+
+
+LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+
+
+def make_snippets(count: int, rng: random.Random) -> Dict[str, str]:
+    snippets: Dict[str, str] = {}
+    while len(snippets) < count:
+        word = ''.join(rng.choice(LETTERS) for _ in range(rng.randint(3, 8)))
+        snippets[f";{word}"] = f"Expansion of {word}"
+    return snippets
+
+
+def make_typing(snippets: Dict[str, str], keys: int, rng: random.Random) -> str:
+    abbreviations = list(snippets)
+    out: List[str] = []
+    length = 0
+    while length < keys:
+        if rng.random() < 0.05:
+            word = rng.choice(abbreviations)
+        else:
+            word = ''.join(rng.choice(LETTERS) for _ in range(rng.randint(2, 10)))
+        out.append(word + ' ')
+        length += len(word) + 1
+    return ''.join(out)
+
+
+def run_naive(snippets: Dict[str, str], typing: str) -> Tuple[float, int]:
+    abbreviations = sorted(snippets, key=len, reverse=True)
+    longest = len(abbreviations[0])
+    typed = ''
+    expanded = 0
+    start = time.perf_counter()
+    for char in typing:
+        typed = (typed + char)[-longest:]
+        for abbreviation in abbreviations:
+            if typed.endswith(abbreviation):
+                expanded += 1
+                typed = ''
+                break
+    return time.perf_counter() - start, expanded
+
+
+def run_automaton(matcher: SnippetMatcher, typing: str) -> Tuple[float, int]:
+    expanded = 0
+    start = time.perf_counter()
+    for char in typing:
+        if matcher.feed(char) is not None:
+            expanded += 1
+            matcher.reset()
+    return time.perf_counter() - start, expanded
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--counts', default='10,100,1000,10000',
+                        help='Comma-separated snippet counts')
+    parser.add_argument('--keys', type=int, default=20000, help='Keystrokes typed per run')
+    parser.add_argument('--naive-limit', type=int, default=10000,
+                        help='Skip the naive matcher above this many snippets')
+    args = parser.parse_args()
+
+    print(f"{'snippets':>9} {'naive us/key':>13} {'automaton us/key':>17} {'expanded':>9} "
+          f"{'compile ms':>11} {'states':>8} {'memory KiB':>11}")
+    for count in (int(value) for value in args.counts.split(',')):
+        rng = random.Random(count)
+        snippets = make_snippets(count, rng)
+        typing = make_typing(snippets, args.keys, rng)
+
+        start = time.perf_counter()
+        compile_snippets(snippets)
+        compile_ms = (time.perf_counter() - start) * 1000
+
+        tracemalloc.start()
+        automaton, _ = compile_snippets(snippets)
+        matcher = SnippetMatcher(automaton)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        elapsed, expanded = run_automaton(matcher, typing)
+        automaton_us = elapsed / len(typing) * 1e6
+        if count <= args.naive_limit:
+            elapsed, naive_expanded = run_naive(snippets, typing)
+            naive = f"{elapsed / len(typing) * 1e6:13.2f}"
+            if naive_expanded != expanded:
+                print(f"mismatch: naive expanded {naive_expanded}, automaton {expanded}")
+                return 1
+        else:
+            naive = f"{'-':>13}"
+
+        print(f"{count:9d} {naive} {automaton_us:17.2f} {expanded:9d} "
+              f"{compile_ms:11.1f} {len(automaton['fail']):8d} {memory / 1024:11.0f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
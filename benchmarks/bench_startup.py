@@ -0,0 +1,130 @@
+"""Benchmark time-to-first-hotkey and resident memory of a fresh process.
+
+Each run starts a new interpreter that imports ``customhk.main``, loads the
+example configuration and builds the HotkeyManager (everything that happens
+before the first hotkey can fire), then reports phase timings, peak RSS and
+which heavy optional modules were imported along the way.
+
+Modules that should only load on first use (tkinter, pystray, PIL,
+win32clipboard, ctypes.wintypes) are listed as violations, and the script
+exits with status 1 if any of them was imported, so it can guard against
+regressions.
+
+The manager is built on the simulator platform, so the benchmark runs on
+headless hosts such as CI; --native uses pynput and the Windows backends.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 10] [--native]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Must not be imported before the first hotkey works
+DEFERRED = ['tkinter', 'pystray', 'PIL', 'win32clipboard', 'ctypes.wintypes']
+
+CHILD = r'''
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+
+import customhk.main
+imported = time.perf_counter()
+
+import logging
+logging.disable(logging.CRITICAL)
+from pathlib import Path
+from customhk.config import Config
+from customhk.hotkey_manager import HotkeyManager
+
+if {simulate!r}:
+    # Headless hosts (CI) have no keyboard hook or X connection for pynput
+    from customhk.backends import set_platform
+    from customhk.backends.simulator import Simulator
+    set_platform(Simulator())
+
+config = Config(Path({config!r}))
+loaded = time.perf_counter()
+manager = HotkeyManager(config)
+manager.shutdown()
+ready = time.perf_counter()
+
+try:
+    import resource
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        rss_kb //= 1024
+except ImportError:
+    rss_kb = 0
+
+print(json.dumps({{
+    'import_ms': (imported - start) * 1000,
+    'config_ms': (loaded - imported) * 1000,
+    'manager_ms': (ready - loaded) * 1000,
+    'total_ms': (ready - start) * 1000,
+    'rss_kb': rss_kb,
+    'modules': len(sys.modules),
+    'deferred': [m for m in {deferred!r} if m in sys.modules],
+}}))
+'''
+
+
+def run_once(config_path: Path, simulate: bool = True) -> dict:
+    """Run one fresh interpreter and return its measurements."""
+    code = CHILD.format(
+        root=str(ROOT), config=str(config_path), deferred=DEFERRED, simulate=simulate
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', code],
+        capture_output=True, text=True, env=os.environ.copy(), check=False
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip())
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10, help='Fresh processes to start')
+    parser.add_argument('--native', action='store_true',
+                        help='Build the manager on the native platform (needs a desktop session)')
+    args = parser.parse_args()
+    simulate = not args.native
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config_path = Path(tmp) / 'config.yaml'
+        shutil.copy(ROOT / 'config.example.yaml', config_path)
+
+        run_once(config_path, simulate)  # warm the OS file cache and the config cache
+        runs = [run_once(config_path, simulate) for _ in range(args.runs)]
+
+    def median(key: str) -> float:
+        return statistics.median(run[key] for run in runs)
+
+    print(f"fresh processes: {args.runs} ({'native' if args.native else 'simulated'} platform)")
+    print(f"  import customhk.main : {median('import_ms'):7.1f} ms")
+    print(f"  load config          : {median('config_ms'):7.1f} ms")
+    print(f"  build HotkeyManager  : {median('manager_ms'):7.1f} ms")
+    print(f"  time to first hotkey : {median('total_ms'):7.1f} ms")
+    print(f"  peak RSS             : {median('rss_kb') / 1024:7.1f} MiB")
+    print(f"  modules loaded       : {median('modules'):7.0f}")
+
+    deferred = sorted({name for run in runs for name in run['deferred']})
+    if deferred:
+        print(f"  loaded too early     : {', '.join(deferred)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""Benchmark text transform pipelines.
+
+Runs one pipeline over a synthetic clipboard text three ways and reports
+time and peak memory (tracemalloc) for each:
+
+    staged    every transform builds its whole output string before the
+              next one runs (what chaining string helpers would do)
+    pipeline  the compiled single pass, memo cleared before each run
+    memo      the same input again, answered from the result memo
+
+Usage:
+    python benchmarks/bench_transforms.py [--lines 200000] [--repeat 5]
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from customhk.transforms import Pipeline, TransformMemo  # noqa: E402
+
+
+STEPS = ['trim', 'drop_blank', 'dedupe', {'wrap': 72}, {'number': '{n}. '}, {'quote': '> '}]
+
+WORDS = ('meeting', 'invoice', 'deploy', 'customer', 'review', 'budget',
+         'release', 'ticket', 'draft', 'schedule', 'report', 'server')
+
+
+def make_text(lines: int, seed: int = 1) -> str:
+    rng = random.Random(seed)
+    out: List[str] = []
+    for _ in range(lines):
+        if rng.random() < 0.1:
+            out.append('   ')
+            continue
+        words = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(3, 25)))
+        out.append(f"  {words}  ")
+    return '\n'.join(out)
+
+
+def staged(pipeline: Pipeline, text: str) -> str:
+    """Apply each stage to the whole text, materializing every step."""
+    for stage in pipeline.stages:
+        text = '\n'.join(stage(text.split('\n')))
+    return text
+
+
+def measure(
+    func: Callable[[], str],
+    repeat: int,
+    before: Callable[[], None] = lambda: None
+) -> Tuple[float, int, str]:
+    best = float('inf')
+    result = ''
+    for _ in range(repeat):
+        before()
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+
+    before()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lines', type=int, default=200000, help='Input lines')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per mode (best is reported)')
+    args = parser.parse_args()
+
+    text = make_text(args.lines)
+    memo = TransformMemo(max_bytes=len(text) * 8)
+    pipeline = Pipeline(STEPS, memo=memo)
+    print(f"{args.lines} lines, {len(text) / 1e6:.1f} M characters, {pipeline!r}\n")
+
+    results = {
+        'staged': measure(lambda: staged(pipeline, text), args.repeat),
+        'pipeline': measure(lambda: ''.join(pipeline.stream(text)), args.repeat, memo.clear),
+    }
+    pipeline.apply(text)
+    results['memo'] = measure(lambda: pipeline.apply(text), args.repeat)
+
+    reference = results['staged'][2]
+    for mode, (seconds, peak, result) in results.items():
+        check = 'ok' if result == reference else 'MISMATCH'
+        print(f"  {mode:<9} {seconds * 1e3:9.2f} ms  peak {peak / 1e6:7.2f} MB  {check}")
+    print(f"\n  memo: {memo.get_stats()}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
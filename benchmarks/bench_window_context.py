@@ -0,0 +1,138 @@
+"""Benchmark foreground-window lookups with and without the context cache.
+
+Uses a fake window backend so it runs on any OS. Each fake system call burns a
+configurable amount of time and is counted, so the numbers show both the
+number of OS queries per keypress and the resulting latency.
+
+Usage:
+    python benchmarks/bench_window_context.py [--presses 20000] [--call-cost-us 5]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from customhk.utils.window import ForegroundContextCache, WindowBackend  # noqa: E402
+
+
+class FakeWindowBackend(WindowBackend):
+    """In-memory window source with per-call cost and call counting."""
+
+    def __init__(self, call_cost: float, windows: int = 20, events: bool = True):
+        self.call_cost = call_cost
+        self.events = events
+        self.calls = 0
+        self.windows: Dict[int, tuple] = {
+            hwnd: (f"Document {hwnd} - App{hwnd % 5}", f"Class{hwnd % 3}", 1000 + hwnd % 5)
+            for hwnd in range(1, windows + 1)
+        }
+        self.foreground = 1
+        self._callback: Optional[Callable[[int], None]] = None
+
+    def _syscall(self) -> None:
+        self.calls += 1
+        end = time.perf_counter() + self.call_cost
+        while time.perf_counter() < end:
+            pass
+
+    def focus(self, hwnd: int) -> None:
+        self.foreground = hwnd
+        if self._callback is not None:
+            self._callback(hwnd)
+
+    def foreground_window(self) -> int:
+        self._syscall()
+        return self.foreground
+
+    def window_title(self, hwnd: int) -> Optional[str]:
+        self._syscall()
+        return self.windows[hwnd][0]
+
+    def window_class(self, hwnd: int) -> Optional[str]:
+        self._syscall()
+        return self.windows[hwnd][1]
+
+    def window_pid(self, hwnd: int) -> int:
+        self._syscall()
+        return self.windows[hwnd][2]
+
+    def process_start_time(self, pid: int) -> Optional[int]:
+        self._syscall()  # OpenProcess + GetProcessTimes + CloseHandle
+        return pid * 7
+
+    def process_image(self, pid: int) -> Optional[str]:
+        self._syscall()  # QueryFullProcessImageNameW
+        return f"C:\\Program Files\\App\\app{pid}.exe"
+
+    def watch_focus(self, callback: Callable[[int], None]) -> bool:
+        if not self.events:
+            return False
+        self._callback = callback
+        return True
+
+
+def uncached_lookup(backend: FakeWindowBackend) -> tuple:
+    """The pre-cache pattern: title and process queried separately."""
+    hwnd = backend.foreground_window()
+    title = backend.window_title(hwnd)
+    hwnd = backend.foreground_window()
+    pid = backend.window_pid(hwnd)
+    backend._syscall()  # OpenProcess
+    image = backend.process_image(pid)
+    backend._syscall()  # CloseHandle
+    return title, image
+
+
+def run(name: str, backend: FakeWindowBackend, lookup: Callable[[], object],
+        focus_script: List[int]) -> None:
+    backend.calls = 0
+    start = time.perf_counter()
+    for hwnd in focus_script:
+        if hwnd:
+            backend.focus(hwnd)
+        lookup()
+    elapsed = time.perf_counter() - start
+    presses = len(focus_script)
+    print(f"{name:<18} {elapsed / presses * 1e6:>10.2f} {backend.calls / presses:>12.3f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--presses', type=int, default=20000)
+    parser.add_argument('--focus-every', type=int, default=50,
+                        help='Average keypresses between focus changes')
+    parser.add_argument('--call-cost-us', type=float, default=5.0,
+                        help='Simulated cost of one OS call in microseconds')
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    script = [
+        rng.randint(1, 20) if rng.random() < 1.0 / args.focus_every else 0
+        for _ in range(args.presses)
+    ]
+    cost = args.call_cost_us / 1e6
+
+    print(f"{'mode':<18} {'us/lookup':>10} {'OS calls/key':>12}")
+
+    backend = FakeWindowBackend(cost)
+    run('uncached', backend, lambda: uncached_lookup(backend), script)
+
+    backend = FakeWindowBackend(cost, events=False)
+    cache = ForegroundContextCache(backend, max_age=0.25)
+    run('cache (polling)', backend, cache.get, script)
+
+    backend = FakeWindowBackend(cost, events=True)
+    cache = ForegroundContextCache(backend)
+    run('cache (events)', backend, cache.get, script)
+    print(f"\nevent cache stats: {cache.get_stats()}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
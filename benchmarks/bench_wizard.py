@@ -0,0 +1,148 @@
+"""Benchmark opening the wizard: a new Tk per open versus the persistent UI.
+
+Opens the wizard --opens times two ways and reports the time from the
+request to the window being mapped (visible):
+
+    per-open    what ShowWizardAction used to do: a new thread, a new
+                tk.Tk() interpreter and widget tree, and its own mainloop,
+                destroyed when closed
+    persistent  WizardUI: one UI thread with the wizard built hidden ahead
+                of time; an open is a show and focus marshalled onto it
+
+For the persistent UI it also checks that repeated opens leave nothing
+behind: Python heap growth (tracemalloc), and the number of Tcl commands
+and widgets, which grow if callbacks or widgets are created per open.
+
+Needs a display (Tk cannot create windows otherwise).
+
+Usage:
+    python benchmarks/bench_wizard.py [--opens 50]
+"""
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from customhk.actions.registry import get_registry  # noqa: E402
+from customhk.actions.wizard import HotkeyWizard, WizardUI  # noqa: E402
+
+
+def open_per_open() -> float:
+    """Open and close a wizard with its own interpreter; return seconds to visible."""
+    import tkinter as tk
+
+    requested_at = time.perf_counter()
+    visible: List[float] = []
+
+    def run() -> None:
+        root = tk.Tk()
+        wizard = HotkeyWizard(get_registry(), None)
+
+        def on_visible(seconds: float) -> None:
+            visible.append(seconds)
+            root.quit()
+
+        wizard.on_visible = on_visible
+        wizard.build(root)
+        wizard.open(requested_at)
+        root.mainloop()
+        root.destroy()
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join()
+    return visible[0]
+
+
+def on_ui(ui: WizardUI, func: Callable[[], Any]) -> Any:
+    """Run a function on the UI thread and wait for its result."""
+    done = threading.Event()
+    result: List[Any] = []
+    ui.call(lambda: (result.append(func()), done.set()))
+    if not done.wait(10):
+        raise RuntimeError("UI thread did not respond")
+    return result[0]
+
+
+def open_persistent(ui: WizardUI) -> float:
+    """Open and hide the persistent wizard; return seconds to visible."""
+    opens = ui.get_stats()['opens']
+    ui.show(None, lambda name: None, lambda key: None)
+    deadline = time.perf_counter() + 10
+    while ui.get_stats()['opens'] == opens:
+        if time.perf_counter() > deadline:
+            raise RuntimeError("Wizard did not become visible")
+        time.sleep(0.0005)
+    visible = ui.get_stats()['last_visible_ms'] / 1000.0
+    on_ui(ui, ui.wizard.hide)
+    return visible
+
+
+def tk_objects(ui: WizardUI) -> int:
+    """Count Tcl commands and widgets of the UI's interpreter."""
+    def count() -> int:
+        window = ui.wizard.window
+        widgets = 0
+        pending = [window]
+        while pending:
+            widget = pending.pop()
+            widgets += 1
+            pending.extend(widget.winfo_children())
+        return len(window.tk.call('info', 'commands')) + widgets
+    return on_ui(ui, count)
+
+
+def report(label: str, seconds: List[float]) -> None:
+    ms = sorted(s * 1000 for s in seconds)
+    print(f"  {label:10s} median {statistics.median(ms):7.2f} ms   "
+          f"p95 {ms[int(len(ms) * 0.95) - 1]:7.2f} ms   max {ms[-1]:7.2f} ms")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--opens', type=int, default=50, help='Opens per approach')
+    args = parser.parse_args()
+
+    try:
+        import tkinter as tk
+        tk.Tk().destroy()
+    except Exception as e:
+        print(f"Tk unavailable: {e}")
+        return 1
+
+    print(f"Time from request to visible over {args.opens} opens:")
+    report('per-open', [open_per_open() for _ in range(args.opens)])
+
+    ui = WizardUI()
+    ui.start()
+    on_ui(ui, lambda: None)
+    build_ms = ui.get_stats()['build_ms']
+    print(f"\n  (persistent window built once in {build_ms:.1f} ms, off the open path)")
+
+    # Warm up, then measure growth over the timed opens
+    for _ in range(5):
+        open_persistent(ui)
+    tracemalloc.start()
+    heap = tracemalloc.get_traced_memory()[0]
+    objects = tk_objects(ui)
+    times = [open_persistent(ui) for _ in range(args.opens)]
+    heap_growth = tracemalloc.get_traced_memory()[0] - heap
+    object_growth = tk_objects(ui) - objects
+    tracemalloc.stop()
+    report('persistent', times)
+
+    print(f"\n  after {args.opens} persistent opens: Python heap {heap_growth / 1024:+.1f} KiB, "
+          f"Tcl commands and widgets {object_growth:+d}")
+    ui.stop()
+    return 0 if object_growth == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
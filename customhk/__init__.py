@@ -1,8 +1,18 @@
 """CustomHK - Custom Hotkey Automation Tool."""
 
+import importlib
+
 __version__ = "2.0.0"
 __author__ = "Andrew"
 
-from .main import CustomHKApp, main
-
 __all__ = ['CustomHKApp', 'main', '__version__']
+
+
+def __getattr__(name):
+    # Importing the application pulls in pynput and the actions; defer it so
+    # ``import customhk.config`` and friends stay cheap.
+    if name in ('CustomHKApp', 'main'):
+        module = importlib.import_module('.main', __name__)
+        globals().update(CustomHKApp=module.CustomHKApp, main=module.main)
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
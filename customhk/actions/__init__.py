@@ -1,11 +1,28 @@
-"""Action modules for CustomHK."""
+"""Action modules for CustomHK.
 
-# Import all action modules to ensure they register themselves
-from . import signature
-from . import clipboard
-from . import wizard
+Built-in actions are listed in ``BUILTIN_ACTIONS`` rather than imported here;
+the registry imports each module the first time its action is used.
+Third-party packages add actions through the ``customhk.actions`` entry point
+group (see ``discovery.py``).
+"""
 
-# Export the registry for external use
-from .registry import get_registry, register_action
+from .registry import ActionSpec, get_registry, register_action
 
-__all__ = ['get_registry', 'register_action']
+# Built-in action manifest: name, module, class and the shared resources the
+# action uses
+BUILTIN_ACTIONS = [
+    ActionSpec('type_signature', 'customhk.actions.signature', 'TypeSignatureAction',
+               ('keyboard',)),
+    ActionSpec('paste_formatted_notes', 'customhk.actions.clipboard',
+               'PasteFormattedNotesAction', ('clipboard', 'keyboard')),
+    ActionSpec('pretty_notes', 'customhk.actions.clipboard', 'PrettyNotesAction',
+               ('keyboard',)),
+    ActionSpec('paste_history', 'customhk.actions.clipboard', 'PasteHistoryAction',
+               ('clipboard', 'keyboard')),
+    ActionSpec('paste_transformed', 'customhk.actions.clipboard', 'PasteTransformedAction',
+               ('clipboard', 'keyboard')),
+    ActionSpec('record_macro', 'customhk.actions.macro', 'RecordMacroAction', ('keyboard',)),
+    ActionSpec('show_wizard', 'customhk.actions.wizard', 'ShowWizardAction', ('tk',)),
+]
+
+__all__ = ['ActionSpec', 'BUILTIN_ACTIONS', 'get_registry', 'register_action']
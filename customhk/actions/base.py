@@ -4,30 +4,53 @@ from abc import ABC, abstractmethod
 from typing import Any, Dict, Optional
 import logging
 
+from .. import metrics
+from ..scheduling import ActionCancelled, PRIORITIES
+
 
 logger = logging.getLogger(__name__)
 
 
 class Action(ABC):
-    """Base class for all hotkey actions."""
+    """Base class for all hotkey actions.
+
+    ``priority`` is the scheduling class (see customhk.scheduling); the
+    action's ``priority`` setting overrides the class default.
+    """
+
+    priority = 'normal'
 
     def __init__(self, config: Dict[str, Any], keyboard_controller: Any):
         """Initialize action.
 
         Args:
             config: Configuration dictionary for this action
-            keyboard_controller: pynput keyboard controller instance
+            keyboard_controller: Key injector of the active platform (see customhk.backends)
         """
         self.config = config
         self.kb = keyboard_controller
         self.name = self.__class__.__name__
         self.enabled = True
 
+        priority = config.get('priority') if isinstance(config, dict) else None
+        if priority in PRIORITIES:
+            self.priority = priority
+        elif priority is not None:
+            logger.warning(f"Unknown priority {priority!r} for {self.name}, using {self.priority}")
+
     @abstractmethod
     def execute(self) -> None:
         """Execute the action. Must be implemented by subclasses."""
         pass
 
+    def preload(self) -> None:
+        """Prepare expensive resources ahead of the first execute().
+
+        Called once the hotkeys are active, so the work does not delay them;
+        slow work should be started on a thread.
+        """
+        pass
+
     def pre_execute(self) -> bool:
         """Called before execute(). Return False to cancel execution.
 
@@ -59,7 +82,10 @@ class Action(ABC):
         try:
             self.execute()
             self.post_execute(success=True)
+        except ActionCancelled:
+            logger.info(f"Action {self.name} cancelled")
         except Exception as e:
+            metrics.note_failure()
             self.post_execute(success=False, error=e)
             logger.exception(f"Error executing action {self.name}: {e}")
 
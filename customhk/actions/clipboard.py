@@ -1,11 +1,12 @@
 """Clipboard-related actions."""
 
+import itertools
 import logging
 from typing import Any, Dict
-from pynput.keyboard import Key
 
 from .base import Action
 from .registry import register_action
+from ..transforms import compile_pipeline
 from ..utils.clipboard import ClipboardManager
 from ..utils.keyboard import KeyboardHelper
 
@@ -17,17 +18,19 @@ logger = logging.getLogger(__name__)
 class PasteFormattedNotesAction(Action):
     """Formats clipboard text as a bulleted list and pastes it."""
 
+    priority = 'bulk'
+
     def __init__(self, config: Dict[str, Any], keyboard_controller: Any):
         """Initialize paste formatted notes action.
 
         Args:
             config: Configuration dict with 'prefix' and 'separator'
-            keyboard_controller: pynput keyboard controller
+            keyboard_controller: Key injector
         """
         super().__init__(config, keyboard_controller)
         self.prefix = config.get('prefix', '-')
         self.separator = config.get('separator', '\n\n---------------\n\n')
-        self.helper = KeyboardHelper(keyboard_controller)
+        self.helper = KeyboardHelper(keyboard_controller, config.get('injection'))
         self.clipboard = ClipboardManager()
         logger.debug(f"Initialized PasteFormattedNotesAction (prefix: '{self.prefix}')")
 
@@ -41,11 +44,19 @@ class PasteFormattedNotesAction(Action):
             logger.warning("No text in clipboard, aborting")
             return
 
-        # Format as list
-        formatted = self.clipboard.format_as_list(text, self.prefix)
+        # Format as list, lazily
+        chunk_size = self.helper.injector.settings['chunk_size']
+        formatted = self.clipboard.iter_as_list(text, self.prefix, chunk_size)
+        pieces = itertools.chain((self.separator,), formatted)
 
-        # Type separator and formatted text
-        self.helper.type_text(self.separator + formatted, release_alt=True)
+        # Send separator and formatted text chunk by chunk (abortable); long
+        # text is pasted a clipboard block at a time
+        lines = text.count('\n') - text.count('\r\n') + 1
+        total = len(self.separator) + len(text) + len(self.prefix) * lines
+        if self.helper.injector.choose_length(total) == 'paste':
+            self.helper.paste_stream(pieces, total)
+        else:
+            self.helper.type_stream(pieces, total)
 
 
 @register_action("pretty_notes")
@@ -57,7 +68,7 @@ class PrettyNotesAction(Action):
 
         Args:
             config: Configuration dict
-            keyboard_controller: pynput keyboard controller
+            keyboard_controller: Key injector
         """
         super().__init__(config, keyboard_controller)
         self.helper = KeyboardHelper(keyboard_controller)
@@ -67,14 +78,89 @@ class PrettyNotesAction(Action):
         """Execute the legacy pretty notes key sequence."""
         logger.info("Executing pretty notes navigation")
 
-        # Release alt first
-        self.helper.release_modifiers(Key.alt)
+        with self.helper.batch() as batch:
+            # Release alt first
+            batch.release('<alt>')
+
+            # Press dash
+            batch.tap('-')
+
+            # Navigate up and home
+            batch.tap('<up>', '<home>')
+
+            # Re-press alt to maintain modifier state
+            batch.press('<alt>')
+
+
+@register_action("paste_history")
+class PasteHistoryAction(Action):
+    """Types an earlier clipboard entry from the clipboard history."""
+
+    def __init__(self, config: Dict[str, Any], keyboard_controller: Any):
+        """Initialize paste history action.
+
+        Args:
+            config: Configuration dict with 'index' (1 is the entry copied
+                before the current one)
+            keyboard_controller: Key injector
+        """
+        super().__init__(config, keyboard_controller)
+        self.index = int(config.get('index', 1))
+        self.helper = KeyboardHelper(keyboard_controller, config.get('injection'))
+        logger.debug(f"Initialized PasteHistoryAction (index: {self.index})")
+
+    def execute(self) -> None:
+        """Look up the history entry and type it."""
+        history = ClipboardManager.get_history()
+        if history is None:
+            logger.warning("Clipboard history is disabled (app.clipboard_history.enabled)")
+            return
+
+        text = history.get(self.index)
+        if text is None:
+            logger.warning(f"Clipboard history has no entry {self.index} ({len(history)} entries)")
+            return
 
-        # Press dash
-        self.helper.press_key_sequence('-')
+        logger.info(f"Pasting clipboard history entry {self.index}")
+        self.helper.type_text(text, release_alt=True)
 
-        # Navigate up and home
-        self.helper.press_key_sequence(Key.up, Key.home)
 
-        # Re-press alt to maintain modifier state
-        self.kb.press(Key.alt)
+@register_action("paste_transformed")
+class PasteTransformedAction(Action):
+    """Types clipboard text passed through a pipeline of transforms."""
+
+    priority = 'bulk'
+
+    def __init__(self, config: Dict[str, Any], keyboard_controller: Any):
+        """Initialize paste transformed action.
+
+        Args:
+            config: Configuration dict with 'transforms' (see
+                customhk.transforms) and 'separator'
+            keyboard_controller: Key injector
+
+        Raises:
+            ValueError: If the transforms are invalid
+        """
+        super().__init__(config, keyboard_controller)
+        self.pipeline = compile_pipeline(config.get('transforms') or [])
+        self.separator = config.get('separator', '')
+        self.helper = KeyboardHelper(keyboard_controller, config.get('injection'))
+        self.clipboard = ClipboardManager()
+        logger.debug(f"Initialized PasteTransformedAction ({self.pipeline!r})")
+
+    def execute(self) -> None:
+        """Get clipboard text, transform it, and type it."""
+        logger.info(f"Executing paste transformed: {self.pipeline!r}")
+
+        text = self.clipboard.get_text()
+        if not text:
+            logger.warning("No text in clipboard, aborting")
+            return
+
+        # Send chunk by chunk (abortable), typed or pasted by the output's
+        # length; the progress total is the input's, as an estimate
+        chunk_size = self.helper.injector.settings['chunk_size']
+        pieces = self.pipeline.stream(text, chunk_size)
+        self.helper.send_stream(itertools.chain((self.separator,), pieces),
+                                len(self.separator) + len(text))
@@ -0,0 +1,182 @@
+"""Discovery of built-in and third-party actions.
+
+Third-party packages provide actions through the ``customhk.actions`` entry
+point group. The entry point name is the action name, its value points at the
+class, and optional extras declare the shared resources the action uses::
+
+    [project.entry-points."customhk.actions"]
+    jira_link = "customhk_jira.actions:JiraLinkAction [clipboard, keyboard]"
+
+Scanning installed distributions for entry points is slow, so the result is
+cached as a JSON manifest in ``~/.customhk``. The cache is keyed by the
+modification times of the ``sys.path`` directories, which change whenever a
+package is installed or removed there.
+"""
+
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from . import BUILTIN_ACTIONS
+from .registry import ActionSpec
+
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = 'customhk.actions'
+
+# Bump whenever the manifest layout changes
+MANIFEST_VERSION = 1
+
+DEFAULT_MANIFEST_PATH = Path.home() / '.customhk' / 'action_manifest.json'
+
+
+def _parse_entry_point(name: str, value: str, source: str) -> Optional[ActionSpec]:
+    """Turn an entry point into an ActionSpec.
+
+    Args:
+        name: Entry point name (the action name)
+        value: ``module:Class [resource, ...]``
+        source: Distribution providing the entry point
+
+    Returns:
+        ActionSpec or None if the value is malformed
+    """
+    target, _, extras = value.partition('[')
+    module, _, class_name = target.strip().partition(':')
+    if not module or not class_name:
+        logger.warning(f"Ignoring action entry point {name} = {value!r}: expected module:Class")
+        return None
+
+    resources = tuple(
+        resource.strip() for resource in extras.rstrip().rstrip(']').split(',')
+        if resource.strip()
+    )
+    return ActionSpec(name, module.strip(), class_name.strip(), resources, source)
+
+
+def scan_entry_points() -> List[ActionSpec]:
+    """Find actions provided by installed distributions.
+
+    Returns:
+        ActionSpecs in discovery order
+    """
+    from importlib import metadata
+
+    try:
+        entry_points = metadata.entry_points(group=ENTRY_POINT_GROUP)
+    except TypeError:  # Python < 3.10
+        entry_points = metadata.entry_points().get(ENTRY_POINT_GROUP, [])
+
+    specs = []
+    for entry_point in entry_points:
+        dist = getattr(entry_point, 'dist', None)
+        source = dist.metadata['Name'] if dist is not None else 'plugin'
+        spec = _parse_entry_point(entry_point.name, entry_point.value, source)
+        if spec is not None:
+            specs.append(spec)
+    return specs
+
+
+def _fingerprint() -> List[Any]:
+    """Describe the import path state the manifest depends on.
+
+    Returns:
+        JSON-serializable fingerprint
+    """
+    paths = []
+    for entry in sys.path:
+        try:
+            mtime = os.stat(entry or '.').st_mtime_ns
+        except OSError:
+            continue
+        paths.append([entry, mtime])
+    return [MANIFEST_VERSION, list(sys.version_info[:2]), paths]
+
+
+def _load_manifest(path: Path, fingerprint: List[Any]) -> Optional[List[ActionSpec]]:
+    """Read the cached plugin manifest if it is still valid.
+
+    Args:
+        path: Manifest file
+        fingerprint: Current fingerprint
+
+    Returns:
+        Cached specs or None
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if manifest.get('fingerprint') != fingerprint:
+        return None
+    try:
+        return [
+            ActionSpec(name, module, class_name, tuple(resources), source)
+            for name, module, class_name, resources, source in manifest['actions']
+        ]
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _store_manifest(path: Path, fingerprint: List[Any], specs: List[ActionSpec]) -> None:
+    """Write the plugin manifest; failures only disable caching.
+
+    Args:
+        path: Manifest file
+        fingerprint: Fingerprint the specs were scanned under
+        specs: Discovered plugin specs
+    """
+    manifest: Dict[str, Any] = {
+        'fingerprint': fingerprint,
+        'actions': [list(spec) for spec in specs],
+    }
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.debug(f"Could not write action manifest {path}: {e}")
+
+
+def discover_actions(
+    manifest_path: Optional[Path] = DEFAULT_MANIFEST_PATH,
+    refresh: bool = False
+) -> List[ActionSpec]:
+    """Get the specs of every available action without importing any.
+
+    Args:
+        manifest_path: Plugin manifest cache (None to disable caching)
+        refresh: Rescan entry points even if the cache is valid
+
+    Returns:
+        Built-in specs followed by plugin specs; plugins may override
+        built-in names
+    """
+    plugins = None
+    fingerprint = _fingerprint()
+
+    if manifest_path is not None and not refresh:
+        plugins = _load_manifest(manifest_path, fingerprint)
+
+    if plugins is None:
+        try:
+            plugins = scan_entry_points()
+        except Exception as e:
+            logger.error(f"Failed to scan for action plugins: {e}")
+            plugins = []
+        else:
+            if manifest_path is not None:
+                _store_manifest(manifest_path, fingerprint, plugins)
+        logger.debug(f"Scanned entry points: {len(plugins)} action plugin(s)")
+
+    if plugins:
+        logger.info(f"Found {len(plugins)} action plugin(s): {[spec.name for spec in plugins]}")
+    return list(BUILTIN_ACTIONS) + plugins
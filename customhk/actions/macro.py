@@ -0,0 +1,263 @@
+"""Macro actions: playback of the ``macros:`` section and recording."""
+
+import logging
+import threading
+import weakref
+from typing import Any, Dict, Optional
+
+from .base import Action
+from .. import metrics
+from ..backends import get_platform
+from ..macros import KeyLog, parse_speed
+from ..recorder import MacroRecorder, save_recording
+from ..scheduling import ActionCancelled, continue_later
+from ..utils.injection import abort_generation
+from ..utils.keyboard import KeyBatch
+
+
+logger = logging.getLogger(__name__)
+
+_runs: 'weakref.WeakSet[_MacroRun]' = weakref.WeakSet()
+
+
+class _MacroRun:
+    """One execution of a macro plan.
+
+    Segments are injected one batch each. Waits are not slept: the run
+    schedules its next segment on the platform's timer and returns, so no
+    thread is held while a macro waits. When a wait is over, the rest is
+    queued on the dispatcher again under the macro's name, priority and
+    trigger, so it is scheduled, preempted and cancelled like the first
+    segment instead of being injected from the timer thread. The jobs of
+    one run are continuations of the first, so statistics count the run
+    once, timed from its start to its last segment.
+
+    Every segment has a deadline, the previous one's plus the time it took
+    to inject plus the wait (without the injection time for recordings,
+    which keep their timeline), so timers firing late do not add up over a
+    long macro.
+    """
+
+    def __init__(self, action: 'MacroAction'):
+        self.action = action
+        self.platform = get_platform()
+        self.index = 0
+        self.deadline = self.platform.now()
+        self.started = self.deadline
+        self.waited = False
+        self.late = 0.0
+        self.token = abort_generation()
+        self.cancelled = False
+        # First dispatcher job of the run (None when run directly)
+        self.origin = None
+
+    def run(self) -> None:
+        """Inject segments until the next wait that is not yet due."""
+        segments = self.action.segments
+        while self.index < len(segments):
+            if self.cancelled or abort_generation() != self.token:
+                logger.info(f"Macro {self.action.name} aborted at segment {self.index + 1}")
+                self._finish()
+                return
+
+            wait, events, chars = segments[self.index]
+            if wait and not self.waited:
+                self.deadline += wait
+                delay = self.deadline - self.platform.now()
+                if delay > 0:
+                    self.waited = True
+                    self.origin = continue_later()
+                    self.platform.call_later(delay, self._resume)
+                    return
+            self.waited = False
+
+            started = self.platform.now()
+            self.late = max(self.late, started - self.deadline)
+            batch = KeyBatch(self.action.kb)
+            batch.events = list(events)
+            batch.injected = chars
+            try:
+                sent = batch.flush()
+            except ActionCancelled:
+                logger.info(f"Macro {self.action.name} cancelled")
+                self._finish()
+                return
+            if not sent:
+                logger.error(f"Macro {self.action.name} stopped at segment {self.index + 1}")
+                self._finish()
+                return
+
+            self.index += 1
+            if not self.action.plan['timeline']:
+                self.deadline += self.platform.now() - started
+
+        logger.debug(
+            f"Macro {self.action.name} finished in {self.platform.now() - self.started:.3f}s "
+            f"(latest segment {self.late * 1000:.1f} ms behind schedule)"
+        )
+        self._finish()
+
+    def _resume(self) -> None:
+        """Timer callback: queue the rest of the macro once a wait is over."""
+        origin = self.origin
+        if origin is None:
+            self._continue()
+            return
+
+        # The manager's dispatcher, which a reload may have replaced since
+        submit = self.action.submit or origin.scheduler.submit
+        if not submit(origin.name, self._continue, origin.trigger, origin.priority, origin):
+            logger.warning(
+                f"Macro {self.action.name} stopped: could not queue segment {self.index + 1}"
+            )
+            self._finish()
+
+    def _continue(self) -> None:
+        """Inject the segments after a wait, handling errors like Action.__call__."""
+        try:
+            self.run()
+        except Exception as e:
+            self._finish()
+            metrics.note_failure()
+            logger.exception(f"Error running macro {self.action.name}: {e}")
+
+    def _finish(self) -> None:
+        self.action._finished(self)
+
+
+class MacroAction(Action):
+    """Runs a macro compiled from the ``macros:`` section (see customhk.macros)."""
+
+    def __init__(self, config: Dict[str, Any], keyboard_controller: Any):
+        """Initialize macro action.
+
+        Args:
+            config: Configuration dict with 'macro' (the compiled plan),
+                'name' (the macro's key in ``macros:``), optionally 'speed'
+                overriding the macro's replay speed and 'submit' queuing
+                the rest of a run after a wait (ActionDispatcher.submit
+                signature; the dispatcher that started the run if absent)
+            keyboard_controller: Key injector
+
+        Raises:
+            ValueError: If no compiled plan was given or the speed is invalid
+        """
+        plan = config.get('macro')
+        if not plan:
+            raise ValueError("Macro action created without a compiled macro")
+        super().__init__(config, keyboard_controller)
+        self.name = config.get('name') or plan['title'] or self.name
+        self.plan = plan
+        self.speed = parse_speed(config['speed']) if 'speed' in config else plan['speed']
+        self.submit = config.get('submit')
+
+        if plan['recording'] is not None:
+            self.segments = KeyLog.from_bytes(plan['recording']).segments(self.speed)
+        elif self.speed != 1.0:
+            scale = 1.0 / self.speed if self.speed else 0.0
+            self.segments = tuple(
+                (wait * scale, events, chars) for wait, events, chars in plan['segments']
+            )
+        else:
+            self.segments = plan['segments']
+        self._run = None
+        self._lock = threading.Lock()
+        logger.debug(
+            f"Initialized MacroAction {self.name} ({plan['steps']} steps, "
+            f"{len(self.segments)} batches, {plan['duration']:.2f}s at speed 1, "
+            f"speed {self.speed or 'max'})"
+        )
+
+    def execute(self) -> None:
+        """Start the macro; later segments run from the timer."""
+        with self._lock:
+            if self._run is not None:
+                logger.info(f"Macro {self.name} is already running")
+                return
+            run = self._run = _MacroRun(self)
+        _runs.add(run)
+
+        logger.info(f"Running macro {self.name}")
+        try:
+            run.run()
+        except Exception:
+            self._finished(run)
+            raise
+
+    def is_running(self) -> bool:
+        """Check whether a run of this macro is in progress.
+
+        Returns:
+            True while the macro has segments left
+        """
+        return self._run is not None
+
+    def cancel(self) -> None:
+        """Stop the running macro before its next segment."""
+        run = self._run
+        if run is not None:
+            run.cancelled = True
+            self._finished(run)
+
+    def _finished(self, run: _MacroRun) -> None:
+        with self._lock:
+            if self._run is run:
+                self._run = None
+
+
+class RecordMacroAction(Action):
+    """Starts recording key events as a macro, or stops and saves it."""
+
+    priority = 'critical'
+
+    def __init__(self, config: Dict[str, Any], keyboard_controller: Any):
+        """Initialize record macro action.
+
+        Args:
+            config: Configuration dict with 'config_path' (the file the
+                macro is saved to) and 'speed' (replay speed stored with it)
+            keyboard_controller: Key injector
+
+        Raises:
+            ValueError: If the speed is invalid
+        """
+        super().__init__(config, keyboard_controller)
+        self.config_path = config.get('config_path')
+        self.speed = config.get('speed', 1)
+        parse_speed(self.speed)
+        self.recorder: Optional[MacroRecorder] = None
+        logger.debug("Initialized RecordMacroAction")
+
+    def execute(self) -> None:
+        """Toggle recording."""
+        if self.recorder is None:
+            self.recorder = MacroRecorder()
+            self.recorder.start()
+            logger.info("Recording a macro; trigger record_macro again to stop")
+            return
+
+        recorder, self.recorder = self.recorder, None
+        log = recorder.stop()
+        if not len(log):
+            logger.warning("No keys recorded, nothing saved")
+            return
+        if not self.config_path:
+            logger.error("No configuration file to save the macro to")
+            return
+
+        name = save_recording(self.config_path, log, speed=self.speed)
+        logger.info(
+            f"Recorded macro '{name}' ({len(log)} key events); bind it to a hotkey to replay it"
+        )
+
+
+def cancel_all() -> int:
+    """Stop every running macro before its next segment.
+
+    Returns:
+        Number of macros that were running
+    """
+    runs = [run for run in list(_runs) if run.action._run is run]
+    for run in runs:
+        run.action.cancel()
+    return len(runs)
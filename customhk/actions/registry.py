@@ -1,6 +1,14 @@
-"""Action registry for managing available actions."""
+"""Action registry for managing available actions.
 
-from typing import Dict, Type, Any, Optional
+Actions are known to the registry either as loaded classes (registered with
+``@register_action`` when their module is imported) or as ``ActionSpec``
+entries from the action manifest (built-ins and ``customhk.actions`` entry
+points). A spec'd action's module is imported the first time an instance is
+created, so startup cost does not grow with the number of installed actions.
+"""
+
+import importlib
+from typing import Dict, List, NamedTuple, Tuple, Type, Any, Optional
 import logging
 
 from .base import Action
@@ -9,13 +17,93 @@ from .base import Action
 logger = logging.getLogger(__name__)
 
 
+class ActionSpec(NamedTuple):
+    """Where to find an action without importing it."""
+
+    name: str
+    module: str
+    class_name: str
+    resources: Tuple[str, ...] = ()
+    source: str = "builtin"
+
+
 class ActionRegistry:
     """Registry for all available actions."""
 
     def __init__(self):
         """Initialize the action registry."""
         self._actions: Dict[str, Type[Action]] = {}
+        self._specs: Dict[str, ActionSpec] = {}
         self._instances: Dict[str, Action] = {}
+        self.discovered = False
+
+    def declare(self, spec: ActionSpec) -> None:
+        """Declare an action that is imported on first use.
+
+        Args:
+            spec: Action manifest entry
+        """
+        current = self._specs.get(spec.name)
+        if current is not None and current != spec:
+            logger.warning(
+                f"Action '{spec.name}' from {spec.source} overrides {current.source}"
+            )
+        self._specs[spec.name] = spec
+
+    def get_spec(self, name: str) -> Optional[ActionSpec]:
+        """Get the manifest entry of an action.
+
+        Args:
+            name: Name of the action
+
+        Returns:
+            ActionSpec or None if the action was registered directly
+        """
+        return self._specs.get(name)
+
+    def is_loaded(self, name: str) -> bool:
+        """Check whether an action's class has been imported.
+
+        Args:
+            name: Name of the action
+
+        Returns:
+            True if the class is loaded
+        """
+        return name in self._actions
+
+    def _load(self, name: str) -> Optional[Type[Action]]:
+        """Get an action class, importing its module if needed.
+
+        Args:
+            name: Name of the action
+
+        Returns:
+            Action class or None if unknown or it failed to import
+        """
+        action_class = self._actions.get(name)
+        if action_class is not None:
+            return action_class
+
+        spec = self._specs.get(name)
+        if spec is None:
+            return None
+
+        try:
+            module = importlib.import_module(spec.module)
+            # Modules using @register_action have registered themselves
+            action_class = self._actions.get(name) or getattr(module, spec.class_name)
+        except Exception as e:
+            logger.error(f"Failed to import action '{name}' from {spec.module}: {e}")
+            return None
+
+        if not (isinstance(action_class, type) and issubclass(action_class, Action)):
+            logger.error(f"{spec.module}.{spec.class_name} is not an Action subclass")
+            return None
+
+        self._actions[name] = action_class
+        logger.debug(f"Loaded action '{name}' from {spec.module}")
+        return action_class
 
     def register(self, name: str, action_class: Type[Action]) -> None:
         """Register an action class.
@@ -34,7 +122,8 @@ class ActionRegistry:
         self,
         name: str,
         config: Dict[str, Any],
-        keyboard_controller: Any
+        keyboard_controller: Any,
+        instance_name: Optional[str] = None
     ) -> Optional[Action]:
         """Create an instance of a registered action.
 
@@ -42,18 +131,23 @@ class ActionRegistry:
             name: Name of the action to instantiate
             config: Configuration for the action
             keyboard_controller: Keyboard controller instance
+            instance_name: Name to keep the instance under, for actions
+                defined in the config with a ``type`` (defaults to name)
 
         Returns:
             Action instance or None if action not found
         """
-        if name not in self._actions:
-            logger.error(f"Action '{name}' not found in registry")
+        instance_name = instance_name or name
+        action_class = self._load(name)
+        if action_class is None:
+            if name not in self._specs:
+                logger.error(f"Action '{name}' not found in registry")
             return None
 
         try:
-            instance = self._actions[name](config, keyboard_controller)
-            self._instances[name] = instance
-            logger.debug(f"Created instance of action: {name}")
+            instance = action_class(config, keyboard_controller)
+            self._instances[instance_name] = instance
+            logger.debug(f"Created instance of action: {instance_name} ({name})")
             return instance
         except Exception as e:
             logger.error(f"Failed to create instance of action '{name}': {e}")
@@ -70,13 +164,23 @@ class ActionRegistry:
         """
         return self._instances.get(name)
 
-    def list_actions(self) -> list[str]:
-        """Get list of all registered action names.
+    def list_instances(self) -> List[str]:
+        """Get the names of all created action instances.
+
+        Returns:
+            List of instance names, including config-defined actions
+        """
+        return list(self._instances)
+
+    def list_actions(self) -> List[str]:
+        """Get list of all registered action names, loaded or not.
 
         Returns:
             List of action names
         """
-        return list(self._actions.keys())
+        names = list(self._specs)
+        names.extend(name for name in self._actions if name not in self._specs)
+        return names
 
     def unregister(self, name: str) -> None:
         """Unregister an action.
@@ -84,8 +188,9 @@ class ActionRegistry:
         Args:
             name: Name of the action to unregister
         """
-        if name in self._actions:
-            del self._actions[name]
+        if name in self._actions or name in self._specs:
+            self._actions.pop(name, None)
+            self._specs.pop(name, None)
             logger.info(f"Unregistered action: {name}")
 
         if name in self._instances:
@@ -117,7 +222,16 @@ def register_action(name: str):
 def get_registry() -> ActionRegistry:
     """Get the global action registry.
 
+    The action manifest (built-in actions and installed plugins) is loaded
+    into the registry on first call.
+
     Returns:
         Global ActionRegistry instance
     """
+    if not _registry.discovered:
+        _registry.discovered = True
+        from .discovery import discover_actions
+
+        for spec in discover_actions():
+            _registry.declare(spec)
     return _registry
@@ -20,11 +20,11 @@ class TypeSignatureAction(Action):
 
         Args:
             config: Configuration dict, should contain 'signature' key
-            keyboard_controller: pynput keyboard controller
+            keyboard_controller: Key injector
         """
         super().__init__(config, keyboard_controller)
         self.signature = config.get('signature', 'Thanks')
-        self.helper = KeyboardHelper(keyboard_controller)
+        self.helper = KeyboardHelper(keyboard_controller, config.get('injection'))
         logger.debug(f"Initialized TypeSignatureAction with signature: {self.signature[:20]}...")
 
     def execute(self) -> None:
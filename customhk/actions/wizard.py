@@ -1,48 +1,76 @@
 """GUI wizard for interactive hotkey selection."""
 
 import logging
-import tkinter as tk
-from tkinter import ttk
-from typing import Any, Dict, Optional, Callable
+import queue
 import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
 
 from .base import Action
 from .registry import register_action, get_registry
+from ..utils.clipboard import ClipboardManager
+from ..utils.injection import resolve_settings
+from ..utils.keyboard import KeyboardHelper
+
+
+if TYPE_CHECKING:
+    import tkinter as tk
 
 
 logger = logging.getLogger(__name__)
 
+# Milliseconds between checks for queued calls when Tcl cannot be called
+# from other threads
+POLL_INTERVAL_MS = 50
+
 
 class HotkeyWizard:
-    """GUI wizard for selecting and executing actions."""
+    """GUI wizard for selecting and executing actions.
+
+    The window is built once and then shown and hidden; every method that
+    touches it must run on the thread that created it (see WizardUI).
+    """
+
+    HISTORY_RESULTS = 20
 
-    def __init__(self, action_registry, config, on_action_selected: Optional[Callable] = None):
+    def __init__(
+        self,
+        action_registry,
+        config,
+        on_action_selected: Optional[Callable] = None,
+        on_history_selected: Optional[Callable] = None
+    ):
         """Initialize the wizard.
 
         Args:
             action_registry: ActionRegistry instance
             config: Configuration object
             on_action_selected: Callback when action is selected
+            on_history_selected: Callback with the entry key when a clipboard
+                history entry is selected
         """
         self.registry = action_registry
         self.config = config
         self.on_action_selected = on_action_selected
-        self.window: Optional[tk.Tk] = None
+        self.on_history_selected = on_history_selected
+        # Called with the seconds from an open() request to the window being mapped
+        self.on_visible: Optional[Callable[[float], None]] = None
+        self.window: Optional['tk.Tk'] = None
         self.selected_action: Optional[str] = None
+        self.selected_history: Optional[bytes] = None
+        self._history_rows: Dict[int, bytes] = {}  # listbox index -> entry key
+        self._requested_at: Optional[float] = None
 
-    def show(self) -> None:
-        """Show the wizard window."""
-        if self.window is not None:
-            # Window already exists, bring to front
-            try:
-                self.window.lift()
-                self.window.focus_force()
-                return
-            except:
-                self.window = None
+    def build(self, window: 'tk.Tk') -> None:
+        """Build the widgets into a (withdrawn) window.
+
+        Args:
+            window: Tk root window the wizard lives in
+        """
+        import tkinter as tk
+        from tkinter import ttk
 
-        # Create new window
-        self.window = tk.Tk()
+        self.window = window
         self.window.title("CustomHK - Hotkey Wizard")
         self.window.geometry("600x400")
 
@@ -68,10 +96,9 @@ class HotkeyWizard:
         search_label = ttk.Label(search_frame, text="Search:")
         search_label.pack(side='left', padx=(0, 10))
 
-        search_var = tk.StringVar()
-        search_entry = ttk.Entry(search_frame, textvariable=search_var)
-        search_entry.pack(side='left', fill='x', expand=True)
-        search_entry.focus()
+        self.search_var = tk.StringVar(self.window)
+        self.search_entry = ttk.Entry(search_frame, textvariable=self.search_var)
+        self.search_entry.pack(side='left', fill='x', expand=True)
 
         # Action list frame
         list_frame = ttk.Frame(self.window)
@@ -95,13 +122,12 @@ class HotkeyWizard:
         self.action_listbox.grid(row=0, column=0, sticky='nsew')
         scrollbar.config(command=self.action_listbox.yview)
 
-        # Populate actions
-        self._populate_actions()
-
         # Bind events
         self.action_listbox.bind('<Double-Button-1>', self._on_action_selected)
         self.action_listbox.bind('<Return>', self._on_action_selected)
-        search_var.trace('w', lambda *args: self._filter_actions(search_var.get()))
+        self.search_var.trace_add(
+            'write', lambda *args: self._filter_actions(self.search_var.get())
+        )
 
         # Button frame
         button_frame = ttk.Frame(self.window)
@@ -121,11 +147,51 @@ class HotkeyWizard:
         )
         cancel_btn.pack(side='right', padx=5)
 
-        # Bind escape key to close
+        # Escape and the close button hide the window; it is reused
         self.window.bind('<Escape>', lambda e: self._on_cancel_clicked())
+        self.window.protocol('WM_DELETE_WINDOW', self._on_cancel_clicked)
+        self.window.bind('<Map>', self._on_map)
+
+    def open(self, requested_at: Optional[float] = None) -> None:
+        """Show the window with an up-to-date action list and an empty search.
+
+        Args:
+            requested_at: perf_counter time the wizard was asked for, to
+                report the time until it is visible (now if None)
+        """
+        self.selected_action = None
+        self.selected_history = None
+        self._requested_at = time.perf_counter() if requested_at is None else requested_at
+
+        # Clearing the search repopulates the list through its trace
+        if self.search_var.get():
+            self.search_var.set('')
+        else:
+            self._populate_actions()
+
+        visible = self.window.state() == 'normal'
+        self.window.deiconify()
+        self.window.lift()
+        self.window.focus_force()
+        self.search_entry.focus_set()
+        if visible:
+            # Already on screen, no <Map> follows
+            self._report_visible()
+
+    def hide(self) -> None:
+        """Hide the window, keeping it for the next open()."""
+        if self.window is not None:
+            self.window.withdraw()
+
+    def _on_map(self, event: Any) -> None:
+        """Report the time to visible once the window itself is mapped."""
+        if event.widget is self.window:
+            self._report_visible()
 
-        # Start main loop
-        self.window.mainloop()
+    def _report_visible(self) -> None:
+        requested_at, self._requested_at = self._requested_at, None
+        if requested_at is not None and self.on_visible is not None:
+            self.on_visible(time.perf_counter() - requested_at)
 
     def _populate_actions(self, filter_text: str = "") -> None:
         """Populate the action list.
@@ -133,16 +199,24 @@ class HotkeyWizard:
         Args:
             filter_text: Optional filter string
         """
-        self.action_listbox.delete(0, tk.END)
+        self.action_listbox.delete(0, 'end')
 
-        actions = self.registry.list_actions()
-        actions.sort()
+        # Registered actions plus actions defined in the config with a type
+        actions = sorted(set(self.registry.list_actions()) | set(self.registry.list_instances()))
 
         for action_name in actions:
             if not filter_text or filter_text.lower() in action_name.lower():
                 # Format action name for display
                 display_name = action_name.replace('_', ' ').title()
-                self.action_listbox.insert(tk.END, f"{display_name}  ({action_name})")
+                self.action_listbox.insert('end', f"{display_name}  ({action_name})")
+
+        # Matching clipboard history entries follow the actions
+        self._history_rows = {}
+        history = ClipboardManager.get_history()
+        if history is not None and filter_text:
+            for entry in history.search(filter_text, self.HISTORY_RESULTS):
+                self._history_rows[self.action_listbox.size()] = entry.key
+                self.action_listbox.insert('end', f"Clipboard: {entry.preview}")
 
     def _filter_actions(self, filter_text: str) -> None:
         """Filter actions based on search text.
@@ -158,6 +232,12 @@ class HotkeyWizard:
         if not selection:
             return
 
+        key = self._history_rows.get(selection[0])
+        if key is not None:
+            self.selected_history = key
+            self._execute_and_close()
+            return
+
         selected_text = self.action_listbox.get(selection[0])
         # Extract action name from parentheses
         if '(' in selected_text and ')' in selected_text:
@@ -171,52 +251,268 @@ class HotkeyWizard:
 
     def _on_cancel_clicked(self) -> None:
         """Handle cancel button click."""
-        if self.window:
-            self.window.destroy()
-            self.window = None
+        self.hide()
 
     def _execute_and_close(self) -> None:
-        """Execute selected action and close wizard."""
+        """Hide the wizard and run the selection off the UI thread."""
+        self.hide()
+
         if self.selected_action and self.on_action_selected:
-            self.on_action_selected(self.selected_action)
+            callback, selection = self.on_action_selected, self.selected_action
+        elif self.selected_history and self.on_history_selected:
+            callback, selection = self.on_history_selected, self.selected_history
+        else:
+            return
+
+        # Typing must neither block the window's event loop nor reach it
+        threading.Thread(
+            target=callback, args=(selection,), name='customhk-wizard-selection', daemon=True
+        ).start()
+
+
+class WizardUI:
+    """Owns the wizard window on one long-lived UI thread.
+
+    The thread creates the process's only Tk interpreter, builds the wizard
+    into a hidden window and runs the event loop until stop(). Other
+    threads never touch Tk directly: call() queues a function and wakes the
+    loop, which runs it. Opening the wizard is therefore a show and focus
+    of the prebuilt window, not a new interpreter and widget tree.
+    """
+
+    def __init__(self) -> None:
+        """Initialize; the thread starts on start() or the first call()."""
+        self.wizard: Optional[HotkeyWizard] = None
+        self.error: Optional[str] = None
+        self._calls: 'queue.SimpleQueue[Callable[[], None]]' = queue.SimpleQueue()
+        self._root: Optional['tk.Tk'] = None
+        self._threaded = False
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+
+        # Statistics (guarded by _lock)
+        self._build_ms: Optional[float] = None
+        self._opens = 0
+        self._last_visible = 0.0
+        self._max_visible = 0.0
+        self._total_visible = 0.0
+
+    def start(self) -> None:
+        """Start the UI thread and build the wizard in the background."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='customhk-ui', daemon=True)
+                self._thread.start()
+
+    def call(self, func: Callable[[], None]) -> bool:
+        """Run a function on the UI thread. Safe to call from any thread.
 
-        self._on_cancel_clicked()
+        Args:
+            func: Called with no arguments once the wizard is built
+
+        Returns:
+            False if the UI could not be started
+        """
+        if self.error is not None:
+            logger.error(f"Wizard unavailable: {self.error}")
+            return False
+        self.start()
+        self._calls.put(func)
+
+        # Until the loop runs, queued calls are picked up when it starts
+        root = self._root
+        if self._ready.is_set() and self._threaded and root is not None:
+            try:
+                root.after(0, self._drain)
+            except Exception as e:
+                logger.debug(f"Could not wake the UI thread: {e}")
+        return True
+
+    def show(
+        self,
+        config: Any,
+        on_action_selected: Callable[[str], None],
+        on_history_selected: Callable[[bytes], None]
+    ) -> bool:
+        """Show and focus the wizard.
+
+        Args:
+            config: Configuration the wizard is opened for
+            on_action_selected: Called with the chosen action name
+            on_history_selected: Called with the chosen history entry key
+
+        Returns:
+            False if the UI could not be started
+        """
+        requested_at = time.perf_counter()
+
+        def open_wizard() -> None:
+            wizard = self.wizard
+            wizard.config = config
+            wizard.on_action_selected = on_action_selected
+            wizard.on_history_selected = on_history_selected
+            wizard.open(requested_at)
+
+        return self.call(open_wizard)
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """End the event loop and destroy the window.
+
+        Args:
+            timeout: Seconds to wait for the UI thread
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        if self._ready.wait(timeout) and self.error is None:
+            self._calls.put(self._root.quit)
+            if self._threaded:
+                try:
+                    self._root.after(0, self._drain)
+                except Exception as e:
+                    logger.debug(f"Could not wake the UI thread: {e}")
+        thread.join(timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get wizard timings.
+
+        Returns:
+            Dictionary with 'build_ms' (creating the hidden window, None
+            until built), 'opens' and the last, average and maximum
+            milliseconds from a show() request to the window being visible
+        """
+        with self._lock:
+            return {
+                'build_ms': self._build_ms,
+                'opens': self._opens,
+                'last_visible_ms': self._last_visible * 1000.0,
+                'avg_visible_ms': (
+                    self._total_visible / self._opens * 1000.0 if self._opens else 0.0
+                ),
+                'max_visible_ms': self._max_visible * 1000.0,
+            }
+
+    def _run(self) -> None:
+        """UI thread: build the hidden wizard and run the event loop."""
+        started = time.perf_counter()
+        try:
+            # Tk is only loaded once the wizard is first needed
+            import tkinter as tk
+
+            root = tk.Tk()
+            root.withdraw()
+            wizard = HotkeyWizard(get_registry(), None)
+            wizard.on_visible = self._on_visible
+            wizard.build(root)
+            # Without a threaded Tcl, other threads cannot wake the loop
+            self._threaded = bool(root.tk.call('info', 'exists', 'tcl_platform(threaded)'))
+        except Exception as e:
+            self.error = str(e)
+            logger.error(f"Failed to create the wizard window: {e}", exc_info=True)
+            self._ready.set()
+            return
+
+        with self._lock:
+            self._build_ms = (time.perf_counter() - started) * 1000.0
+        logger.debug(f"Built the wizard window in {self._build_ms:.1f} ms")
+
+        self.wizard = wizard
+        self._root = root
+        root.after_idle(self._on_ready)
+        try:
+            root.mainloop()
+        finally:
+            self._root = None
+            self.wizard = None
+            root.destroy()
+            logger.debug("Wizard UI thread stopped")
+
+    def _on_ready(self) -> None:
+        """First turn of the event loop: accept calls."""
+        self._ready.set()
+        self._drain()
+        if not self._threaded:
+            self._poll()
+
+    def _poll(self) -> None:
+        self._drain()
+        self._root.after(POLL_INTERVAL_MS, self._poll)
+
+    def _drain(self) -> None:
+        """Run every queued call (on the UI thread)."""
+        while True:
+            try:
+                func = self._calls.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                func()
+            except Exception as e:
+                logger.error(f"Wizard UI call failed: {e}", exc_info=True)
+
+    def _on_visible(self, seconds: float) -> None:
+        with self._lock:
+            self._opens += 1
+            self._last_visible = seconds
+            self._max_visible = max(self._max_visible, seconds)
+            self._total_visible += seconds
+        logger.debug(f"Wizard visible after {seconds * 1000.0:.1f} ms")
+
+
+_ui: Optional[WizardUI] = None
+_ui_lock = threading.Lock()
+
+
+def get_wizard_ui() -> WizardUI:
+    """Get the shared wizard UI (its thread starts on first use).
+
+    Returns:
+        WizardUI
+    """
+    global _ui
+    if _ui is None:
+        with _ui_lock:
+            if _ui is None:
+                _ui = WizardUI()
+    return _ui
+
+
+def stop_wizard_ui() -> None:
+    """Stop the shared wizard UI thread if it was started."""
+    global _ui
+    with _ui_lock:
+        ui, _ui = _ui, None
+    if ui is not None:
+        ui.stop()
 
 
 @register_action("show_wizard")
 class ShowWizardAction(Action):
     """Shows the GUI wizard for selecting actions."""
 
+    priority = 'interactive'
+
     def __init__(self, config: Dict[str, Any], keyboard_controller: Any):
         """Initialize show wizard action.
 
         Args:
             config: Configuration dict with app config
-            keyboard_controller: pynput keyboard controller
+            keyboard_controller: Key injector
         """
         super().__init__(config, keyboard_controller)
         self.app_config = config
         logger.debug("Initialized ShowWizardAction")
 
     def execute(self) -> None:
-        """Show the wizard in a separate thread."""
+        """Show the wizard on the UI thread (returns without waiting)."""
         logger.info("Showing hotkey wizard")
+        get_wizard_ui().show(self.app_config, self._on_action_selected, self._on_history_selected)
 
-        # Run wizard in separate thread to avoid blocking
-        def run_wizard():
-            try:
-                registry = get_registry()
-                wizard = HotkeyWizard(
-                    registry,
-                    self.app_config,
-                    on_action_selected=self._on_action_selected
-                )
-                wizard.show()
-            except Exception as e:
-                logger.error(f"Error showing wizard: {e}", exc_info=True)
-
-        wizard_thread = threading.Thread(target=run_wizard, daemon=True)
-        wizard_thread.start()
+    def preload(self) -> None:
+        """Build the hidden wizard window ahead of the first open."""
+        get_wizard_ui().start()
 
     def _on_action_selected(self, action_name: str) -> None:
         """Handle action selection from wizard.
@@ -237,3 +533,20 @@ class ShowWizardAction(Action):
                 logger.error(f"Error executing action {action_name}: {e}", exc_info=True)
         else:
             logger.error(f"Action {action_name} not found in registry")
+
+    def _on_history_selected(self, key: bytes) -> None:
+        """Type a clipboard history entry chosen in the wizard.
+
+        Args:
+            key: Key of the selected history entry
+        """
+        history = ClipboardManager.get_history()
+        text = history.get_by_key(key) if history is not None else None
+        if text is None:
+            logger.warning("Selected clipboard history entry is no longer available")
+            return
+
+        logger.info("Typing clipboard history entry selected from wizard")
+        app = self.app_config.get('app') or {}
+        helper = KeyboardHelper(self.kb, resolve_settings(app.get('injection')))
+        helper.type_text(text, release_alt=False)
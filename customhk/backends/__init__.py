@@ -0,0 +1,86 @@
+"""Platform backends: key injection, key events, clipboard and windows.
+
+The application reaches the desktop only through the active ``Platform``.
+By default that is ``NativePlatform`` (pynput, pywin32, user32);
+``customhk.backends.simulator.Simulator`` replaces it with a deterministic
+in-memory desktop for benchmarks and CI::
+
+    from customhk.backends import set_platform
+    from customhk.backends.simulator import Simulator
+
+    set_platform(Simulator())
+"""
+
+import threading
+from typing import Optional
+
+from .base import (
+    PRESS,
+    RELEASE,
+    TYPE,
+    ClipboardBackend,
+    ClipboardBusy,
+    KeyEvent,
+    KeyEventSource,
+    KeyInjectionError,
+    KeyInjector,
+    KeyListener,
+    Platform,
+    WindowBackend,
+    send_events,
+)
+
+
+__all__ = [
+    'PRESS',
+    'RELEASE',
+    'TYPE',
+    'ClipboardBackend',
+    'ClipboardBusy',
+    'KeyEvent',
+    'KeyEventSource',
+    'KeyInjectionError',
+    'KeyInjector',
+    'KeyListener',
+    'Platform',
+    'WindowBackend',
+    'get_platform',
+    'send_events',
+    'set_platform',
+]
+
+_platform: Optional[Platform] = None
+_platform_lock = threading.Lock()
+
+
+def get_platform() -> Platform:
+    """Get the active platform, creating the native one on first use.
+
+    Returns:
+        Active Platform
+    """
+    global _platform
+    if _platform is None:
+        with _platform_lock:
+            if _platform is None:
+                from .native import NativePlatform
+                _platform = NativePlatform()
+    return _platform
+
+
+def set_platform(platform: Platform) -> None:
+    """Install a platform for everything created from now on.
+
+    Components created earlier keep their backends (a running HotkeyManager
+    keeps its keyboard controller). The shared foreground window cache is
+    dropped so that it is rebuilt on the new window backend.
+
+    Args:
+        platform: Platform to use
+    """
+    global _platform
+    from ..utils.window import WindowManager
+
+    with _platform_lock:
+        _platform = platform
+    WindowManager.reset_context_cache()
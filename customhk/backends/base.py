@@ -0,0 +1,284 @@
+"""Interfaces between CustomHK and the operating system.
+
+Everything that touches the desktop goes through one of these: injecting
+keys, receiving key events, the clipboard and foreground-window queries
+(``WindowBackend``, defined with the window cache in ``utils.window``). A
+``Platform`` bundles one implementation of each.
+"""
+
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from ..utils.window import WindowBackend
+
+
+# Kinds of key events in a batch (see KeyInjector.send)
+PRESS = 'press'
+RELEASE = 'release'
+TYPE = 'type'
+
+KeyEvent = Tuple[str, Any]
+
+
+class KeyInjectionError(Exception):
+    """A batch of key events was only partly injected."""
+
+    def __init__(self, message: str, sent: int = 0):
+        """Initialize the error.
+
+        Args:
+            message: What went wrong
+            sent: Number of events of the batch injected before the failure
+        """
+        super().__init__(message)
+        self.sent = sent
+
+
+def send_events(injector: Any, events: Sequence[KeyEvent]) -> None:
+    """Inject a batch of key events one call at a time.
+
+    Works with any object that has pynput's ``press``/``release``/``type``
+    methods; this is what backends without a batch submission use.
+
+    Args:
+        injector: Key injector or pynput-style controller
+        events: (PRESS | RELEASE, key) or (TYPE, text) tuples
+
+    Raises:
+        KeyInjectionError: If an event could not be injected
+    """
+    for sent, (kind, value) in enumerate(events):
+        try:
+            if kind == PRESS:
+                injector.press(value)
+            elif kind == RELEASE:
+                injector.release(value)
+            elif kind == TYPE:
+                injector.type(value)
+            else:
+                raise ValueError(f"Unknown key event kind {kind!r}")
+        except Exception as e:
+            raise KeyInjectionError(f"{kind} {value!r} failed: {e}", sent) from e
+
+
+class KeyInjector(ABC):
+    """Sends synthetic key events to the focused application.
+
+    This is what actions receive as ``keyboard_controller``. The method names
+    match pynput's ``Controller``. Keys are characters or chord tokens for
+    special keys (``<alt>``, ``<home>``, ``<f5>``).
+    """
+
+    @abstractmethod
+    def press(self, key: Any) -> None:
+        """Press a key."""
+
+    @abstractmethod
+    def release(self, key: Any) -> None:
+        """Release a key."""
+
+    def type(self, text: str) -> None:
+        """Type text by pressing and releasing each character.
+
+        Args:
+            text: Text to type
+        """
+        for char in text:
+            self.press(char)
+            self.release(char)
+
+    def send(self, events: Sequence[KeyEvent]) -> None:
+        """Inject a batch of key events, in one OS submission if possible.
+
+        Args:
+            events: (PRESS | RELEASE, key) or (TYPE, text) tuples
+
+        Raises:
+            KeyInjectionError: If the batch was not injected completely
+        """
+        send_events(self, events)
+
+
+class KeyListener(ABC):
+    """A running subscription to key events (pynput listeners conform)."""
+
+    @abstractmethod
+    def start(self) -> None:
+        """Start delivering events."""
+
+    @abstractmethod
+    def stop(self) -> None:
+        """Stop delivering events."""
+
+    def canonical(self, key: Any) -> Any:
+        """Map a key to its canonical form (e.g. drop shift from letters).
+
+        Args:
+            key: Key as delivered to the callback
+
+        Returns:
+            Canonical key
+        """
+        return key
+
+
+class KeyEventSource(ABC):
+    """Creates listeners for global hotkeys and raw key events."""
+
+    @abstractmethod
+    def hotkeys(self, hotkey_map: Dict[str, Callable[[], None]]) -> KeyListener:
+        """Create a listener firing callbacks when chords are pressed.
+
+        Args:
+            hotkey_map: Normalized chord (``<ctrl>+<shift>+s``) -> callback
+
+        Returns:
+            Listener, not yet started
+        """
+
+    @abstractmethod
+    def listener(
+        self,
+        on_press: Callable[[Any], None],
+        on_release: Callable[[Any], None]
+    ) -> KeyListener:
+        """Create a listener receiving every key press and release.
+
+        Keys are pynput ``Key``/``KeyCode`` objects or chord tokens such as
+        ``<ctrl>`` and ``k``.
+
+        Args:
+            on_press: Called with each pressed key
+            on_release: Called with each released key
+
+        Returns:
+            Listener, not yet started
+        """
+
+
+class ClipboardBusy(Exception):
+    """Raised when the clipboard is held open by another application.
+
+    The operation did nothing and may succeed if retried shortly.
+    """
+
+
+class ClipboardBackend(ABC):
+    """Reads and writes the system clipboard as text.
+
+    get_text, set_text, save and restore may raise ``ClipboardBusy`` when
+    another application has the clipboard open; ``ClipboardWorker`` retries
+    them. Other failures are reported through the return value.
+    """
+
+    @abstractmethod
+    def get_text(self) -> Optional[str]:
+        """Get the clipboard text.
+
+        Returns:
+            Clipboard text, or None if it holds no text or cannot be read
+        """
+
+    @abstractmethod
+    def set_text(self, text: str) -> bool:
+        """Replace the clipboard content with text.
+
+        Args:
+            text: Text to store
+
+        Returns:
+            True if successful
+        """
+
+    def save(self) -> Any:
+        """Capture the clipboard content so it can be put back later.
+
+        Returns:
+            Opaque snapshot for restore(); this default keeps text only
+        """
+        return self.get_text()
+
+    def restore(self, saved: Any) -> bool:
+        """Put back content captured by save().
+
+        Args:
+            saved: Snapshot from save()
+
+        Returns:
+            True if the clipboard holds the saved content again
+        """
+        if saved is None:
+            return False
+        return self.set_text(saved)
+
+    def sequence_number(self) -> Optional[int]:
+        """Get a counter that changes whenever the clipboard content changes.
+
+        Returns:
+            Sequence number, or None if the backend cannot tell (every read
+            then goes to the clipboard)
+        """
+        return None
+
+    def watch_changes(self, callback: Callable[[], None]) -> bool:
+        """Start delivering clipboard change events.
+
+        Args:
+            callback: Called (on any thread) after every clipboard change
+
+        Returns:
+            True if events are supported, False to fall back to polling
+        """
+        return False
+
+    def unwatch_changes(self) -> None:
+        """Stop delivering clipboard change events."""
+
+
+class Platform:
+    """One implementation of every backend."""
+
+    name = "custom"
+
+    def __init__(
+        self,
+        keyboard: KeyInjector,
+        events: KeyEventSource,
+        clipboard: ClipboardBackend,
+        window: WindowBackend
+    ):
+        """Bundle backends into a platform.
+
+        Args:
+            keyboard: Key injection backend
+            events: Key event source
+            clipboard: Clipboard backend
+            window: Foreground window backend
+        """
+        self.keyboard = keyboard
+        self.events = events
+        self.clipboard = clipboard
+        self.window = window
+
+    def sleep(self, seconds: float) -> None:
+        """Wait, in this platform's notion of time.
+
+        Args:
+            seconds: Time to wait
+        """
+        time.sleep(seconds)
+
+    def now(self) -> float:
+        """Get monotonic time in seconds, in this platform's notion of time."""
+        return time.monotonic()
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> None:
+        """Run a callback after a delay without blocking the caller.
+
+        Args:
+            delay: Seconds from now
+            callback: Called with no arguments on the shared timer thread
+        """
+        from ..utils.timers import get_timers
+        get_timers().call_later(delay, callback)
@@ -0,0 +1,275 @@
+"""One owner thread for all clipboard access.
+
+Only one process can have the clipboard open at a time, and clipboard
+managers, remote desktop clients and password managers open it constantly.
+``ClipboardWorker`` wraps a clipboard backend so that every operation becomes
+a request on a queue served by a single thread. When the backend reports the
+clipboard as busy, the request is retried with jittered exponential backoff
+(``base_delay`` doubling up to ``max_delay``, at most ``retries`` times) until
+its deadline, ``timeout`` seconds after it was made. A caller waits at most
+until the deadline and then gets the operation's failure value (None or
+False), as for any other clipboard error.
+
+Settings come from ``app.clipboard``.
+"""
+
+import logging
+import queue
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from .base import ClipboardBackend, ClipboardBusy
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS: Dict[str, Any] = {
+    'timeout': 1.0,       # Seconds a request may take, retries included
+    'retries': 8,         # Retries after the clipboard was found busy
+    'base_delay': 0.005,  # First backoff delay in seconds
+    'max_delay': 0.2,     # Backoff cap in seconds
+}
+
+OUTCOMES = ('ok', 'retried', 'failed', 'expired', 'timeout', 'error')
+
+_STOP = object()  # Sentinel telling the worker thread to exit
+
+
+class _Request:
+    """One queued clipboard operation."""
+
+    __slots__ = (
+        'operation', 'args', 'failure', 'submitted', 'deadline',
+        'done', 'result', 'outcome', 'abandoned',
+    )
+
+    def __init__(self, operation: str, args: tuple, failure: Any, submitted: float, timeout: float):
+        self.operation = operation
+        self.args = args
+        self.failure = failure              # returned if the operation does not succeed
+        self.submitted = submitted
+        self.deadline = submitted + timeout
+        self.done = threading.Event()
+        self.result = failure
+        self.outcome: Optional[str] = None
+        self.abandoned = False              # the caller stopped waiting
+
+
+class ClipboardWorker(ClipboardBackend):
+    """Serializes a clipboard backend's operations on one thread, with retries."""
+
+    def __init__(
+        self,
+        backend: ClipboardBackend,
+        settings: Optional[Dict[str, Any]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        observer: Optional[Callable[[str, str, int, float], None]] = None
+    ):
+        """Initialize the worker; its thread starts with the first request.
+
+        Args:
+            backend: Backend doing the actual clipboard access
+            settings: Retry and deadline settings (see DEFAULT_SETTINGS)
+            clock: Time source for deadlines
+            sleep: Used to wait between retries
+            observer: Called with (operation, outcome, attempts, seconds)
+                after every request
+        """
+        self.backend = backend
+        self.clock = clock
+        self.sleep = sleep
+        self.observer = observer
+        self.configure(settings)
+
+        self._queue: 'queue.Queue[Any]' = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        self._owner = 0  # ident of the worker thread
+        self._stats_lock = threading.Lock()
+        self._random = random.Random()
+
+        self.requests = 0
+        self.attempts = 0
+        self.busy = 0
+        self.max_depth = 0
+        self.outcomes: Dict[str, int] = {outcome: 0 for outcome in OUTCOMES}
+
+    def configure(self, settings: Optional[Dict[str, Any]]) -> None:
+        """Apply retry and deadline settings.
+
+        Args:
+            settings: ``app.clipboard`` mapping (missing keys use DEFAULT_SETTINGS)
+        """
+        merged = dict(DEFAULT_SETTINGS)
+        merged.update(settings or {})
+        self.timeout = float(merged['timeout'])
+        self.retries = int(merged['retries'])
+        self.base_delay = float(merged['base_delay'])
+        self.max_delay = float(merged['max_delay'])
+
+    def get_text(self) -> Optional[str]:
+        return self._call('get_text', (), None)
+
+    def set_text(self, text: str) -> bool:
+        return self._call('set_text', (text,), False)
+
+    def save(self) -> Any:
+        return self._call('save', (), None)
+
+    def restore(self, saved: Any) -> bool:
+        if saved is None:
+            return False
+        return self._call('restore', (saved,), False)
+
+    # Change detection does not open the clipboard and needs no queueing
+
+    def sequence_number(self) -> Optional[int]:
+        return self.backend.sequence_number()
+
+    def watch_changes(self, callback: Callable[[], None]) -> bool:
+        return self.backend.watch_changes(callback)
+
+    def unwatch_changes(self) -> None:
+        self.backend.unwatch_changes()
+
+    def _call(self, operation: str, args: tuple, failure: Any) -> Any:
+        """Queue an operation and wait for its result.
+
+        Args:
+            operation: Backend method name
+            args: Its arguments
+            failure: Value to return if it does not succeed in time
+
+        Returns:
+            The backend's result, or failure
+        """
+        request = _Request(operation, args, failure, self.clock(), self.timeout)
+        with self._stats_lock:
+            self.requests += 1
+
+        if threading.get_ident() == self._owner:
+            # Called from the worker itself (e.g. by the backend): run inline
+            self._serve(request)
+            return request.result
+
+        self._ensure_thread()
+        self._queue.put(request)
+        depth = self._queue.qsize()
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+        if not request.done.wait(self.timeout):
+            request.abandoned = True
+            self._finish(request, 'timeout', 0)
+            if request.outcome == 'timeout':
+                logger.warning(f"Clipboard {operation} timed out after {self.timeout:.2f} s")
+        return request.result
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="customhk-clipboard-worker", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        self._owner = threading.get_ident()
+        while True:
+            request = self._queue.get()
+            if request is _STOP:
+                break
+            if not request.abandoned:
+                self._serve(request)
+        self._owner = 0
+
+    def _serve(self, request: _Request) -> None:
+        """Perform a request, retrying while the clipboard is busy."""
+        if self.clock() > request.deadline:
+            self._finish(request, 'expired', 0)
+            return
+
+        method = getattr(self.backend, request.operation)
+        attempts = 0
+        while True:
+            if request.abandoned:
+                return
+            attempts += 1
+            with self._stats_lock:
+                self.attempts += 1
+            try:
+                result = method(*request.args)
+            except ClipboardBusy as e:
+                with self._stats_lock:
+                    self.busy += 1
+                # Jitter keeps retries from locking step with the other
+                # application's periodic access
+                delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+                delay *= 0.5 + self._random.random() / 2
+                if attempts > self.retries or self.clock() + delay > request.deadline:
+                    logger.warning(
+                        f"Clipboard {request.operation} gave up after {attempts} attempts, "
+                        f"held by another application: {e}"
+                    )
+                    self._finish(request, 'failed', attempts)
+                    return
+                self.sleep(delay)
+            except Exception as e:
+                logger.error(f"Clipboard {request.operation} failed: {e}")
+                self._finish(request, 'error', attempts)
+                return
+            else:
+                request.result = result
+                self._finish(request, 'retried' if attempts > 1 else 'ok', attempts)
+                return
+
+    def _finish(self, request: _Request, outcome: str, attempts: int) -> None:
+        """Complete a request once (the caller's timeout and the worker may race)."""
+        with self._stats_lock:
+            if request.done.is_set():
+                return
+            self.outcomes[outcome] += 1
+            request.outcome = outcome
+            if outcome not in ('ok', 'retried'):
+                request.result = request.failure
+            request.done.set()
+        if self.observer is not None:
+            try:
+                seconds = self.clock() - request.submitted
+                self.observer(request.operation, outcome, attempts, seconds)
+            except Exception as e:
+                logger.debug(f"Clipboard observer failed: {e}")
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stop the worker thread (a later request starts a new one).
+
+        Args:
+            timeout: Seconds to wait for the thread to finish
+        """
+        with self._thread_lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None and thread.is_alive():
+            self._queue.put(_STOP)
+            thread.join(timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get contention counters.
+
+        Returns:
+            Dictionary with requests, attempts, busy (attempts that found the
+            clipboard held), max_depth and a count per outcome
+        """
+        with self._stats_lock:
+            return {
+                'requests': self.requests,
+                'attempts': self.attempts,
+                'busy': self.busy,
+                'max_depth': self.max_depth,
+                'outcomes': dict(self.outcomes),
+            }
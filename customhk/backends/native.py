@@ -0,0 +1,507 @@
+"""The real desktop: pynput for keys, pywin32 and user32 for the rest.
+
+Each backend is created on first use, so asking for the platform does not
+import pynput or pywin32 until something needs them.
+"""
+
+import logging
+import sys
+import threading
+from functools import cached_property
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .base import (
+    PRESS,
+    RELEASE,
+    TYPE,
+    ClipboardBackend,
+    ClipboardBusy,
+    KeyEvent,
+    KeyEventSource,
+    KeyInjectionError,
+    KeyInjector,
+    KeyListener,
+    Platform,
+    send_events,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class SendInputBatch:
+    """Translates key event batches into one user32 ``SendInput`` call."""
+
+    INPUT_KEYBOARD = 1
+    KEYEVENTF_EXTENDEDKEY = 0x0001
+    KEYEVENTF_KEYUP = 0x0002
+    KEYEVENTF_UNICODE = 0x0004
+
+    # Keys that need KEYEVENTF_EXTENDEDKEY: navigation block, right-hand
+    # modifiers, Windows keys, numpad divide and num lock
+    EXTENDED_VKS = frozenset((
+        0x21, 0x22, 0x23, 0x24, 0x25, 0x26, 0x27, 0x28, 0x2D, 0x2E,
+        0x5B, 0x5C, 0x5D, 0x6F, 0x90, 0xA3, 0xA5,
+    ))
+
+    # Typed control characters that applications expect as keys (as pynput does)
+    CONTROL_VKS = {'\n': 0x0D, '\r': 0x0D, '\t': 0x09}
+
+    def __init__(self, keys: Any):
+        """Load user32 and declare the INPUT structures.
+
+        Args:
+            keys: pynput's ``Key`` enum, used to resolve chord tokens
+        """
+        import ctypes
+
+        ulong_ptr = ctypes.c_size_t
+
+        class KEYBDINPUT(ctypes.Structure):
+            _fields_ = [('wVk', ctypes.c_ushort), ('wScan', ctypes.c_ushort),
+                        ('dwFlags', ctypes.c_ulong), ('time', ctypes.c_ulong),
+                        ('dwExtraInfo', ulong_ptr)]
+
+        class MOUSEINPUT(ctypes.Structure):
+            _fields_ = [('dx', ctypes.c_long), ('dy', ctypes.c_long),
+                        ('mouseData', ctypes.c_ulong), ('dwFlags', ctypes.c_ulong),
+                        ('time', ctypes.c_ulong), ('dwExtraInfo', ulong_ptr)]
+
+        class HARDWAREINPUT(ctypes.Structure):
+            _fields_ = [('uMsg', ctypes.c_ulong), ('wParamL', ctypes.c_ushort),
+                        ('wParamH', ctypes.c_ushort)]
+
+        class _INPUTUNION(ctypes.Union):
+            _fields_ = [('mi', MOUSEINPUT), ('ki', KEYBDINPUT), ('hi', HARDWAREINPUT)]
+
+        class INPUT(ctypes.Structure):
+            _fields_ = [('type', ctypes.c_ulong), ('u', _INPUTUNION)]
+
+        self._ctypes = ctypes
+        self._input = INPUT
+        self._user32 = ctypes.WinDLL('user32', use_last_error=True)
+        self._user32.SendInput.argtypes = (ctypes.c_uint, ctypes.POINTER(INPUT), ctypes.c_int)
+        self._user32.SendInput.restype = ctypes.c_uint
+        self._user32.VkKeyScanW.argtypes = (ctypes.c_wchar,)
+        self._user32.VkKeyScanW.restype = ctypes.c_short
+        self._keys = keys
+
+    def _key(self, key: Any, up: bool) -> Tuple[int, int, int]:
+        """Get (vk, scan, flags) for pressing or releasing one key."""
+        flags = self.KEYEVENTF_KEYUP if up else 0
+        if isinstance(key, str) and len(key) > 2 and key[0] == '<' and key[-1] == '>':
+            key = self._keys[key[1:-1]]
+        if isinstance(key, str):
+            if len(key) == 1:
+                scan = self._user32.VkKeyScanW(key)
+                # The high byte is the shift/ctrl/alt state the character
+                # needs; the bare key would type another character ('1'
+                # for '!'), so those are sent as the character itself
+                if scan != -1 and not scan & 0xFF00:
+                    return scan & 0xFF, 0, flags
+                return 0, ord(key), flags | self.KEYEVENTF_UNICODE
+            raise ValueError(f"Cannot inject key {key!r}")
+        # pynput Key members carry a KeyCode, KeyCodes carry vk or char
+        code = getattr(key, 'value', key)
+        vk = getattr(code, 'vk', None)
+        if vk is None:
+            char = getattr(code, 'char', None)
+            if char is None:
+                raise ValueError(f"Cannot inject key {key!r}")
+            return self._key(char, up)
+        if vk in self.EXTENDED_VKS:
+            flags |= self.KEYEVENTF_EXTENDEDKEY
+        return vk, 0, flags
+
+    def _text(self, text: str) -> List[Tuple[int, int, int]]:
+        """Get (vk, scan, flags) for typing text as Unicode input."""
+        inputs = []
+        for char in text:
+            vk = self.CONTROL_VKS.get(char)
+            if vk is not None:
+                inputs.append((vk, 0, 0))
+                inputs.append((vk, 0, self.KEYEVENTF_KEYUP))
+                continue
+            units = char.encode('utf-16-le')
+            for i in range(0, len(units), 2):
+                unit = units[i] | units[i + 1] << 8
+                inputs.append((0, unit, self.KEYEVENTF_UNICODE))
+                inputs.append((0, unit, self.KEYEVENTF_UNICODE | self.KEYEVENTF_KEYUP))
+        return inputs
+
+    def send(self, events: Sequence[KeyEvent]) -> None:
+        """Inject a batch with one SendInput call.
+
+        Args:
+            events: (PRESS | RELEASE, key) or (TYPE, text) tuples
+
+        Raises:
+            KeyInjectionError: If an event cannot be translated or SendInput
+                inserted fewer inputs than requested
+        """
+        specs: List[Tuple[int, int, int]] = []
+        owners: List[int] = []
+        for index, (kind, value) in enumerate(events):
+            try:
+                if kind == PRESS:
+                    translated = [self._key(value, up=False)]
+                elif kind == RELEASE:
+                    translated = [self._key(value, up=True)]
+                elif kind == TYPE:
+                    translated = self._text(value)
+                else:
+                    raise ValueError(f"Unknown key event kind {kind!r}")
+            except (KeyError, ValueError) as e:
+                raise KeyInjectionError(f"{kind} {value!r}: {e}", 0) from e
+            specs.extend(translated)
+            owners.extend([index] * len(translated))
+
+        if not specs:
+            return
+
+        inputs = (self._input * len(specs))()
+        for item, (vk, scan, flags) in zip(inputs, specs):
+            item.type = self.INPUT_KEYBOARD
+            item.u.ki.wVk = vk
+            item.u.ki.wScan = scan
+            item.u.ki.dwFlags = flags
+
+        inserted = self._user32.SendInput(len(specs), inputs, self._ctypes.sizeof(self._input))
+        if inserted != len(specs):
+            error = self._ctypes.get_last_error()
+            sent = owners[inserted] if inserted < len(owners) else len(events)
+            raise KeyInjectionError(
+                f"SendInput inserted {inserted} of {len(specs)} inputs (error {error}); "
+                f"input may be blocked by a higher-integrity window",
+                sent
+            )
+
+
+class PynputKeyInjector(KeyInjector):
+    """Key injection through pynput's ``Controller``.
+
+    Accepts everything the Controller does plus chord tokens for special
+    keys (``<alt>``, ``<home>``); other Controller methods are passed through.
+    On Windows, batches and typed text go to the OS in a single ``SendInput``
+    call.
+    """
+
+    def __init__(self) -> None:
+        from pynput.keyboard import Controller, Key
+
+        self.controller = Controller()
+        self._keys = Key
+        self._batch: Optional[SendInputBatch] = None
+        if sys.platform == 'win32':
+            try:
+                self._batch = SendInputBatch(Key)
+            except (AttributeError, OSError) as e:
+                logger.warning(f"SendInput unavailable, injecting keys one at a time: {e}")
+
+    def _resolve(self, key: Any) -> Any:
+        if isinstance(key, str) and len(key) > 2 and key[0] == '<' and key[-1] == '>':
+            return self._keys[key[1:-1]]
+        return key
+
+    def press(self, key: Any) -> None:
+        self.controller.press(self._resolve(key))
+
+    def release(self, key: Any) -> None:
+        self.controller.release(self._resolve(key))
+
+    def type(self, text: str) -> None:
+        if self._batch is not None:
+            self._batch.send([(TYPE, text)])
+        else:
+            self.controller.type(text)
+
+    def send(self, events: Sequence[KeyEvent]) -> None:
+        if self._batch is not None:
+            self._batch.send(events)
+        else:
+            send_events(self, events)
+
+    def __getattr__(self, name: str) -> Any:
+        if name == 'controller':
+            raise AttributeError(name)
+        return getattr(self.controller, name)
+
+
+class PynputEventSource(KeyEventSource):
+    """Key events from pynput's global keyboard hook."""
+
+    def hotkeys(self, hotkey_map: Dict[str, Callable[[], None]]) -> KeyListener:
+        from pynput import keyboard
+
+        return keyboard.GlobalHotKeys(hotkey_map)
+
+    def listener(
+        self,
+        on_press: Callable[[Any], None],
+        on_release: Callable[[Any], None]
+    ) -> KeyListener:
+        from pynput import keyboard
+
+        return keyboard.Listener(on_press=on_press, on_release=on_release)
+
+
+class Win32ClipboardBackend(ClipboardBackend):
+    """Clipboard access through ``win32clipboard`` (imported on first use).
+
+    Change detection uses user32 directly: ``GetClipboardSequenceNumber``
+    and ``WM_CLIPBOARDUPDATE`` sent to a message-only window.
+    """
+
+    WM_CLIPBOARDUPDATE = 0x031D
+    WM_CLOSE = 0x0010
+    HWND_MESSAGE = -3
+
+    def __init__(self) -> None:
+        """Initialize; nothing is loaded until first used."""
+        self._thread: Optional[threading.Thread] = None
+        self._hwnd = 0
+
+    @cached_property
+    def _user32(self) -> Any:
+        import ctypes
+
+        user32 = ctypes.WinDLL('user32', use_last_error=True)
+        user32.GetClipboardSequenceNumber.restype = ctypes.c_ulong
+        return user32
+
+    def sequence_number(self) -> Optional[int]:
+        return self._user32.GetClipboardSequenceNumber()
+
+    def watch_changes(self, callback: Callable[[], None]) -> bool:
+        if self._thread is not None:
+            return True
+
+        ready = threading.Event()
+        self._thread = threading.Thread(
+            target=self._listen,
+            args=(callback, ready),
+            name="customhk-clipboard",
+            daemon=True
+        )
+        self._thread.start()
+        ready.wait(2.0)
+        return self._hwnd != 0
+
+    def unwatch_changes(self) -> None:
+        if self._thread is None:
+            return
+
+        if self._hwnd:
+            self._user32.PostMessageW(self._hwnd, self.WM_CLOSE, 0, 0)
+        self._thread.join(2.0)
+        self._thread = None
+        self._hwnd = 0
+
+    def _listen(self, callback: Callable[[], None], ready: threading.Event) -> None:
+        """Own a message-only window registered as a clipboard format listener."""
+        import ctypes
+        from ctypes import wintypes
+
+        user32 = self._user32
+        lresult = ctypes.c_ssize_t
+        WNDPROC = ctypes.WINFUNCTYPE(lresult, wintypes.HWND, wintypes.UINT,
+                                     wintypes.WPARAM, wintypes.LPARAM)
+
+        class WNDCLASSW(ctypes.Structure):
+            _fields_ = [('style', wintypes.UINT), ('lpfnWndProc', WNDPROC),
+                        ('cbClsExtra', ctypes.c_int), ('cbWndExtra', ctypes.c_int),
+                        ('hInstance', wintypes.HINSTANCE), ('hIcon', wintypes.HICON),
+                        ('hCursor', wintypes.HANDLE), ('hbrBackground', wintypes.HBRUSH),
+                        ('lpszMenuName', wintypes.LPCWSTR), ('lpszClassName', wintypes.LPCWSTR)]
+
+        user32.DefWindowProcW.restype = lresult
+        user32.DefWindowProcW.argtypes = [wintypes.HWND, wintypes.UINT,
+                                          wintypes.WPARAM, wintypes.LPARAM]
+        user32.RegisterClassW.argtypes = [ctypes.POINTER(WNDCLASSW)]
+        user32.CreateWindowExW.restype = wintypes.HWND
+        user32.CreateWindowExW.argtypes = [
+            wintypes.DWORD, wintypes.LPCWSTR, wintypes.LPCWSTR, wintypes.DWORD,
+            ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+            wintypes.HWND, wintypes.HMENU, wintypes.HINSTANCE, wintypes.LPVOID
+        ]
+        user32.AddClipboardFormatListener.argtypes = [wintypes.HWND]
+        user32.RemoveClipboardFormatListener.argtypes = [wintypes.HWND]
+        user32.PostMessageW.argtypes = [wintypes.HWND, wintypes.UINT,
+                                        wintypes.WPARAM, wintypes.LPARAM]
+        user32.DestroyWindow.argtypes = [wintypes.HWND]
+        user32.UnregisterClassW.argtypes = [wintypes.LPCWSTR, wintypes.HINSTANCE]
+
+        def window_proc(hwnd, msg, wparam, lparam):
+            if msg == self.WM_CLIPBOARDUPDATE:
+                try:
+                    callback()
+                except Exception as e:
+                    logger.error(f"Error handling clipboard change: {e}")
+                return 0
+            if msg == self.WM_CLOSE:
+                user32.RemoveClipboardFormatListener(hwnd)
+                user32.DestroyWindow(hwnd)
+                user32.PostQuitMessage(0)
+                return 0
+            return user32.DefWindowProcW(hwnd, msg, wparam, lparam)
+
+        proc = WNDPROC(window_proc)
+        window_class = WNDCLASSW(lpfnWndProc=proc, lpszClassName="CustomHKClipboardListener")
+        user32.RegisterClassW(ctypes.byref(window_class))
+        hwnd = user32.CreateWindowExW(
+            0, window_class.lpszClassName, "CustomHK clipboard", 0,
+            0, 0, 0, 0, self.HWND_MESSAGE, None, None, None
+        )
+        if not hwnd or not user32.AddClipboardFormatListener(hwnd):
+            logger.warning("Clipboard change events unavailable, falling back to polling")
+            if hwnd:
+                user32.DestroyWindow(hwnd)
+            user32.UnregisterClassW(window_class.lpszClassName, None)
+            ready.set()
+            return
+
+        self._hwnd = hwnd
+        ready.set()
+
+        msg = wintypes.MSG()
+        while user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
+
+        # The class refers to this thread's window procedure
+        user32.UnregisterClassW(window_class.lpszClassName, None)
+
+    def _open(self) -> Any:
+        """Open the clipboard.
+
+        Returns:
+            The win32clipboard module
+
+        Raises:
+            ClipboardBusy: If another application has the clipboard open
+        """
+        import win32clipboard
+
+        try:
+            win32clipboard.OpenClipboard()
+        except Exception as e:
+            raise ClipboardBusy(str(e)) from e
+        return win32clipboard
+
+    def get_text(self) -> Optional[str]:
+        win32clipboard = self._open()
+        try:
+            if win32clipboard.IsClipboardFormatAvailable(win32clipboard.CF_UNICODETEXT):
+                text = win32clipboard.GetClipboardData(win32clipboard.CF_UNICODETEXT)
+                return text
+            else:
+                logger.debug("Clipboard does not contain text")
+                return None
+        except Exception as e:
+            logger.error(f"Failed to get clipboard text: {e}")
+            return None
+        finally:
+            try:
+                win32clipboard.CloseClipboard()
+            except Exception:
+                pass
+
+    def set_text(self, text: str) -> bool:
+        win32clipboard = self._open()
+        try:
+            win32clipboard.EmptyClipboard()
+            win32clipboard.SetClipboardText(text, win32clipboard.CF_UNICODETEXT)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to set clipboard text: {e}")
+            return False
+        finally:
+            try:
+                win32clipboard.CloseClipboard()
+            except Exception:
+                pass
+
+    # GDI and owner-display formats hold handles that die with the clipboard
+    _HANDLE_FORMATS = {2, 3, 9, 14, 0x80, 0x82, 0x83, 0x8E}
+
+    def save(self) -> Any:
+        """Capture every clipboard format that holds plain data.
+
+        Returns:
+            List of (format, data), or None if the clipboard cannot be read
+
+        Raises:
+            ClipboardBusy: If another application has the clipboard open
+        """
+        formats = []
+        win32clipboard = self._open()
+        try:
+            fmt = win32clipboard.EnumClipboardFormats(0)
+            while fmt:
+                if fmt not in self._HANDLE_FORMATS:
+                    try:
+                        data = win32clipboard.GetClipboardData(fmt)
+                    except Exception:
+                        data = None
+                    if isinstance(data, (bytes, str)):
+                        formats.append((fmt, data))
+                fmt = win32clipboard.EnumClipboardFormats(fmt)
+        except Exception as e:
+            logger.error(f"Failed to save clipboard: {e}")
+            return None
+        finally:
+            try:
+                win32clipboard.CloseClipboard()
+            except Exception:
+                pass
+        return formats
+
+    def restore(self, saved: Any) -> bool:
+        if saved is None:
+            return False
+        win32clipboard = self._open()
+        try:
+            win32clipboard.EmptyClipboard()
+            for fmt, data in saved:
+                try:
+                    win32clipboard.SetClipboardData(fmt, data)
+                except Exception as e:
+                    logger.debug(f"Could not restore clipboard format {fmt}: {e}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to restore clipboard: {e}")
+            return False
+        finally:
+            try:
+                win32clipboard.CloseClipboard()
+            except Exception:
+                pass
+
+
+class NativePlatform(Platform):
+    """The platform CustomHK runs on by default."""
+
+    name = "native"
+
+    def __init__(self) -> None:
+        """Initialize; backends are created when first accessed."""
+
+    @cached_property
+    def keyboard(self) -> KeyInjector:
+        return PynputKeyInjector()
+
+    @cached_property
+    def events(self) -> KeyEventSource:
+        return PynputEventSource()
+
+    @cached_property
+    def clipboard(self) -> ClipboardBackend:
+        from .clipboard_worker import ClipboardWorker
+
+        return ClipboardWorker(Win32ClipboardBackend())
+
+    @cached_property
+    def window(self):
+        from ..utils.window import Win32WindowBackend
+
+        return Win32WindowBackend()
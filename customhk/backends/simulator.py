@@ -0,0 +1,536 @@
+"""Deterministic in-memory platform for benchmarks and CI.
+
+The simulator implements every backend without touching the desktop. Time is
+a ``VirtualClock``: each simulated operation advances it by a configurable
+latency instead of sleeping, so a run produces the same timings on any
+machine. Every operation is counted and (optionally) logged with its virtual
+timestamp::
+
+    sim = Simulator(latencies={'key_press': 0.0002, 'clipboard_get': 0.002})
+    set_platform(sim)
+    window = sim.windows.open("Inbox - Outlook", "OUTLOOK.EXE")
+    sim.clipboard.text = "line one\\nline two"
+    sim.tap('<ctrl>+<shift>+s')        # fires the bound hotkey
+    print(sim.typed_text(), sim.clock.now())
+
+Pass ``realtime=True`` to also spend each latency as real wall time, which
+is useful for load tests that exercise the dispatcher's worker threads.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from ..keys import MODIFIER_ALIASES, MODIFIER_ORDER, normalize_chord, split_chord
+from .base import (
+    PRESS,
+    RELEASE,
+    TYPE,
+    ClipboardBackend,
+    ClipboardBusy,
+    KeyEvent,
+    KeyEventSource,
+    KeyInjectionError,
+    KeyInjector,
+    KeyListener,
+    Platform,
+)
+from ..utils.window import WindowBackend
+
+
+# Operations the simulator charges latency for
+OPERATIONS = (
+    'key_submit',      # one call into the OS input queue (per key, or per batch)
+    'key_press',       # injected key down
+    'key_release',     # injected key up
+    'hook',            # delivering a user key event to the listeners
+    'clipboard_get',
+    'clipboard_set',
+    'clipboard_seq',   # reading the clipboard sequence number
+    'clipboard_busy',  # a clipboard access refused because another app holds it
+    'window_query',    # any foreground window / process query
+)
+
+
+class SimEvent(NamedTuple):
+    """One logged operation."""
+
+    time: float
+    operation: str
+    detail: Any
+
+
+class VirtualClock:
+    """Simulated monotonic time.
+
+    ``sleep`` advances the clock instead of blocking, and callbacks scheduled
+    with ``call_later`` run, in time order, as the clock passes them.
+    """
+
+    def __init__(self, start: float = 0.0):
+        """Initialize the clock.
+
+        Args:
+            start: Initial time in seconds
+        """
+        self._now = start
+        self._lock = threading.Lock()
+        self._timers: List[Any] = []
+        self._sequence = itertools.count()
+
+    def now(self) -> float:
+        """Get the current virtual time in seconds."""
+        return self._now
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> None:
+        """Run a callback once the clock has advanced by ``delay``.
+
+        Args:
+            delay: Seconds from now
+            callback: Called with no arguments
+        """
+        with self._lock:
+            due = self._now + max(0.0, delay)
+            heapq.heappush(self._timers, (due, next(self._sequence), callback))
+
+    def advance(self, seconds: float) -> None:
+        """Move the clock forward, running timers that fall due on the way.
+
+        Args:
+            seconds: Seconds to advance (negative values are ignored)
+        """
+        with self._lock:
+            target = self._now + max(0.0, seconds)
+
+        while True:
+            with self._lock:
+                if not self._timers or self._timers[0][0] > target:
+                    self._now = max(self._now, target)
+                    return
+                when, _, callback = heapq.heappop(self._timers)
+                self._now = max(self._now, when)
+            callback()
+
+    sleep = advance
+
+    def pending(self) -> int:
+        """Get the number of timers not yet run."""
+        return len(self._timers)
+
+
+class SimulatedKeyboard(KeyInjector):
+    """Records injected key events.
+
+    Each press and release is its own submission; ``send`` submits a whole
+    batch at once.
+    """
+
+    def __init__(self, sim: 'Simulator'):
+        self.sim = sim
+
+    def press(self, key: Any) -> None:
+        self.sim.operation('key_submit', 1)
+        self.sim.operation('key_press', key)
+
+    def release(self, key: Any) -> None:
+        self.sim.operation('key_submit', 1)
+        self.sim.operation('key_release', key)
+
+    def type(self, text: str) -> None:
+        self.send([(TYPE, text)])
+
+    def send(self, events: Sequence[KeyEvent]) -> None:
+        for sent, (kind, value) in enumerate(events):
+            if kind not in (PRESS, RELEASE, TYPE):
+                raise KeyInjectionError(f"Unknown key event kind {kind!r}", sent)
+        self.sim.operation('key_submit', len(events))
+        for kind, value in events:
+            if kind == PRESS:
+                self.sim.operation('key_press', value)
+            elif kind == RELEASE:
+                self.sim.operation('key_release', value)
+            else:
+                for char in value:
+                    self.sim.operation('key_press', char)
+                    self.sim.operation('key_release', char)
+
+
+class _SimulatedListener(KeyListener):
+    """Raw key listener fed by SimulatedEventSource."""
+
+    def __init__(self, source: 'SimulatedEventSource', on_press: Callable, on_release: Callable):
+        self.source = source
+        self.on_press = on_press
+        self.on_release = on_release
+
+    def start(self) -> None:
+        self.source.attach(self)
+
+    def stop(self) -> None:
+        self.source.detach(self)
+
+    def key_down(self, token: str, chord: str) -> None:
+        self.on_press(token)
+
+    def key_up(self, token: str) -> None:
+        self.on_release(token)
+
+
+class _SimulatedHotkeys(_SimulatedListener):
+    """Fires a callback when the held keys form a bound chord."""
+
+    def __init__(self, source: 'SimulatedEventSource', hotkey_map: Dict[str, Callable[[], None]]):
+        super().__init__(source, None, None)
+        self.hotkeys = {normalize_chord(chord): callback for chord, callback in hotkey_map.items()}
+
+    def key_down(self, token: str, chord: str) -> None:
+        callback = self.hotkeys.get(chord)
+        if callback is not None:
+            callback()
+
+    def key_up(self, token: str) -> None:
+        pass
+
+
+class SimulatedEventSource(KeyEventSource):
+    """Delivers simulated user key presses to the active listeners.
+
+    Keys are chord tokens (``<ctrl>``, ``<f5>``, ``k``); listeners receive
+    the tokens themselves.
+    """
+
+    def __init__(self, sim: 'Simulator'):
+        self.sim = sim
+        self.held: List[str] = []
+        self._listeners: List[_SimulatedListener] = []
+        self._lock = threading.Lock()
+
+    def hotkeys(self, hotkey_map: Dict[str, Callable[[], None]]) -> KeyListener:
+        return _SimulatedHotkeys(self, hotkey_map)
+
+    def listener(
+        self,
+        on_press: Callable[[Any], None],
+        on_release: Callable[[Any], None]
+    ) -> KeyListener:
+        return _SimulatedListener(self, on_press, on_release)
+
+    def attach(self, listener: _SimulatedListener) -> None:
+        with self._lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+
+    def detach(self, listener: _SimulatedListener) -> None:
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    @property
+    def listening(self) -> int:
+        """Number of started listeners."""
+        return len(self._listeners)
+
+    def press(self, key: str) -> None:
+        """Simulate the user pressing a key.
+
+        Args:
+            key: Chord token such as ``<ctrl>`` or ``s``
+        """
+        token = key.strip().lower()
+        token = MODIFIER_ALIASES.get(token, token)
+        self.sim.operation('hook', token)
+        if token not in self.held:
+            self.held.append(token)
+        modifiers = [m for m in MODIFIER_ORDER if m in self.held]
+        chord = '+'.join(modifiers + [t for t in self.held if t not in MODIFIER_ORDER])
+        for listener in list(self._listeners):
+            listener.key_down(token, chord)
+
+    def release(self, key: str) -> None:
+        """Simulate the user releasing a key.
+
+        Args:
+            key: Chord token
+        """
+        token = key.strip().lower()
+        token = MODIFIER_ALIASES.get(token, token)
+        self.sim.operation('hook', token)
+        if token in self.held:
+            self.held.remove(token)
+        for listener in list(self._listeners):
+            listener.key_up(token)
+
+    def tap(self, chord: str) -> None:
+        """Press the keys of a chord in order, then release them in reverse.
+
+        Args:
+            chord: Chord such as ``<ctrl>+<shift>+s``
+        """
+        tokens = split_chord(chord)
+        for token in tokens:
+            self.press(token)
+        for token in reversed(tokens):
+            self.release(token)
+
+
+class SimulatedClipboard(ClipboardBackend):
+    """Clipboard holding a single text value.
+
+    Assigning ``text`` directly acts like another application copying: it is
+    free, but bumps the sequence number and notifies watchers like any other
+    change. Watchers are called synchronously.
+
+    Set ``busy_when`` to a function of the virtual time to simulate other
+    applications holding the clipboard: accesses while it returns True raise
+    ``ClipboardBusy``.
+    """
+
+    def __init__(self, sim: 'Simulator'):
+        self.sim = sim
+        self._text: Optional[str] = None
+        self.sequence = 0
+        self._callback: Optional[Callable[[], None]] = None
+        self.busy_when: Optional[Callable[[float], bool]] = None
+
+    def _open(self) -> None:
+        if self.busy_when is not None and self.busy_when(self.sim.clock.now()):
+            self.sim.operation('clipboard_busy')
+            raise ClipboardBusy("OpenClipboard: access denied (simulated)")
+
+    @property
+    def text(self) -> Optional[str]:
+        return self._text
+
+    @text.setter
+    def text(self, value: Optional[str]) -> None:
+        self._text = value
+        self.sequence += 1
+        if self._callback is not None:
+            self._callback()
+
+    def get_text(self) -> Optional[str]:
+        self._open()
+        self.sim.operation('clipboard_get')
+        return self.text
+
+    def set_text(self, text: str) -> bool:
+        self._open()
+        self.sim.operation('clipboard_set', len(text))
+        self.text = text
+        return True
+
+    def save(self) -> Any:
+        self._open()
+        self.sim.operation('clipboard_get')
+        return (self.text,)
+
+    def restore(self, saved: Any) -> bool:
+        self._open()
+        self.sim.operation('clipboard_set', 'restore')
+        self.text = saved[0]
+        return True
+
+    def sequence_number(self) -> Optional[int]:
+        self.sim.operation('clipboard_seq')
+        return self.sequence
+
+    def watch_changes(self, callback: Callable[[], None]) -> bool:
+        self._callback = callback
+        return True
+
+    def unwatch_changes(self) -> None:
+        self._callback = None
+
+
+class SimulatedWindows(WindowBackend):
+    """A desktop of simulated top-level windows."""
+
+    def __init__(self, sim: 'Simulator'):
+        self.sim = sim
+        self.foreground = 0
+        # hwnd -> [title, class name, pid]
+        self.windows: Dict[int, List[Any]] = {}
+        # pid -> (start time, executable path)
+        self.processes: Dict[int, tuple] = {}
+        self._next_hwnd = 0x10000
+        self._next_pid = 1000
+        self._callback: Optional[Callable[[int], None]] = None
+
+    def open(
+        self,
+        title: str,
+        process: str = "app.exe",
+        window_class: str = "SimWindow",
+        focus: bool = True
+    ) -> int:
+        """Open a window owned by a new process.
+
+        Args:
+            title: Window title
+            process: Executable name
+            window_class: Window class name
+            focus: Bring the window to the foreground
+
+        Returns:
+            Window handle
+        """
+        self._next_hwnd += 4
+        self._next_pid += 4
+        hwnd, pid = self._next_hwnd, self._next_pid
+        started = int(self.sim.clock.now() * 1e7) + pid
+        self.processes[pid] = (started, f"C:\\Program Files\\{process}")
+        self.windows[hwnd] = [title, window_class, pid]
+        if focus:
+            self.focus(hwnd)
+        return hwnd
+
+    def focus(self, hwnd: int) -> None:
+        """Bring a window to the foreground."""
+        self.foreground = hwnd
+        if self._callback is not None:
+            self._callback(hwnd)
+
+    def set_title(self, hwnd: int, title: str) -> None:
+        """Change a window's title."""
+        self.windows[hwnd][0] = title
+        if self._callback is not None and hwnd == self.foreground:
+            self._callback(hwnd)
+
+    def close(self, hwnd: int) -> None:
+        """Close a window (the foreground becomes empty if it was focused)."""
+        self.windows.pop(hwnd, None)
+        if hwnd == self.foreground:
+            self.focus(0)
+
+    def foreground_window(self) -> int:
+        self.sim.operation('window_query', 'foreground')
+        return self.foreground
+
+    def window_title(self, hwnd: int) -> Optional[str]:
+        self.sim.operation('window_query', 'title')
+        window = self.windows.get(hwnd)
+        return window[0] if window else None
+
+    def window_class(self, hwnd: int) -> Optional[str]:
+        self.sim.operation('window_query', 'class')
+        window = self.windows.get(hwnd)
+        return window[1] if window else None
+
+    def window_pid(self, hwnd: int) -> int:
+        self.sim.operation('window_query', 'pid')
+        window = self.windows.get(hwnd)
+        return window[2] if window else 0
+
+    def process_start_time(self, pid: int) -> Optional[int]:
+        self.sim.operation('window_query', 'start_time')
+        process = self.processes.get(pid)
+        return process[0] if process else None
+
+    def process_image(self, pid: int) -> Optional[str]:
+        self.sim.operation('window_query', 'image')
+        process = self.processes.get(pid)
+        return process[1] if process else None
+
+    def watch_focus(self, callback: Callable[[int], None]) -> bool:
+        self._callback = callback
+        return True
+
+    def unwatch_focus(self) -> None:
+        self._callback = None
+
+
+class Simulator(Platform):
+    """In-memory platform with a virtual clock and per-operation latencies."""
+
+    name = "simulator"
+
+    def __init__(
+        self,
+        latencies: Optional[Dict[str, float]] = None,
+        clock: Optional[VirtualClock] = None,
+        realtime: bool = False,
+        record: bool = True
+    ):
+        """Initialize the simulator.
+
+        Args:
+            latencies: Seconds charged per operation (see OPERATIONS);
+                unlisted operations are free
+            clock: Clock to advance (a new VirtualClock if None)
+            realtime: Also spend each latency as real time
+            record: Keep a log of every operation
+        """
+        unknown = set(latencies or {}) - set(OPERATIONS)
+        if unknown:
+            raise ValueError(f"Unknown simulator operations: {sorted(unknown)}")
+
+        self.clock = clock or VirtualClock()
+        self.latencies = {operation: 0.0 for operation in OPERATIONS}
+        self.latencies.update(latencies or {})
+        self.realtime = realtime
+        self.record = record
+        self.log: List[SimEvent] = []
+        self.counts: Counter = Counter()
+        self._lock = threading.Lock()
+
+        self.windows = SimulatedWindows(self)
+        super().__init__(
+            keyboard=SimulatedKeyboard(self),
+            events=SimulatedEventSource(self),
+            clipboard=SimulatedClipboard(self),
+            window=self.windows
+        )
+
+    def operation(self, name: str, detail: Any = None) -> None:
+        """Account for one operation: count it, log it and charge its latency.
+
+        Args:
+            name: Operation name from OPERATIONS
+            detail: Logged with the operation (e.g. the key)
+        """
+        latency = self.latencies.get(name, 0.0)
+        with self._lock:
+            self.counts[name] += 1
+            if self.record:
+                self.log.append(SimEvent(self.clock.now(), name, detail))
+        if latency:
+            if self.realtime:
+                time.sleep(latency)
+            self.clock.advance(latency)
+
+    def sleep(self, seconds: float) -> None:
+        if self.realtime:
+            time.sleep(seconds)
+        self.clock.advance(seconds)
+
+    def now(self) -> float:
+        return self.clock.now()
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> None:
+        """Run a callback when the virtual clock has advanced by ``delay``."""
+        self.clock.call_later(delay, callback)
+
+    def tap(self, chord: str) -> None:
+        """Simulate the user pressing a hotkey chord."""
+        self.events.tap(chord)
+
+    def typed_text(self) -> str:
+        """Reconstruct the text typed through the keyboard backend.
+
+        Returns:
+            Characters of every injected single-character key press, in order
+        """
+        return ''.join(
+            event.detail for event in self.log
+            if event.operation == 'key_press'
+            and isinstance(event.detail, str) and len(event.detail) == 1
+        )
+
+    def reset(self) -> None:
+        """Clear the log and counters (the clock keeps running)."""
+        with self._lock:
+            self.log.clear()
+            self.counts.clear()
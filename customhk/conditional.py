@@ -0,0 +1,403 @@
+"""Compiled matcher for application-specific (conditional) hotkeys.
+
+Rules from ``hotkeys_conditional`` are compiled once when the configuration is
+loaded, grouped by chord. Resolving a keypress then needs a single
+foreground-window lookup, and the matching work per chord does not grow with
+the number of rules:
+
+- ``process`` rules live in a dict keyed by lowercase executable name
+- literal ``window_title`` rules (including plain ``A|B|C`` alternations) live
+  in a substring table indexed by a short, rarely shared slice of each
+  literal, so each title position costs one dict lookup
+- regex ``window_title`` rules with a required literal (``Editor #\\d+`` needs
+  ``editor #``) go in the same table and run their regex only when the
+  literal is present
+- the remaining regex rules share one combined regex per chord, which
+  rejects non-matching windows in a single search
+
+When several rules match the same window, the one listed first wins.
+"""
+
+import logging
+import re
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Tuple
+
+from .keys import normalize_chord
+
+try:
+    from re import _parser as _sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover - older Pythons
+    import sre_parse as _sre_parse  # type: ignore[no-redef]
+
+
+logger = logging.getLogger(__name__)
+
+# Length of the substring used to index literal title rules
+_ANCHOR = 3
+
+_REGEX_SPECIAL = frozenset('.^$*+?{}[]\\|()')
+
+
+def _title_literals(window_title: str) -> Optional[List[str]]:
+    """Get the literal substrings a ``window_title`` rule stands for.
+
+    Titles are matched as case-insensitive regexes; strings that are not valid
+    regexes are matched as plain substrings. Plain text and ``A|B|C``
+    alternations of plain text are returned as literals so they can use the
+    substring table instead of the regex engine.
+
+    Args:
+        window_title: Pattern from the config
+
+    Returns:
+        Lowercase literals, or None if the pattern needs the regex engine
+    """
+    try:
+        re.compile(window_title)
+    except re.error:
+        return [window_title.lower()]
+
+    alternatives = window_title.split('|')
+    if all(alt and not (_REGEX_SPECIAL & set(alt)) for alt in alternatives):
+        return [alt.lower() for alt in alternatives]
+    return None
+
+
+def _required_literal(pattern: str) -> Optional[str]:
+    """Find a literal that every match of a regex must contain.
+
+    Only the longest run of plain characters at the top level of the pattern
+    is considered, which covers the common ``Name - (A|B) #\\d+`` shapes.
+
+    Args:
+        pattern: Regex source
+
+    Returns:
+        Lowercase ASCII literal of at least the anchor length, or None
+    """
+    try:
+        parsed = _sre_parse.parse(pattern)
+    except Exception:
+        return None
+
+    best = ''
+    run: List[str] = []
+    for op, arg in list(parsed) + [(None, None)]:
+        if op is _sre_parse.LITERAL:
+            run.append(chr(arg))
+            continue
+        candidate = ''.join(run)
+        if len(candidate) > len(best):
+            best = candidate
+        run = []
+
+    # Case folding is only reliable for ASCII when pre-filtering on lower()
+    if len(best) < _ANCHOR or not best.isascii():
+        return None
+    return best.lower()
+
+
+def _refers_to_groups(parsed: Any) -> bool:
+    """Check whether a parsed regex refers to its own groups.
+
+    Backreferences (``\\1``, ``(?P=name)``) and conditionals (``(?(1)...)``)
+    are resolved by group number, which changes once patterns are combined.
+
+    Args:
+        parsed: Output of sre_parse.parse() or a piece of it
+
+    Returns:
+        True if the pattern contains a group reference
+    """
+    for op, arg in parsed:
+        if op in (_sre_parse.GROUPREF, _sre_parse.GROUPREF_EXISTS):
+            return True
+        for item in arg if isinstance(arg, (tuple, list)) else (arg,):
+            if isinstance(item, _sre_parse.SubPattern) and _refers_to_groups(item):
+                return True
+            if isinstance(item, list) and any(
+                isinstance(sub, _sre_parse.SubPattern) and _refers_to_groups(sub) for sub in item
+            ):
+                return True
+    return False
+
+
+def _normalize_process(process: str) -> str:
+    """Normalize an executable name for lookup.
+
+    Args:
+        process: Process name such as ``OUTLOOK.EXE`` or ``outlook``
+
+    Returns:
+        Lowercase executable name with ``.exe`` suffix
+    """
+    process = process.strip().lower()
+    if not process.endswith('.exe'):
+        process += '.exe'
+    return process
+
+
+class _ChordRules:
+    """Compiled rules for a single chord."""
+
+    __slots__ = (
+        'process_rules', 'anchors', 'short_literals',
+        'title_regex', 'regex_groups', 'regex_rules'
+    )
+
+    def __init__(self) -> None:
+        # Executable name -> [(rule index, title regex or None, action name)]
+        self.process_rules: Dict[str, List[Tuple[int, Optional[Pattern], str]]] = {}
+        # Anchor slice -> [(rule index, literal, anchor offset, action name,
+        # regex to confirm or None)]
+        self.anchors: Dict[str, List[Tuple[int, str, int, str, Optional[Pattern]]]] = {}
+        # Literals shorter than the anchor length
+        self.short_literals: List[Tuple[int, str, str]] = []
+        # Combined regex over all regex rules, and its group -> position map
+        self.title_regex: Optional[Pattern] = None
+        self.regex_groups: Dict[int, int] = {}
+        # (rule index, compiled regex, action name) in config order
+        self.regex_rules: List[Tuple[int, Pattern, str]] = []
+
+    def build_literals(self, literals: List[Tuple[int, str, str, Optional[Pattern]]]) -> None:
+        """Build the substring table for literal title rules.
+
+        Each literal is indexed under the slice of itself that the fewest
+        other literals share, which keeps every bucket short even when many
+        rules have a common prefix such as ``Project ...``.
+
+        Args:
+            literals: (rule index, lowercase literal, action name, regex to
+                confirm or None) entries
+        """
+        counts: Dict[str, int] = {}
+        for _, literal, _, _ in literals:
+            for gram in {literal[i:i + _ANCHOR] for i in range(len(literal) - _ANCHOR + 1)}:
+                counts[gram] = counts.get(gram, 0) + 1
+
+        for index, literal, action_name, verify in literals:
+            if len(literal) < _ANCHOR:
+                self.short_literals.append((index, literal, action_name))
+                continue
+            offset = min(
+                range(len(literal) - _ANCHOR + 1),
+                key=lambda i: counts[literal[i:i + _ANCHOR]]
+            )
+            self.anchors.setdefault(literal[offset:offset + _ANCHOR], []).append(
+                (index, literal, offset, action_name, verify)
+            )
+
+        for bucket in self.anchors.values():
+            bucket.sort()
+        self.short_literals.sort()
+
+    def build_regex(self, chord: str) -> None:
+        """Combine the regex rules into one pattern.
+
+        Patterns that refer to their own groups by number or name would
+        match differently once combined, so with any of those the rules
+        are checked one by one instead.
+        """
+        if not self.regex_rules:
+            return
+        for _, compiled, _ in self.regex_rules:
+            if compiled.groupindex or _refers_to_groups(_sre_parse.parse(compiled.pattern)):
+                logger.debug(f"Checking window_title rules for {chord} one by one: "
+                             f"{compiled.pattern!r} uses group references")
+                return
+
+        parts = []
+        group = 1
+        for position, (_, compiled, _) in enumerate(self.regex_rules):
+            parts.append(f"({compiled.pattern})")
+            self.regex_groups[group] = position
+            group += 1 + compiled.groups
+
+        try:
+            self.title_regex = re.compile('|'.join(parts), re.IGNORECASE)
+        except re.error as e:
+            # Inline flags and the like cannot always be combined; fall back
+            # to checking the rules one by one.
+            logger.warning(f"Could not combine window_title rules for {chord}: {e}")
+
+    def resolve(self, title: Optional[str], process: Optional[str]) -> Optional[str]:
+        """Find the first matching rule for a window.
+
+        Args:
+            title: Foreground window title
+            process: Foreground process executable name
+
+        Returns:
+            Action name of the winning rule, or None if no rule matches
+        """
+        best_index = None
+        best_action = None
+
+        if process and self.process_rules:
+            for index, title_regex, action_name in self.process_rules.get(process.lower(), ()):
+                if title_regex is None or (title and title_regex.search(title)):
+                    best_index, best_action = index, action_name
+                    break
+
+        if not title:
+            return best_action
+
+        if self.anchors or self.short_literals:
+            lowered = title.lower()
+            anchors = self.anchors
+            if anchors:
+                for pos in range(len(lowered) - _ANCHOR + 1):
+                    bucket = anchors.get(lowered[pos:pos + _ANCHOR])
+                    if bucket is None:
+                        continue
+                    for index, literal, offset, action_name, verify in bucket:
+                        if best_index is not None and index >= best_index:
+                            break
+                        start = pos - offset
+                        if (start >= 0 and lowered.startswith(literal, start)
+                                and (verify is None or verify.search(title))):
+                            best_index, best_action = index, action_name
+                            break
+            for index, literal, action_name in self.short_literals:
+                if best_index is not None and index >= best_index:
+                    break
+                if literal in lowered:
+                    best_index, best_action = index, action_name
+                    break
+
+        if self.regex_rules:
+            if self.title_regex is not None:
+                match = self.title_regex.search(title)
+                if match is None:
+                    return best_action
+                # The leftmost match is not necessarily the first rule, so
+                # only rules up to the matched one need checking.
+                last = self.regex_groups[match.lastindex]
+            else:
+                last = len(self.regex_rules) - 1
+
+            for index, compiled, action_name in self.regex_rules[:last + 1]:
+                if best_index is not None and index >= best_index:
+                    break
+                if compiled.search(title):
+                    best_index, best_action = index, action_name
+                    break
+
+        return best_action
+
+
+class ConditionalMatcher:
+    """Resolves conditional hotkeys to action names for the foreground window."""
+
+    def __init__(self) -> None:
+        """Initialize an empty matcher."""
+        self._chords: Dict[str, _ChordRules] = {}
+        self._action_names: List[str] = []
+        self.rule_count = 0
+
+    @classmethod
+    def compile(cls, rules: Iterable[Dict[str, Any]]) -> 'ConditionalMatcher':
+        """Compile ``hotkeys_conditional`` entries into a matcher.
+
+        Each rule needs ``key``, ``action`` and at least one of
+        ``window_title`` (regex or substring) and ``process`` (executable
+        name). When both are given, both must match. Disabled and invalid
+        rules are skipped with a warning.
+
+        Args:
+            rules: Conditional hotkey configuration dictionaries
+
+        Returns:
+            Compiled ConditionalMatcher
+        """
+        matcher = cls()
+        action_names = set()
+        literals: Dict[str, List[Tuple[int, str, str, Optional[Pattern]]]] = {}
+
+        for index, rule in enumerate(rules or []):
+            if not isinstance(rule, dict) or not rule.get('enabled', True):
+                continue
+
+            key = rule.get('key')
+            action_name = rule.get('action')
+            window_title = rule.get('window_title')
+            process = rule.get('process')
+
+            if not key or not action_name or not (window_title or process):
+                logger.warning(f"Invalid conditional hotkey config: {rule}")
+                continue
+
+            chord = normalize_chord(key)
+            chord_rules = matcher._chords.setdefault(chord, _ChordRules())
+            title_literals = _title_literals(window_title) if window_title else None
+
+            if process:
+                title_regex = None
+                if window_title:
+                    source = window_title if title_literals is None else '|'.join(
+                        re.escape(literal) for literal in title_literals
+                    )
+                    title_regex = re.compile(source, re.IGNORECASE)
+                chord_rules.process_rules.setdefault(_normalize_process(process), []).append(
+                    (index, title_regex, action_name)
+                )
+            elif title_literals is not None:
+                for literal in title_literals:
+                    literals.setdefault(chord, []).append((index, literal, action_name, None))
+            else:
+                compiled = re.compile(window_title, re.IGNORECASE)
+                required = _required_literal(window_title)
+                if required is not None:
+                    literals.setdefault(chord, []).append(
+                        (index, required, action_name, compiled)
+                    )
+                else:
+                    chord_rules.regex_rules.append((index, compiled, action_name))
+
+            action_names.add(action_name)
+            matcher.rule_count += 1
+
+        for chord, chord_rules in matcher._chords.items():
+            chord_rules.build_literals(literals.get(chord, []))
+            chord_rules.build_regex(chord)
+
+        matcher._action_names = sorted(action_names)
+        logger.debug(
+            f"Compiled {matcher.rule_count} conditional hotkeys for {len(matcher._chords)} chords"
+        )
+        return matcher
+
+    def chords(self) -> List[str]:
+        """Get the normalized chords that have conditional rules.
+
+        Returns:
+            List of chord strings
+        """
+        return list(self._chords)
+
+    def action_names(self) -> List[str]:
+        """Get every action name referenced by a compiled rule.
+
+        Returns:
+            Sorted list of unique action names
+        """
+        return list(self._action_names)
+
+    def __contains__(self, chord: str) -> bool:
+        return chord in self._chords
+
+    def resolve(self, chord: str, title: Optional[str], process: Optional[str]) -> Optional[str]:
+        """Resolve a chord to an action name for the given window.
+
+        Args:
+            chord: Normalized chord string
+            title: Foreground window title
+            process: Foreground process executable name
+
+        Returns:
+            Action name, or None if no rule applies
+        """
+        chord_rules = self._chords.get(chord)
+        if chord_rules is None:
+            return None
+        return chord_rules.resolve(title, process)
@@ -3,25 +3,193 @@
 import os
 import logging
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-import yaml
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .config_cache import ConfigCache, compile_bindings, content_hash
+from .keys import normalize_chord
 
 
 logger = logging.getLogger(__name__)
 
 
+def _binding_table(data: Dict[str, Any]) -> Dict[Tuple, str]:
+    """Flatten every enabled hotkey binding into identity -> action name.
+
+    Args:
+        data: Raw configuration data
+
+    Returns:
+        Dictionary keyed by a tuple identifying the trigger
+    """
+    table: Dict[Tuple, str] = {}
+    hotkeys = data.get('hotkeys') or {}
+
+    for entry in hotkeys.get('global') or []:
+        if isinstance(entry, dict) and entry.get('enabled', True) and entry.get('key'):
+            table[('global', normalize_chord(entry['key']))] = entry.get('action')
+
+    for entry in data.get('hotkeys_conditional') or []:
+        if isinstance(entry, dict) and entry.get('enabled', True) and entry.get('key'):
+            identity = ('conditional', normalize_chord(entry['key']),
+                        entry.get('window_title'), entry.get('process'))
+            table[identity] = entry.get('action')
+
+    leader = hotkeys.get('leader') or '<leader>'
+    timeout = hotkeys.get('sequence_timeout')
+    for entry in hotkeys.get('sequences') or []:
+        if isinstance(entry, dict) and entry.get('enabled', True) and entry.get('keys'):
+            steps = tuple(
+                normalize_chord(leader if step.strip() == '<leader>' else step)
+                for step in entry['keys'].split(',')
+            )
+            table[('sequence', steps, entry.get('timeout', timeout))] = entry.get('action')
+
+    return table
+
+
+def _actions_of_type(data: Dict[str, Any], action_type: str) -> Set[str]:
+    """Find every action name that resolves to an action type.
+
+    Args:
+        data: Raw configuration data
+        action_type: Registered action type
+
+    Returns:
+        The type's own name and every ``actions:`` entry with that ``type``
+    """
+    names = {action_type}
+    for name, settings in (data.get('actions') or {}).items():
+        if isinstance(settings, dict) and settings.get('type') == action_type:
+            names.add(name)
+    return names
+
+
+def _merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """Merge two configuration mappings.
+
+    Nested mappings are merged recursively, lists are concatenated (base
+    first) and any other value in ``override`` replaces the one in ``base``.
+
+    Args:
+        base: Lower-priority data (an included file)
+        override: Higher-priority data
+
+    Returns:
+        New merged dictionary
+    """
+    merged = dict(base)
+    for key, value in override.items():
+        current = merged.get(key)
+        if isinstance(current, dict) and isinstance(value, dict):
+            merged[key] = _merge(current, value)
+        elif isinstance(current, list) and isinstance(value, list):
+            merged[key] = current + value
+        else:
+            merged[key] = value
+    return merged
+
+
+class ConfigDiff:
+    """Structured difference between two configurations."""
+
+    def __init__(self, old: Dict[str, Any], new: Dict[str, Any]):
+        """Compute the difference.
+
+        Args:
+            old: Previous configuration data
+            new: New configuration data
+        """
+        sections = set(old) | set(new)
+        self.changed_sections: Set[str] = {k for k in sections if old.get(k) != new.get(k)}
+
+        # Actions whose constructor input changed
+        old_actions = old.get('actions') or {}
+        new_actions = new.get('actions') or {}
+        self.changed_actions: Set[str] = {
+            name for name in set(old_actions) | set(new_actions)
+            if old_actions.get(name) != new_actions.get(name)
+        }
+        # Macros are actions too
+        old_macros = old.get('macros') or {}
+        new_macros = new.get('macros') or {}
+        for name in set(old_macros) | set(new_macros):
+            if old_macros.get(name) != new_macros.get(name):
+                # Including entries with the macro as their type
+                self.changed_actions.update(_actions_of_type(old, name))
+                self.changed_actions.update(_actions_of_type(new, name))
+        if (old.get('user') or {}).get('signature') != (new.get('user') or {}).get('signature'):
+            self.changed_actions.update(_actions_of_type(old, 'type_signature'))
+            self.changed_actions.update(_actions_of_type(new, 'type_signature'))
+        if self.changed_sections:
+            # The wizard is built from the whole configuration
+            self.changed_actions.add('show_wizard')
+
+        old_bindings = _binding_table(old)
+        new_bindings = _binding_table(new)
+        self.added_bindings = [k for k in new_bindings if k not in old_bindings]
+        self.removed_bindings = [k for k in old_bindings if k not in new_bindings]
+        self.changed_bindings = [
+            k for k in new_bindings
+            if k in old_bindings and old_bindings[k] != new_bindings[k]
+        ]
+
+        if (old.get('app') or {}).get('injection') != (new.get('app') or {}).get('injection'):
+            # Every action resolves its injection settings against app.injection
+            self.changed_actions.update(
+                name for name in (*old_bindings.values(), *new_bindings.values()) if name
+            )
+
+        # Worker pool settings; the dispatcher is replaced to apply them
+        self.dispatch_changed = (
+            (old.get('app') or {}).get('dispatch') != (new.get('app') or {}).get('dispatch')
+        )
+
+    @property
+    def bindings_changed(self) -> int:
+        """Number of bindings added, removed or pointed at another action."""
+        return len(self.added_bindings) + len(self.removed_bindings) + len(self.changed_bindings)
+
+    def is_empty(self) -> bool:
+        """Check whether nothing changed.
+
+        Returns:
+            True if both configurations are identical
+        """
+        return not self.changed_sections
+
+    def summary(self) -> str:
+        """Get a one-line human readable summary.
+
+        Returns:
+            Summary string
+        """
+        if self.is_empty():
+            return "no changes"
+        return (
+            f"sections: {', '.join(sorted(self.changed_sections))}; "
+            f"bindings +{len(self.added_bindings)} -{len(self.removed_bindings)} "
+            f"~{len(self.changed_bindings)}; "
+            f"actions: {', '.join(sorted(self.changed_actions)) or 'none'}"
+        )
+
+
 class Config:
     """Manages application configuration loaded from YAML file."""
 
-    def __init__(self, config_path: Optional[Path] = None):
+    def __init__(self, config_path: Optional[Path] = None, use_cache: bool = True):
         """Initialize configuration.
 
         Args:
             config_path: Path to config file. If None, searches for config.yaml
                         in current directory, then user home directory.
+            use_cache: Load from and maintain the compiled config cache
         """
         self.config_path = config_path or self._find_config()
         self.data: Dict[str, Any] = {}
+        self.bindings: Dict[str, Any] = compile_bindings({})
+        self.source_paths: List[Path] = [Path(self.config_path)]
+        self.cache: Optional[ConfigCache] = ConfigCache(self.config_path) if use_cache else None
+        self._index: Dict[str, Any] = {}
         self.load()
 
     def _find_config(self) -> Path:
@@ -48,22 +216,170 @@ class Config:
             f"No configuration file found. Searched: {[str(p) for p in search_paths]}"
         )
 
-    def load(self) -> None:
-        """Load configuration from YAML file."""
+    def _read_file(
+        self,
+        path: Path,
+        sources: Dict[Path, str],
+        ancestors: Tuple[Path, ...] = ()
+    ) -> Dict[str, Any]:
+        """Parse one configuration file and the files it includes.
+
+        Files listed under ``include`` (relative to the including file) are
+        merged underneath the including file's own settings.
+
+        Args:
+            path: File to parse
+            sources: Files read so far -> content hash; ``path`` and its
+                includes are added
+            ancestors: Files currently including ``path`` (cycle detection)
+
+        Returns:
+            Merged configuration data
+        """
+        path = Path(path)
+        resolved = path.resolve()
+        if resolved in ancestors:
+            raise ValueError(f"Configuration include cycle at {path}")
+        with open(path, 'rb') as f:
+            raw = f.read()
+        sources.setdefault(path, content_hash(raw))
+
+        # PyYAML is only needed when the compiled cache is stale. The C
+        # loader (when built with libyaml) parses several times faster.
+        import yaml
+
+        loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+        data = yaml.load(raw.decode('utf-8'), Loader=loader) or {}
+
+        if not isinstance(data, dict):
+            raise ValueError(f"Configuration root must be a mapping: {path}")
+
+        includes = data.pop('include', None) or []
+        if isinstance(includes, str):
+            includes = [includes]
+
+        merged: Dict[str, Any] = {}
+        for include in includes:
+            include_path = Path(include).expanduser()
+            if not include_path.is_absolute():
+                include_path = path.parent / include_path
+            merged = _merge(
+                merged,
+                self._read_file(include_path, sources, ancestors + (resolved,))
+            )
+
+        return _merge(merged, data)
+
+    def _read(self) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Load the configuration from the cache, or parse the YAML files.
+
+        Updates ``source_paths`` only if loading succeeds.
+
+        Returns:
+            (configuration data, compiled bindings)
+        """
+        if self.cache is not None:
+            cached = self.cache.load()
+            if cached is not None:
+                data, self.source_paths, bindings = cached
+                logger.debug(f"Loaded compiled configuration from {self.cache.path}")
+                return data, bindings
+
+        sources: Dict[Path, str] = {}
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                self.data = yaml.safe_load(f) or {}
-            logger.info(f"Loaded configuration from {self.config_path}")
+            data = self._read_file(Path(self.config_path), sources)
+            bindings = compile_bindings(data)
         except Exception as e:
             logger.error(f"Failed to load configuration: {e}")
             raise
 
-    def reload(self) -> None:
-        """Reload configuration from disk."""
-        self.load()
+        if self.cache is not None:
+            self.cache.store(data, sources, bindings)
+        self.source_paths = list(sources)
+        return data, bindings
+
+    def _apply(self, data: Dict[str, Any], bindings: Dict[str, Any]) -> None:
+        """Make newly loaded data current.
+
+        Args:
+            data: Configuration data
+            bindings: Compiled bindings for ``data``
+        """
+        for warning in bindings['warnings']:
+            logger.warning(warning)
+        self._index = self._build_index(data)
+        self.bindings = bindings
+        self.data = data
+
+    @staticmethod
+    def _build_index(data: Dict[str, Any]) -> Dict[str, Any]:
+        """Flatten nested mappings into a dotted key -> value index for get().
+
+        Args:
+            data: Configuration data
+
+        Returns:
+            Index sharing its values with ``data``
+        """
+        index: Dict[str, Any] = {}
+        stack = [('', data)]
+        while stack:
+            prefix, mapping = stack.pop()
+            for key, value in mapping.items():
+                if not isinstance(key, str):
+                    continue
+                dotted = prefix + key
+                index[dotted] = value
+                if isinstance(value, dict):
+                    stack.append((dotted + '.', value))
+        return index
+
+    def load(self) -> None:
+        """Load configuration from YAML file."""
+        self._apply(*self._read())
+        logger.info(f"Loaded configuration from {self.config_path}")
+        if len(self.source_paths) > 1:
+            logger.info(f"Included files: {[str(p) for p in self.source_paths[1:]]}")
+
+    def reload(self) -> ConfigDiff:
+        """Reload configuration from disk.
+
+        The current data is kept if the file cannot be parsed.
+
+        Returns:
+            Difference between the previous and the reloaded configuration
+        """
+        old = self.data
+        new, bindings = self._read()
+        self._apply(new, bindings)
+        logger.info(f"Reloaded configuration from {self.config_path}")
+        return ConfigDiff(old, new)
+
+    def snapshot(self) -> Tuple[Any, ...]:
+        """Capture the current configuration state, for restore().
+
+        Returns:
+            Opaque state
+        """
+        return self.data, self._index, self.bindings, list(self.source_paths)
+
+    def restore(self, state: Tuple[Any, ...]) -> ConfigDiff:
+        """Go back to a state captured by snapshot().
+
+        Args:
+            state: Output of snapshot()
+
+        Returns:
+            Difference between the current and the restored configuration
+        """
+        current = self.data
+        self.data, self._index, self.bindings, self.source_paths = state
+        return ConfigDiff(current, self.data)
 
     def save(self) -> None:
         """Save current configuration back to file."""
+        import yaml
+
         try:
             with open(self.config_path, 'w', encoding='utf-8') as f:
                 yaml.safe_dump(self.data, f, default_flow_style=False, sort_keys=False)
@@ -82,18 +398,8 @@ class Config:
         Returns:
             Configuration value or default
         """
-        keys = key.split('.')
-        value = self.data
-
-        for k in keys:
-            if isinstance(value, dict):
-                value = value.get(k)
-                if value is None:
-                    return default
-            else:
-                return default
-
-        return value
+        value = self._index.get(key)
+        return default if value is None else value
 
     def set(self, key: str, value: Any) -> None:
         """Set configuration value using dot notation.
@@ -111,6 +417,8 @@ class Config:
             data = data[k]
 
         data[keys[-1]] = value
+        self._index = self._build_index(self.data)
+        self.bindings = compile_bindings(self.data)
 
     def get_global_hotkeys(self) -> List[Dict[str, Any]]:
         """Get list of global hotkey configurations.
@@ -120,6 +428,14 @@ class Config:
         """
         return self.get('hotkeys.global', [])
 
+    def get_sequence_hotkeys(self) -> List[Dict[str, Any]]:
+        """Get list of key sequence hotkey configurations.
+
+        Returns:
+            List of sequence hotkey configuration dictionaries
+        """
+        return self.get('hotkeys.sequences', [])
+
     def get_conditional_hotkeys(self) -> List[Dict[str, Any]]:
         """Get list of conditional (app-specific) hotkey configurations.
 
@@ -0,0 +1,249 @@
+"""On-disk cache of the compiled configuration.
+
+Parsing YAML is by far the slowest part of loading a large configuration. The
+cache stores the parsed data together with the normalized hotkey bindings in
+``marshal`` format next to the config file (``.config.yaml.cache``). It is
+keyed by the content hash of every source file (the config and its includes)
+and by ``SCHEMA_VERSION``; any mismatch makes ``load`` return None and the
+caller parses the YAML and stores a fresh entry.
+
+``marshal`` only handles built-in types and never runs code on load, which
+makes it both faster and safer than pickle for plain YAML data.
+"""
+
+import hashlib
+import logging
+import marshal
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .keys import normalize_chord
+from .macros import compile_macros
+from .snippets import compile_snippets
+
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the cached layout or compile_bindings() output changes
+SCHEMA_VERSION = 3
+
+
+def compile_bindings(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate and normalize the hotkey bindings of a configuration.
+
+    Args:
+        data: Raw configuration data
+
+    Returns:
+        Dictionary with ``global`` [(chord, action name, key)],
+        ``sequences`` [([chords], action name, timeout, keys)], ``actions``
+        (every bound action name in config order), ``macros`` (macro name
+        -> plan, see customhk.macros), ``snippets`` (the snippet automaton
+        or None, see customhk.snippets) and ``warnings`` (problems found,
+        to be logged on every load)
+    """
+    hotkeys = data.get('hotkeys') or {}
+    warnings: List[str] = []
+    actions: List[str] = []
+
+    def bound(entry: Dict[str, Any]) -> None:
+        action_name = entry.get('action')
+        if not action_name:
+            warnings.append(f"Hotkey config missing action name: {entry}")
+        elif action_name not in actions:
+            actions.append(action_name)
+
+    global_bindings = []
+    for entry in hotkeys.get('global') or []:
+        if not isinstance(entry, dict):
+            warnings.append(f"Invalid hotkey config: {entry}")
+            continue
+        bound(entry)
+        if not entry.get('enabled', True):
+            continue
+        key = entry.get('key')
+        action_name = entry.get('action')
+        if not key or not action_name:
+            warnings.append(f"Invalid hotkey config: {entry}")
+            continue
+        global_bindings.append((normalize_chord(key), action_name, key))
+
+    for entry in data.get('hotkeys_conditional') or []:
+        if isinstance(entry, dict):
+            bound(entry)
+
+    leader = hotkeys.get('leader')
+    sequences = []
+    for entry in hotkeys.get('sequences') or []:
+        if not isinstance(entry, dict):
+            warnings.append(f"Invalid sequence hotkey config: {entry}")
+            continue
+        bound(entry)
+        if not entry.get('enabled', True):
+            continue
+        keys = entry.get('keys')
+        action_name = entry.get('action')
+        if not keys or not action_name:
+            warnings.append(f"Invalid sequence hotkey config: {entry}")
+            continue
+
+        steps = [step.strip() for step in keys.split(',')]
+        if '<leader>' in steps:
+            if not leader:
+                warnings.append(f"Sequence {keys} uses <leader> but hotkeys.leader is not set")
+                continue
+            steps = [leader if step == '<leader>' else step for step in steps]
+        sequences.append(
+            ([normalize_chord(step) for step in steps], action_name, entry.get('timeout'), keys)
+        )
+
+    macros, macro_warnings = compile_macros(data.get('macros'))
+    warnings.extend(macro_warnings)
+
+    snippets, snippet_warnings = compile_snippets(data.get('snippets'))
+    warnings.extend(snippet_warnings)
+
+    return {
+        'global': global_bindings,
+        'sequences': sequences,
+        'actions': actions,
+        'macros': macros,
+        'snippets': snippets,
+        'warnings': warnings,
+    }
+
+
+def content_hash(raw: bytes) -> str:
+    """Hash the content of a source file.
+
+    Args:
+        raw: File content
+
+    Returns:
+        Hex digest
+    """
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def _file_hash(path: Path) -> Optional[str]:
+    """Hash a source file's content.
+
+    Args:
+        path: File to hash
+
+    Returns:
+        Hex digest or None if the file cannot be read
+    """
+    try:
+        with open(path, 'rb') as f:
+            return content_hash(f.read())
+    except OSError:
+        return None
+
+
+class ConfigCache:
+    """Compiled configuration cache stored next to a config file."""
+
+    def __init__(self, config_path: Path):
+        """Initialize the cache for a config file.
+
+        Args:
+            config_path: Path of the main YAML file
+        """
+        config_path = Path(config_path)
+        self.path = config_path.parent / f".{config_path.name}.cache"
+        self.hits = 0
+        self.misses = 0
+
+    def load(self) -> Optional[Tuple[Dict[str, Any], List[Path], Dict[str, Any]]]:
+        """Load the cached configuration if it is still current.
+
+        Returns:
+            (data, source paths, compiled bindings), or None if there is no
+            cache entry or any source file changed
+        """
+        try:
+            with open(self.path, 'rb') as f:
+                entry = marshal.loads(f.read())
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable config cache {self.path}: {e}")
+            self.misses += 1
+            return None
+
+        if (not isinstance(entry, dict)
+                or entry.get('schema') != SCHEMA_VERSION
+                or entry.get('python') != tuple(sys.version_info[:2])):
+            self.misses += 1
+            return None
+
+        sources = []
+        for path, digest in entry['sources']:
+            if _file_hash(Path(path)) != digest:
+                logger.debug(f"Config cache is stale: {path} changed")
+                self.misses += 1
+                return None
+            sources.append(Path(path))
+
+        self.hits += 1
+        return entry['data'], sources, entry['bindings']
+
+    def store(
+        self,
+        data: Dict[str, Any],
+        sources: Dict[Path, str],
+        bindings: Dict[str, Any]
+    ) -> bool:
+        """Write a cache entry.
+
+        Failures (read-only directory, values marshal cannot store such as
+        YAML timestamps) only disable the cache; they are never fatal.
+
+        Args:
+            data: Parsed configuration data
+            sources: Files the data was read from -> hash of the content
+                that was parsed (so a save during parsing is never cached)
+            bindings: Output of compile_bindings()
+
+        Returns:
+            True if the entry was written
+        """
+        entry = {
+            'schema': SCHEMA_VERSION,
+            'python': tuple(sys.version_info[:2]),
+            'sources': [(str(path), digest) for path, digest in sources.items()],
+            'data': data,
+            'bindings': bindings,
+        }
+
+        try:
+            payload = marshal.dumps(entry)
+        except ValueError as e:
+            logger.debug(f"Configuration cannot be cached: {e}")
+            self.clear()
+            return False
+
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.debug(f"Could not write config cache {self.path}: {e}")
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            return False
+        return True
+
+    def clear(self) -> None:
+        """Delete the cache file."""
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
@@ -0,0 +1,399 @@
+"""Automatic configuration reload on file changes."""
+
+import ctypes
+import hashlib
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# (mtime_ns, size) of a file, or None if it is missing
+_StatSignature = Optional[Tuple[int, int]]
+
+
+def _stat_signature(path: Path) -> _StatSignature:
+    """Get a cheap change signature for a file.
+
+    Args:
+        path: File to check
+
+    Returns:
+        (mtime_ns, size) or None if the file does not exist
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _content_hash(path: Path) -> Optional[str]:
+    """Hash a file's content.
+
+    Args:
+        path: File to hash
+
+    Returns:
+        Hex digest or None if the file cannot be read
+    """
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+    except OSError:
+        return None
+
+
+class _PollingSource:
+    """Change source that simply wakes up every ``interval`` seconds."""
+
+    name = "polling"
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._stop = threading.Event()
+
+    def watch(self, directories: List[Path], names: List[str]) -> None:
+        pass
+
+    def wait(self) -> bool:
+        """Block until the next poll.
+
+        Returns:
+            Always False; the caller checks file signatures on every wake-up
+        """
+        self._stop.wait(self.interval)
+        return False
+
+    def close(self) -> None:
+        self._stop.set()
+
+
+class _InotifySource:
+    """Change source using Linux inotify on the config directories."""
+
+    name = "inotify"
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+            | IN_CREATE | IN_DELETE)
+
+    def __init__(self, timeout: float = 1.0):
+        # The running process already has libc loaded; no library search needed
+        self.libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = self.libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.timeout = timeout
+        self._watches: Dict[str, int] = {}
+        self._names: set = set()
+        self._closed = False
+
+    def watch(self, directories: List[Path], names: List[str]) -> None:
+        self._names = {os.fsencode(name) for name in names}
+        for directory in directories:
+            key = str(directory)
+            if key in self._watches:
+                continue
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(key), self.MASK)
+            if wd < 0:
+                logger.warning(f"Cannot watch {directory}: errno {ctypes.get_errno()}")
+                continue
+            self._watches[key] = wd
+
+    def wait(self) -> bool:
+        """Block until a watched file changes.
+
+        Returns:
+            True if an event named a watched file, False on timeout, for
+            unrelated files in the same directory, or after close()
+        """
+        if self._closed:
+            return False
+        try:
+            readable, _, _ = select.select([self.fd], [], [], self.timeout)
+        except (OSError, ValueError):
+            return False
+        if not readable:
+            return False
+
+        relevant = False
+        try:
+            while True:
+                buffer = os.read(self.fd, 65536)
+                if not buffer:
+                    break
+                offset = 0
+                while offset + 16 <= len(buffer):
+                    _, _, _, length = struct.unpack_from('iIII', buffer, offset)
+                    name = buffer[offset + 16:offset + 16 + length].rstrip(b'\0')
+                    if name in self._names:
+                        relevant = True
+                    offset += 16 + length
+        except BlockingIOError:
+            pass
+        except OSError:
+            return False
+        return relevant
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            os.close(self.fd)
+
+
+class _Win32ChangeSource:
+    """Change source using FindFirstChangeNotification on Windows."""
+
+    name = "win32"
+
+    FILE_NOTIFY_CHANGE_FILE_NAME = 0x001
+    FILE_NOTIFY_CHANGE_SIZE = 0x008
+    FILE_NOTIFY_CHANGE_LAST_WRITE = 0x010
+    WAIT_TIMEOUT = 0x102
+    INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+
+    def __init__(self, timeout: float = 1.0):
+        from ctypes import wintypes
+
+        self.kernel32 = ctypes.windll.kernel32
+        self.kernel32.FindFirstChangeNotificationW.restype = wintypes.HANDLE
+        self.kernel32.FindFirstChangeNotificationW.argtypes = [
+            wintypes.LPCWSTR, wintypes.BOOL, wintypes.DWORD
+        ]
+        self.kernel32.FindNextChangeNotification.argtypes = [wintypes.HANDLE]
+        self.kernel32.FindCloseChangeNotification.argtypes = [wintypes.HANDLE]
+        self.kernel32.WaitForMultipleObjects.argtypes = [
+            wintypes.DWORD, ctypes.POINTER(wintypes.HANDLE), wintypes.BOOL, wintypes.DWORD
+        ]
+        self._wintypes = wintypes
+        self.timeout_ms = int(timeout * 1000)
+        self._handles: Dict[str, int] = {}
+        self._closed = False
+
+    def watch(self, directories: List[Path], names: List[str]) -> None:
+        flags = (self.FILE_NOTIFY_CHANGE_FILE_NAME | self.FILE_NOTIFY_CHANGE_SIZE
+                 | self.FILE_NOTIFY_CHANGE_LAST_WRITE)
+        for directory in directories:
+            key = str(directory)
+            if key in self._handles:
+                continue
+            handle = self.kernel32.FindFirstChangeNotificationW(key, False, flags)
+            if not handle or handle == self.INVALID_HANDLE_VALUE:
+                logger.warning(f"Cannot watch {directory}")
+                continue
+            self._handles[key] = handle
+
+    def wait(self) -> bool:
+        if self._closed or not self._handles:
+            time.sleep(self.timeout_ms / 1000.0)
+            return False
+
+        handles = list(self._handles.values())
+        array = (self._wintypes.HANDLE * len(handles))(*handles)
+        result = self.kernel32.WaitForMultipleObjects(len(handles), array, False, self.timeout_ms)
+        if result == self.WAIT_TIMEOUT or result >= len(handles):
+            return False
+
+        self.kernel32.FindNextChangeNotification(handles[result])
+        return True
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        for handle in self._handles.values():
+            self.kernel32.FindCloseChangeNotification(handle)
+        self._handles.clear()
+
+
+class ConfigWatcher:
+    """Watches the configuration files and triggers a reload when they change.
+
+    Editors often save with several writes or a write-temp-then-rename, so
+    change notifications are debounced: the reload runs once the files have
+    been quiet for ``debounce`` seconds, and only if their content actually
+    changed. Native notifications (inotify, Win32 change notifications) are
+    used where available; otherwise the files are polled by mtime and size.
+    """
+
+    def __init__(
+        self,
+        paths: Callable[[], List[Path]],
+        on_change: Callable[[], None],
+        debounce: float = 0.3,
+        poll_interval: float = 1.0,
+        use_native: bool = True
+    ):
+        """Initialize the watcher.
+
+        Args:
+            paths: Returns the files to watch (re-read after every reload,
+                so newly included files are picked up)
+            on_change: Called on the watcher thread when the files changed
+            debounce: Quiet period in seconds before reloading
+            poll_interval: Seconds between checks when polling
+            use_native: Use OS change notifications when available
+        """
+        self.paths = paths
+        self.on_change = on_change
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_native = use_native
+        self.reloads = 0
+        self.events = 0
+
+        self._source = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._signatures: Dict[Path, _StatSignature] = {}
+        self._hashes: Dict[Path, Optional[str]] = {}
+
+    def _create_source(self):
+        """Pick the best available change source."""
+        if self.use_native:
+            try:
+                if sys.platform.startswith('linux'):
+                    return _InotifySource(timeout=self.poll_interval)
+                if sys.platform == 'win32':
+                    return _Win32ChangeSource(timeout=self.poll_interval)
+            except Exception as e:
+                logger.warning(f"Native file watching unavailable, polling instead: {e}")
+        return _PollingSource(self.poll_interval)
+
+    def _snapshot(self, keep: bool = False) -> None:
+        """Record the watched files' signatures and hashes as the baseline.
+
+        Args:
+            keep: Keep the baseline of files that were already watched, taken
+                before the reload, so a save made while the reload ran still
+                differs from it; only new files (includes) are read now
+        """
+        signatures: Dict[Path, _StatSignature] = {}
+        hashes: Dict[Path, Optional[str]] = {}
+        for path in self.paths():
+            if keep and path in self._signatures:
+                signatures[path] = self._signatures[path]
+                hashes[path] = self._hashes.get(path)
+            else:
+                signatures[path] = _stat_signature(path)
+                hashes[path] = _content_hash(path)
+        self._signatures = signatures
+        self._hashes = hashes
+
+        if self._source is not None:
+            # Both the path as configured and the file a symlink points to,
+            # since editors replace the target in its own directory
+            resolved = [p.resolve() for p in signatures]
+            self._source.watch(
+                sorted({p.absolute().parent for p in signatures} | {p.parent for p in resolved}),
+                sorted({p.name for p in signatures} | {p.name for p in resolved})
+            )
+
+    def _changed(self) -> bool:
+        """Check whether any watched file's content changed.
+
+        Returns:
+            True if a reload is needed
+        """
+        changed = False
+        for path, signature in list(self._signatures.items()):
+            current = _stat_signature(path)
+            if current == signature:
+                continue
+            if current is None:
+                # Mid-save (deleted before rename) or removed: wait for it
+                continue
+            self._signatures[path] = current
+            content = _content_hash(path)
+            if content != self._hashes.get(path):
+                self._hashes[path] = content
+                changed = True
+        return changed
+
+    def start(self) -> None:
+        """Start watching in a background thread."""
+        if self._thread is not None:
+            return
+
+        self._source = self._create_source()
+        self._snapshot()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="customhk-config-watch", daemon=True)
+        self._thread.start()
+        logger.info(
+            f"Watching {len(self._signatures)} configuration file(s) ({self._source.name})"
+        )
+
+    def stop(self) -> None:
+        """Stop watching."""
+        if self._thread is None:
+            return
+
+        self._running = False
+        self._source.close()
+        self._thread.join(self.poll_interval + 1.0)
+        self._thread = None
+        self._source = None
+
+    def _run(self) -> None:
+        """Watcher loop."""
+        while self._running:
+            notified = self._source.wait()
+            if not self._running:
+                break
+            # Poll wake-ups and timeouts double as a safety net against
+            # missed notifications; both only cost a stat() per file.
+            if not notified and not self._any_stat_changed():
+                continue
+            self.events += 1
+
+            # Debounce: wait until the files stop changing
+            quiet_since = time.monotonic()
+            last = self._current_stats()
+            while self._running:
+                time.sleep(min(self.debounce, 0.05))
+                current = self._current_stats()
+                if current != last:
+                    last = current
+                    quiet_since = time.monotonic()
+                elif time.monotonic() - quiet_since >= self.debounce:
+                    break
+
+            if not self._running or not self._changed():
+                continue
+
+            self.reloads += 1
+            try:
+                self.on_change()
+            except Exception as e:
+                logger.error(f"Configuration reload failed: {e}", exc_info=True)
+
+            # Includes may have changed; refresh the watched set
+            self._snapshot(keep=True)
+
+    def _current_stats(self) -> List[_StatSignature]:
+        """Get the stat signatures of all watched files."""
+        return [_stat_signature(path) for path in self._signatures]
+
+    def _any_stat_changed(self) -> bool:
+        """Cheap check used on timeouts: did any mtime/size change?"""
+        return any(
+            _stat_signature(path) != signature
+            for path, signature in self._signatures.items()
+        )
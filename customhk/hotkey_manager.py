@@ -1,111 +1,1041 @@
 """Hotkey management and listener lifecycle."""
 
+import itertools
 import logging
-from typing import Dict, Any, Optional, Callable
-from pynput import keyboard
-from pynput.keyboard import Controller
+import queue
+import threading
+import time
+from typing import Dict, Any, List, Optional, Callable
 
-from .actions.registry import get_registry
-from .utils.window import WindowManager
+from . import profiling
+from .actions.registry import ActionSpec, get_registry
+from .backends import KeyListener, get_platform
+from .backends.clipboard_worker import ClipboardWorker
+from .conditional import ConditionalMatcher
+from .config import ConfigDiff
+from .keys import MODIFIER_ORDER, key_token, normalize_chord
+from .macros import MACRO_SOURCE
+from .metrics import ActionMetrics, get_metrics, swap_scratch
+from .scheduling import DEFAULT_PRIORITY, PRIORITIES, Job, priority_level, set_current_job
+from .snippets import SnippetExpander
+from .utils.clipboard import ClipboardManager
+from .utils.injection import request_abort, resolve_settings
+from .utils.window import WindowContext, WindowManager
 
 
 logger = logging.getLogger(__name__)
 
+_STOP = object()  # Sentinel telling a dispatcher worker to exit
+_STOP_LEVEL = len(PRIORITIES)  # Queued after every action
+
+# Stops streamed typing (hotkeys.abort); Esc alone is too common
+DEFAULT_ABORT_KEY = '<ctrl>+<alt>+<esc>'
+
+
+class ActionDispatcher:
+    """Runs triggered actions on a bounded pool of worker threads.
+
+    Each action name is pinned to a single worker, so repeated presses of the
+    same hotkey run in the order they were pressed while different actions can
+    run side by side. ``submit`` only enqueues, which hands control back to the
+    listener's hook thread immediately.
+
+    Queued actions run highest priority class first (see ``scheduling``).
+    Submitting an action asks every running lower-priority action to pause
+    at its next checkpoint; a paused worker runs the higher-priority actions
+    queued on it itself, then resumes once no higher-priority work is left.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_queue: int = 32,
+        observer: Optional[Callable[[str, Optional[str], float, float, float], None]] = None,
+        on_schedule: Optional[Callable[[str, str, str, Optional[float]], None]] = None
+    ):
+        """Initialize the dispatcher.
+
+        Args:
+            workers: Number of worker threads
+            max_queue: Maximum number of pending actions per worker
+            observer: Called on the worker after every action with
+                (name, trigger, enqueued_at, started_at, finished_at), the
+                times being perf_counter timestamps; used by benchmarks
+                and metrics
+            on_schedule: Called with (decision, name, priority, seconds) for
+                every scheduling decision: 'preempt' (requested), 'paused'
+                (seconds = preemption latency), 'resumed' (seconds paused),
+                'inline' (run on a paused worker), 'cancelled' and 'dropped'
+        """
+        self.num_workers = max(1, int(workers))
+        self.max_queue = max(1, int(max_queue))
+        self.observer = observer
+        self.on_schedule = on_schedule
+        self._queues: List[queue.PriorityQueue] = []
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._sequence = itertools.count()
+        self._running: List[Job] = []
+
+        # Counters (guarded by _lock)
+        self._submitted = 0
+        self._completed = 0
+        self._dropped = 0
+        self._active = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._preempted = 0
+        self._cancelled = 0
+
+    def start(self) -> None:
+        """Start the worker threads (no-op if already running)."""
+        if self._threads:
+            return
+
+        self._queues = [
+            queue.PriorityQueue(maxsize=self.max_queue) for _ in range(self.num_workers)
+        ]
+        for index, work_queue in enumerate(self._queues):
+            thread = threading.Thread(
+                target=self._worker,
+                args=(work_queue,),
+                name=f"customhk-dispatch-{index}",
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+        logger.info(f"Started action dispatcher with {self.num_workers} workers")
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stop the worker threads after their queued actions finish.
+
+        Args:
+            timeout: Seconds to wait for each worker to exit
+        """
+        if not self._threads:
+            return
+
+        for work_queue in self._queues:
+            work_queue.put((_STOP_LEVEL, next(self._sequence), _STOP))
+        for thread in self._threads:
+            thread.join(timeout)
+
+        self._threads = []
+        self._queues = []
+        logger.info("Stopped action dispatcher")
+
+    def is_running(self) -> bool:
+        """Check if the worker threads are running.
+
+        Returns:
+            True if the dispatcher accepts work
+        """
+        return bool(self._threads)
+
+    def submit(
+        self,
+        name: str,
+        action: Callable[[], None],
+        trigger: Optional[str] = None,
+        priority: str = DEFAULT_PRIORITY,
+        origin: Optional[Job] = None
+    ) -> bool:
+        """Queue an action for execution. Safe to call from the hook thread.
+
+        Args:
+            name: Action name, used to pin the action to a worker
+            action: Callable to run
+            trigger: Hotkey that triggered the action, passed to the observer
+            priority: Priority class (see scheduling.PRIORITIES)
+            origin: First job of the run this continues (see
+                scheduling.continue_later)
+
+        Returns:
+            True if queued, False if the dispatcher is stopped or the queue is full
+        """
+        queues = self._queues
+        if not queues:
+            logger.warning(f"Dispatcher not running, dropping action {name}")
+            return False
+
+        job = Job(name, action, trigger, priority_level(priority), self, origin)
+        job.home = queues[hash(name) % len(queues)]
+        try:
+            job.home.put_nowait((job.level, next(self._sequence), job))
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+            logger.warning(f"Dispatch queue full, dropping action {name}")
+            self._decision('dropped', job)
+            return False
+
+        preempted = []
+        with self._changed:
+            self._submitted += 1
+            for running in self._running:
+                if running.level > job.level and running.preempt_at is None:
+                    running.preempt_at = job.enqueued_at
+                    preempted.append(running)
+            self._changed.notify_all()
+
+        for running in preempted:
+            self._decision('preempt', running)
+        return True
+
+    def cancel(self, priority: str = 'bulk') -> int:
+        """Cancel running actions of a priority class or lower.
+
+        They stop at their next checkpoint; queued actions still run.
+
+        Args:
+            priority: Highest priority class to cancel
+
+        Returns:
+            Number of actions cancelled
+        """
+        level = priority_level(priority)
+        with self._changed:
+            jobs = [job for job in self._running if job.level >= level and not job.cancelled]
+            for job in jobs:
+                job.cancelled = True
+            self._changed.notify_all()
+        if jobs:
+            logger.info(f"Cancelling {', '.join(job.name for job in jobs)}")
+        return len(jobs)
+
+    def yield_to_higher(self, job: Job) -> None:
+        """Pause a preempted job until no higher-priority work is left.
+
+        Called from scheduling.checkpoint() on the job's own worker.
+        Higher-priority jobs queued on that worker are run here, nested.
+
+        Args:
+            job: The running job asked to step aside
+        """
+        paused_at = time.perf_counter()
+        with self._lock:
+            self._preempted += 1
+            job.paused = True
+        self._decision('paused', job, paused_at - job.preempt_at)
+
+        while not job.cancelled:
+            nested = self._take_higher(job.home, job.level)
+            if nested is not None:
+                self._decision('inline', nested)
+                # The paused job's counters stay out of the nested job's record
+                saved = swap_scratch()
+                try:
+                    self._run(nested)
+                finally:
+                    swap_scratch(saved)
+                continue
+
+            with self._changed:
+                if not self._higher_pending(job.level):
+                    break
+                # Woken by submissions and finished jobs; the timeout covers
+                # work queued on a worker that does not reach a checkpoint
+                self._changed.wait(0.05)
+
+        with self._lock:
+            job.paused = False
+            job.preempt_at = None
+        self._decision('resumed', job, time.perf_counter() - paused_at)
+
+    def _take_higher(self, work_queue: queue.PriorityQueue, level: int) -> Optional[Job]:
+        """Remove the first queued job of a higher priority than level."""
+        with work_queue.mutex:
+            if not work_queue.queue or work_queue.queue[0][0] >= level:
+                return None
+        try:
+            return work_queue.get_nowait()[2]
+        except queue.Empty:
+            return None
+
+    def _higher_pending(self, level: int) -> bool:
+        """Check for higher-priority jobs running or queued. Call with _lock held."""
+        if any(job.level < level and not job.paused for job in self._running):
+            return True
+        for work_queue in self._queues:
+            with work_queue.mutex:
+                if work_queue.queue and work_queue.queue[0][0] < level:
+                    return True
+        return False
+
+    def _decision(self, decision: str, job: Job, seconds: Optional[float] = None) -> None:
+        on_schedule = self.on_schedule
+        if on_schedule is not None:
+            try:
+                on_schedule(decision, job.name, job.priority, seconds)
+            except Exception as e:
+                logger.error(f"Schedule observer failed for {job.name}: {e}")
+
+    def _worker(self, work_queue: queue.PriorityQueue) -> None:
+        """Worker loop: run queued actions until told to stop.
+
+        Args:
+            work_queue: Queue owned by this worker
+        """
+        while True:
+            item = work_queue.get()[2]
+            if item is _STOP:
+                return
+            self._run(item)
+
+    def _run(self, job: Job) -> None:
+        """Run one job on the current thread and account for it."""
+        started_at = job.started_at = time.perf_counter()
+        wait = started_at - job.enqueued_at
+        with self._lock:
+            self._active += 1
+            self._total_wait += wait
+            if wait > self._max_wait:
+                self._max_wait = wait
+            self._running.append(job)
+
+        first = job.origin or job
+        if job.origin is not None:
+            swap_scratch(first.carried)
+        previous = set_current_job(job)
+        try:
+            job.action()
+        except Exception as e:
+            # Action.__call__ already handles its own errors; this guards
+            # against plain callables killing the worker.
+            logger.error(f"Unhandled error in dispatched action {job.name}: {e}", exc_info=True)
+        finally:
+            set_current_job(previous)
+            finished_at = time.perf_counter()
+            with self._changed:
+                self._active -= 1
+                self._completed += 1
+                self._running.remove(job)
+                if job.cancelled:
+                    self._cancelled += 1
+                self._changed.notify_all()
+
+        if job.cancelled:
+            self._decision('cancelled', job)
+
+        if job.continued:
+            # Reported with the job that finishes the run
+            first.carried = swap_scratch()
+            return
+
+        observer = self.observer
+        if observer is not None:
+            try:
+                observer(job.name, job.trigger, first.enqueued_at, first.started_at, finished_at)
+            except Exception as e:
+                logger.error(f"Dispatch observer failed for {job.name}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get dispatcher counters.
+
+        Returns:
+            Dictionary with queue depth, throughput and wait-time counters
+        """
+        depths = [q.qsize() for q in self._queues]
+        with self._lock:
+            started = self._completed + self._active
+            return {
+                'workers': self.num_workers,
+                'queue_depth': sum(depths),
+                'queue_depths': depths,
+                'submitted': self._submitted,
+                'completed': self._completed,
+                'dropped': self._dropped,
+                'active': self._active,
+                'avg_wait_ms': (self._total_wait / started * 1000.0) if started else 0.0,
+                'max_wait_ms': self._max_wait * 1000.0,
+                'running': [job.name for job in self._running],
+                'preempted': self._preempted,
+                'cancelled': self._cancelled,
+            }
+
+
+class _SequenceNode:
+    """A state in the sequence trie."""
+
+    __slots__ = ('children', 'action_name', 'keys', 'timeout', 'step_timeout')
+
+    def __init__(self) -> None:
+        self.children: Dict[str, '_SequenceNode'] = {}
+        self.action_name: Optional[str] = None
+        self.keys = ''  # The sequence ending here, e.g. "<ctrl>+k, s"
+        # Max gap allowed between steps for the sequence ending here
+        self.timeout = 0.0
+        # Longest gap any sequence through this node allows for its next step
+        self.step_timeout = 0.0
+
+
+class SequenceMatcher:
+    """Matches multi-chord hotkey sequences such as ``<ctrl>+k, s``.
+
+    Sequences are stored in a trie keyed by normalized chord, so each key
+    event is a single dict lookup no matter how many sequences exist. A
+    sequence that is also the prefix of a longer one (``<ctrl>+k`` and
+    ``<ctrl>+k, s``) fires once the next chord rules out the longer one, or
+    after ``ambiguity_timeout`` seconds with no further input.
+    """
+
+    def __init__(
+        self,
+        on_match: Callable[[str, str], None],
+        default_timeout: float = 1.0,
+        ambiguity_timeout: float = 0.5
+    ):
+        """Initialize the matcher.
+
+        Args:
+            on_match: Called with the action name and the sequence (as
+                ``<ctrl>+k, s``) when a sequence completes
+            default_timeout: Max seconds between steps unless a sequence sets its own
+            ambiguity_timeout: Seconds to wait before firing a sequence that
+                is also a prefix of a longer one
+        """
+        self.on_match = on_match
+        self.default_timeout = default_timeout
+        self.ambiguity_timeout = ambiguity_timeout
+        self.root = _SequenceNode()
+        self.sequence_count = 0
+
+        self._lock = threading.Lock()
+        self._state = self.root
+        self._last_step = 0.0
+        self._max_gap = 0.0
+        self._pending_timer: Optional[threading.Timer] = None
+
+    def add(self, steps: List[str], action_name: str, timeout: Optional[float] = None) -> bool:
+        """Add a sequence.
+
+        Args:
+            steps: Chords making up the sequence
+            action_name: Action to run when the sequence completes
+            timeout: Max seconds between steps (default_timeout if None)
+
+        Returns:
+            True if added, False if the sequence was empty or already bound
+        """
+        chords = [normalize_chord(step) for step in steps]
+        if not chords or not all(chords):
+            return False
+
+        timeout = self.default_timeout if timeout is None else float(timeout)
+        node = self.root
+        for chord in chords:
+            node.step_timeout = max(node.step_timeout, timeout)
+            node = node.children.setdefault(chord, _SequenceNode())
+
+        if node.action_name is not None:
+            logger.warning(f"Sequence {', '.join(chords)} already bound to {node.action_name}")
+            return False
+
+        node.action_name = action_name
+        node.keys = ', '.join(chords)
+        node.timeout = timeout
+        self.sequence_count += 1
+        return True
+
+    def first_chords(self) -> List[str]:
+        """Get the chords that start a sequence.
+
+        Returns:
+            List of normalized chords
+        """
+        return list(self.root.children)
+
+    def feed(self, chord: str, now: Optional[float] = None) -> bool:
+        """Advance the state machine with one chord.
+
+        Args:
+            chord: Normalized chord that was just pressed
+            now: Event time (time.monotonic() if None)
+
+        Returns:
+            True if the chord was part of a sequence
+        """
+        if now is None:
+            now = time.monotonic()
+
+        fire = []
+        with self._lock:
+            consumed = self._step(chord, now, fire)
+
+        for node in fire:
+            self.on_match(node.action_name, node.keys)
+        return consumed
+
+    def _step(self, chord: str, now: float, fire: List[_SequenceNode]) -> bool:
+        """Advance the state machine; caller holds the lock."""
+        state = self._state
+        gap = now - self._last_step
+
+        if state is not self.root and gap > state.step_timeout:
+            # Too slow: the pending sequence (if any) timed out too
+            self._reset()
+            state = self.root
+
+        child = state.children.get(chord)
+        if child is None:
+            if state is self.root:
+                return False
+            # A complete-but-ambiguous sequence fires when the next chord
+            # rules out the longer ones; the chord then starts afresh.
+            if state.action_name is not None and self._max_gap <= state.timeout:
+                fire.append(state)
+            self._reset()
+            return self._step(chord, now, fire)
+
+        if self._pending_timer is not None:
+            self._pending_timer.cancel()
+            self._pending_timer = None
+
+        self._max_gap = max(self._max_gap, gap) if state is not self.root else 0.0
+        self._state = child
+        self._last_step = now
+
+        if child.action_name is None:
+            return True
+
+        if not child.children:
+            if self._max_gap <= child.timeout:
+                fire.append(child)
+            self._reset()
+            return True
+
+        # Ambiguous prefix: wait briefly for a longer sequence
+        self._pending_timer = threading.Timer(self.ambiguity_timeout, self._flush_pending, (child,))
+        self._pending_timer.daemon = True
+        self._pending_timer.start()
+        return True
+
+    def _flush_pending(self, node: _SequenceNode) -> None:
+        """Fire an ambiguous sequence once no longer one followed."""
+        with self._lock:
+            if self._state is not node:
+                return
+            fire = self._max_gap <= node.timeout
+            self._pending_timer = None
+            self._reset()
+
+        if fire:
+            self.on_match(node.action_name, node.keys)
+
+    def _reset(self) -> None:
+        """Return to the root state."""
+        if self._pending_timer is not None:
+            self._pending_timer.cancel()
+            self._pending_timer = None
+        self._state = self.root
+        self._max_gap = 0.0
+
+    def reset(self) -> None:
+        """Abandon any partially typed sequence."""
+        with self._lock:
+            self._reset()
+
+
+def _priority(action: Any) -> str:
+    """Get an action's priority class (see scheduling.PRIORITIES)."""
+    return getattr(action, 'priority', DEFAULT_PRIORITY)
+
+
+class _Bindings:
+    """Everything needed to resolve a keypress, swapped as a unit on reload."""
+
+    __slots__ = ('actions', 'chords', 'conditional', 'sequences', 'abort')
+
+    def __init__(
+        self,
+        actions: Dict[str, Any],
+        chords: Dict[str, str],
+        conditional: ConditionalMatcher,
+        sequences: SequenceMatcher,
+        abort: Optional[str] = None
+    ):
+        self.actions = actions          # action name -> Action instance
+        self.chords = chords            # normalized chord -> global action name
+        self.conditional = conditional
+        self.sequences = sequences
+        self.abort = abort              # normalized chord stopping streamed typing
+
+    def listener_chords(self) -> List[str]:
+        """Get every chord the hotkey listener has to watch.
+
+        Returns:
+            Sorted list of normalized chords
+        """
+        chords = set(self.chords) | set(self.conditional.chords())
+        if self.abort:
+            chords.add(self.abort)
+        return sorted(chords)
+
 
 class HotkeyManager:
     """Manages hotkey registration, listeners, and action execution."""
 
-    def __init__(self, config):
+    def __init__(self, config, keyboard_controller: Optional[Any] = None):
         """Initialize hotkey manager.
 
         Args:
             config: Configuration object
+            keyboard_controller: Controller handed to actions (the active
+                platform's key injector if None)
         """
         self.config = config
-        self.kb_controller = Controller()
-        self.listener: Optional[keyboard.GlobalHotKeys] = None
+        self.platform = get_platform()
+        self.kb_controller = (
+            keyboard_controller if keyboard_controller is not None else self.platform.keyboard
+        )
+        self.listener: Optional[KeyListener] = None
+        self.sequence_listener: Optional[KeyListener] = None
+        self.snippets: Optional[SnippetExpander] = None
+        self._held_modifiers: set = set()
         self.enabled = True
         self.registry = get_registry()
-        self.action_instances: Dict[str, Any] = {}
         self.hotkey_map: Dict[str, Callable] = {}
+        self.get_window_context: Callable[[], WindowContext] = WindowManager.get_active_context
+        self.metrics: Optional[ActionMetrics] = (
+            get_metrics() if config.get('app.metrics.enabled', True) else None
+        )
+        self.dispatcher = self._create_dispatcher()
+        self._bindings = _Bindings({}, {}, ConditionalMatcher(), SequenceMatcher(self._on_sequence))
+        # Listener callbacks carry the generation they were created for, so a
+        # listener being replaced during a reload goes quiet immediately.
+        self._generation = 0
+        self._reload_lock = threading.Lock()
+        self._macros: List[str] = []
 
         # Initialize all actions from config
         self._initialize_actions()
 
-    def _initialize_actions(self) -> None:
-        """Initialize action instances from configuration."""
-        logger.info("Initializing actions from configuration")
+    @property
+    def action_instances(self) -> Dict[str, Any]:
+        """Action instances currently bound to hotkeys."""
+        return self._bindings.actions
 
-        # Get global hotkeys
-        global_hotkeys = self.config.get_global_hotkeys()
+    @property
+    def conditional(self) -> ConditionalMatcher:
+        """Compiled conditional hotkeys currently in effect."""
+        return self._bindings.conditional
 
-        for hotkey_config in global_hotkeys:
-            action_name = hotkey_config.get('action')
-            if not action_name:
-                logger.warning(f"Hotkey config missing action name: {hotkey_config}")
-                continue
+    @property
+    def sequences(self) -> SequenceMatcher:
+        """Key sequence matcher currently in effect."""
+        return self._bindings.sequences
 
-            # Skip if already created
-            if action_name in self.action_instances:
-                continue
+    def _bound_action_names(self) -> List[str]:
+        """Get the action names referenced by any hotkey in the config.
+
+        Returns:
+            Action names in config order, without duplicates
+        """
+        # Collected (globally, per application and from key sequences) when
+        # the config was compiled
+        return list(self.config.bindings['actions'])
+
+    def _create_action(self, action_name: str) -> Optional[Any]:
+        """Create an action instance from configuration.
+
+        Args:
+            action_name: Name of the action
+
+        Returns:
+            Action instance or None on failure
+        """
+        # Get action-specific config (copied so the config data stays pristine)
+        action_config = dict(self.config.get_action_config(action_name) or {})
+
+        # An entry with a "type" defines a new action of that type
+        action_type = action_config.pop('type', None) or action_name
+
+        # Macros carry their compiled plan
+        if action_type in self._macros:
+            macro = self.config.bindings['macros'][action_type]
+            action_config.update(name=action_name, macro=macro, submit=self._dispatch)
+            if macro['priority'] is not None:
+                action_config.setdefault('priority', macro['priority'])
+
+        # Add user signature to config if needed
+        if action_type == 'type_signature':
+            action_config['signature'] = self.config.get_user_signature()
+
+        # Recorded macros are saved to the configuration file
+        if action_type == 'record_macro':
+            action_config['config_path'] = str(self.config.config_path)
 
-            # Get action-specific config
-            action_config = self.config.get_action_config(action_name)
+        # Resolve text injection settings against the app-wide defaults
+        action_config['injection'] = resolve_settings(
+            self.config.get('app.injection'),
+            action_config.get('injection')
+        )
 
-            # Add user signature to config if needed
-            if action_name == 'type_signature':
-                action_config['signature'] = self.config.get_user_signature()
+        # Add entire config for wizard action
+        if action_type == 'show_wizard':
+            action_config = self.config.data
 
-            # Add entire config for wizard action
-            if action_name == 'show_wizard':
-                action_config = self.config.data
+        # Create action instance
+        start = time.perf_counter()
+        instance = self.registry.create_instance(
+            action_type,
+            action_config,
+            self.kb_controller,
+            instance_name=action_name
+        )
+        profiling.record_action(action_name, time.perf_counter() - start)
 
-            # Create action instance
-            instance = self.registry.create_instance(
-                action_name,
-                action_config,
-                self.kb_controller
+        if instance:
+            logger.info(f"Created action instance: {action_name}")
+        else:
+            logger.error(f"Failed to create action instance: {action_name}")
+        return instance
+
+    def _register_macros(self) -> None:
+        """Declare each compiled macro as an action, replacing the previous set."""
+        macros = self.config.bindings.get('macros') or {}
+        for name in self._macros:
+            if name not in macros:
+                self.registry.unregister(name)
+
+        declared = []
+        for name in macros:
+            spec = self.registry.get_spec(name)
+            if spec is not None:
+                taken = spec.source != MACRO_SOURCE
+            else:
+                taken = self.registry.is_loaded(name)
+            if taken:
+                logger.warning(f"Macro '{name}' has the name of an existing action, ignoring it")
+                continue
+            self.registry.declare(
+                ActionSpec(
+                    name, 'customhk.actions.macro', 'MacroAction', ('keyboard',), MACRO_SOURCE
+                )
             )
+            declared.append(name)
+        self._macros = declared
+
+    def _initialize_actions(self, actions: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Initialize action instances from configuration.
+
+        Instances already present in ``actions`` are reused; actions no longer
+        bound to any hotkey are dropped.
+
+        Args:
+            actions: Existing instances to reuse (current bindings if None)
+
+        Returns:
+            Dictionary of action name -> instance
+        """
+        logger.info("Initializing actions from configuration")
+        self._register_macros()
 
+        if actions is None:
+            actions = self._bindings.actions
+
+        instances: Dict[str, Any] = {}
+        for action_name in self._bound_action_names():
+            instance = actions.get(action_name) or self._create_action(action_name)
             if instance:
-                self.action_instances[action_name] = instance
-                logger.info(f"Created action instance: {action_name}")
-            else:
-                logger.error(f"Failed to create action instance: {action_name}")
+                instances[action_name] = instance
+
+        actions.clear()
+        actions.update(instances)
+        return actions
 
-    def _build_hotkey_map(self) -> Dict[str, Callable]:
-        """Build hotkey mapping from configuration.
+    def _build_bindings(self, actions: Dict[str, Any]) -> _Bindings:
+        """Build chord, conditional and sequence tables from configuration.
+
+        Args:
+            actions: Action instances to bind
 
         Returns:
-            Dictionary mapping hotkey strings to callable actions
+            New _Bindings (not yet active)
         """
-        hotkey_map = {}
+        chords: Dict[str, str] = {}
 
-        # Add global hotkeys
-        global_hotkeys = self.config.get_global_hotkeys()
-        for hotkey_config in global_hotkeys:
-            if not hotkey_config.get('enabled', True):
+        # Add global hotkeys (validated and normalized by the config)
+        for chord, action_name, key in self.config.bindings['global']:
+            if action_name not in actions:
+                logger.warning(f"Action {action_name} not found for hotkey {key}")
                 continue
 
-            key = hotkey_config.get('key')
-            action_name = hotkey_config.get('action')
+            chords[chord] = action_name
+            logger.debug(f"Mapped hotkey {key} -> {action_name}")
+
+        # Add conditional (app-specific) hotkeys. Chords that also have a
+        # global binding fall back to it when no rule matches the window.
+        conditional = ConditionalMatcher.compile(self.config.get_conditional_hotkeys())
+        for action_name in conditional.action_names():
+            if action_name not in actions:
+                logger.warning(f"Action {action_name} not found for conditional hotkeys")
+
+        sequences = self._build_sequences(actions)
+        for chord in sequences.first_chords():
+            if chord in chords or chord in conditional:
+                logger.warning(f"Hotkey {chord} also starts a key sequence; both will fire")
+
+        abort = self.config.get('hotkeys.abort', DEFAULT_ABORT_KEY)
+        abort = normalize_chord(abort) if abort else None
+
+        return _Bindings(actions, chords, conditional, sequences, abort)
+
+    def _build_hotkey_map(self, bindings: _Bindings, generation: int) -> Dict[str, Callable]:
+        """Build the callback map handed to the hotkey listener.
+
+        Args:
+            bindings: Bindings providing the chords
+            generation: Listener generation the callbacks belong to
+
+        Returns:
+            Dictionary mapping hotkey strings to callbacks
+        """
+        return {
+            chord: self._make_trigger(chord, generation)
+            for chord in bindings.listener_chords()
+        }
+
+    def _build_sequences(self, actions: Dict[str, Any]) -> SequenceMatcher:
+        """Build the sequence matcher from ``hotkeys.sequences``.
 
-            if not key or not action_name:
-                logger.warning(f"Invalid hotkey config: {hotkey_config}")
+        ``<leader>`` in a sequence was already replaced by the
+        ``hotkeys.leader`` chord when the config was compiled.
+
+        Args:
+            actions: Action instances available for binding
+
+        Returns:
+            SequenceMatcher with all enabled sequences
+        """
+        sequences = SequenceMatcher(
+            self._on_sequence,
+            default_timeout=self.config.get('hotkeys.sequence_timeout', 1.0),
+            ambiguity_timeout=self.config.get('hotkeys.sequence_ambiguity_timeout', 0.5)
+        )
+
+        for steps, action_name, timeout, keys in self.config.bindings['sequences']:
+            if action_name not in actions:
+                logger.warning(f"Action {action_name} not found for sequence {keys}")
                 continue
 
-            action = self.action_instances.get(action_name)
-            if not action:
-                logger.warning(f"Action {action_name} not found for hotkey {key}")
+            if sequences.add(steps, action_name, timeout):
+                logger.debug(f"Mapped sequence {keys} -> {action_name}")
+
+        return sequences
+
+    def _dispatch(
+        self,
+        name: str,
+        action: Callable[[], None],
+        trigger: Optional[str] = None,
+        priority: str = DEFAULT_PRIORITY,
+        origin: Optional[Job] = None
+    ) -> bool:
+        """Queue work on the current dispatcher (see ActionDispatcher.submit).
+
+        Snippets and waiting macros queue work long after they were set up,
+        when a reload may have replaced the dispatcher.
+        """
+        return self.dispatcher.submit(name, action, trigger, priority, origin)
+
+    def _submit(self, action_name: str, trigger: Optional[str] = None) -> None:
+        """Queue an action by name on the dispatcher.
+
+        Args:
+            action_name: Name of the action
+            trigger: Hotkey that triggered it, for statistics
+        """
+        action = self._bindings.actions.get(action_name)
+        if action is None:
+            logger.warning(f"Action {action_name} not found")
+            return
+        self.dispatcher.submit(action_name, action, trigger, _priority(action))
+
+    def _on_chord(self, chord: str) -> None:
+        """Resolve a pressed chord to an action and queue it.
+
+        Args:
+            chord: Normalized chord string
+        """
+        bindings = self._bindings
+        action_name = None
+
+        if chord in bindings.conditional:
+            context = self.get_window_context()
+            action_name = bindings.conditional.resolve(chord, context.title, context.process)
+
+        if action_name is None:
+            action_name = bindings.chords.get(chord)
+            if action_name is None:
+                return
+
+        action = bindings.actions.get(action_name)
+        if action is None:
+            logger.warning(f"Action {action_name} not found for hotkey {chord}")
+            return
+
+        self.dispatcher.submit(action_name, action, chord, _priority(action))
+
+    def _make_trigger(self, chord: str, generation: int) -> Callable[[], None]:
+        """Create the listener callback for a chord.
+
+        The callback only resolves and enqueues the action, so the listener's
+        hook thread is released immediately. The abort chord is handled right
+        here rather than queued, since the workers may be busy typing.
+
+        Args:
+            chord: Normalized chord string
+            generation: Listener generation the callback belongs to
+
+        Returns:
+            Callback suitable for the hotkey listener
+        """
+        def trigger() -> None:
+            if generation == self._generation:
+                if chord == self._bindings.abort:
+                    self.abort()
+                self._on_chord(chord)
+
+        return trigger
+
+    def _on_sequence(self, action_name: str, keys: str) -> None:
+        """Run the action for a completed key sequence.
+
+        Args:
+            action_name: Name of the action
+            keys: The completed sequence
+        """
+        self._submit(action_name, keys)
+
+    def _on_key_press(self, key: Any) -> None:
+        """Raw listener callback feeding the sequence matcher.
+
+        Args:
+            key: Key pressed
+        """
+        if self.sequence_listener is not None:
+            key = self.sequence_listener.canonical(key)
+        token = key_token(key)
+        if token is None:
+            return
+
+        if token in MODIFIER_ORDER:
+            self._held_modifiers.add(token)
+            return
+
+        chord = '+'.join([m for m in MODIFIER_ORDER if m in self._held_modifiers] + [token])
+        self._bindings.sequences.feed(chord)
+
+    def _on_key_release(self, key: Any) -> None:
+        """Raw listener callback tracking held modifiers.
+
+        Args:
+            key: Key released
+        """
+        if self.sequence_listener is not None:
+            key = self.sequence_listener.canonical(key)
+        self._held_modifiers.discard(key_token(key))
+
+    def _start_sequence_listener(self) -> None:
+        """Start the raw key listener used for key sequences."""
+        if self.sequence_listener is not None:
+            return
+
+        self._held_modifiers.clear()
+        self.sequence_listener = self.platform.events.listener(
+            self._on_key_press,
+            self._on_key_release
+        )
+        self.sequence_listener.start()
+
+    def _stop_sequence_listener(self) -> None:
+        """Stop the raw key listener used for key sequences."""
+        if self.sequence_listener is not None:
+            self.sequence_listener.stop()
+            self.sequence_listener = None
+
+    def preload_actions(self, names: Optional[List[str]] = None) -> None:
+        """Let bound actions prepare ahead of their first use (see Action.preload).
+
+        Args:
+            names: Actions to preload (every bound action if None)
+        """
+        actions = self.action_instances
+        for action_name in list(actions) if names is None else names:
+            preload = getattr(actions.get(action_name), 'preload', None)
+            if preload is None:
                 continue
+            try:
+                preload()
+            except Exception as e:
+                logger.warning(f"Failed to preload action {action_name}: {e}")
 
-            hotkey_map[key] = action
-            logger.debug(f"Mapped hotkey {key} -> {action_name}")
+    def _create_dispatcher(self) -> ActionDispatcher:
+        """Build an action dispatcher from the ``app.dispatch`` settings."""
+        return ActionDispatcher(
+            workers=self.config.get('app.dispatch.workers', 2),
+            max_queue=self.config.get('app.dispatch.queue_size', 32),
+            observer=self.metrics.observe if self.metrics is not None else None,
+            on_schedule=self.metrics.observe_schedule if self.metrics is not None else None
+        )
+
+    def _replace_dispatcher(self) -> None:
+        """Apply changed ``app.dispatch`` settings with a new dispatcher.
+
+        New work goes to the new workers right away; actions already queued
+        or running finish on the old ones, which are stopped in the
+        background.
+        """
+        old = self.dispatcher
+        self.dispatcher = self._create_dispatcher()
+        if not old.is_running():
+            return
 
-        # TODO: Add conditional (app-specific) hotkeys
-        # This will require checking active window in the action wrapper
+        self.dispatcher.start()
+        threading.Thread(target=old.stop, name="customhk-dispatch-retire", daemon=True).start()
+
+    def _start_snippets(self) -> None:
+        """Start expanding the configured snippets, or stop if there are none."""
+        automaton = self.config.bindings['snippets']
+        if automaton is None:
+            self._stop_snippets()
+            return
+
+        injection = resolve_settings(self.config.get('app.injection'))
+        if self.snippets is None:
+            self.snippets = SnippetExpander(
+                automaton, self.kb_controller, self._dispatch, injection, self.platform
+            )
+        else:
+            self.snippets.update(automaton, injection)
+        self.snippets.start()
+
+    def _stop_snippets(self) -> None:
+        """Stop the snippet expander's key listener."""
+        if self.snippets is not None:
+            self.snippets.stop()
+            self.snippets = None
+
+    def _start_window_tracking(self) -> None:
+        """Subscribe to focus changes now rather than on the first keypress."""
+        if not self.conditional.chords():
+            return
+        try:
+            WindowManager.get_context_cache().start()
+        except Exception as e:
+            logger.warning(f"Foreground window tracking unavailable: {e}")
 
-        return hotkey_map
+    def _configure_clipboard(self) -> None:
+        """Apply app.clipboard to the clipboard worker and app.clipboard_history."""
+        clipboard = self.platform.clipboard
+        if isinstance(clipboard, ClipboardWorker):
+            clipboard.configure(self.config.get('app.clipboard'))
+            if self.metrics is not None:
+                clipboard.observer = self.metrics.observe_clipboard
+        ClipboardManager.configure_history(self.config.get('app.clipboard_history'))
 
     def start(self) -> None:
         """Start listening for hotkeys."""
@@ -113,20 +1043,40 @@ class HotkeyManager:
             logger.warning("Listener already running")
             return
 
-        self.hotkey_map = self._build_hotkey_map()
+        self._bindings = self._build_bindings(self._bindings.actions)
+        self._generation += 1
+        self.hotkey_map = self._build_hotkey_map(self._bindings, self._generation)
 
-        if not self.hotkey_map:
+        if (not set(self.hotkey_map) - {self._bindings.abort}
+                and not self.sequences.sequence_count
+                and self.config.bindings['snippets'] is None):
             logger.warning("No hotkeys configured, listener not started")
             return
 
+        self.dispatcher.start()
+        self._start_window_tracking()
+        self._configure_clipboard()
+
         try:
-            self.listener = keyboard.GlobalHotKeys(self.hotkey_map)
+            self.listener = self.platform.events.hotkeys(self.hotkey_map)
             self.listener.start()
+
+            if self.sequences.sequence_count:
+                self._start_sequence_listener()
+            self._start_snippets()
+
             self.enabled = True
-            logger.info(f"Started hotkey listener with {len(self.hotkey_map)} hotkeys")
+            logger.info(
+                f"Started hotkey listener with {len(self.hotkey_map)} hotkeys "
+                f"and {self.sequences.sequence_count} sequences"
+            )
         except Exception as e:
             logger.error(f"Failed to start hotkey listener: {e}")
+            if self.listener is not None:
+                self.listener.stop()
             self.listener = None
+            self._stop_sequence_listener()
+            self._stop_snippets()
 
     def stop(self) -> None:
         """Stop listening for hotkeys."""
@@ -137,6 +1087,9 @@ class HotkeyManager:
         try:
             self.listener.stop()
             self.listener = None
+            self._stop_sequence_listener()
+            self._stop_snippets()
+            self.sequences.reset()
             self.enabled = False
             logger.info("Stopped hotkey listener")
         except Exception as e:
@@ -146,9 +1099,120 @@ class HotkeyManager:
         """Restart the hotkey listener (useful after config changes)."""
         logger.info("Restarting hotkey listener")
         self.stop()
-        self._initialize_actions()  # Reinitialize actions with new config
+        self._bindings.actions = self._initialize_actions({})  # Rebuild actions with new config
         self.start()
 
+    def reload(self, diff: Optional[ConfigDiff] = None) -> Dict[str, Any]:
+        """Apply a reloaded configuration without a gap in hotkey handling.
+
+        Only actions whose settings changed are rebuilt. New bindings are
+        built while the current ones keep serving and then swapped in with a
+        single assignment. The hotkey listener is only replaced if the set of
+        chords changed, and the new one is started before the old one stops.
+
+        Args:
+            diff: Difference returned by Config.reload() (rebuild all actions if None)
+
+        Returns:
+            Report with 'latency_ms', 'bindings_changed', 'actions_rebuilt'
+            and 'listener_replaced'
+        """
+        with self._reload_lock:
+            started = time.perf_counter()
+            current = self._bindings
+
+            if diff is not None and diff.dispatch_changed:
+                self._replace_dispatcher()
+
+            # Reuse unchanged action instances, rebuild the rest
+            reusable = {
+                name: instance for name, instance in current.actions.items()
+                if diff is not None and name not in diff.changed_actions
+            }
+            actions = self._initialize_actions(reusable)
+            rebuilt = sorted(
+                name for name in actions if actions[name] is not current.actions.get(name)
+            )
+
+            bindings = self._build_bindings(actions)
+            replace_listener = (
+                self.listener is not None
+                and bindings.listener_chords() != current.listener_chords()
+            )
+
+            old_listener = None
+            if replace_listener:
+                generation = self._generation + 1
+                hotkey_map = self._build_hotkey_map(bindings, generation)
+                new_listener = self.platform.events.hotkeys(hotkey_map)
+                new_listener.start()
+                old_listener = self.listener
+                self._bindings = bindings
+                self._generation = generation
+                self.listener = new_listener
+                self.hotkey_map = hotkey_map
+            else:
+                self._bindings = bindings
+                if self.listener is None:
+                    self.hotkey_map = self._build_hotkey_map(bindings, self._generation)
+
+            if old_listener is not None:
+                old_listener.stop()
+
+            if self.listener is not None:
+                if bindings.sequences.sequence_count:
+                    self._start_sequence_listener()
+                else:
+                    self._stop_sequence_listener()
+                self._start_snippets()
+                self._start_window_tracking()
+                self._configure_clipboard()
+                self.preload_actions(rebuilt)
+
+            report = {
+                'latency_ms': (time.perf_counter() - started) * 1000.0,
+                'bindings_changed': diff.bindings_changed if diff is not None else None,
+                'actions_rebuilt': rebuilt,
+                'listener_replaced': replace_listener,
+            }
+
+        logger.info(
+            f"Applied configuration in {report['latency_ms']:.1f} ms: "
+            f"{report['bindings_changed']} bindings changed, "
+            f"{len(rebuilt)} actions rebuilt"
+            + (", listener replaced" if replace_listener else "")
+        )
+        return report
+
+    def shutdown(self) -> None:
+        """Stop the listener and the action dispatcher."""
+        if self.listener is not None:
+            self.stop()
+        self.dispatcher.stop()
+        if self._macros:
+            from .actions.macro import cancel_all
+            cancel_all()
+        if self.registry.is_loaded('show_wizard'):
+            from .actions.wizard import stop_wizard_ui
+            stop_wizard_ui()
+        ClipboardManager.reset_history()
+        if isinstance(self.platform.clipboard, ClipboardWorker):
+            self.platform.clipboard.stop()
+
+        if self.conditional.chords():
+            try:
+                WindowManager.get_context_cache().stop()
+            except Exception as e:
+                logger.debug(f"Failed to stop foreground window tracking: {e}")
+
+    def get_dispatch_stats(self) -> Dict[str, Any]:
+        """Get action dispatcher counters.
+
+        Returns:
+            Dictionary of dispatcher statistics
+        """
+        return self.dispatcher.get_stats()
+
     def is_running(self) -> bool:
         """Check if listener is running.
 
@@ -162,10 +1226,19 @@ class HotkeyManager:
         if not self.enabled:
             self.start()
 
+    def abort(self) -> None:
+        """Stop streamed typing and cancel running bulk actions.
+
+        Safe to call from the hook thread.
+        """
+        request_abort()
+        self.dispatcher.cancel('bulk')
+
     def disable(self) -> None:
-        """Disable hotkey listening."""
+        """Disable hotkey listening and cancel running bulk actions."""
         if self.enabled:
             self.stop()
+            self.dispatcher.cancel('bulk')
 
     def toggle(self) -> bool:
         """Toggle hotkey listening on/off.
@@ -0,0 +1,125 @@
+"""Helpers for parsing and normalizing hotkey strings."""
+
+from enum import Enum
+from typing import Any, List, Optional, Tuple
+
+
+# Modifier tokens in the order they appear in a normalized chord
+MODIFIER_ORDER = ('<ctrl>', '<alt>', '<shift>', '<cmd>')
+
+# Side-specific modifier names folded onto their generic token
+MODIFIER_ALIASES = {
+    '<ctrl_l>': '<ctrl>',
+    '<ctrl_r>': '<ctrl>',
+    '<alt_l>': '<alt>',
+    '<alt_r>': '<alt>',
+    '<alt_gr>': '<alt>',
+    '<shift_l>': '<shift>',
+    '<shift_r>': '<shift>',
+    '<cmd_l>': '<cmd>',
+    '<cmd_r>': '<cmd>',
+}
+
+# Names of special keys that can be injected as ``<name>`` tokens (pynput's
+# ``Key`` members)
+SPECIAL_KEYS = frozenset(
+    ['alt', 'alt_l', 'alt_r', 'alt_gr', 'backspace', 'caps_lock', 'cmd', 'cmd_l',
+     'cmd_r', 'ctrl', 'ctrl_l', 'ctrl_r', 'delete', 'down', 'end', 'enter', 'esc',
+     'home', 'insert', 'left', 'menu', 'num_lock', 'page_down', 'page_up', 'pause',
+     'print_screen', 'right', 'scroll_lock', 'shift', 'shift_l', 'shift_r', 'space',
+     'tab', 'up', 'media_play_pause', 'media_volume_mute', 'media_volume_down',
+     'media_volume_up', 'media_previous', 'media_next']
+    + [f'f{n}' for n in range(1, 25)]
+)
+
+
+def split_chord(chord: str) -> List[str]:
+    """Split a chord string such as ``<ctrl>+<shift>+s`` into tokens.
+
+    A literal ``+`` key is written as the last token (``<ctrl>++``).
+
+    Args:
+        chord: Hotkey chord string
+
+    Returns:
+        List of lowercase tokens
+    """
+    chord = chord.strip().lower()
+    if not chord:
+        return []
+
+    if chord == '+':
+        return ['+']
+
+    trailing_plus = chord.endswith('++')
+    if trailing_plus:
+        chord = chord[:-2]
+
+    tokens = [token.strip() for token in chord.split('+') if token.strip()]
+    if trailing_plus:
+        tokens.append('+')
+    return tokens
+
+
+def normalize_chord(chord: str) -> str:
+    """Normalize a chord so equivalent spellings compare equal.
+
+    Modifiers are de-duplicated and put in a fixed order, and side-specific
+    modifiers are folded onto the generic one.
+
+    Args:
+        chord: Hotkey chord string (e.g. ``<shift>+<ctrl>+S``)
+
+    Returns:
+        Normalized chord string (e.g. ``<ctrl>+<shift>+s``)
+    """
+    modifiers, keys = parse_chord(chord)
+    return '+'.join(list(modifiers) + list(keys))
+
+
+def parse_chord(chord: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Parse a chord into its modifier and non-modifier tokens.
+
+    Args:
+        chord: Hotkey chord string
+
+    Returns:
+        Tuple of (modifiers in canonical order, other keys in given order)
+    """
+    found = set()
+    keys: List[str] = []
+
+    for token in split_chord(chord):
+        token = MODIFIER_ALIASES.get(token, token)
+        if token in MODIFIER_ORDER:
+            found.add(token)
+        elif token not in keys:
+            keys.append(token)
+
+    modifiers = tuple(m for m in MODIFIER_ORDER if m in found)
+    return modifiers, tuple(keys)
+
+
+def key_token(key: Any) -> Optional[str]:
+    """Convert a (canonical) key to a chord token.
+
+    Args:
+        key: pynput Key or KeyCode, or a chord token from a simulated source
+
+    Returns:
+        Token such as ``<ctrl>``, ``<f1>`` or ``k``, or None if unknown
+    """
+    if isinstance(key, str):
+        return MODIFIER_ALIASES.get(key, key)
+
+    if isinstance(key, Enum):  # pynput Key
+        return MODIFIER_ALIASES.get(f"<{key.name}>", f"<{key.name}>")
+
+    char = getattr(key, 'char', None)
+    if char:
+        return char.lower()
+
+    vk = getattr(key, 'vk', None)
+    if vk is not None:
+        return f"<{vk}>"
+    return None
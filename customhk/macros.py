@@ -0,0 +1,420 @@
+"""Compile the ``macros:`` section into execution plans.
+
+A macro is a list of steps::
+
+    macros:
+      copy_and_sign:
+        name: "Copy and sign"
+        steps:
+          - type: key_press
+            key: "ctrl+c"
+          - type: wait
+            duration: 0.1
+          - type: type_text
+            text: "Some text"
+
+Macros are compiled when the configuration is loaded (and stored in the
+compiled config cache). Compiling validates every step and flattens the
+steps into segments: the key events between two waits become one batch,
+injected with a single backend submission, and each segment carries the wait
+that precedes it. Invalid macros are reported as configuration warnings and
+left out.
+
+A recorded macro (see customhk.recorder) has a ``recording`` instead of
+``steps``: a ``KeyLog`` in base64, replayed with its recorded timing at
+``speed`` (``1`` is real time, ``2`` twice as fast, ``max`` without waits).
+
+Each compiled macro is registered as an action under its key in
+``macros:``, so it is bound like any other action (``action: copy_and_sign``).
+"""
+
+import base64
+import binascii
+import logging
+import struct
+import sys
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .backends.base import PRESS, RELEASE, TYPE
+from .keys import SPECIAL_KEYS, split_chord
+
+
+logger = logging.getLogger(__name__)
+
+STEP_TYPES = ('key_press', 'wait', 'type_text')
+
+# Replayed events closer together than this (after scaling) share a batch
+MIN_WAIT = 0.002
+
+# Most events injected in one batch, so long replays stay abortable
+MAX_BATCH = 512
+
+# Registry source of the actions declared for macros
+MACRO_SOURCE = 'macros'
+
+# Other spellings accepted for special keys
+KEY_ALIASES = {
+    'control': 'ctrl',
+    'return': 'enter',
+    'escape': 'esc',
+    'del': 'delete',
+    'ins': 'insert',
+    'win': 'cmd',
+    'pgup': 'page_up',
+    'pgdn': 'page_down',
+}
+
+
+def _key_token(token: str) -> str:
+    """Map one chord token to the injector's key form ('c' or '<ctrl>')."""
+    bracketed = len(token) > 2 and token[0] == '<' and token[-1] == '>'
+    name = token[1:-1] if bracketed else token
+    if len(name) == 1:
+        return name
+    name = KEY_ALIASES.get(name, name)
+    if name not in SPECIAL_KEYS:
+        raise ValueError(f"unknown key {token!r}")
+    return f"<{name}>"
+
+
+def _chord_events(chord: Any, repeat: Any) -> List[Tuple[str, str]]:
+    """Key events pressing a chord's keys in order and releasing them in reverse."""
+    if not isinstance(chord, str) or not chord.strip():
+        raise ValueError("key_press needs a 'key'")
+    if isinstance(repeat, bool) or not isinstance(repeat, int) or repeat < 1:
+        raise ValueError(f"repeat must be a positive integer, not {repeat!r}")
+
+    keys = [_key_token(token) for token in split_chord(chord)]
+    events = [(PRESS, key) for key in keys] + [(RELEASE, key) for key in reversed(keys)]
+    return events * repeat
+
+
+def parse_speed(value: Any) -> float:
+    """Validate a replay speed.
+
+    Args:
+        value: Positive number (1 is real time) or 'max'
+
+    Returns:
+        Speed factor, 0.0 meaning no waits
+
+    Raises:
+        ValueError: If the value is neither
+    """
+    if value == 'max':
+        return 0.0
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+        raise ValueError(f"speed must be a positive number or 'max', not {value!r}")
+    return float(value)
+
+
+class KeyLog:
+    """Compact log of key events with the time since the previous event.
+
+    Events are stored column-wise in arrays: the kind (one byte), an index
+    into a table of distinct keys (two bytes) and the delay before the event
+    in microseconds (four bytes), so a recording costs 7 bytes per event.
+    ``to_bytes`` writes the same arrays behind a small header, and
+    ``from_bytes`` reads them back without per-event parsing.
+    """
+
+    MAGIC = b'CHKL'
+    VERSION = 1
+    _HEADER = struct.Struct('<4sBII')
+    _KINDS = (PRESS, RELEASE)
+    _MAX_DELAY = 2 ** 32 - 1
+
+    def __init__(self) -> None:
+        self.kinds = array('B')
+        self.keys = array('H')
+        self.delays = array('I')
+        self.table: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def append(self, kind: str, key: str, delay: float) -> None:
+        """Add an event.
+
+        Args:
+            kind: PRESS or RELEASE
+            key: Key as injected ('c' or '<ctrl>')
+            delay: Seconds since the previous event
+        """
+        key_id = self._ids.get(key)
+        if key_id is None:
+            if len(self.table) >= 0xFFFF:
+                raise ValueError("too many distinct keys")
+            key_id = self._ids[key] = len(self.table)
+            self.table.append(key)
+        self.kinds.append(self._KINDS.index(kind))
+        self.keys.append(key_id)
+        self.delays.append(min(self._MAX_DELAY, max(0, round(delay * 1e6))))
+
+    def truncate(self, length: int) -> None:
+        """Drop the events after the first ``length``.
+
+        Args:
+            length: Number of events to keep
+        """
+        del self.kinds[length:], self.keys[length:], self.delays[length:]
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def __iter__(self) -> Iterator[Tuple[str, str, float]]:
+        kinds, table = self._KINDS, self.table
+        for kind, key, delay in zip(self.kinds, self.keys, self.delays):
+            yield kinds[kind], table[key], delay / 1e6
+
+    @property
+    def duration(self) -> float:
+        """Recorded time in seconds."""
+        return sum(self.delays) / 1e6
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the event arrays."""
+        return sum(a.itemsize * len(a) for a in (self.kinds, self.keys, self.delays))
+
+    def to_bytes(self) -> bytes:
+        """Serialize the log.
+
+        Returns:
+            Header, key table and the three arrays (little-endian)
+        """
+        table = '\0'.join(self.table).encode('utf-8')
+        keys, delays = self.keys, self.delays
+        if sys.byteorder == 'big':
+            keys, delays = array('H', keys), array('I', delays)
+            keys.byteswap()
+            delays.byteswap()
+        return b''.join((
+            self._HEADER.pack(self.MAGIC, self.VERSION, len(self), len(table)),
+            table, self.kinds.tobytes(), keys.tobytes(), delays.tobytes(),
+        ))
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> 'KeyLog':
+        """Read a serialized log.
+
+        Args:
+            raw: Output of to_bytes()
+
+        Returns:
+            KeyLog
+
+        Raises:
+            ValueError: If the data is not a valid log
+        """
+        size = cls._HEADER.size
+        if len(raw) < size:
+            raise ValueError("recording is truncated")
+        magic, version, count, table_size = cls._HEADER.unpack_from(raw)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError("not a recording of a supported version")
+        if len(raw) != size + table_size + count * 7:
+            raise ValueError("recording is truncated")
+
+        log = cls()
+        offset = size + table_size
+        if table_size:
+            log.table = raw[size:offset].decode('utf-8').split('\0')
+        log._ids = {key: index for index, key in enumerate(log.table)}
+        log.kinds.frombytes(raw[offset:offset + count])
+        log.keys.frombytes(raw[offset + count:offset + count * 3])
+        log.delays.frombytes(raw[offset + count * 3:])
+        if sys.byteorder == 'big':
+            log.keys.byteswap()
+            log.delays.byteswap()
+        if (log.kinds and max(log.kinds) >= len(cls._KINDS)
+                or log.keys and max(log.keys) >= len(log.table)):
+            raise ValueError("recording is corrupt")
+        return log
+
+    def encode(self) -> str:
+        """Serialize the log as base64 text for the config file."""
+        return base64.b64encode(self.to_bytes()).decode('ascii')
+
+    @classmethod
+    def decode(cls, text: str) -> 'KeyLog':
+        """Read a log from base64 text.
+
+        Raises:
+            ValueError: If the text is not a valid log
+        """
+        try:
+            raw = base64.b64decode(''.join(text.split()), validate=True)
+        except (binascii.Error, ValueError) as e:
+            raise ValueError(f"recording is not valid base64: {e}") from None
+        return cls.from_bytes(raw)
+
+    def segments(self, speed: float = 1.0) -> 'RecordedSegments':
+        """Group the events into timed batches for playback.
+
+        Args:
+            speed: Speed factor (see parse_speed); 0.0 replays without waits
+
+        Returns:
+            Sequence of (wait, key events, key presses) segments
+        """
+        return RecordedSegments(self, speed)
+
+
+class RecordedSegments(Sequence):
+    """Playback segments of a KeyLog, built on access.
+
+    Events whose scaled delay is under MIN_WAIT join the current batch (up
+    to MAX_BATCH events). A segment's wait is the scaled time since the
+    previous segment began, so playback follows the recorded timeline.
+    Only the segment boundaries are stored.
+    """
+
+    def __init__(self, log: KeyLog, speed: float):
+        self.log = log
+        self.starts = array('I')
+        self.waits = array('d')
+        scale = 1e-6 / speed if speed else 0.0
+        pending = 0.0
+        size = MAX_BATCH
+        for index, delay in enumerate(log.delays):
+            pending += delay * scale
+            if size >= MAX_BATCH or pending >= MIN_WAIT:
+                self.starts.append(index)
+                self.waits.append(pending)
+                pending = 0.0
+                size = 0
+            size += 1
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, index: int) -> Tuple[float, Tuple[Tuple[str, str], ...], int]:
+        if not 0 <= index < len(self.starts):
+            raise IndexError(index)
+        start = self.starts[index]
+        end = self.starts[index + 1] if index + 1 < len(self.starts) else len(self.log)
+        kinds, table = KeyLog._KINDS, self.log.table
+        events = tuple(
+            (kinds[kind], table[key])
+            for kind, key in zip(self.log.kinds[start:end], self.log.keys[start:end])
+        )
+        return self.waits[index], events, sum(1 for kind, _ in events if kind == PRESS)
+
+
+def compile_macro(spec: Any) -> Dict[str, Any]:
+    """Validate a macro and flatten it into segments.
+
+    Args:
+        spec: One entry of ``macros:``
+
+    Returns:
+        Plan with 'title', 'description', 'priority', 'speed' (see
+        parse_speed), 'steps' (number of configured steps or recorded
+        events), 'duration' (total wait in seconds at speed 1) and
+        'segments': tuple of (wait before, key events, characters) where
+        wait is in seconds and the events are (PRESS | RELEASE | TYPE,
+        value) tuples. Recorded macros have no segments but 'recording'
+        (the serialized KeyLog) and 'timeline' True: their waits count
+        from the start of the previous segment rather than its end
+
+    Raises:
+        ValueError: If the macro or one of its steps is invalid
+    """
+    if not isinstance(spec, dict):
+        raise ValueError("must be a mapping with 'steps'")
+    header = {
+        'title': str(spec.get('name') or ''),
+        'description': str(spec.get('description') or ''),
+        'priority': spec.get('priority'),
+        'speed': parse_speed(spec.get('speed', 1)),
+    }
+
+    recording = spec.get('recording')
+    if recording is not None:
+        if not isinstance(recording, str):
+            raise ValueError("recording must be base64 text")
+        log = KeyLog.decode(recording)
+        if not len(log):
+            raise ValueError("recording has no key events")
+        # Kept serialized; the action builds its segments when created
+        return dict(
+            header, steps=len(log), duration=log.duration, segments=(),
+            recording=log.to_bytes(), timeline=True,
+        )
+
+    steps = spec.get('steps')
+    if not isinstance(steps, list) or not steps:
+        raise ValueError("needs a non-empty 'steps' list")
+
+    segments = []
+    wait = 0.0
+    duration = 0.0
+    events: List[Tuple[str, str]] = []
+    chars = 0
+
+    for number, step in enumerate(steps, 1):
+        try:
+            if not isinstance(step, dict):
+                raise ValueError("must be a mapping with a 'type'")
+            kind = step.get('type')
+            if kind == 'wait':
+                seconds = step.get('duration')
+                if (isinstance(seconds, bool) or not isinstance(seconds, (int, float))
+                        or seconds < 0):
+                    raise ValueError(f"duration must be a number of seconds, not {seconds!r}")
+                if events:
+                    segments.append((wait, tuple(events), chars))
+                    events, chars, wait = [], 0, 0.0
+                wait += float(seconds)
+                duration += float(seconds)
+            elif kind == 'key_press':
+                repeat = step.get('repeat', 1)
+                events.extend(_chord_events(step.get('key'), repeat))
+                chars += repeat
+            elif kind == 'type_text':
+                text = step.get('text')
+                if not isinstance(text, str):
+                    raise ValueError("type_text needs a 'text' string")
+                if not text:
+                    continue
+                if events and events[-1][0] == TYPE:
+                    events[-1] = (TYPE, events[-1][1] + text)
+                else:
+                    events.append((TYPE, text))
+                chars += len(text)
+            else:
+                raise ValueError(f"unknown type {kind!r} (expected one of {', '.join(STEP_TYPES)})")
+        except ValueError as e:
+            raise ValueError(f"step {number}: {e}") from None
+
+    if events:
+        segments.append((wait, tuple(events), chars))
+    if not segments:
+        raise ValueError("has no key_press or type_text steps")
+
+    return dict(header, steps=len(steps), duration=duration, segments=tuple(segments),
+                recording=None, timeline=False)
+
+
+def compile_macros(macros: Any) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+    """Compile the ``macros:`` section.
+
+    Args:
+        macros: Raw ``macros:`` value (None when the section is empty)
+
+    Returns:
+        (macro name -> plan, warnings for macros that were left out)
+    """
+    if macros is None:
+        return {}, []
+    if not isinstance(macros, dict):
+        return {}, [f"Invalid macros section (expected a mapping): {macros!r}"]
+
+    plans: Dict[str, Dict[str, Any]] = {}
+    warnings: List[str] = []
+    for name, spec in macros.items():
+        try:
+            plans[str(name)] = compile_macro(spec)
+        except ValueError as e:
+            warnings.append(f"Macro '{name}' ignored: {e}")
+    return plans, warnings
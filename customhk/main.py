@@ -1,15 +1,19 @@
 """Main application entry point for CustomHK."""
 
+import argparse
 import logging
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, List, Optional
 
-from .config import Config
-from .hotkey_manager import HotkeyManager
-from .tray_icon import TrayIconManager
-import customhk.actions  # Import to register all actions
-from .utils import __init__ as utils_init  # Create utils __init__.py
+from . import profiling
+
+if TYPE_CHECKING:
+    from .config import Config
+    from .config_watcher import ConfigWatcher
+    from .hotkey_manager import HotkeyManager
+    from .metrics import MetricsServer
+    from .tray_icon import TrayIconManager
 
 
 logger = logging.getLogger(__name__)
@@ -24,9 +28,11 @@ class CustomHKApp:
         Args:
             config_path: Optional path to configuration file
         """
-        self.config: Optional[Config] = None
-        self.hotkey_manager: Optional[HotkeyManager] = None
-        self.tray_manager: Optional[TrayIconManager] = None
+        self.config: Optional['Config'] = None
+        self.hotkey_manager: Optional['HotkeyManager'] = None
+        self.tray_manager: Optional['TrayIconManager'] = None
+        self.config_watcher: Optional['ConfigWatcher'] = None
+        self.metrics_server: Optional['MetricsServer'] = None
         self.config_path = config_path
 
     def setup_logging(self) -> None:
@@ -53,8 +59,9 @@ class CustomHKApp:
             file_handler.setLevel(logging.DEBUG)
             file_handler.setFormatter(detailed_formatter)
 
-        # Console handler (simple)
-        console_handler = logging.StreamHandler(sys.stdout)
+        # Console handler (simple). While profiling, stdout carries the report.
+        console_stream = sys.stderr if profiling.get_profiler() else sys.stdout
+        console_handler = logging.StreamHandler(console_stream)
         console_handler.setLevel(numeric_level)
         console_handler.setFormatter(simple_formatter)
 
@@ -80,22 +87,45 @@ class CustomHKApp:
         try:
             # Load configuration
             logger.info("Loading configuration...")
-            self.config = Config(self.config_path)
+            with profiling.phase('config'):
+                from .config import Config
+                self.config = Config(self.config_path)
 
             # Setup logging
-            self.setup_logging()
+            with profiling.phase('logging'):
+                self.setup_logging()
 
             # Initialize hotkey manager
             logger.info("Initializing hotkey manager...")
-            self.hotkey_manager = HotkeyManager(self.config)
+            with profiling.phase('hotkey_manager'):
+                from .hotkey_manager import HotkeyManager
+                self.hotkey_manager = HotkeyManager(self.config)
 
             # Initialize tray icon manager
             logger.info("Initializing tray icon...")
-            self.tray_manager = TrayIconManager(
-                self.config,
-                self.hotkey_manager,
-                on_exit=self.shutdown
-            )
+            with profiling.phase('tray_icon'):
+                from .tray_icon import TrayIconManager
+                self.tray_manager = TrayIconManager(
+                    self.config,
+                    self.hotkey_manager,
+                    on_exit=self.shutdown
+                )
+
+            # Reload automatically when the config files change
+            if self.config.get('app.watch_config', True):
+                from .config_watcher import ConfigWatcher
+                self.config_watcher = ConfigWatcher(
+                    lambda: self.config.source_paths,
+                    self.tray_manager.reload_config,
+                    debounce=self.config.get('app.watch_debounce', 0.3),
+                    poll_interval=self.config.get('app.watch_poll_interval', 1.0)
+                )
+
+            # Serve statistics locally if a port is configured
+            metrics_port = self.config.get('app.metrics.port', 0)
+            if metrics_port and self.hotkey_manager.metrics is not None:
+                from .metrics import MetricsServer
+                self.metrics_server = MetricsServer(self.hotkey_manager.metrics, int(metrics_port))
 
             logger.info("Application initialized successfully")
 
@@ -109,6 +139,17 @@ class CustomHKApp:
             # Start hotkey listener
             logger.info("Starting hotkey listener...")
             self.hotkey_manager.start()
+            self.hotkey_manager.preload_actions()
+
+            if self.config_watcher:
+                self.config_watcher.start()
+
+            if self.metrics_server:
+                try:
+                    self.metrics_server.start()
+                except OSError as e:
+                    logger.error(f"Cannot serve statistics on port {self.metrics_server.port}: {e}")
+                    self.metrics_server = None
 
             # Start tray icon (blocking)
             logger.info("Starting system tray icon...")
@@ -127,17 +168,96 @@ class CustomHKApp:
         """Gracefully shutdown the application."""
         logger.info("Shutting down CustomHK...")
 
+        if self.config_watcher:
+            self.config_watcher.stop()
+
         if self.hotkey_manager:
-            self.hotkey_manager.stop()
+            self.hotkey_manager.shutdown()
+
+        if self.metrics_server:
+            self.metrics_server.stop()
 
         if self.tray_manager:
+            if self.config.get('app.metrics.file'):
+                self.tray_manager.export_statistics()
             self.tray_manager.stop()
 
         logger.info("CustomHK shutdown complete")
 
+    def profile_startup(
+        self,
+        output: Optional[Path] = None,
+        budget_ms: Optional[float] = None
+    ) -> int:
+        """Start up to the point where hotkeys work, report timings and exit.
+
+        The tray icon is prepared (image and menu) but not shown, and the
+        config watcher is not started.
+
+        Args:
+            output: Report file (stdout if None)
+            budget_ms: Fail if startup takes longer than this
+
+        Returns:
+            Process exit code: 0, or 1 if the budget was exceeded
+        """
+        profiler = profiling.get_profiler()
+
+        self.initialize()
+        with profiling.phase('hotkey_listener'):
+            self.hotkey_manager.start()
+        profiler.mark('first_hotkey')
+
+        with profiling.phase('tray_menu'):
+            self.tray_manager.preload()
+
+        profiler.stop()
+        report = profiler.write(output, budget_ms)
+        self.hotkey_manager.shutdown()
+
+        logger.info(
+            f"Startup: {report['total_ms']:.1f} ms total, first hotkey after "
+            f"{report['first_hotkey_ms']:.1f} ms, peak RSS {report['memory']['peak_rss_kb']} KiB"
+        )
+        if report['within_budget'] is False:
+            logger.error(f"Startup took {report['total_ms']:.1f} ms, budget is {budget_ms} ms")
+            return 1
+        return 0
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments.
+
+    Args:
+        argv: Arguments (sys.argv[1:] if None)
+
+    Returns:
+        Parsed arguments
+    """
+    parser = argparse.ArgumentParser(prog='customhk', description="Custom hotkey automation tool")
+    parser.add_argument('config', nargs='?', type=Path, help="Path to config.yaml")
+    parser.add_argument(
+        '--profile-startup', action='store_true',
+        help="Start up, print a JSON startup profile and exit"
+    )
+    parser.add_argument(
+        '--profile-output', type=Path, metavar='FILE',
+        help="Write the startup profile to FILE instead of stdout"
+    )
+    parser.add_argument(
+        '--startup-budget', type=float, metavar='MS',
+        help="With --profile-startup, exit with status 1 if startup exceeds MS milliseconds"
+    )
+    return parser.parse_args(argv)
+
 
 def main() -> None:
     """Main entry point for the application."""
+    args = parse_args()
+
+    if args.profile_startup:
+        profiling.StartupProfiler().start()
+
     # Initial basic logging setup
     logging.basicConfig(
         level=logging.INFO,
@@ -146,16 +266,16 @@ def main() -> None:
 
     logger.info("Starting CustomHK...")
 
-    # Parse command line arguments
-    config_path = None
-    if len(sys.argv) > 1:
-        config_path = Path(sys.argv[1])
-        if not config_path.exists():
-            logger.error(f"Configuration file not found: {config_path}")
-            sys.exit(1)
+    config_path = args.config
+    if config_path is not None and not config_path.exists():
+        logger.error(f"Configuration file not found: {config_path}")
+        sys.exit(1)
 
     # Create and run application
     app = CustomHKApp(config_path)
+    if args.profile_startup:
+        sys.exit(app.profile_startup(args.profile_output, args.startup_budget))
+
     app.initialize()
     app.run()
 
@@ -0,0 +1,559 @@
+"""Per-action and per-hotkey statistics.
+
+For every action and every hotkey the dispatcher records how long the press
+waited for a worker, how long the action ran, how many characters it
+injected and whether it failed, and the scheduler reports every decision it
+takes (preemptions, pauses, cancellations) with the time a preempted action
+took to reach a checkpoint. The clipboard worker reports each clipboard
+request with its outcome, retries and latency. Each histogram has a fixed set of
+logarithmic buckets, so memory stays constant no matter how long the
+application runs.
+
+Actions report injected characters and failures through ``note_injected``
+and ``note_failure``; both write to a per-thread scratch record that the
+dispatcher collects once the action returns. The statistics are shown in the
+tray's "Statistics" menu and can be exported as JSON or OpenMetrics text, to
+a file or over a local HTTP endpoint (``app.metrics``).
+"""
+
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# 100 us .. ~105 s, doubling
+TIME_BOUNDS = tuple(0.0001 * 2 ** i for i in range(21))
+
+# 1 .. 65536 characters, doubling
+CHAR_BOUNDS = tuple(float(2 ** i) for i in range(17))
+
+OPENMETRICS_CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+_scratch = threading.local()
+
+
+def note_injected(count: int) -> None:
+    """Count characters or keys injected by the action running on this thread.
+
+    Args:
+        count: Number of characters or keys
+    """
+    _scratch.chars = getattr(_scratch, 'chars', 0) + count
+
+
+def note_failure() -> None:
+    """Mark the action running on this thread as failed."""
+    _scratch.failed = True
+
+
+def swap_scratch(record: tuple = (0, False)) -> tuple:
+    """Replace this thread's scratch record.
+
+    A worker running a preempting action inline saves the paused action's
+    record this way and puts it back afterwards, so neither is charged for
+    the other's characters or failure.
+
+    Args:
+        record: (characters injected, failed) to install
+
+    Returns:
+        The record that was replaced
+    """
+    previous = (getattr(_scratch, 'chars', 0), getattr(_scratch, 'failed', False))
+    _scratch.chars, _scratch.failed = record
+    return previous
+
+
+def _take_scratch() -> tuple:
+    """Get and clear this thread's scratch record.
+
+    Returns:
+        (characters injected, failed)
+    """
+    chars = getattr(_scratch, 'chars', 0)
+    failed = getattr(_scratch, 'failed', False)
+    _scratch.chars = 0
+    _scratch.failed = False
+    return chars, failed
+
+
+class Histogram:
+    """Histogram with fixed buckets."""
+
+    __slots__ = ('bounds', 'counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self, bounds: Sequence[float]):
+        """Initialize an empty histogram.
+
+        Args:
+            bounds: Ascending bucket upper bounds; larger values go to an
+                overflow bucket
+        """
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add a value.
+
+        Args:
+            value: Observed value
+        """
+        self.counts[bisect_left(self.bounds, value)] += 1
+        if not self.count or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += 1
+        self.total += value
+
+    def percentile(self, fraction: float) -> float:
+        """Estimate a percentile.
+
+        Args:
+            fraction: Percentile as a fraction (0.99 for p99)
+
+        Returns:
+            Upper bound of the bucket holding the percentile (capped at the
+            largest value seen), or 0.0 if empty
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, int(fraction * self.count + 0.5))
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= rank:
+                if index < len(self.bounds):
+                    return min(self.bounds[index], self.max)
+                return self.max
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summarize the histogram.
+
+        Returns:
+            Dictionary with count, sum, min, max, mean, p50, p90 and p99
+        """
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'min': self.min,
+            'max': self.max,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.percentile(0.5),
+            'p90': self.percentile(0.9),
+            'p99': self.percentile(0.99),
+        }
+
+
+class BindingMetrics:
+    """Statistics for one action or hotkey."""
+
+    __slots__ = ('runs', 'failures', 'wait', 'run', 'chars')
+
+    def __init__(self) -> None:
+        self.runs = 0
+        self.failures = 0
+        self.wait = Histogram(TIME_BOUNDS)
+        self.run = Histogram(TIME_BOUNDS)
+        self.chars = Histogram(CHAR_BOUNDS)
+
+    def record(self, wait: float, run: float, chars: int, failed: bool) -> None:
+        self.runs += 1
+        if failed:
+            self.failures += 1
+        self.wait.observe(wait)
+        self.run.observe(run)
+        self.chars.observe(chars)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'runs': self.runs,
+            'failures': self.failures,
+            'wait_seconds': self.wait.to_dict(),
+            'run_seconds': self.run.to_dict(),
+            'chars_injected': self.chars.to_dict(),
+        }
+
+
+def _escape_label(value: str) -> str:
+    """Escape a label value for the OpenMetrics text format."""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_bound(bound: float) -> str:
+    return f"{bound:.6g}"
+
+
+def _braces(labels: str) -> str:
+    return f"{{{labels}}}" if labels else ""
+
+
+def _histogram_lines(name: str, labels: str, histogram: Histogram) -> List[str]:
+    """Render one labelled histogram as OpenMetrics bucket, sum and count lines."""
+    lines = []
+    bucket_labels = f"{labels}," if labels else ""
+    cumulative = 0
+    for bound, bucket in zip(histogram.bounds, histogram.counts):
+        cumulative += bucket
+        lines.append(f'{name}_bucket{{{bucket_labels}le="{_format_bound(bound)}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{{bucket_labels}le="+Inf"}} {histogram.count}')
+    lines.append(f"{name}_sum{_braces(labels)} {histogram.total:.9g}")
+    lines.append(f"{name}_count{_braces(labels)} {histogram.count}")
+    return lines
+
+
+class ActionMetrics:
+    """Statistics for every action and hotkey, fed by the dispatcher."""
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        self.actions: Dict[str, BindingMetrics] = {}
+        self.hotkeys: Dict[str, BindingMetrics] = {}
+        self.decisions: Dict[Tuple[str, str], int] = {}  # (decision, priority) -> count
+        self.preemption_latency = Histogram(TIME_BOUNDS)
+        self.paused = Histogram(TIME_BOUNDS)
+        self.clipboard: Dict[Tuple[str, str], int] = {}  # (operation, outcome) -> count
+        self.clipboard_busy = 0
+        self.clipboard_latency = Histogram(TIME_BOUNDS)
+        self.since = time.time()
+        self._lock = threading.Lock()
+
+    def observe(
+        self,
+        name: str,
+        trigger: Optional[str],
+        enqueued_at: float,
+        started_at: float,
+        finished_at: float
+    ) -> None:
+        """Record one action run. Used as the dispatcher observer.
+
+        Collects the characters and failure noted by the action on this
+        thread while it ran.
+
+        Args:
+            name: Action name
+            trigger: Hotkey that triggered the action, if known
+            enqueued_at: When the press was queued (perf_counter)
+            started_at: When the action started
+            finished_at: When the action returned
+        """
+        chars, failed = _take_scratch()
+        wait = started_at - enqueued_at
+        run = finished_at - started_at
+        with self._lock:
+            stats = self.actions.get(name)
+            if stats is None:
+                stats = self.actions[name] = BindingMetrics()
+            stats.record(wait, run, chars, failed)
+
+            if trigger:
+                stats = self.hotkeys.get(trigger)
+                if stats is None:
+                    stats = self.hotkeys[trigger] = BindingMetrics()
+                stats.record(wait, run, chars, failed)
+
+    def observe_schedule(
+        self,
+        decision: str,
+        name: str,
+        priority: str,
+        seconds: Optional[float] = None
+    ) -> None:
+        """Record one scheduling decision. Used as the dispatcher's on_schedule.
+
+        Args:
+            decision: 'preempt', 'paused', 'resumed', 'inline', 'cancelled'
+                or 'dropped'
+            name: Action the decision applies to
+            priority: Its priority class
+            seconds: Preemption latency for 'paused', time paused for 'resumed'
+        """
+        with self._lock:
+            key = (decision, priority)
+            self.decisions[key] = self.decisions.get(key, 0) + 1
+            if seconds is not None:
+                if decision == 'paused':
+                    self.preemption_latency.observe(seconds)
+                elif decision == 'resumed':
+                    self.paused.observe(seconds)
+
+    def observe_clipboard(
+        self,
+        operation: str,
+        outcome: str,
+        attempts: int,
+        seconds: float
+    ) -> None:
+        """Record one clipboard request. Used as the clipboard worker's observer.
+
+        Args:
+            operation: 'get_text', 'set_text', 'save' or 'restore'
+            outcome: 'ok', 'retried', 'failed', 'expired', 'timeout' or 'error'
+            attempts: Times the clipboard was tried
+            seconds: Time from request to completion
+        """
+        with self._lock:
+            key = (operation, outcome)
+            self.clipboard[key] = self.clipboard.get(key, 0) + 1
+            if outcome == 'retried':
+                self.clipboard_busy += attempts - 1
+            elif outcome == 'failed':
+                self.clipboard_busy += attempts
+            self.clipboard_latency.observe(seconds)
+
+    def reset(self) -> None:
+        """Discard all statistics."""
+        with self._lock:
+            self.actions.clear()
+            self.hotkeys.clear()
+            self.decisions.clear()
+            self.preemption_latency = Histogram(TIME_BOUNDS)
+            self.paused = Histogram(TIME_BOUNDS)
+            self.clipboard.clear()
+            self.clipboard_busy = 0
+            self.clipboard_latency = Histogram(TIME_BOUNDS)
+            self.since = time.time()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get all statistics.
+
+        Returns:
+            JSON-serializable dictionary (times in seconds)
+        """
+        with self._lock:
+            return {
+                'since': self.since,
+                'actions': {name: stats.to_dict() for name, stats in self.actions.items()},
+                'hotkeys': {key: stats.to_dict() for key, stats in self.hotkeys.items()},
+                'scheduler': {
+                    'decisions': [
+                        {'decision': decision, 'priority': priority, 'count': count}
+                        for (decision, priority), count in sorted(self.decisions.items())
+                    ],
+                    'preemption_latency_seconds': self.preemption_latency.to_dict(),
+                    'paused_seconds': self.paused.to_dict(),
+                },
+                'clipboard': {
+                    'requests': [
+                        {'operation': operation, 'outcome': outcome, 'count': count}
+                        for (operation, outcome), count in sorted(self.clipboard.items())
+                    ],
+                    'busy': self.clipboard_busy,
+                    'latency_seconds': self.clipboard_latency.to_dict(),
+                },
+            }
+
+    def to_json(self) -> str:
+        """Export the statistics as JSON."""
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_openmetrics(self) -> str:
+        """Export the statistics in the OpenMetrics text format.
+
+        Returns:
+            Exposition text ending with ``# EOF``
+        """
+        lines: List[str] = []
+        with self._lock:
+            for kind, label, table in (
+                ('action', 'action', self.actions),
+                ('hotkey', 'hotkey', self.hotkeys),
+            ):
+                rows = [(f'{label}="{_escape_label(key)}"', stats) for key, stats in table.items()]
+                prefix = f"customhk_{kind}"
+
+                for metric, attribute in (('runs', 'runs'), ('failures', 'failures')):
+                    lines.append(f"# TYPE {prefix}_{metric} counter")
+                    for labels, stats in rows:
+                        value = getattr(stats, attribute)
+                        lines.append(f"{prefix}_{metric}_total{{{labels}}} {value}")
+
+                for metric, attribute, unit in (
+                    ('wait_seconds', 'wait', 'seconds'),
+                    ('run_seconds', 'run', 'seconds'),
+                    ('chars_injected', 'chars', None),
+                ):
+                    lines.append(f"# TYPE {prefix}_{metric} histogram")
+                    if unit:
+                        lines.append(f"# UNIT {prefix}_{metric} {unit}")
+                    for labels, stats in rows:
+                        histogram = getattr(stats, attribute)
+                        lines.extend(_histogram_lines(f"{prefix}_{metric}", labels, histogram))
+
+            lines.append("# TYPE customhk_scheduler_decisions counter")
+            for (decision, priority), count in sorted(self.decisions.items()):
+                lines.append(
+                    'customhk_scheduler_decisions_total'
+                    f'{{decision="{decision}",priority="{priority}"}} {count}'
+                )
+            for metric, histogram in (
+                ('preemption_latency_seconds', self.preemption_latency),
+                ('paused_seconds', self.paused),
+            ):
+                lines.append(f"# TYPE customhk_scheduler_{metric} histogram")
+                lines.append(f"# UNIT customhk_scheduler_{metric} seconds")
+                lines.extend(_histogram_lines(f"customhk_scheduler_{metric}", "", histogram))
+
+            lines.append("# TYPE customhk_clipboard_requests counter")
+            for (operation, outcome), count in sorted(self.clipboard.items()):
+                lines.append(
+                    'customhk_clipboard_requests_total'
+                    f'{{operation="{operation}",outcome="{outcome}"}} {count}'
+                )
+            lines.append("# TYPE customhk_clipboard_busy counter")
+            lines.append(f"customhk_clipboard_busy_total {self.clipboard_busy}")
+            lines.append("# TYPE customhk_clipboard_latency_seconds histogram")
+            lines.append("# UNIT customhk_clipboard_latency_seconds seconds")
+            lines.extend(_histogram_lines(
+                "customhk_clipboard_latency_seconds", "", self.clipboard_latency
+            ))
+        lines.append("# EOF")
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: Path) -> None:
+        """Write the statistics to a file.
+
+        Args:
+            path: Destination; ``.prom`` and ``.txt`` files get OpenMetrics
+                text, anything else JSON
+        """
+        path = Path(path).expanduser()
+        text = self.to_openmetrics() if path.suffix in ('.prom', '.txt') else self.to_json()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding='utf-8')
+        logger.info(f"Statistics written to {path}")
+
+    def summary(self, limit: int = 10) -> List[str]:
+        """Describe the slowest hotkeys in one line each.
+
+        Args:
+            limit: Maximum number of lines
+
+        Returns:
+            Lines such as ``<alt>+2: 14 runs, p50 3.1 ms, p99 41.0 ms, ...``, slowest
+            p99 first, plus a preemption line once an action was preempted
+            and a clipboard line once the clipboard was found busy
+        """
+        with self._lock:
+            rows = sorted(
+                self.hotkeys.items() or self.actions.items(),
+                key=lambda item: item[1].run.percentile(0.99),
+                reverse=True
+            )[:limit]
+            lines = []
+            for key, stats in rows:
+                line = (
+                    f"{key}: {stats.runs} runs, p50 {stats.run.percentile(0.5) * 1000:.1f} ms, "
+                    f"p99 {stats.run.percentile(0.99) * 1000:.1f} ms, "
+                    f"wait p99 {stats.wait.percentile(0.99) * 1000:.1f} ms"
+                )
+                if stats.failures:
+                    line += f", {stats.failures} failed"
+                lines.append(line)
+            if self.preemption_latency.count:
+                lines.append(
+                    f"Preempted {self.preemption_latency.count} times, "
+                    f"p99 {self.preemption_latency.percentile(0.99) * 1000:.1f} ms to pause"
+                )
+            if self.clipboard_busy:
+                gave_up = sum(
+                    count for (_, outcome), count in self.clipboard.items()
+                    if outcome in ('failed', 'expired', 'timeout')
+                )
+                lines.append(
+                    f"Clipboard busy {self.clipboard_busy} times, {gave_up} requests gave up"
+                )
+            return lines
+
+
+class MetricsServer:
+    """Serves the statistics on a local HTTP port.
+
+    ``GET /metrics`` returns OpenMetrics text and ``GET /metrics.json`` JSON.
+    The server only listens on the loopback interface.
+    """
+
+    def __init__(self, metrics: ActionMetrics, port: int, host: str = '127.0.0.1'):
+        """Initialize the server.
+
+        Args:
+            metrics: Statistics to serve
+            port: TCP port (0 picks a free one)
+            host: Interface to listen on
+        """
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start serving in a background thread."""
+        if self._server is not None:
+            return
+
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split('?', 1)[0]
+                if path == '/metrics':
+                    body, content_type = metrics.to_openmetrics(), OPENMETRICS_CONTENT_TYPE
+                elif path == '/metrics.json':
+                    body, content_type = metrics.to_json(), 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                payload = body.encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                logger.debug(f"metrics: {format % args}")
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="customhk-metrics", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Serving statistics on http://{self.host}:{self.port}/metrics")
+
+    def stop(self) -> None:
+        """Stop serving."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        self._thread = None
+
+
+_metrics = ActionMetrics()
+
+
+def get_metrics() -> ActionMetrics:
+    """Get the process-wide statistics.
+
+    Returns:
+        ActionMetrics instance
+    """
+    return _metrics
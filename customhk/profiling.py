@@ -0,0 +1,246 @@
+"""Startup profiling (``customhk --profile-startup``).
+
+Records per-phase wall time, per-module import time, per-action construction
+time and peak memory while the application starts, and produces a JSON report
+that release checks can compare against a startup budget.
+
+The hooks in the startup path (``phase`` and ``record_action``) do nothing
+unless a profiler is active, so they cost a function call in normal runs.
+"""
+
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+_active: Optional['StartupProfiler'] = None
+
+
+class _ImportTimer:
+    """Meta path finder that times module execution.
+
+    It finds nothing itself: it asks the finders behind it for the spec and
+    wraps the loader's ``exec_module`` to measure inclusive and self time.
+    """
+
+    def __init__(self) -> None:
+        self.records: Dict[str, List[float]] = {}  # module -> [inclusive, self]
+        self._stack: List[List[float]] = []  # [start, time spent in children]
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+
+        loader = spec.loader
+        # Built-in and frozen modules are loaded by shared classes; leave
+        # them alone and only time per-module loader instances.
+        if loader is None or isinstance(loader, type) or not hasattr(loader, 'exec_module'):
+            return spec
+
+        exec_module = loader.exec_module
+
+        def timed_exec_module(module):
+            frame = [time.perf_counter(), 0.0]
+            self._stack.append(frame)
+            try:
+                exec_module(module)
+            finally:
+                self._stack.pop()
+                elapsed = time.perf_counter() - frame[0]
+                self.records[fullname] = [elapsed, elapsed - frame[1]]
+                if self._stack:
+                    self._stack[-1][1] += elapsed
+
+        loader.exec_module = timed_exec_module
+        return spec
+
+
+def _peak_rss_kb() -> Optional[int]:
+    """Get the peak resident set size of this process.
+
+    Returns:
+        Peak RSS in KiB, or None if it cannot be determined
+    """
+    if sys.platform == 'win32':
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [
+                ('cb', wintypes.DWORD),
+                ('PageFaultCount', wintypes.DWORD),
+                ('PeakWorkingSetSize', ctypes.c_size_t),
+                ('WorkingSetSize', ctypes.c_size_t),
+                ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                ('PagefileUsage', ctypes.c_size_t),
+                ('PeakPagefileUsage', ctypes.c_size_t),
+            ]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(
+            process, ctypes.byref(counters), counters.cb
+        ):
+            return None
+        return counters.PeakWorkingSetSize // 1024
+
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+class StartupProfiler:
+    """Collects startup measurements."""
+
+    def __init__(self) -> None:
+        """Initialize the profiler (call start() to begin recording)."""
+        self.started = 0.0
+        self.phases: List[Dict[str, Any]] = []
+        self.actions: List[Dict[str, Any]] = []
+        self.preloaded: List[str] = []
+        self.marks: Dict[str, float] = {}
+        self._imports = _ImportTimer()
+
+    def start(self) -> None:
+        """Start recording and make this the active profiler."""
+        global _active
+        self.started = time.perf_counter()
+        self.preloaded = sorted(sys.modules)
+        sys.meta_path.insert(0, self._imports)
+        _active = self
+
+    def stop(self) -> None:
+        """Stop recording."""
+        global _active
+        if self._imports in sys.meta_path:
+            sys.meta_path.remove(self._imports)
+        if _active is self:
+            _active = None
+
+    def mark(self, name: str) -> None:
+        """Record a point in time, such as the first hotkey becoming active.
+
+        Args:
+            name: Mark name (reported as ``<name>_ms``)
+        """
+        self.marks[name] = round((time.perf_counter() - self.started) * 1000, 3)
+
+    def report(self, budget_ms: Optional[float] = None) -> Dict[str, Any]:
+        """Build the report.
+
+        Args:
+            budget_ms: Startup budget to check the total against
+
+        Returns:
+            JSON-serializable report
+        """
+        total_ms = (time.perf_counter() - self.started) * 1000
+        imports = sorted(
+            (
+                {'module': name, 'ms': round(inclusive * 1000, 3),
+                 'self_ms': round(own * 1000, 3)}
+                for name, (inclusive, own) in self._imports.records.items()
+            ),
+            key=lambda record: record['self_ms'],
+            reverse=True
+        )
+        report = {
+            'total_ms': round(total_ms, 3),
+            'budget_ms': budget_ms,
+            'within_budget': None if budget_ms is None else total_ms <= budget_ms,
+            'phases': self.phases,
+            'actions': self.actions,
+            'imports': imports,
+            'preloaded_modules': len(self.preloaded),
+            'memory': {'peak_rss_kb': _peak_rss_kb()},
+            'python': sys.version.split()[0],
+            'platform': sys.platform,
+            'pid': os.getpid(),
+        }
+        report.update((f"{name}_ms", value) for name, value in self.marks.items())
+        return report
+
+    def write(self, output: Optional[Path], budget_ms: Optional[float] = None) -> Dict[str, Any]:
+        """Write the report as JSON to a file, or to stdout.
+
+        Args:
+            output: Destination file, or None for stdout
+            budget_ms: Startup budget to check the total against
+
+        Returns:
+            The report
+        """
+        report = self.report(budget_ms)
+        text = json.dumps(report, indent=2)
+        if output is None:
+            print(text)
+        else:
+            Path(output).write_text(text + '\n', encoding='utf-8')
+            logger.info(f"Startup profile written to {output}")
+        return report
+
+
+def get_profiler() -> Optional[StartupProfiler]:
+    """Get the active profiler.
+
+    Returns:
+        Active StartupProfiler or None
+    """
+    return _active
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time a startup phase if profiling is active.
+
+    Args:
+        name: Phase name
+    """
+    profiler = _active
+    if profiler is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        profiler.phases.append({
+            'name': name,
+            'start_ms': round((start - profiler.started) * 1000, 3),
+            'ms': round((end - start) * 1000, 3),
+        })
+
+
+def record_action(name: str, seconds: float) -> None:
+    """Record how long an action took to construct, if profiling is active.
+
+    Args:
+        name: Action name
+        seconds: Construction time including its lazy import
+    """
+    profiler = _active
+    if profiler is not None:
+        profiler.actions.append({'name': name, 'ms': round(seconds * 1000, 3)})
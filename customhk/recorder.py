@@ -0,0 +1,232 @@
+"""Record key events as macros.
+
+``MacroRecorder`` listens to every key press and release through the active
+platform's raw listener and appends them to a ``KeyLog`` with the time since
+the previous event. ``save_recording`` adds the log to the ``macros:``
+section of the configuration file::
+
+    macros:
+      recorded_20261017_140312:
+        name: "Recorded 2026-10-17 14:03:12"
+        speed: 1
+        recording: "Q0hLTAEGAAAA..."
+
+The entry is inserted as text, so the rest of the file, comments included,
+is left as it is. Replay speed can be changed by editing ``speed``.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, List, Optional, Set
+
+from .backends import KeyListener, get_platform
+from .backends.base import PRESS, RELEASE
+from .keys import SPECIAL_KEYS, key_token
+from .macros import KeyLog, parse_speed
+
+
+logger = logging.getLogger(__name__)
+
+_MACROS_BLOCK = re.compile(r'^macros:\s*(#.*)?$')
+_MACROS_INLINE = re.compile(r'^macros:')
+
+
+class MacroRecorder:
+    """Captures key events into a KeyLog."""
+
+    def __init__(self, platform: Any = None):
+        """Initialize the recorder.
+
+        Args:
+            platform: Platform to listen on (the active one if None)
+        """
+        self.platform = platform or get_platform()
+        self.log = KeyLog()
+        self.skipped = 0
+        self._held: Set[str] = set()
+        self._last: Optional[float] = None
+        self._listener: Optional[KeyListener] = None
+        self._lock = threading.Lock()
+
+    @property
+    def recording(self) -> bool:
+        """Whether the recorder is listening."""
+        return self._listener is not None
+
+    def start(self) -> None:
+        """Start recording into a new log."""
+        if self._listener is not None:
+            return
+        self.log = KeyLog()
+        self.skipped = 0
+        self._held.clear()
+        self._last = None
+        self._listener = self.platform.events.listener(self._on_press, self._on_release)
+        self._listener.start()
+        logger.info("Started recording a macro")
+
+    def stop(self) -> KeyLog:
+        """Stop recording.
+
+        The log is cut after the last moment no key was held before the
+        final keys, which drops the chord that stopped the recording whether
+        or not it was released yet. The macro therefore never leaves keys
+        pressed either.
+
+        Returns:
+            Recorded log
+        """
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.stop()
+
+        with self._lock:
+            log = self.log
+            held: Set[str] = set()
+            boundaries = [0]
+            for index, (kind, key, _) in enumerate(log, 1):
+                if kind == PRESS:
+                    held.add(key)
+                else:
+                    held.discard(key)
+                if not held:
+                    boundaries.append(index)
+            if len(boundaries) > 1 and boundaries[-1] == len(log):
+                boundaries.pop()
+            log.truncate(boundaries[-1])
+            self._held.clear()
+
+        logger.info(
+            f"Recorded {len(log)} key events over {log.duration:.1f}s "
+            f"({log.nbytes} bytes, {self.skipped} keys skipped)"
+        )
+        return log
+
+    def _token(self, key: Any) -> Optional[str]:
+        if self._listener is not None:
+            key = self._listener.canonical(key)
+        token = key_token(key)
+        if token is None or len(token) > 1 and token[1:-1] not in SPECIAL_KEYS:
+            # Keys known only by virtual key code cannot be injected by name
+            self.skipped += 1
+            return None
+        return token
+
+    def _add(self, kind: str, token: str) -> None:
+        now = self.platform.now()
+        # The recording starts at the first key, not when recording started
+        delay = 0.0 if self._last is None else now - self._last
+        self._last = now
+        self.log.append(kind, token, delay)
+
+    def _on_press(self, key: Any) -> None:
+        token = self._token(key)
+        if token is None:
+            return
+        with self._lock:
+            self._held.add(token)
+            self._add(PRESS, token)
+
+    def _on_release(self, key: Any) -> None:
+        token = self._token(key)
+        if token is None:
+            return
+        with self._lock:
+            # Keys held when recording started are released without a press
+            if token not in self._held:
+                return
+            self._held.discard(token)
+            self._add(RELEASE, token)
+
+
+def _insert_entry(text: str, lines: List[str]) -> str:
+    """Insert an entry at the top of the ``macros:`` block of a YAML text.
+
+    Args:
+        text: YAML text
+        lines: Entry lines, a tab standing for one level of indentation
+
+    Returns:
+        New text
+
+    Raises:
+        ValueError: If the text has a ``macros:`` key that is not a block
+    """
+    source = text.splitlines(keepends=True)
+    for index, line in enumerate(source):
+        if _MACROS_BLOCK.match(line.rstrip('\r\n')):
+            break
+        if _MACROS_INLINE.match(line):
+            raise ValueError("the macros: section is not a block mapping")
+    else:
+        index = None
+
+    # Indent like the entries already in the section
+    indent = '  '
+    for line in source[index + 1:] if index is not None else ():
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#'):
+            continue
+        if line[0] in ' \t':
+            indent = line[:len(line) - len(line.lstrip())]
+        break
+    block = [indent + entry.replace('\t', indent) for entry in lines]
+
+    if index is None:
+        prefix = '' if not text or text.endswith('\n') else '\n'
+        return text + prefix + 'macros:\n' + ''.join(block)
+    return ''.join(source[:index + 1] + block + source[index + 1:])
+
+
+def save_recording(
+    config_path: Path,
+    log: KeyLog,
+    name: Optional[str] = None,
+    speed: Any = 1
+) -> str:
+    """Add a recording to the ``macros:`` section of a configuration file.
+
+    If the section cannot be edited, the entry is written to
+    ``recorded_macros.yaml`` next to the file instead (include it to use it).
+
+    Args:
+        config_path: Configuration file
+        log: Recorded events
+        name: Macro name (recorded_<timestamp> if None)
+        speed: Replay speed to store (see macros.parse_speed)
+
+    Returns:
+        Name of the saved macro
+
+    Raises:
+        OSError: If no file could be written
+    """
+    parse_speed(speed)
+    stamp = time.localtime()
+    name = name or time.strftime('recorded_%Y%m%d_%H%M%S', stamp)
+    lines = [
+        f"{name}:\n",
+        f"\tname: {json.dumps(time.strftime('Recorded %Y-%m-%d %H:%M:%S', stamp))}\n",
+        f"\tspeed: {json.dumps(speed)}\n",
+        f"\trecording: \"{log.encode()}\"\n",
+    ]
+
+    path = Path(config_path)
+    try:
+        text = _insert_entry(path.read_text(encoding='utf-8'), lines)
+    except ValueError as e:
+        path = path.with_name('recorded_macros.yaml')
+        logger.warning(f"Cannot add the macro to {config_path} ({e}), writing {path}")
+        text = _insert_entry(path.read_text(encoding='utf-8') if path.exists() else '', lines)
+
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+    logger.info(f"Saved macro '{name}' to {path}")
+    return name
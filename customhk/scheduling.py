@@ -0,0 +1,158 @@
+"""Priority classes and cooperative preemption for running actions.
+
+Every action has a priority class. The dispatcher runs higher classes first,
+and when one is triggered while a lower-class action is running, it asks the
+running action to step aside. Actions are never interrupted at arbitrary
+points: they notice the request at a ``checkpoint()``, which
+``KeyboardHelper`` calls before each batch of key events. There the action
+pauses until the higher-priority work has finished, then carries on, or
+raises ``ActionCancelled`` if it was cancelled (abort hotkey, disabling the
+hotkeys) in the meantime.
+
+Classes, highest first:
+
+``critical``
+    Must never wait behind anything (toggles, aborts).
+``interactive``
+    Brings up UI (the wizard).
+``normal``
+    Short text and key sequences.
+``bulk``
+    Long-running typing such as formatted notes; preemptible.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Optional
+
+
+logger = logging.getLogger(__name__)
+
+PRIORITIES = ('critical', 'interactive', 'normal', 'bulk')
+DEFAULT_PRIORITY = 'normal'
+
+_current = threading.local()
+
+
+class ActionCancelled(Exception):
+    """Raised at a checkpoint when the running action has been cancelled."""
+
+
+def priority_level(priority: Any) -> int:
+    """Map a priority class name to its rank (0 is highest).
+
+    Args:
+        priority: Class name from PRIORITIES
+
+    Returns:
+        Rank; unknown names rank as the default class
+    """
+    try:
+        return PRIORITIES.index(priority)
+    except ValueError:
+        logger.warning(f"Unknown action priority {priority!r}, using {DEFAULT_PRIORITY}")
+        return PRIORITIES.index(DEFAULT_PRIORITY)
+
+
+class Job:
+    """One queued or running action."""
+
+    __slots__ = (
+        'name', 'action', 'trigger', 'level', 'enqueued_at',
+        'scheduler', 'home', 'cancelled', 'preempt_at', 'paused',
+        'origin', 'started_at', 'continued', 'carried',
+    )
+
+    def __init__(
+        self,
+        name: str,
+        action: Callable[[], None],
+        trigger: Optional[str],
+        level: int,
+        scheduler: Any,
+        origin: Optional['Job'] = None
+    ):
+        self.name = name
+        self.action = action
+        self.trigger = trigger
+        self.level = level
+        self.enqueued_at = time.perf_counter()
+        self.scheduler = scheduler      # object with yield_to_higher(job)
+        self.home = None                # queue of the worker the job is pinned to
+        self.cancelled = False
+        self.preempt_at: Optional[float] = None  # when preemption was requested
+        self.paused = False                      # waiting at a checkpoint
+        # A run split over several jobs (see continue_later) is accounted
+        # once, on its first job
+        self.origin = origin                     # first job of the run, if continued
+        self.started_at: Optional[float] = None
+        self.continued = False                   # the run goes on in a later job
+        self.carried = (0, False)                # metrics scratch carried between jobs
+
+    @property
+    def priority(self) -> str:
+        """Priority class name."""
+        return PRIORITIES[self.level]
+
+
+def current_job() -> Optional[Job]:
+    """Get the job running on this thread.
+
+    Returns:
+        Job, or None outside of dispatched actions
+    """
+    return getattr(_current, 'job', None)
+
+
+def set_current_job(job: Optional[Job]) -> Optional[Job]:
+    """Make a job the one running on this thread.
+
+    Args:
+        job: Job starting (None when it finishes)
+
+    Returns:
+        The previous job, to restore after a nested run
+    """
+    previous = getattr(_current, 'job', None)
+    _current.job = job
+    return previous
+
+
+def continue_later() -> Optional[Job]:
+    """Mark the running job's action as continuing in a later job.
+
+    The job is then not reported to the dispatcher's observer when it
+    returns; the run is reported once, when the last job of it finishes,
+    with the first job's wait and the time from its start. Pass the result
+    as ``origin`` when submitting the continuation.
+
+    Returns:
+        First job of the run, or None outside of dispatched actions
+    """
+    job = getattr(_current, 'job', None)
+    if job is None:
+        return None
+    job.continued = True
+    return job.origin or job
+
+
+def checkpoint() -> None:
+    """Let higher-priority work run, or stop if cancelled.
+
+    Call between units of work that are safe to pause at, i.e. with no keys
+    held down. Returns immediately when nothing is pending, and does nothing
+    outside of dispatched actions.
+
+    Raises:
+        ActionCancelled: If the running action was cancelled
+    """
+    job = getattr(_current, 'job', None)
+    if job is None:
+        return
+    if job.cancelled:
+        raise ActionCancelled(job.name)
+    if job.preempt_at is not None:
+        job.scheduler.yield_to_higher(job)
+        if job.cancelled:
+            raise ActionCancelled(job.name)
@@ -0,0 +1,339 @@
+"""Abbreviation-triggered text snippets.
+
+The ``snippets:`` section maps abbreviations to the text that replaces them::
+
+    snippets:
+      ";sig": "Best regards,\\nYour Name"
+      ";addr":
+        text: "123 Main Street"
+        enabled: true
+
+Typing an abbreviation anywhere erases it and inserts the text. The
+abbreviations are compiled into an Aho-Corasick automaton when the
+configuration is loaded (and stored in the compiled config cache), so a
+keystroke costs one transition, amortized over the fallbacks, however many
+snippets there are. An abbreviation fires as soon as its last character is
+typed; when several end there, the longest wins.
+"""
+
+import logging
+from collections import deque
+from functools import partial
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from .keys import MODIFIER_ORDER, key_token
+from .utils.keyboard import KeyboardHelper
+
+
+logger = logging.getLogger(__name__)
+
+# Transitions are keyed by state << _CHAR_BITS | code point in a single dict
+_CHAR_BITS = 21
+
+# Priority class of expansions (see scheduling.PRIORITIES)
+EXPAND_PRIORITY = 'normal'
+
+# Special keys that are part of the typed text
+_TEXT_KEYS = {'<space>': ' '}
+
+# Modifiers that turn a keypress into a shortcut rather than text
+_SHORTCUT_MODIFIERS = frozenset(MODIFIER_ORDER) - {'<shift>'}
+
+
+def _snippet_text(spec: Any) -> Optional[str]:
+    """Get a snippet's text, or None if it is disabled."""
+    if isinstance(spec, dict):
+        if not spec.get('enabled', True):
+            return None
+        spec = spec.get('text')
+    if not isinstance(spec, str) or not spec:
+        raise ValueError("needs a non-empty 'text'")
+    return spec
+
+
+def compile_snippets(snippets: Any) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+    """Compile the ``snippets:`` section into an Aho-Corasick automaton.
+
+    States are numbered from 0 (the root). ``goto`` holds the trie edges,
+    keyed by ``state << 21 | ord(char)``; ``fail`` the state of the longest
+    proper suffix that is also in the trie; ``match`` the index in
+    ``snippets`` of the longest abbreviation ending at each state, or -1.
+    Only built-in types are used, so the result can be marshalled.
+
+    Args:
+        snippets: Raw ``snippets:`` value (None when the section is empty)
+
+    Returns:
+        (automaton with 'goto', 'fail', 'match', 'snippets' [(abbreviation,
+        text)] and 'longest', or None if there are no snippets; warnings for
+        snippets that were left out or can never expand)
+    """
+    if snippets is None:
+        return None, []
+    if not isinstance(snippets, dict):
+        return None, [f"Invalid snippets section (expected a mapping): {snippets!r}"]
+
+    warnings: List[str] = []
+    entries: List[Tuple[str, str]] = []
+    for abbreviation, spec in snippets.items():
+        abbreviation = str(abbreviation)
+        try:
+            if not abbreviation or any(char in abbreviation for char in '\t\r\n'):
+                raise ValueError("the abbreviation must be typed on one line")
+            text = _snippet_text(spec)
+        except ValueError as e:
+            warnings.append(f"Snippet '{abbreviation}' ignored: {e}")
+            continue
+        if text is not None:
+            entries.append((abbreviation, text))
+    if not entries:
+        return None, warnings
+
+    # Trie of the abbreviations
+    goto: Dict[int, int] = {}
+    children: List[List[Tuple[int, int]]] = [[]]
+    match = [-1]
+    ends = []
+    for index, (abbreviation, _) in enumerate(entries):
+        state = 0
+        for char in abbreviation:
+            code = ord(char)
+            edge = state << _CHAR_BITS | code
+            child = goto.get(edge)
+            if child is None:
+                child = goto[edge] = len(match)
+                children[state].append((code, child))
+                children.append([])
+                match.append(-1)
+            state = child
+        match[state] = index
+        ends.append(state)
+
+    # Failure links, breadth first so every suffix state is done before
+    # the states that fall back to it
+    fail = [0] * len(match)
+    queue: Deque[int] = deque(child for _, child in children[0])
+    while queue:
+        state = queue.popleft()
+        if match[state] == -1:
+            match[state] = match[fail[state]]
+        for code, child in children[state]:
+            fallback = fail[state]
+            while fallback and (fallback << _CHAR_BITS | code) not in goto:
+                fallback = fail[fallback]
+            fail[child] = goto.get(fallback << _CHAR_BITS | code, 0)
+            queue.append(child)
+
+    # An abbreviation containing another one expands that one first
+    for index, (abbreviation, _) in enumerate(entries):
+        state = 0
+        for char in abbreviation[:-1]:
+            state = goto[state << _CHAR_BITS | ord(char)]
+            if match[state] != -1:
+                warnings.append(
+                    f"Snippet '{abbreviation}' never expands: typing it expands "
+                    f"'{entries[match[state]][0]}' first"
+                )
+                break
+
+    return {
+        'goto': goto,
+        'fail': fail,
+        'match': match,
+        'snippets': entries,
+        'longest': max(len(abbreviation) for abbreviation, _ in entries),
+    }, warnings
+
+
+class SnippetMatcher:
+    """Runs a compiled snippet automaton over typed characters."""
+
+    def __init__(self, automaton: Dict[str, Any]):
+        """Initialize the matcher in the root state.
+
+        Args:
+            automaton: Output of compile_snippets()
+        """
+        self.goto: Dict[int, int] = automaton['goto']
+        self.fail: List[int] = automaton['fail']
+        self.match: List[int] = automaton['match']
+        self.snippets: List[Tuple[str, str]] = automaton['snippets']
+        self.state = 0
+        # States before the last characters typed, for backspace
+        self._history: Deque[int] = deque(maxlen=max(16, automaton['longest']))
+
+    def feed(self, char: str) -> Optional[Tuple[str, str]]:
+        """Advance by one typed character.
+
+        Args:
+            char: Character typed
+
+        Returns:
+            (abbreviation, text) of the snippet completed by this character,
+            or None
+        """
+        goto = self.goto
+        code = ord(char)
+        state = self.state
+        self._history.append(state)
+        while True:
+            target = goto.get(state << _CHAR_BITS | code)
+            if target is not None:
+                break
+            if not state:
+                target = 0
+                break
+            state = self.fail[state]
+
+        self.state = target
+        index = self.match[target]
+        return self.snippets[index] if index >= 0 else None
+
+    def backspace(self) -> None:
+        """Undo the last character."""
+        self.state = self._history.pop() if self._history else 0
+
+    def reset(self) -> None:
+        """Forget the characters typed so far."""
+        self.state = 0
+        self._history.clear()
+
+
+class SnippetExpander:
+    """Watches typing through a raw key listener and expands snippets.
+
+    The listener callback only advances the automaton; a completed
+    abbreviation is handed to ``submit`` (the action dispatcher), and the
+    expansion erases it with backspaces and inserts the text in the same
+    batch (or pastes long text, per the injection settings). Keys seen
+    while an expansion is pending are ignored, so the expansion's own
+    events never match.
+    """
+
+    def __init__(
+        self,
+        automaton: Dict[str, Any],
+        keyboard_controller: Any,
+        submit: Callable[[str, Callable[[], None], Optional[str], str], bool],
+        injection: Optional[Dict[str, Any]] = None,
+        platform: Any = None
+    ):
+        """Initialize the expander.
+
+        Args:
+            automaton: Output of compile_snippets()
+            keyboard_controller: Key injector
+            submit: Queues an expansion, called as ``submit(name, callable,
+                trigger, priority)`` (ActionDispatcher.submit)
+            injection: Text injection settings (see utils.injection)
+            platform: Platform providing the key listener (the active one
+                if None)
+        """
+        if platform is None:
+            from .backends import get_platform
+            platform = get_platform()
+        self.platform = platform
+        self.helper = KeyboardHelper(keyboard_controller, injection)
+        self.submit = submit
+        self.matcher = SnippetMatcher(automaton)
+        self.listener = None
+        self.expansions = 0
+        self._held_modifiers: set = set()
+        self._pending = False
+
+    @property
+    def snippet_count(self) -> int:
+        """Number of snippets that can expand."""
+        return len(self.matcher.snippets)
+
+    def update(self, automaton: Dict[str, Any], injection: Optional[Dict[str, Any]] = None) -> None:
+        """Switch to a newly compiled set of snippets.
+
+        Args:
+            automaton: Output of compile_snippets()
+            injection: Text injection settings
+        """
+        self.matcher = SnippetMatcher(automaton)
+        self.helper = KeyboardHelper(self.helper.kb, injection)
+
+    def start(self) -> None:
+        """Start the raw key listener."""
+        if self.listener is not None:
+            return
+        self._held_modifiers.clear()
+        self.matcher.reset()
+        self.listener = self.platform.events.listener(self._on_press, self._on_release)
+        self.listener.start()
+        logger.info(f"Expanding {self.snippet_count} snippets")
+
+    def stop(self) -> None:
+        """Stop the raw key listener."""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+    def _on_press(self, key: Any) -> None:
+        """Raw listener callback advancing the automaton.
+
+        Args:
+            key: Key pressed
+        """
+        if self._pending:
+            return
+        matcher = self.matcher
+
+        # The character as typed (shifted), not the canonical key
+        char = key if isinstance(key, str) and len(key) == 1 else getattr(key, 'char', None)
+        if self.listener is not None:
+            key = self.listener.canonical(key)
+        token = key_token(key)
+
+        if token in MODIFIER_ORDER:
+            self._held_modifiers.add(token)
+            return
+        if token == '<backspace>':
+            matcher.backspace()
+            return
+        char = _TEXT_KEYS.get(token, char)
+        if not char or self._held_modifiers & _SHORTCUT_MODIFIERS:
+            # Navigation, enter and shortcuts end the word being typed
+            matcher.reset()
+            return
+
+        snippet = matcher.feed(char)
+        if snippet is None:
+            return
+
+        abbreviation, text = snippet
+        self._pending = True
+        if not self.submit('snippets', partial(self._expand, abbreviation, text),
+                           abbreviation, EXPAND_PRIORITY):
+            self._pending = False
+            matcher.reset()
+
+    def _on_release(self, key: Any) -> None:
+        """Raw listener callback tracking held modifiers.
+
+        Args:
+            key: Key released
+        """
+        if self.listener is not None:
+            key = self.listener.canonical(key)
+        self._held_modifiers.discard(key_token(key))
+
+    def _expand(self, abbreviation: str, text: str) -> None:
+        """Replace a typed abbreviation with its text (runs on a worker)."""
+        try:
+            batch = self.helper.batch().tap(*(['<backspace>'] * len(abbreviation)))
+            if self.helper.injector.choose(text) == 'type':
+                sent = batch.type(text).flush()
+            else:
+                sent = batch.flush()
+                if sent:
+                    self.helper.type_text(text, release_alt=False)
+            if sent:
+                self.expansions += 1
+                logger.debug(f"Expanded snippet {abbreviation} ({len(text)} characters)")
+        finally:
+            self.matcher.reset()
+            self._pending = False
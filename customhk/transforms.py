@@ -0,0 +1,428 @@
+"""Composable text transforms for clipboard actions.
+
+A pipeline is the ``transforms`` list of an action::
+
+    actions:
+      paste_quoted:
+        type: paste_transformed
+        transforms:
+          - trim
+          - dedupe
+          - wrap: 72
+          - quote: "> "
+
+Each step is a name, or a one-key mapping from the name to its main option
+(``wrap: 72``) or to a mapping of options (``sort: {reverse: true}``). Steps
+are validated and compiled when the action is created.
+
+Every transform works on lines: it takes an iterator of lines and yields
+lines. A compiled pipeline chains the steps' generators over the lines of
+the input, so the text is read once and no intermediate string is built
+between steps; only ``sort`` has to hold all lines. The result is produced
+in chunks for streaming, and the whole output is kept in an LRU memo keyed
+by the input's hash and the pipeline's identity, so transforming the same
+clipboard again costs a hash lookup.
+"""
+
+import hashlib
+import json
+import logging
+import textwrap
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .utils.clipboard import ClipboardManager
+
+
+logger = logging.getLogger(__name__)
+
+Stage = Callable[[Iterable[str]], Iterator[str]]
+
+# name -> (factory returning a stage, name of the option a scalar sets)
+TRANSFORMS: Dict[str, Tuple[Callable[..., Stage], Optional[str]]] = {}
+
+
+def transform(name: str, primary: Optional[str] = None):
+    """Register a transform factory.
+
+    Args:
+        name: Step name used in the config
+        primary: Option set by the scalar form (``wrap: 72`` sets ``width``)
+
+    Returns:
+        Decorator
+    """
+    def decorator(factory: Callable[..., Stage]) -> Callable[..., Stage]:
+        TRANSFORMS[name] = (factory, primary)
+        return factory
+    return decorator
+
+
+def _text(name: str, value: Any) -> str:
+    """Check that a text option is a string (YAML reads ``5`` as a number)."""
+    if not isinstance(value, str):
+        raise ValueError(f"{name} must be text (quote it in YAML), not {value!r}")
+    return value
+
+
+@transform('trim', primary='chars')
+def _trim(chars: Optional[str] = None, side: str = 'both') -> Stage:
+    if chars is not None:
+        _text('chars', chars)
+    if side not in ('both', 'left', 'right'):
+        raise ValueError(f"side must be both, left or right, not {side!r}")
+    strip = {'both': str.strip, 'left': str.lstrip, 'right': str.rstrip}[side]
+
+    def stage(lines: Iterable[str]) -> Iterator[str]:
+        for line in lines:
+            yield strip(line, chars)
+    return stage
+
+
+@transform('drop_blank')
+def _drop_blank() -> Stage:
+    def stage(lines: Iterable[str]) -> Iterator[str]:
+        for line in lines:
+            if line.strip():
+                yield line
+    return stage
+
+
+@transform('dedupe', primary='ignore_case')
+def _dedupe(ignore_case: bool = False) -> Stage:
+    def stage(lines: Iterable[str]) -> Iterator[str]:
+        seen = set()
+        for line in lines:
+            key = line.casefold() if ignore_case else line
+            if key not in seen:
+                seen.add(key)
+                yield line
+    return stage
+
+
+@transform('sort', primary='reverse')
+def _sort(reverse: bool = False, ignore_case: bool = False) -> Stage:
+    def stage(lines: Iterable[str]) -> Iterator[str]:
+        yield from sorted(lines, key=str.casefold if ignore_case else None, reverse=reverse)
+    return stage
+
+
+@transform('wrap', primary='width')
+def _wrap(width: int = 80, break_long_words: bool = True) -> Stage:
+    if int(width) < 1:
+        raise ValueError(f"width must be positive, not {width!r}")
+    wrapper = textwrap.TextWrapper(width=int(width), break_long_words=break_long_words)
+
+    def stage(lines: Iterable[str]) -> Iterator[str]:
+        for line in lines:
+            if line.strip():
+                yield from wrapper.wrap(line)
+            else:
+                yield ''
+    return stage
+
+
+def _case(convert: Callable[[str], str]) -> Callable[[], Stage]:
+    def factory() -> Stage:
+        def stage(lines: Iterable[str]) -> Iterator[str]:
+            for line in lines:
+                yield convert(line)
+        return stage
+    return factory
+
+
+transform('upper')(_case(str.upper))
+transform('lower')(_case(str.lower))
+transform('title')(_case(str.title))
+transform('capitalize')(_case(lambda line: line[:1].upper() + line[1:]))
+
+
+@transform('number', primary='format')
+def _number(format: str = '{n}. ', start: int = 1, skip_blank: bool = True) -> Stage:
+    _text('format', format).format(n=0)  # validate the template now
+    start = int(start)
+
+    def stage(lines: Iterable[str]) -> Iterator[str]:
+        n = start
+        for line in lines:
+            if skip_blank and not line.strip():
+                yield line
+                continue
+            yield format.format(n=n) + line
+            n += 1
+    return stage
+
+
+@transform('prefix', primary='text')
+def _prefix(text: str = '- ', skip_blank: bool = False) -> Stage:
+    _text('text', text)
+
+    def stage(lines: Iterable[str]) -> Iterator[str]:
+        for line in lines:
+            yield line if skip_blank and not line.strip() else text + line
+    return stage
+
+
+@transform('quote', primary='text')
+def _quote(text: str = '> ') -> Stage:
+    return _prefix(text)
+
+
+@transform('suffix', primary='text')
+def _suffix(text: str = '') -> Stage:
+    _text('text', text)
+
+    def stage(lines: Iterable[str]) -> Iterator[str]:
+        for line in lines:
+            yield line + text
+    return stage
+
+
+@transform('replace')
+def _replace(old: str, new: str = '') -> Stage:
+    _text('old', old)
+    _text('new', new)
+    if not old:
+        raise ValueError("old must not be empty")
+
+    def stage(lines: Iterable[str]) -> Iterator[str]:
+        for line in lines:
+            yield line.replace(old, new)
+    return stage
+
+
+def _parse_step(step: Any) -> Tuple[str, Dict[str, Any]]:
+    """Split one configured step into (name, options)."""
+    if isinstance(step, str):
+        return step, {}
+    if isinstance(step, dict) and len(step) == 1:
+        name, value = next(iter(step.items()))
+        if value is None:
+            return name, {}
+        if isinstance(value, dict):
+            return name, dict(value)
+        entry = TRANSFORMS.get(name)
+        if entry is None or entry[1] is None:
+            raise ValueError(f"Transform {name!r} takes no single value; use a mapping of options")
+        return name, {entry[1]: value}
+    raise ValueError(f"Invalid transform step {step!r}: use a name or a one-key mapping")
+
+
+class TransformMemo:
+    """LRU of pipeline results within an entry and byte budget."""
+
+    def __init__(self, max_entries: int = 64, max_bytes: int = 8 * 1024 * 1024):
+        """Initialize an empty memo.
+
+        Args:
+            max_entries: Maximum number of results
+            max_bytes: Maximum total result size (characters); results
+                larger than a quarter of it are not kept
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._results: 'OrderedDict[Tuple[str, bytes], str]' = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[str, bytes]) -> Optional[str]:
+        with self._lock:
+            result = self._results.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._results.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key: Tuple[str, bytes], result: str) -> None:
+        if len(result) > self.max_bytes // 4:
+            return
+        with self._lock:
+            previous = self._results.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._results[key] = result
+            self._size += len(result)
+            while len(self._results) > self.max_entries or self._size > self.max_bytes:
+                _, dropped = self._results.popitem(last=False)
+                self._size -= len(dropped)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+            self._size = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get memo counters.
+
+        Returns:
+            Dictionary with entries, size, hits and misses
+        """
+        with self._lock:
+            return {'entries': len(self._results), 'size': self._size,
+                    'hits': self.hits, 'misses': self.misses}
+
+
+_memo = TransformMemo()
+
+# The clipboard cache hands out the same string object until the clipboard
+# changes, so the last input's hash is remembered by identity
+_last_digest: Tuple[Optional[str], bytes] = (None, b'')
+
+
+def get_memo() -> TransformMemo:
+    """Get the shared transform result memo."""
+    return _memo
+
+
+def _digest(text: str) -> bytes:
+    global _last_digest
+    last, digest = _last_digest
+    if text is last:
+        return digest
+    digest = hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+    _last_digest = (text, digest)
+    return digest
+
+
+class Pipeline:
+    """A compiled chain of transforms."""
+
+    def __init__(self, steps: Sequence[Any], memo: Optional[TransformMemo] = None):
+        """Validate and compile the steps.
+
+        Args:
+            steps: Configured transform steps
+            memo: Result memo (the shared one if None)
+
+        Raises:
+            ValueError: If a step is unknown or has invalid options
+        """
+        self.memo = memo if memo is not None else _memo
+        self.stages: List[Stage] = []
+        normalized = []
+        for step in steps or []:
+            name, options = _parse_step(step)
+            entry = TRANSFORMS.get(name)
+            if entry is None:
+                raise ValueError(
+                    f"Unknown transform {name!r} (available: {', '.join(sorted(TRANSFORMS))})"
+                )
+            try:
+                self.stages.append(entry[0](**options))
+            except (TypeError, ValueError, KeyError, IndexError) as e:
+                raise ValueError(f"Invalid options for transform {name!r}: {e}") from e
+            normalized.append([name, options])
+
+        self.names = [name for name, _ in normalized]
+        self.identity = hashlib.blake2b(
+            json.dumps(normalized, sort_keys=True, default=str).encode('utf-8'), digest_size=8
+        ).hexdigest()
+
+    def lines(self, text: str) -> Iterator[str]:
+        """Transform text lazily.
+
+        Args:
+            text: Input text
+
+        Returns:
+            Iterator over the output lines
+        """
+        stream: Iterable[str] = ClipboardManager.iter_lines(text)
+        for stage in self.stages:
+            stream = stage(stream)
+        return iter(stream)
+
+    def stream(self, text: str, chunk_size: int = 4096) -> Iterator[str]:
+        """Transform text in pieces of about chunk_size characters.
+
+        A memoized result is sliced; otherwise the output is produced in one
+        pass and memoized once complete.
+
+        Args:
+            text: Input text
+            chunk_size: Target piece length in characters
+
+        Yields:
+            Consecutive pieces of the output
+        """
+        key = (self.identity, _digest(text))
+        result = self.memo.get(key)
+        if result is not None:
+            for start in range(0, len(result), chunk_size):
+                yield result[start:start + chunk_size]
+            return
+
+        produced: Optional[List[str]] = []
+        size = 0
+        limit = self.memo.max_bytes // 4
+        parts: List[str] = []
+        pending = 0
+        separator = ''
+        for line in self.lines(text):
+            parts.append(separator + line)
+            separator = '\n'
+            pending += len(parts[-1])
+            if pending < chunk_size:
+                continue
+
+            joined = ''.join(parts)
+            full = len(joined) - len(joined) % chunk_size
+            for start in range(0, full, chunk_size):
+                piece = joined[start:start + chunk_size]
+                if produced is not None:
+                    produced.append(piece)
+                    size += len(piece)
+                    if size > limit:
+                        produced = None
+                yield piece
+            rest = joined[full:]
+            parts = [rest] if rest else []
+            pending = len(rest)
+
+        tail = ''.join(parts)
+        if tail:
+            if produced is not None:
+                produced.append(tail)
+            yield tail
+        # Only reached when the whole output was consumed
+        if produced is not None:
+            self.memo.put(key, ''.join(produced))
+
+    def apply(self, text: str) -> str:
+        """Transform text.
+
+        Args:
+            text: Input text
+
+        Returns:
+            Output text
+        """
+        key = (self.identity, _digest(text))
+        result = self.memo.get(key)
+        if result is None:
+            result = '\n'.join(self.lines(text))
+            self.memo.put(key, result)
+        return result
+
+    def __repr__(self) -> str:
+        return f"Pipeline({' | '.join(self.names) or 'identity'})"
+
+
+def compile_pipeline(steps: Sequence[Any]) -> Pipeline:
+    """Compile configured transform steps.
+
+    Args:
+        steps: The ``transforms`` list of an action
+
+    Returns:
+        Pipeline
+
+    Raises:
+        ValueError: If a step is unknown or has invalid options
+    """
+    return Pipeline(steps)
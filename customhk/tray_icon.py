@@ -1,14 +1,19 @@
 """System tray icon management."""
 
 import logging
+import threading
 from pathlib import Path
-from typing import Optional, Callable
-import pystray
-from PIL import Image
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+if TYPE_CHECKING:
+    import pystray
+    from PIL import Image
 
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_STATISTICS_FILE = Path.home() / '.customhk' / 'statistics.json'
+
 
 class TrayIconManager:
     """Manages the system tray icon and menu."""
@@ -29,16 +34,29 @@ class TrayIconManager:
         self.config = config
         self.hotkey_manager = hotkey_manager
         self.on_exit_callback = on_exit
-        self.icon: Optional[pystray.Icon] = None
+        self.icon: Optional['pystray.Icon'] = None
+        self.last_reload_error: Optional[str] = None
+        self._reload_lock = threading.Lock()
+        self._icon_image: Optional['Image.Image'] = None
+
+    @property
+    def icon_image(self) -> 'Image.Image':
+        """Tray icon image, loaded on first use.
 
-        # Load icon image
-        icon_path = self._find_icon()
-        if icon_path and icon_path.exists():
-            self.icon_image = Image.open(icon_path)
-        else:
-            # Create a simple default icon if file not found
-            logger.warning(f"Icon not found at {icon_path}, using default")
-            self.icon_image = self._create_default_icon()
+        Returns:
+            PIL Image
+        """
+        if self._icon_image is None:
+            from PIL import Image
+
+            icon_path = self._find_icon()
+            if icon_path and icon_path.exists():
+                self._icon_image = Image.open(icon_path)
+            else:
+                # Create a simple default icon if file not found
+                logger.warning(f"Icon not found at {icon_path}, using default")
+                self._icon_image = self._create_default_icon()
+        return self._icon_image
 
     def _find_icon(self) -> Optional[Path]:
         """Find the icon file.
@@ -62,22 +80,26 @@ class TrayIconManager:
 
         return None
 
-    def _create_default_icon(self) -> Image.Image:
+    def _create_default_icon(self) -> 'Image.Image':
         """Create a simple default icon.
 
         Returns:
             PIL Image
         """
+        from PIL import Image
+
         # Create a simple 64x64 icon with a colored square
         img = Image.new('RGB', (64, 64), color=(73, 109, 137))
         return img
 
-    def _create_menu(self) -> pystray.Menu:
+    def _create_menu(self) -> 'pystray.Menu':
         """Create the tray icon menu.
 
         Returns:
             pystray.Menu instance
         """
+        import pystray
+
         app_name = self.config.get('app.name', 'CustomHK')
 
         return pystray.Menu(
@@ -89,11 +111,16 @@ class TrayIconManager:
                 checked=lambda item: self.hotkey_manager.is_running()
             ),
             pystray.MenuItem('Reload Config', self._on_reload_config),
+            pystray.MenuItem(
+                'Statistics',
+                pystray.Menu(self._statistics_items),
+                visible=self.hotkey_manager.metrics is not None
+            ),
             pystray.Menu.SEPARATOR,
             pystray.MenuItem('Exit', self._on_exit)
         )
 
-    def _on_toggle(self, icon: pystray.Icon, item: pystray.MenuItem) -> None:
+    def _on_toggle(self, icon: 'pystray.Icon', item: 'pystray.MenuItem') -> None:
         """Handle enable/disable toggle.
 
         Args:
@@ -107,22 +134,145 @@ class TrayIconManager:
         # Update icon menu
         icon.update_menu()
 
-    def _on_reload_config(self, icon: pystray.Icon, item: pystray.MenuItem) -> None:
+    def _on_reload_config(self, icon: 'pystray.Icon', item: 'pystray.MenuItem') -> None:
         """Handle config reload request.
 
         Args:
             icon: Tray icon instance
             item: Menu item
         """
-        logger.info("Reloading configuration")
-        try:
-            self.config.reload()
-            self.hotkey_manager.restart()
+        # Reload off the tray thread; hotkeys keep working on the old
+        # bindings until the new ones are swapped in.
+        threading.Thread(target=self.reload_config, name="customhk-reload", daemon=True).start()
+
+    def reload_config(self) -> bool:
+        """Reload the configuration and apply only what changed.
+
+        If the new configuration cannot be loaded or applied, the last good
+        one stays (or is put back) in effect and the error is shown as a
+        tray notification.
+
+        Returns:
+            True if the new configuration was applied
+        """
+        with self._reload_lock:
+            logger.info("Reloading configuration")
+            previous = self.config.snapshot()
+            try:
+                diff = self.config.reload()
+                logger.info(f"Configuration changes: {diff.summary()}")
+                self.hotkey_manager.reload(diff)
+            except Exception as e:
+                self.last_reload_error = str(e)
+                logger.error(f"Failed to reload configuration: {e}")
+                self._notify(self._roll_back(previous, e))
+                return False
+
+            if self.last_reload_error is not None:
+                self._notify("Configuration reloaded")
+            self.last_reload_error = None
             logger.info("Configuration reloaded successfully")
+            return True
+
+    def _roll_back(self, previous: Any, error: Exception) -> str:
+        """Put the previous configuration back after a failed reload.
+
+        Args:
+            previous: Config.snapshot() taken before the reload
+            error: Why the reload failed
+
+        Returns:
+            Notification text describing the state left in effect
+        """
+        diff = self.config.restore(previous)
+        if diff.is_empty():
+            return f"Config not reloaded, keeping previous settings:\n{error}"
+        try:
+            self.hotkey_manager.reload(diff)
         except Exception as e:
-            logger.error(f"Failed to reload configuration: {e}")
+            logger.error(f"Could not restore the previous configuration: {e}", exc_info=True)
+            return f"Config only partly applied, restart CustomHK:\n{error}"
+        logger.info("Previous configuration restored")
+        return f"Config not applied, previous settings restored:\n{error}"
+
+    def _notify(self, message: str) -> None:
+        """Show a tray notification if the platform supports it.
+
+        Args:
+            message: Notification text
+        """
+        if self.icon is None:
+            return
+        try:
+            self.icon.notify(message, "CustomHK")
+        except Exception as e:
+            logger.debug(f"Tray notification failed: {e}")
+
+    def _statistics_items(self) -> List['pystray.MenuItem']:
+        """Build the Statistics submenu from the current numbers.
+
+        Returns:
+            Menu items: one line per hotkey (slowest first), then commands
+        """
+        import pystray
+
+        metrics = self.hotkey_manager.metrics
+        lines = metrics.summary() if metrics is not None else []
+        items = [pystray.MenuItem(line, None, enabled=False) for line in lines]
+        if not items:
+            items.append(pystray.MenuItem('No actions run yet', None, enabled=False))
+
+        items += [
+            pystray.Menu.SEPARATOR,
+            pystray.MenuItem('Refresh', lambda icon, item: icon.update_menu()),
+            pystray.MenuItem('Export...', self._on_export_statistics),
+            pystray.MenuItem('Reset', self._on_reset_statistics),
+        ]
+        return items
+
+    def export_statistics(self) -> Optional[Path]:
+        """Write the statistics to ``app.metrics.file``.
+
+        Returns:
+            File written, or None on failure
+        """
+        metrics = self.hotkey_manager.metrics
+        if metrics is None:
+            return None
+
+        path = Path(self.config.get('app.metrics.file') or DEFAULT_STATISTICS_FILE).expanduser()
+        try:
+            metrics.write(path)
+        except OSError as e:
+            logger.error(f"Failed to write statistics to {path}: {e}")
+            self._notify(f"Could not export statistics:\n{e}")
+            return None
+        return path
+
+    def _on_export_statistics(self, icon: 'pystray.Icon', item: 'pystray.MenuItem') -> None:
+        """Handle the Statistics > Export menu item.
 
-    def _on_exit(self, icon: pystray.Icon, item: pystray.MenuItem) -> None:
+        Args:
+            icon: Tray icon instance
+            item: Menu item
+        """
+        path = self.export_statistics()
+        if path is not None:
+            self._notify(f"Statistics written to {path}")
+
+    def _on_reset_statistics(self, icon: 'pystray.Icon', item: 'pystray.MenuItem') -> None:
+        """Handle the Statistics > Reset menu item.
+
+        Args:
+            icon: Tray icon instance
+            item: Menu item
+        """
+        if self.hotkey_manager.metrics is not None:
+            self.hotkey_manager.metrics.reset()
+            logger.info("Statistics reset")
+        icon.update_menu()
+
+    def _on_exit(self, icon: 'pystray.Icon', item: 'pystray.MenuItem') -> None:
         """Handle exit request.
 
         Args:
@@ -141,36 +291,79 @@ class TrayIconManager:
         if self.on_exit_callback:
             self.on_exit_callback()
 
-    def run(self) -> None:
-        """Start the tray icon (blocking call)."""
+    def preload(self) -> None:
+        """Load the icon image and build the menu ahead of run()."""
+        self.icon_image
+        self._create_menu()
+
+    def _create_icon(self) -> 'pystray.Icon':
+        """Create the tray icon.
+
+        pystray and PIL are imported here rather than at module load, so
+        they are paid for after the hotkeys are already active.
+
+        Returns:
+            pystray.Icon instance
+        """
+        import pystray
+
         app_name = self.config.get('app.name', 'CustomHK')
 
-        self.icon = pystray.Icon(
+        return pystray.Icon(
             "customhk_icon",
             self.icon_image,
             app_name,
             self._create_menu()
         )
 
+    def _on_injection_progress(self, progress: Dict[str, Any]) -> None:
+        """Show the progress of streamed typing in the icon's tooltip.
+
+        Args:
+            progress: InjectionProgress snapshot
+        """
+        if self.icon is None:
+            return
+
+        app_name = self.config.get('app.name', 'CustomHK')
+        if progress['finished']:
+            self.icon.title = app_name
+            return
+
+        done = f"{progress['chars']} chars"
+        if progress['total']:
+            done = f"{min(100, 100 * progress['chars'] // progress['total'])}%"
+        from .hotkey_manager import DEFAULT_ABORT_KEY
+        abort_key = self.config.get('hotkeys.abort', DEFAULT_ABORT_KEY)
+        hint = f", {abort_key} to stop" if abort_key else ""
+        self.icon.title = f"{app_name} - typing {done} ({progress['rate']:.0f} chars/s{hint})"
+
+    def _watch_injection_progress(self) -> None:
+        from .utils.injection import add_progress_listener
+
+        add_progress_listener(self._on_injection_progress)
+
+    def run(self) -> None:
+        """Start the tray icon (blocking call)."""
+        self.icon = self._create_icon()
+        self._watch_injection_progress()
+
         logger.info("Starting system tray icon")
         self.icon.run()
 
     def run_detached(self) -> None:
         """Start the tray icon in detached mode (non-blocking)."""
-        app_name = self.config.get('app.name', 'CustomHK')
-
-        self.icon = pystray.Icon(
-            "customhk_icon",
-            self.icon_image,
-            app_name,
-            self._create_menu()
-        )
+        self.icon = self._create_icon()
+        self._watch_injection_progress()
 
         logger.info("Starting system tray icon (detached)")
         self.icon.run_detached()
 
     def stop(self) -> None:
         """Stop the tray icon."""
+        from .utils.injection import remove_progress_listener
+
+        remove_progress_listener(self._on_injection_progress)
         if self.icon:
             self.icon.stop()
             logger.info("Stopped system tray icon")
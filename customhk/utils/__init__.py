@@ -1,7 +1,20 @@
 """Utility modules for CustomHK."""
 
-from .clipboard import ClipboardManager
-from .keyboard import KeyboardHelper
-from .window import WindowManager
+import importlib
 
-__all__ = ['ClipboardManager', 'KeyboardHelper', 'WindowManager']
+__all__ = ['ClipboardManager', 'KeyboardHelper', 'TextInjector', 'WindowManager']
+
+_MODULES = {
+    'ClipboardManager': '.clipboard',
+    'KeyboardHelper': '.keyboard',
+    'TextInjector': '.injection',
+    'WindowManager': '.window',
+}
+
+
+def __getattr__(name):
+    # Submodules load platform libraries; import them only when used
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module, __name__), name)
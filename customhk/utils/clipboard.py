@@ -1,16 +1,299 @@
-"""Clipboard utilities for Windows."""
+"""Clipboard utilities.
+
+Reads and writes go to the active platform's clipboard backend; on the
+native platform ``win32clipboard`` is imported on first use so that loading
+the actions does not pay for pywin32 before the clipboard is actually needed.
+Reads go through ``ClipboardCache``, which only opens the clipboard when its
+sequence number has changed and tells subscribers (the clipboard history)
+about every change.
+"""
 
 import logging
-from typing import Optional
-import win32clipboard
+import re
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional
+
+from ..backends import ClipboardBackend, get_platform
+from .clipboard_history import DEFAULT_SETTINGS as HISTORY_SETTINGS
+from .clipboard_history import ClipboardHistory
 
 
 logger = logging.getLogger(__name__)
 
+# The boundaries str.splitlines() recognizes
+_LINE_BREAK = re.compile('\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]')
+
+
+class ClipboardCache:
+    """Caches the clipboard text between clipboard changes.
+
+    With a backend that reports a sequence number, a read while the number
+    is unchanged returns the cached text without opening the clipboard.
+    Subscribers are called with the new text after every change, driven by
+    the backend's change events or, without them, by polling the sequence
+    number (or the text itself if there is none) every ``poll_interval``
+    seconds. Watching only runs while there are subscribers.
+    """
+
+    def __init__(
+        self,
+        backend: ClipboardBackend,
+        poll_interval: float = 1.0,
+        use_events: bool = True
+    ):
+        """Initialize the cache.
+
+        Args:
+            backend: Clipboard backend to read
+            poll_interval: Seconds between polls when change events are unavailable
+            use_events: Subscribe to change events when supported
+        """
+        self.backend = backend
+        self.poll_interval = poll_interval
+        self.use_events = use_events
+        self._lock = threading.Lock()
+        self._text: Optional[str] = None
+        self._sequence: Optional[int] = None  # sequence number _text was read at
+        self._notified: Any = None             # last sequence (or text) reported
+        self._quiet = 0
+        self._subscribers: List[Callable[[str], None]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.event_driven = False
+
+        self.reads = 0
+        self.hits = 0
+        self.changes = 0
+        self.notifications = 0
+
+    def get_text(self) -> Optional[str]:
+        """Get the clipboard text, from the cache if the clipboard is unchanged.
+
+        Returns:
+            Clipboard text or None
+        """
+        self.reads += 1
+        sequence = self.backend.sequence_number()
+        if sequence is not None and sequence == self._sequence:
+            self.hits += 1
+            return self._text
+
+        with self._lock:
+            text = self.backend.get_text()
+            # Read failures are not cached, so the next read retries
+            if sequence is not None and text is not None:
+                self._text, self._sequence = text, sequence
+            return text
+
+    def set_text(self, text: str) -> bool:
+        """Set the clipboard text.
+
+        Args:
+            text: Text to set
+
+        Returns:
+            True if successful
+        """
+        ok = self.backend.set_text(text)
+        self.invalidate()
+        return ok
+
+    def invalidate(self) -> None:
+        """Forget the cached text."""
+        with self._lock:
+            self._sequence = None
+            self._text = None
+
+    @contextmanager
+    def quiet(self) -> Iterator[None]:
+        """Do not report clipboard changes made inside the block.
+
+        Used while the clipboard briefly holds text being pasted.
+        """
+        with self._lock:
+            self._quiet += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._quiet -= 1
+                self._notified = self._marker()
+
+    def _marker(self) -> Any:
+        """Identify the current clipboard content (sequence number or text)."""
+        sequence = self.backend.sequence_number()
+        return sequence if sequence is not None else ('text', self.backend.get_text())
+
+    def subscribe(self, callback: Callable[[str], None]) -> None:
+        """Call back with the new text after every clipboard change.
+
+        Args:
+            callback: Called with the clipboard text (on a watcher thread)
+        """
+        start = False
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+                start = len(self._subscribers) == 1
+        if start:
+            self._start()
+
+    def unsubscribe(self, callback: Callable[[str], None]) -> None:
+        """Stop calling a subscriber.
+
+        Args:
+            callback: Callback passed to subscribe()
+        """
+        with self._lock:
+            if callback not in self._subscribers:
+                return
+            self._subscribers.remove(callback)
+            stop = not self._subscribers
+        if stop:
+            self._stop_watching()
+
+    def _start(self) -> None:
+        self._notified = self._marker()
+        if self.use_events:
+            try:
+                self.event_driven = self.backend.watch_changes(self._on_change)
+            except Exception as e:
+                logger.warning(f"Clipboard change events unavailable: {e}")
+                self.event_driven = False
+
+        if not self.event_driven:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._poll_loop, name="customhk-clipboard-poll", daemon=True
+            )
+            self._thread.start()
+
+        mode = "event-driven" if self.event_driven else "polling"
+        logger.info(f"Clipboard change watching started ({mode})")
+
+    def _stop_watching(self) -> None:
+        if self.event_driven:
+            self.backend.unwatch_changes()
+            self.event_driven = False
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(2.0)
+            self._thread = None
+
+    def stop(self) -> None:
+        """Drop every subscriber and stop watching."""
+        with self._lock:
+            had_subscribers = bool(self._subscribers)
+            self._subscribers.clear()
+        if had_subscribers:
+            self._stop_watching()
+
+    def _poll_loop(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            self.poll()
+
+    def poll(self) -> None:
+        """Check for a change once and notify subscribers if there was one."""
+        try:
+            if self._marker() != self._notified:
+                self._on_change()
+        except Exception as e:
+            logger.debug(f"Clipboard poll failed: {e}")
+
+    def _on_change(self) -> None:
+        """Handle a clipboard change (from the backend's events or a poll)."""
+        self.changes += 1
+        if self._quiet:
+            return
+
+        text = self.get_text()
+        marker = self._sequence if self._sequence is not None else ('text', text)
+        with self._lock:
+            if self._quiet or marker == self._notified:
+                return
+            self._notified = marker
+            subscribers = list(self._subscribers)
+
+        if not text:
+            return
+        self.notifications += 1
+        for callback in subscribers:
+            try:
+                callback(text)
+            except Exception as e:
+                logger.error(f"Clipboard subscriber failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache counters.
+
+        Returns:
+            Dictionary with reads, hits, hit_rate, changes, notifications,
+            subscribers and event_driven
+        """
+        return {
+            'reads': self.reads,
+            'hits': self.hits,
+            'hit_rate': self.hits / self.reads if self.reads else 0.0,
+            'changes': self.changes,
+            'notifications': self.notifications,
+            'subscribers': len(self._subscribers),
+            'event_driven': self.event_driven,
+        }
+
+
+_cache: Optional[ClipboardCache] = None
+_cache_lock = threading.Lock()
+
+_history: Optional[ClipboardHistory] = None
+_history_settings: Optional[Dict[str, Any]] = None
+_history_lock = threading.Lock()
+
 
 class ClipboardManager:
     """Manages clipboard operations with proper error handling."""
 
+    @staticmethod
+    def get_cache() -> ClipboardCache:
+        """Get the shared clipboard cache for the active platform.
+
+        Returns:
+            ClipboardCache (rebuilt, keeping its subscribers, if the platform
+            was switched)
+        """
+        global _cache
+        backend = get_platform().clipboard
+        cache = _cache
+        if cache is not None and cache.backend is backend:
+            return cache
+
+        with _cache_lock:
+            if _cache is None or _cache.backend is not backend:
+                old = _cache
+                _cache = ClipboardCache(backend)
+                if old is not None:
+                    subscribers = list(old._subscribers)
+                    _cache.poll_interval = old.poll_interval
+                    old.stop()
+                    for callback in subscribers:
+                        _cache.subscribe(callback)
+            return _cache
+
+    @staticmethod
+    def quiet(backend: Optional[ClipboardBackend] = None) -> ContextManager:
+        """Do not report clipboard changes made inside the block to subscribers.
+
+        Args:
+            backend: Clipboard backend being written (the active platform's if None)
+
+        Returns:
+            Context manager
+        """
+        cache = _cache
+        if cache is None or (backend is not None and cache.backend is not backend):
+            return nullcontext()
+        return cache.quiet()
+
     @staticmethod
     def get_text() -> Optional[str]:
         """Get text from clipboard.
@@ -18,22 +301,7 @@ class ClipboardManager:
         Returns:
             Clipboard text or None if clipboard doesn't contain text or error occurs
         """
-        try:
-            win32clipboard.OpenClipboard()
-            if win32clipboard.IsClipboardFormatAvailable(win32clipboard.CF_UNICODETEXT):
-                text = win32clipboard.GetClipboardData(win32clipboard.CF_UNICODETEXT)
-                return text
-            else:
-                logger.debug("Clipboard does not contain text")
-                return None
-        except Exception as e:
-            logger.error(f"Failed to get clipboard text: {e}")
-            return None
-        finally:
-            try:
-                win32clipboard.CloseClipboard()
-            except:
-                pass
+        return ClipboardManager.get_cache().get_text()
 
     @staticmethod
     def set_text(text: str) -> bool:
@@ -45,19 +313,67 @@ class ClipboardManager:
         Returns:
             True if successful, False otherwise
         """
-        try:
-            win32clipboard.OpenClipboard()
-            win32clipboard.EmptyClipboard()
-            win32clipboard.SetClipboardText(text, win32clipboard.CF_UNICODETEXT)
-            return True
-        except Exception as e:
-            logger.error(f"Failed to set clipboard text: {e}")
-            return False
-        finally:
-            try:
-                win32clipboard.CloseClipboard()
-            except:
-                pass
+        return ClipboardManager.get_cache().set_text(text)
+
+    @staticmethod
+    def get_history() -> Optional[ClipboardHistory]:
+        """Get the clipboard history.
+
+        Returns:
+            ClipboardHistory, or None if history is disabled
+        """
+        return _history
+
+    @staticmethod
+    def configure_history(settings: Optional[Dict[str, Any]]) -> Optional[ClipboardHistory]:
+        """Enable, resize or disable the clipboard history.
+
+        Calling again with the same settings keeps the current history.
+        Changed settings build a new one and carry the entries over.
+
+        Args:
+            settings: ``app.clipboard_history`` settings
+
+        Returns:
+            The active ClipboardHistory, or None if disabled
+        """
+        global _history, _history_settings
+        merged = dict(HISTORY_SETTINGS)
+        merged.update(settings or {})
+
+        with _history_lock:
+            if merged == _history_settings:
+                return _history
+
+            old = _history
+            if old is not None:
+                ClipboardManager.get_cache().unsubscribe(old.add)
+            _history = None
+            _history_settings = merged
+
+            if merged['enabled']:
+                try:
+                    _history = ClipboardHistory.from_settings(merged)
+                except (OSError, ValueError) as e:
+                    logger.error(f"Failed to create clipboard history: {e}")
+                    _history_settings = None
+                else:
+                    if old is not None:
+                        for entry in reversed(list(old.entries())):
+                            _history.add(old.get_by_key(entry.key) or '')
+                    cache = ClipboardManager.get_cache()
+                    cache.poll_interval = merged['poll_interval']
+                    cache.subscribe(_history.add)
+                    logger.info(f"Clipboard history enabled ({len(_history)} entries)")
+
+            if old is not None:
+                old.close()
+            return _history
+
+    @staticmethod
+    def reset_history() -> None:
+        """Stop recording and drop the clipboard history."""
+        ClipboardManager.configure_history({'enabled': False})
 
     @staticmethod
     def format_as_list(text: str, prefix: str = "-") -> str:
@@ -70,9 +386,61 @@ class ClipboardManager:
         Returns:
             Formatted text with prefix on each line
         """
-        if not text:
-            return ""
+        return "".join(ClipboardManager.iter_as_list(text, prefix))
+
+    @staticmethod
+    def iter_lines(text: str) -> Iterator[str]:
+        """Yield the lines of text like str.splitlines(), without a list.
+
+        Args:
+            text: Input text
+
+        Yields:
+            Each line without its line break
+        """
+        pos = 0
+        end = len(text)
+        while pos < end:
+            match = _LINE_BREAK.search(text, pos)
+            if match is None:
+                yield text[pos:]
+                return
+            yield text[pos:match.start()]
+            pos = match.end()
+
+    @staticmethod
+    def iter_as_list(text: str, prefix: str = "-", chunk_size: int = 4096) -> Iterator[str]:
+        """Format text as a list lazily, in pieces of about chunk_size characters.
+
+        Joining the pieces gives the same result as format_as_list(), but only
+        one piece exists at a time.
+
+        Args:
+            text: Input text
+            prefix: Prefix to add to each line
+            chunk_size: Target piece length in characters
+
+        Yields:
+            Consecutive pieces of the formatted text
+        """
+        parts = []
+        size = 0
+        separator = ""
+        for line in ClipboardManager.iter_lines(text):
+            part = f"{separator}{prefix}{line}"
+            separator = "\n"
+            parts.append(part)
+            size += len(part)
+            if size < chunk_size:
+                continue
+
+            joined = "".join(parts)
+            full = len(joined) - len(joined) % chunk_size
+            for start in range(0, full, chunk_size):
+                yield joined[start:start + chunk_size]
+            rest = joined[full:]
+            parts = [rest] if rest else []
+            size = len(rest)
 
-        lines = text.splitlines()
-        formatted_lines = [f"{prefix}{line}" for line in lines]
-        return "\n".join(formatted_lines)
+        if parts:
+            yield "".join(parts)
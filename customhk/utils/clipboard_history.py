@@ -0,0 +1,459 @@
+"""Memory-bounded clipboard history.
+
+Entries are kept in recency order and identified by a hash of their content,
+so copying the same text again moves the existing entry to the front instead
+of storing it twice. Entries of ``compress_threshold`` bytes or more are kept
+zlib-compressed. Each entry also keeps a small bit signature of the
+three-character sequences in its text, so a search only decompresses and
+scans the entries that can contain the query. Once the entries held in
+memory exceed ``max_bytes``, the oldest are moved to a memory-mapped spill
+file (if ``spill_file`` is set) or dropped. The spill file is a fixed-size
+ring: when it wraps, the entries it overwrites are dropped, so neither memory
+nor disk use grows past its budget.
+
+The spill file only lives as long as the process; it is truncated when the
+history is closed and is never read back on startup. Its entries are not
+encrypted (plain UTF-8, or zlib for large ones), so anything copied while
+the history is enabled can be read from it until then.
+"""
+
+import hashlib
+import logging
+import mmap
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict, deque
+from itertools import islice
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS: Dict[str, Any] = {
+    'enabled': False,
+    'max_entries': 10000,
+    'max_bytes': 16 * 1024 * 1024,
+    'compress_threshold': 4096,
+    'spill_file': '',
+    'spill_bytes': 256 * 1024 * 1024,
+    'poll_interval': 1.0,
+}
+
+PREVIEW_LENGTH = 80
+
+# Rough per-entry bookkeeping cost, counted against max_bytes
+ENTRY_OVERHEAD = 200
+
+# Signature bits per distinct trigram, and the signature size bounds
+SIGNATURE_BITS_PER_GRAM = 4
+SIGNATURE_MIN_BITS = 64
+SIGNATURE_MAX_BITS = 1 << 15
+
+
+def _trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _signature(grams: set, bits: int) -> int:
+    """Fold trigrams into a bitmask of the given (power of two) width."""
+    mask = bits - 1
+    signature = 0
+    for position in {hash(gram) & mask for gram in grams}:
+        signature |= 1 << position
+    return signature
+
+
+class HistoryEntry:
+    """One clipboard text in the history."""
+
+    __slots__ = (
+        'key', 'size', 'copied_at', 'preview', 'signature', 'signature_bits',
+        'payload', 'compressed', 'spilled',
+    )
+
+    def __init__(self, key: bytes, size: int, preview: str, text: str):
+        self.key = key                  # content hash
+        self.size = size                # UTF-8 length of the text
+        self.copied_at = time.time()
+        self.preview = preview          # first line, shortened
+        grams = _trigrams(text.lower())
+        bits = SIGNATURE_MIN_BITS
+        while bits < len(grams) * SIGNATURE_BITS_PER_GRAM and bits < SIGNATURE_MAX_BITS:
+            bits <<= 1
+        self.signature_bits = bits
+        self.signature = _signature(grams, bits)
+        self.payload: Any = None        # str, zlib bytes, or None when spilled
+        self.compressed = False
+        self.spilled: Optional[Tuple[int, int]] = None  # (offset, length) in the spill file
+
+    @property
+    def memory(self) -> int:
+        """Bytes this entry holds in memory (approximate)."""
+        if self.payload is None:
+            payload = 0
+        elif self.compressed:
+            payload = len(self.payload)
+        else:
+            payload = self.size
+        return payload + len(self.preview) + self.signature_bits // 8 + ENTRY_OVERHEAD
+
+
+class _SpillFile:
+    """Fixed-size memory-mapped ring of entry payloads."""
+
+    def __init__(self, path: Path, capacity: int):
+        self.path = Path(path).expanduser()
+        self.capacity = capacity
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'w+b')
+        self._file.truncate(capacity)
+        self._map = mmap.mmap(self._file.fileno(), capacity)
+        self.cursor = 0
+        # Extents in write order: (offset, length, entry key)
+        self.extents: Deque[Tuple[int, int, bytes]] = deque()
+
+    def write(self, key: bytes, data: bytes) -> Tuple[Tuple[int, int], List[bytes]]:
+        """Append data at the cursor, wrapping at the end.
+
+        Args:
+            key: Key of the entry the data belongs to
+            data: Payload to store (at most capacity bytes)
+
+        Returns:
+            ((offset, length), keys of entries whose payload was overwritten)
+        """
+        if self.cursor + len(data) > self.capacity:
+            self.cursor = 0
+        start, end = self.cursor, self.cursor + len(data)
+
+        overwritten = []
+        while self.extents:
+            offset, length, victim = self.extents[0]
+            # Extents ahead of the cursor are overwritten once it reaches them
+            if offset < end and offset + length > start:
+                overwritten.append(victim)
+                self.extents.popleft()
+            else:
+                break
+
+        self._map[start:end] = data
+        self.extents.append((start, len(data), key))
+        self.cursor = end
+        return (start, len(data)), overwritten
+
+    def read(self, extent: Tuple[int, int]) -> bytes:
+        offset, length = extent
+        return self._map[offset:offset + length]
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.truncate(0)
+        self._file.close()
+
+
+class ClipboardHistory:
+    """Recency-ordered, deduplicated clipboard texts within a byte budget."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_SETTINGS['max_entries'],
+        max_bytes: int = DEFAULT_SETTINGS['max_bytes'],
+        compress_threshold: int = DEFAULT_SETTINGS['compress_threshold'],
+        spill_file: Optional[Path] = None,
+        spill_bytes: int = DEFAULT_SETTINGS['spill_bytes']
+    ):
+        """Create an empty history.
+
+        Args:
+            max_entries: Maximum number of entries
+            max_bytes: Memory budget for entries held in memory
+            compress_threshold: Entries of at least this many bytes are
+                compressed
+            spill_file: File to spill old entries to (memory only if None)
+            spill_bytes: Size of the spill file
+        """
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = max(1, int(max_bytes))
+        self.compress_threshold = int(compress_threshold)
+        # Every entry, and the ones held in memory; oldest first
+        self._entries: 'OrderedDict[bytes, HistoryEntry]' = OrderedDict()
+        self._resident: 'OrderedDict[bytes, HistoryEntry]' = OrderedDict()
+        self._memory = 0
+        self._spill = _SpillFile(spill_file, int(spill_bytes)) if spill_file else None
+        self._recent_texts: 'OrderedDict[bytes, str]' = OrderedDict()  # decoded large entries
+        self._lock = threading.RLock()
+
+        # Counters (guarded by _lock)
+        self._added = 0
+        self._deduplicated = 0
+        self._evicted = 0
+        self._spilled = 0
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> 'ClipboardHistory':
+        """Create a history from ``app.clipboard_history`` settings.
+
+        Args:
+            settings: Settings mapping (missing keys use DEFAULT_SETTINGS)
+
+        Returns:
+            New ClipboardHistory
+        """
+        merged = dict(DEFAULT_SETTINGS)
+        merged.update(settings or {})
+        return cls(
+            max_entries=merged['max_entries'],
+            max_bytes=merged['max_bytes'],
+            compress_threshold=merged['compress_threshold'],
+            spill_file=Path(merged['spill_file']) if merged['spill_file'] else None,
+            spill_bytes=merged['spill_bytes'],
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _hash(data: bytes) -> bytes:
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+    def add(self, text: str) -> bool:
+        """Record a clipboard text as the most recent entry.
+
+        Args:
+            text: Clipboard text
+
+        Returns:
+            True if a new entry was stored, False if it was empty or already
+            present (it is then moved to the front)
+        """
+        if not text:
+            return False
+
+        data = text.encode('utf-8', 'surrogatepass')
+        key = self._hash(data)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._deduplicated += 1
+                entry.copied_at = time.time()
+                self._entries.move_to_end(key)
+                if entry.payload is None:
+                    self._load(entry)
+                else:
+                    self._resident.move_to_end(key)
+                self._enforce_budget()
+                return False
+
+            first_line = text.lstrip().split('\n', 1)[0][:PREVIEW_LENGTH]
+            entry = HistoryEntry(key, len(data), first_line, text)
+            self._store(entry, text, data)
+            self._entries[key] = entry
+            self._added += 1
+            self._enforce_budget()
+            return True
+
+    def _store(self, entry: HistoryEntry, text: str, data: bytes) -> None:
+        """Keep an entry's payload in memory, compressed if large."""
+        if entry.size >= self.compress_threshold:
+            compressed = zlib.compress(data, 6)
+            if len(compressed) < entry.size:
+                entry.payload = compressed
+                entry.compressed = True
+        if entry.payload is None:
+            entry.payload = text
+            entry.compressed = False
+        entry.spilled = None
+        self._resident[entry.key] = entry
+        self._memory += entry.memory
+
+    def _load(self, entry: HistoryEntry) -> None:
+        """Bring a spilled entry back into memory."""
+        data = self._read_spilled(entry)
+        self._store(entry, data.decode('utf-8', 'surrogatepass'), data)
+
+    def _read_spilled(self, entry: HistoryEntry) -> bytes:
+        data = self._spill.read(entry.spilled)
+        return zlib.decompress(data) if entry.compressed else data
+
+    def _enforce_budget(self) -> None:
+        """Spill or drop the oldest entries until within budget."""
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries.values())))
+
+        while self._memory > self.max_bytes and len(self._resident) > 1:
+            oldest = next(iter(self._resident.values()))
+            if self._spill is not None and self._spill_entry(oldest):
+                continue
+            self._drop(oldest)
+
+    def _spill_entry(self, entry: HistoryEntry) -> bool:
+        """Move an entry's payload to the spill file."""
+        if entry.compressed:
+            data = entry.payload
+        else:
+            data = entry.payload.encode('utf-8', 'surrogatepass')
+        if len(data) > self._spill.capacity:
+            return False
+
+        extent, overwritten = self._spill.write(entry.key, data)
+        del self._resident[entry.key]
+        self._memory -= entry.memory
+        entry.payload = None
+        entry.spilled = extent
+        self._spilled += 1
+        for key in overwritten:
+            victim = self._entries.get(key)
+            # Skip extents of entries since reloaded, re-spilled or dropped
+            if victim is not None and victim is not entry and victim.spilled is not None \
+                    and self._overlaps(victim.spilled, extent):
+                self._drop(victim)
+        return True
+
+    @staticmethod
+    def _overlaps(a: Tuple[int, int], b: Tuple[int, int]) -> bool:
+        return a[0] < b[0] + b[1] and b[0] < a[0] + a[1]
+
+    def _drop(self, entry: HistoryEntry) -> None:
+        del self._entries[entry.key]
+        if self._resident.pop(entry.key, None) is not None:
+            self._memory -= entry.memory
+        self._recent_texts.pop(entry.key, None)
+        self._evicted += 1
+
+    def _text(self, entry: HistoryEntry) -> str:
+        """Get an entry's full text, decompressing or reading it back if needed."""
+        if entry.payload is not None and not entry.compressed:
+            return entry.payload
+
+        text = self._recent_texts.get(entry.key)
+        if text is not None:
+            self._recent_texts.move_to_end(entry.key)
+            return text
+
+        if entry.payload is None:
+            data = self._read_spilled(entry)
+        else:
+            data = zlib.decompress(entry.payload)
+        text = data.decode('utf-8', 'surrogatepass')
+        self._recent_texts[entry.key] = text
+        if len(self._recent_texts) > 4:
+            self._recent_texts.popitem(last=False)
+        return text
+
+    def get(self, index: int = 0) -> Optional[str]:
+        """Get an entry by recency.
+
+        Args:
+            index: 0 for the most recent entry, 1 for the one before, ...
+
+        Returns:
+            Entry text, or None if there are not that many entries
+        """
+        with self._lock:
+            if index < 0 or index >= len(self._entries):
+                return None
+            if index < len(self._entries) // 2:
+                values = islice(reversed(self._entries.values()), index, None)
+            else:
+                values = islice(self._entries.values(), len(self._entries) - 1 - index, None)
+            return self._text(next(values))
+
+    def get_by_key(self, key: bytes) -> Optional[str]:
+        """Get an entry by its content hash.
+
+        Args:
+            key: HistoryEntry.key
+
+        Returns:
+            Entry text, or None if it is no longer in the history
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return self._text(entry) if entry is not None else None
+
+    def entries(self) -> Iterator[HistoryEntry]:
+        """Iterate over the entries, most recent first.
+
+        Yields:
+            HistoryEntry objects (snapshot taken when iteration starts)
+        """
+        with self._lock:
+            snapshot = list(reversed(self._entries.values()))
+        yield from snapshot
+
+    def search(self, query: str, limit: int = 50) -> List[HistoryEntry]:
+        """Find entries containing a substring, case-insensitively.
+
+        Queries of three or more characters skip entries whose signature
+        rules them out; shorter ones scan every entry.
+
+        Args:
+            query: Text to look for
+            limit: Maximum number of results
+
+        Returns:
+            Matching entries, most recent first
+        """
+        if not query:
+            return list(self.entries())[:limit]
+
+        pattern = re.compile(re.escape(query), re.IGNORECASE)
+        grams = _trigrams(query.lower())
+        wanted: Dict[int, int] = {}  # signature width -> query signature
+        results = []
+        with self._lock:
+            for entry in reversed(self._entries.values()):
+                if grams:
+                    bits = entry.signature_bits
+                    signature = wanted.get(bits)
+                    if signature is None:
+                        signature = wanted[bits] = _signature(grams, bits)
+                    if entry.signature & signature != signature:
+                        continue
+                if pattern.search(self._text(entry)):
+                    results.append(entry)
+                    if len(results) >= limit:
+                        break
+        return results
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._resident.clear()
+            self._recent_texts.clear()
+            self._memory = 0
+            if self._spill is not None:
+                self._spill.extents.clear()
+                self._spill.cursor = 0
+
+    def close(self) -> None:
+        """Clear the history and truncate the spill file."""
+        with self._lock:
+            self.clear()
+            if self._spill is not None:
+                self._spill.close()
+                self._spill = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get history counters.
+
+        Returns:
+            Dictionary with entry counts, memory and spill use, and counters
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'resident': len(self._resident),
+                'memory_bytes': self._memory,
+                'max_bytes': self.max_bytes,
+                'spilled_entries': len(self._entries) - len(self._resident),
+                'spill_bytes': self._spill.capacity if self._spill is not None else 0,
+                'added': self._added,
+                'deduplicated': self._deduplicated,
+                'evicted': self._evicted,
+                'spilled': self._spilled,
+            }
@@ -0,0 +1,294 @@
+"""Text injection strategies.
+
+Text reaches the focused application in one of two ways:
+
+``type``
+    Every character is sent as a key press and release. Works everywhere,
+    but long text takes a while and anything the user types meanwhile gets
+    mixed in.
+
+``paste``
+    The clipboard is saved, set to the text, the paste chord is sent once
+    and the saved clipboard is put back after ``restore_delay`` (the target
+    application reads the clipboard asynchronously after the chord).
+
+``auto`` (the default) pastes text of at least ``paste_threshold``
+characters and types anything shorter. If the clipboard cannot be set the
+text is typed instead.
+
+Settings come from ``app.injection`` and can be overridden per action with
+``actions.<name>.injection`` (a strategy name or a mapping of settings).
+
+Long typed text can be streamed: it is sent ``chunk_size`` characters at a
+time, progress and throughput are reported every ``progress_interval``
+seconds, and ``request_abort()`` (bound to the ``hotkeys.abort`` chord)
+stops every stream in progress before its next chunk. Streamed text that is
+pasted goes through the clipboard ``paste_block`` characters at a time, so
+the clipboard never holds all of it.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from ..backends import get_platform
+from ..keys import split_chord
+from .clipboard import ClipboardManager
+
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES = ('auto', 'type', 'paste')
+
+DEFAULT_SETTINGS: Dict[str, Any] = {
+    'strategy': 'auto',
+    'paste_threshold': 200,
+    'paste_keys': '<ctrl>+v',
+    'restore_delay': 0.15,
+    'chunk_size': 256,
+    'paste_block': 65536,
+    'progress_interval': 1.0,
+}
+
+_abort_lock = threading.Lock()
+_abort_generation = 0
+
+_progress_listeners: List[Callable[[Dict[str, Any]], None]] = []
+
+
+def request_abort() -> None:
+    """Stop every streaming injection in progress at its next chunk.
+
+    Cheap enough to call from the keyboard hook thread.
+    """
+    global _abort_generation
+    with _abort_lock:
+        _abort_generation += 1
+
+
+def abort_generation() -> int:
+    """Get a token that changes whenever an abort is requested.
+
+    Returns:
+        Current abort generation; compare it later to detect an abort
+    """
+    return _abort_generation
+
+
+def add_progress_listener(callback: Callable[[Dict[str, Any]], None]) -> None:
+    """Receive progress reports from streaming injections.
+
+    Args:
+        callback: Called with InjectionProgress.snapshot() dictionaries
+    """
+    _progress_listeners.append(callback)
+
+
+def remove_progress_listener(callback: Callable[[Dict[str, Any]], None]) -> None:
+    """Stop receiving progress reports.
+
+    Args:
+        callback: Callback passed to add_progress_listener()
+    """
+    if callback in _progress_listeners:
+        _progress_listeners.remove(callback)
+
+
+def resolve_settings(
+    app_settings: Optional[Dict[str, Any]],
+    action_settings: Any = None
+) -> Dict[str, Any]:
+    """Combine the defaults, ``app.injection`` and an action's override.
+
+    Args:
+        app_settings: The ``app.injection`` mapping
+        action_settings: The action's ``injection`` value: a strategy name
+            or a mapping of settings
+
+    Returns:
+        Complete settings dictionary
+    """
+    settings = dict(DEFAULT_SETTINGS)
+    settings.update(app_settings or {})
+    if isinstance(action_settings, str):
+        settings['strategy'] = action_settings
+    elif isinstance(action_settings, dict):
+        settings.update(action_settings)
+
+    if settings['strategy'] not in STRATEGIES:
+        logger.warning(f"Unknown injection strategy {settings['strategy']!r}, using auto")
+        settings['strategy'] = 'auto'
+    return settings
+
+
+class TextInjector:
+    """Sends text to the focused application by typing or pasting."""
+
+    def __init__(self, controller: Any, settings: Optional[Dict[str, Any]] = None, platform=None):
+        """Initialize the injector.
+
+        Args:
+            controller: Key injector
+            settings: Output of resolve_settings() (defaults if None)
+            platform: Platform providing the clipboard and sleep (the active
+                one if None)
+        """
+        self.kb = controller
+        self.settings = settings if settings is not None else resolve_settings(None)
+        self.platform = platform
+        self.paste_keys = split_chord(self.settings['paste_keys'])
+
+    def choose(self, text: str) -> str:
+        """Pick the strategy for a text.
+
+        Args:
+            text: Text about to be injected
+
+        Returns:
+            'type' or 'paste'
+        """
+        return self.choose_length(len(text))
+
+    def choose_length(self, length: int) -> str:
+        """Pick the strategy for a text of a given length.
+
+        Args:
+            length: Number of characters about to be injected (may be an
+                estimate for streamed text)
+
+        Returns:
+            'type' or 'paste'
+        """
+        strategy = self.settings['strategy']
+        if strategy == 'auto':
+            return 'paste' if length >= self.settings['paste_threshold'] else 'type'
+        return strategy
+
+    def inject(self, text: str) -> str:
+        """Send text using the configured strategy.
+
+        Args:
+            text: Text to send
+
+        Returns:
+            Strategy actually used ('type' or 'paste')
+        """
+        if self.choose(text) == 'paste':
+            if self.paste(text):
+                return 'paste'
+            logger.warning("Clipboard paste failed, typing the text instead")
+        self.kb.type(text)
+        return 'type'
+
+    def paste(self, text: str) -> bool:
+        """Paste text through the clipboard, restoring its previous content.
+
+        Args:
+            text: Text to paste
+
+        Returns:
+            True if the text was pasted, False if the clipboard could not be
+            set (nothing was sent)
+        """
+        platform = self.platform or get_platform()
+        clipboard = platform.clipboard
+
+        # The pasted text is not a copy: keep it out of the clipboard history
+        with ClipboardManager.quiet(clipboard):
+            saved = clipboard.save()
+            if not clipboard.set_text(text):
+                return False
+
+            try:
+                for key in self.paste_keys:
+                    self.kb.press(key)
+                for key in reversed(self.paste_keys):
+                    self.kb.release(key)
+            finally:
+                # Give the application time to read the clipboard before it changes
+                platform.sleep(self.settings['restore_delay'])
+                if not clipboard.restore(saved):
+                    logger.warning("Could not restore the clipboard after pasting")
+        return True
+
+
+class InjectionProgress:
+    """Tracks a streaming injection and reports progress and throughput."""
+
+    def __init__(self, total: Optional[int] = None, interval: float = 1.0):
+        """Start tracking.
+
+        Args:
+            total: Expected number of characters, if known
+            interval: Seconds between progress reports
+        """
+        self.total = total
+        self.interval = interval
+        self.chars = 0
+        self.chunks = 0
+        self.started = time.perf_counter()
+        self.finished = False
+        self.aborted = False
+        self._next_report = self.started + interval
+
+    def update(self, chars: int) -> None:
+        """Count a sent chunk, reporting if the interval has passed.
+
+        Args:
+            chars: Characters in the chunk
+        """
+        self.chars += chars
+        self.chunks += 1
+        now = time.perf_counter()
+        if now >= self._next_report:
+            self._next_report = now + self.interval
+            self._report()
+
+    def finish(self, aborted: bool = False) -> Dict[str, Any]:
+        """Stop tracking and send the final report.
+
+        Args:
+            aborted: True if the stream was stopped early
+
+        Returns:
+            Final snapshot()
+        """
+        self.finished = True
+        self.aborted = aborted
+        return self._report()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the current progress.
+
+        Returns:
+            Dictionary with chars, total, chunks, seconds, rate (characters
+            per second), finished and aborted
+        """
+        seconds = time.perf_counter() - self.started
+        return {
+            'chars': self.chars,
+            'total': self.total,
+            'chunks': self.chunks,
+            'seconds': seconds,
+            'rate': self.chars / seconds if seconds > 0 else 0.0,
+            'finished': self.finished,
+            'aborted': self.aborted,
+        }
+
+    def _report(self) -> Dict[str, Any]:
+        progress = self.snapshot()
+        if self.total:
+            percent = min(100.0, 100.0 * progress['chars'] / self.total)
+            done = f"{progress['chars']}/{self.total} chars ({percent:.0f}%)"
+        else:
+            done = f"{progress['chars']} chars"
+        state = "aborted" if self.aborted else "finished" if self.finished else "in progress"
+        logger.info(f"Typing {state}: {done}, {progress['rate']:.0f} chars/s")
+
+        for callback in list(_progress_listeners):
+            try:
+                callback(progress)
+            except Exception as e:
+                logger.error(f"Progress listener failed: {e}")
+        return progress
@@ -1,63 +1,382 @@
 """Keyboard utilities and helpers."""
 
+import itertools
 import logging
-from typing import Any
-from pynput.keyboard import Key
+from typing import Any, Dict, Iterable, List, Optional
+
+from .. import metrics
+from ..scheduling import ActionCancelled, checkpoint
+from ..backends.base import PRESS, RELEASE, TYPE, KeyEvent, KeyInjectionError, send_events
+from .injection import InjectionProgress, TextInjector, abort_generation
 
 
 logger = logging.getLogger(__name__)
 
 
-class KeyboardHelper:
-    """Helper methods for keyboard operations."""
+class KeyBatch:
+    """Collects key events and injects them in one backend submission.
+
+    On Windows a batch becomes a single ``SendInput`` call, so the events
+    reach the application back to back and cannot interleave with the user's
+    typing. Use it as a context manager to flush on exit::
+
+        with helper.batch() as batch:
+            batch.release('<alt>')
+            batch.tap('-', '<up>', '<home>')
+    """
 
     def __init__(self, controller: Any):
-        """Initialize with a keyboard controller.
+        """Initialize an empty batch.
 
         Args:
-            controller: pynput keyboard Controller instance
+            controller: Key injector (objects without ``send`` get one call
+                per event)
         """
         self.kb = controller
+        self.events: List[KeyEvent] = []
+        self.injected = 0
 
-    def release_modifiers(self, *keys: Key) -> None:
-        """Release modifier keys.
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def __enter__(self) -> 'KeyBatch':
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if exc_type is None:
+            self.flush()
+
+    def press(self, *keys: Any) -> 'KeyBatch':
+        """Add key presses.
+
+        Args:
+            keys: Characters or chord tokens such as '<alt>'
+        """
+        self.events.extend((PRESS, key) for key in keys)
+        return self
+
+    def release(self, *keys: Any) -> 'KeyBatch':
+        """Add key releases.
 
         Args:
-            keys: Keys to release (e.g., Key.alt, Key.ctrl)
+            keys: Characters or chord tokens
+        """
+        self.events.extend((RELEASE, key) for key in keys)
+        return self
+
+    def tap(self, *keys: Any) -> 'KeyBatch':
+        """Add a press and release of each key in turn.
+
+        Args:
+            keys: Characters or chord tokens
         """
         for key in keys:
+            self.events.append((PRESS, key))
+            self.events.append((RELEASE, key))
+        self.injected += len(keys)
+        return self
+
+    def type(self, text: str) -> 'KeyBatch':
+        """Add text to type.
+
+        Args:
+            text: Text to type
+        """
+        if text:
+            self.events.append((TYPE, text))
+            self.injected += len(text)
+        return self
+
+    def clear(self) -> None:
+        """Drop the collected events without sending them."""
+        self.events = []
+        self.injected = 0
+
+    def flush(self) -> bool:
+        """Send the collected events and start a new batch.
+
+        A failure is logged and counted once for the whole batch; keys the
+        batch pressed before it failed are released. Before sending, this is
+        a scheduling checkpoint: the action may pause for higher-priority
+        actions here.
+
+        Returns:
+            True if every event was injected
+
+        Raises:
+            ActionCancelled: If the running action was cancelled (the batch
+                is dropped)
+        """
+        events, injected = self.events, self.injected
+        self.clear()
+        if not events:
+            return True
+
+        checkpoint()
+
+        send = getattr(self.kb, 'send', None)
+        try:
+            if send is not None:
+                send(events)
+            else:
+                send_events(self.kb, events)
+        except Exception as e:
+            sent = e.sent if isinstance(e, KeyInjectionError) else 0
+            metrics.note_failure()
+            logger.error(f"Key batch failed after {sent} of {len(events)} events: {e}")
+            self._release_held(events[:sent])
+            return False
+
+        metrics.note_injected(injected)
+        return True
+
+    def _release_held(self, events: List[KeyEvent]) -> None:
+        """Release keys left pressed by the sent part of a failed batch."""
+        held: List[Any] = []
+        for kind, key in events:
+            if kind == PRESS and key not in held:
+                held.append(key)
+            elif kind == RELEASE and key in held:
+                held.remove(key)
+        for key in reversed(held):
             try:
                 self.kb.release(key)
             except Exception as e:
                 logger.warning(f"Failed to release key {key}: {e}")
 
+
+def _blocks(chunks: Iterable[str], size: int) -> Iterable[str]:
+    """Join pieces of text into blocks of at least ``size`` characters.
+
+    Args:
+        chunks: Pieces of text
+        size: Smallest block (only the last block may be shorter)
+
+    Yields:
+        Blocks of text
+    """
+    pending: List[str] = []
+    length = 0
+    for chunk in chunks:
+        pending.append(chunk)
+        length += len(chunk)
+        if length >= size:
+            yield ''.join(pending)
+            pending = []
+            length = 0
+    if pending:
+        yield ''.join(pending)
+
+
+class KeyboardHelper:
+    """Helper methods for keyboard operations."""
+
+    def __init__(self, controller: Any, injection: Optional[Dict[str, Any]] = None):
+        """Initialize with a keyboard controller.
+
+        Args:
+            controller: Key injector (see customhk.backends.KeyInjector)
+            injection: Text injection settings (see utils.injection)
+        """
+        self.kb = controller
+        self.injector = TextInjector(controller, injection)
+
+    def batch(self) -> KeyBatch:
+        """Start a batch of key events sent in one submission.
+
+        Returns:
+            Empty KeyBatch on this helper's controller
+        """
+        return KeyBatch(self.kb)
+
+    def release_modifiers(self, *keys: Any) -> None:
+        """Release modifier keys.
+
+        Args:
+            keys: Keys to release (e.g., '<alt>', '<ctrl>')
+        """
+        self.batch().release(*keys).flush()
+
     def type_text(self, text: str, release_alt: bool = True) -> None:
         """Type text, optionally releasing alt first.
 
+        Long text may be pasted through the clipboard instead, depending on
+        the injection settings.
+
         Args:
             text: Text to type
             release_alt: If True, release alt key before typing
         """
+        batch = self.batch()
         if release_alt:
-            self.release_modifiers(Key.alt)
+            batch.release('<alt>')
+
+        if self.injector.choose(text) == 'type':
+            batch.type(text).flush()
+            return
+        batch.flush()
 
         try:
-            self.kb.type(text)
+            self.injector.inject(text)
+            metrics.note_injected(len(text))
         except Exception as e:
+            metrics.note_failure()
             logger.error(f"Failed to type text: {e}")
 
+    def type_stream(
+        self,
+        chunks: Iterable[str],
+        total: Optional[int] = None,
+        release_alt: bool = True
+    ) -> bool:
+        """Type text produced piece by piece, one batch per chunk.
+
+        Text is consumed as it is typed, so it never has to exist as one
+        string. Progress is reported while typing, and the stream stops
+        before the next chunk when an abort is requested (``hotkeys.abort``).
+        Between chunks, higher-priority actions may run first.
+
+        Args:
+            chunks: Pieces of text, ideally about ``chunk_size`` characters
+            total: Expected number of characters, for progress reports
+            release_alt: If True, release alt key before typing
+
+        Returns:
+            True if all text was typed, False if aborted or failed
+
+        Raises:
+            ActionCancelled: If the running action was cancelled
+        """
+        token = abort_generation()
+        progress = InjectionProgress(total, self.injector.settings['progress_interval'])
+        batch = self.batch()
+        if release_alt:
+            batch.release('<alt>')
+
+        for chunk in chunks:
+            if abort_generation() != token:
+                progress.finish(aborted=True)
+                return False
+            try:
+                sent = batch.type(chunk).flush()
+            except ActionCancelled:
+                progress.finish(aborted=True)
+                raise
+            if not sent:
+                progress.finish()
+                return False
+            progress.update(len(chunk))
+
+        batch.flush()
+        progress.finish()
+        return True
+
+    def send_stream(
+        self,
+        chunks: Iterable[str],
+        total: Optional[int] = None,
+        release_alt: bool = True
+    ) -> bool:
+        """Type or paste text produced piece by piece, by its actual length.
+
+        With the ``auto`` strategy, pieces are read ahead until
+        ``paste_threshold`` characters were produced or the text ended, so
+        short output is typed and long output pasted without holding more
+        than the threshold.
+
+        Args:
+            chunks: Pieces of text
+            total: Expected number of characters, for progress reports
+            release_alt: If True, release alt key first
+
+        Returns:
+            True if all text was sent, False if aborted or failed
+
+        Raises:
+            ActionCancelled: If the running action was cancelled
+        """
+        chunks = iter(chunks)
+        threshold = self.injector.settings['paste_threshold']
+        head: List[str] = []
+        length = 0
+        if self.injector.settings['strategy'] == 'auto':
+            for chunk in chunks:
+                head.append(chunk)
+                length += len(chunk)
+                if length >= threshold:
+                    break
+
+        stream = itertools.chain(head, chunks)
+        if self.injector.choose_length(length) == 'paste':
+            return self.paste_stream(stream, total, release_alt)
+        return self.type_stream(stream, total, release_alt)
+
+    def paste_stream(
+        self,
+        chunks: Iterable[str],
+        total: Optional[int] = None,
+        release_alt: bool = True
+    ) -> bool:
+        """Paste text produced piece by piece, one clipboard block at a time.
+
+        Pieces are collected into blocks of about ``paste_block`` characters
+        and each block is pasted on its own, so neither the text nor the
+        clipboard ever holds more than one block. Aborts, cancellation and
+        progress work as in type_stream(), between blocks. A block the
+        clipboard refuses is typed instead.
+
+        Args:
+            chunks: Pieces of text
+            total: Expected number of characters, for progress reports
+            release_alt: If True, release alt key before pasting
+
+        Returns:
+            True if all text was sent, False if aborted or failed
+
+        Raises:
+            ActionCancelled: If the running action was cancelled
+        """
+        token = abort_generation()
+        progress = InjectionProgress(total, self.injector.settings['progress_interval'])
+        if release_alt:
+            self.release_modifiers('<alt>')
+
+        for block in _blocks(chunks, self.injector.settings['paste_block']):
+            if abort_generation() != token:
+                progress.finish(aborted=True)
+                return False
+            try:
+                checkpoint()
+            except ActionCancelled:
+                progress.finish(aborted=True)
+                raise
+
+            try:
+                pasted = self.injector.paste(block)
+            except Exception as e:
+                metrics.note_failure()
+                logger.error(f"Failed to paste text: {e}")
+                progress.finish()
+                return False
+            if pasted:
+                metrics.note_injected(len(block))
+            else:
+                logger.warning("Clipboard paste failed, typing the text instead")
+                if not self.batch().type(block).flush():
+                    progress.finish()
+                    return False
+            progress.update(len(block))
+
+        progress.finish()
+        return True
+
     def press_key_sequence(self, *keys: Any) -> None:
         """Press and release a sequence of keys.
 
         Args:
             keys: Keys to press in sequence
         """
-        for key in keys:
-            try:
-                self.kb.press(key)
-                self.kb.release(key)
-            except Exception as e:
-                logger.error(f"Failed to press key {key}: {e}")
+        self.batch().tap(*keys).flush()
 
     def hold_keys(self, *keys: Any) -> None:
         """Press multiple keys simultaneously (hold them down).
@@ -65,11 +384,7 @@ class KeyboardHelper:
         Args:
             keys: Keys to press
         """
-        for key in keys:
-            try:
-                self.kb.press(key)
-            except Exception as e:
-                logger.error(f"Failed to press key {key}: {e}")
+        self.batch().press(*keys).flush()
 
     def release_keys(self, *keys: Any) -> None:
         """Release multiple keys.
@@ -77,8 +392,4 @@ class KeyboardHelper:
         Args:
             keys: Keys to release
         """
-        for key in keys:
-            try:
-                self.kb.release(key)
-            except Exception as e:
-                logger.error(f"Failed to release key {key}: {e}")
+        self.batch().release(*keys).flush()
@@ -0,0 +1,111 @@
+"""A shared timer thread for work that waits without holding a thread."""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Any, Callable, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class TimerThread:
+    """Runs callbacks at monotonic deadlines on one daemon thread.
+
+    Callbacks run in deadline order, one at a time, so they should be short:
+    a callback that has more to wait for schedules itself again instead of
+    sleeping.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic, name: str = 'customhk-timers'):
+        """Initialize the timer thread (started on first use).
+
+        Args:
+            clock: Monotonic time source in seconds
+            name: Thread name
+        """
+        self.clock = clock
+        self.name = name
+        self._timers: List[Any] = []
+        self._sequence = itertools.count()
+        self._changed = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        # Bumped by stop(); a thread exits once it no longer matches, so a
+        # thread started right after a stop never revives the old one
+        self._generation = 0
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> None:
+        """Run a callback once ``delay`` seconds have passed.
+
+        Args:
+            delay: Seconds from now
+            callback: Called with no arguments on the timer thread
+        """
+        when = self.clock() + max(0.0, delay)
+        with self._changed:
+            heapq.heappush(self._timers, (when, next(self._sequence), callback))
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, args=(self._generation,), name=self.name, daemon=True
+                )
+                self._thread.start()
+            self._changed.notify()
+
+    def _run(self, generation: int) -> None:
+        while True:
+            with self._changed:
+                while True:
+                    if self._generation != generation:
+                        return
+                    if not self._timers:
+                        self._changed.wait()
+                        continue
+                    delay = self._timers[0][0] - self.clock()
+                    if delay <= 0:
+                        _, _, callback = heapq.heappop(self._timers)
+                        break
+                    self._changed.wait(delay)
+
+            try:
+                callback()
+            except Exception as e:
+                logger.exception(f"Timer callback failed: {e}")
+
+    def pending(self) -> int:
+        """Get the number of callbacks not yet run."""
+        with self._changed:
+            return len(self._timers)
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """Drop pending callbacks and stop the thread.
+
+        Args:
+            timeout: Seconds to wait for a running callback to finish
+        """
+        with self._changed:
+            thread, self._thread = self._thread, None
+            self._timers.clear()
+            self._generation += 1
+            self._changed.notify_all()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+
+_timers: Optional[TimerThread] = None
+_timers_lock = threading.Lock()
+
+
+def get_timers() -> TimerThread:
+    """Get the shared timer thread.
+
+    Returns:
+        TimerThread
+    """
+    global _timers
+    if _timers is None:
+        with _timers_lock:
+            if _timers is None:
+                _timers = TimerThread()
+    return _timers
@@ -2,113 +2,576 @@
 
 import logging
 import re
-from typing import Optional
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Dict, NamedTuple, Optional, Pattern, Tuple
 import ctypes
-from ctypes import wintypes
 
 
 logger = logging.getLogger(__name__)
 
 
-class WindowManager:
-    """Manages window detection and querying for app-specific hotkeys."""
+class WindowContext(NamedTuple):
+    """Snapshot of the foreground window.
 
-    @staticmethod
-    def get_active_window_title() -> Optional[str]:
-        """Get the title of the currently active window.
+    A new snapshot is taken once per focus (or title) change and shared by
+    every caller until the next one.
+    """
+
+    title: Optional[str]
+    process: Optional[str]
+    window_class: Optional[str] = None
+    hwnd: int = 0
+    pid: int = 0
+    serial: int = 0
+
+
+_EMPTY_CONTEXT = WindowContext(None, None)
+
+
+@lru_cache(maxsize=256)
+def _compile_pattern(pattern: str, flags: int) -> Optional[Pattern]:
+    """Compile and cache a window pattern.
+
+    Args:
+        pattern: Regex pattern
+        flags: Regex flags
+
+    Returns:
+        Compiled pattern or None if the pattern is invalid
+    """
+    try:
+        return re.compile(pattern, flags)
+    except re.error as e:
+        logger.error(f"Invalid regex pattern '{pattern}': {e}")
+        return None
+
+
+class WindowBackend(ABC):
+    """Source of foreground-window information.
+
+    The Win32 backend talks to user32/kernel32; other backends (fakes,
+    simulators) let the caching logic run anywhere.
+    """
+
+    @abstractmethod
+    def foreground_window(self) -> int:
+        """Get the handle of the foreground window (0 if none)."""
+
+    @abstractmethod
+    def window_title(self, hwnd: int) -> Optional[str]:
+        """Get a window's title."""
+
+    @abstractmethod
+    def window_class(self, hwnd: int) -> Optional[str]:
+        """Get a window's class name."""
+
+    @abstractmethod
+    def window_pid(self, hwnd: int) -> int:
+        """Get the id of the process owning a window (0 if unknown)."""
+
+    @abstractmethod
+    def process_start_time(self, pid: int) -> Optional[int]:
+        """Get a process's creation time, used to detect pid reuse."""
+
+    @abstractmethod
+    def process_image(self, pid: int) -> Optional[str]:
+        """Get the full executable path of a process."""
+
+    def watch_focus(self, callback: Callable[[int], None]) -> bool:
+        """Start delivering focus/title change events.
+
+        Args:
+            callback: Called with the window handle on every change
 
         Returns:
-            Window title string or None if unable to get title
+            True if events are supported, False to fall back to polling
         """
-        try:
-            # Get handle to foreground window
-            user32 = ctypes.windll.user32
-            hwnd = user32.GetForegroundWindow()
+        return False
 
-            if not hwnd:
-                return None
+    def unwatch_focus(self) -> None:
+        """Stop delivering focus change events."""
+
+
+class Win32WindowBackend(WindowBackend):
+    """Window backend using the Win32 API via ctypes."""
+
+    EVENT_SYSTEM_FOREGROUND = 0x0003
+    EVENT_OBJECT_NAMECHANGE = 0x800C
+    WINEVENT_OUTOFCONTEXT = 0x0000
+    WINEVENT_SKIPOWNPROCESS = 0x0002
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    WM_QUIT = 0x0012
+
+    def __init__(self) -> None:
+        """Initialize the backend."""
+        from ctypes import wintypes
+
+        self.user32 = ctypes.windll.user32
+        self.kernel32 = ctypes.windll.kernel32
+        self._wintypes = wintypes
+        self._thread: Optional[threading.Thread] = None
+        self._thread_id = 0
+
+    def foreground_window(self) -> int:
+        return self.user32.GetForegroundWindow() or 0
 
-            # Get window title length
-            length = user32.GetWindowTextLengthW(hwnd)
-            if length == 0:
+    def window_title(self, hwnd: int) -> Optional[str]:
+        # Get window title length
+        length = self.user32.GetWindowTextLengthW(hwnd)
+        if length == 0:
+            return None
+
+        # Get window title
+        buffer = ctypes.create_unicode_buffer(length + 1)
+        self.user32.GetWindowTextW(hwnd, buffer, length + 1)
+        return buffer.value
+
+    def window_class(self, hwnd: int) -> Optional[str]:
+        buffer = ctypes.create_unicode_buffer(256)
+        if not self.user32.GetClassNameW(hwnd, buffer, 256):
+            return None
+        return buffer.value
+
+    def window_pid(self, hwnd: int) -> int:
+        pid = self._wintypes.DWORD()
+        self.user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+        return pid.value
+
+    def _open_process(self, pid: int) -> Any:
+        return self.kernel32.OpenProcess(self.PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+
+    def process_start_time(self, pid: int) -> Optional[int]:
+        process = self._open_process(pid)
+        if not process:
+            return None
+
+        try:
+            FILETIME = self._wintypes.FILETIME
+            creation, exit_time = FILETIME(), FILETIME()
+            kernel_time, user_time = FILETIME(), FILETIME()
+            if not self.kernel32.GetProcessTimes(
+                process,
+                ctypes.byref(creation),
+                ctypes.byref(exit_time),
+                ctypes.byref(kernel_time),
+                ctypes.byref(user_time)
+            ):
                 return None
+            return (creation.dwHighDateTime << 32) | creation.dwLowDateTime
+        finally:
+            self.kernel32.CloseHandle(process)
 
-            # Get window title
-            buffer = ctypes.create_unicode_buffer(length + 1)
-            user32.GetWindowTextW(hwnd, buffer, length + 1)
+    def process_image(self, pid: int) -> Optional[str]:
+        process = self._open_process(pid)
+        if not process:
+            return None
 
-            return buffer.value
-        except Exception as e:
-            logger.error(f"Failed to get active window title: {e}")
+        try:
+            buffer = ctypes.create_unicode_buffer(260)
+            size = self._wintypes.DWORD(260)
+            if self.kernel32.QueryFullProcessImageNameW(process, 0, buffer, ctypes.byref(size)):
+                return buffer.value
             return None
+        finally:
+            self.kernel32.CloseHandle(process)
 
-    @staticmethod
-    def get_active_window_class() -> Optional[str]:
-        """Get the class name of the currently active window.
+    def watch_focus(self, callback: Callable[[int], None]) -> bool:
+        if self._thread is not None:
+            return True
+
+        ready = threading.Event()
+        self._thread = threading.Thread(
+            target=self._event_loop,
+            args=(callback, ready),
+            name="customhk-winevents",
+            daemon=True
+        )
+        self._thread.start()
+        ready.wait(2.0)
+        return self._thread_id != 0
+
+    def unwatch_focus(self) -> None:
+        if self._thread is None:
+            return
+
+        if self._thread_id:
+            self.user32.PostThreadMessageW(self._thread_id, self.WM_QUIT, 0, 0)
+        self._thread.join(2.0)
+        self._thread = None
+        self._thread_id = 0
+
+    def _event_loop(self, callback: Callable[[int], None], ready: threading.Event) -> None:
+        """Own the WinEvent hooks and pump messages so they get delivered.
+
+        Foreground changes are hooked globally; title changes are hooked only
+        for the current foreground process, re-registered on every focus
+        change so unrelated name-change traffic never reaches Python.
+        """
+        user32 = self.user32
+        wintypes = self._wintypes
+        flags = self.WINEVENT_OUTOFCONTEXT | self.WINEVENT_SKIPOWNPROCESS
+        state = {'foreground': 0, 'name_hook': None}
+
+        WinEventProc = ctypes.WINFUNCTYPE(
+            None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+            wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+        )
+        user32.SetWinEventHook.restype = wintypes.HANDLE
+        user32.SetWinEventHook.argtypes = [
+            wintypes.DWORD, wintypes.DWORD, wintypes.HMODULE, WinEventProc,
+            wintypes.DWORD, wintypes.DWORD, wintypes.DWORD
+        ]
+        user32.UnhookWinEvent.argtypes = [wintypes.HANDLE]
+
+        def on_event(hook, event, hwnd, id_object, id_child, thread, event_time):
+            try:
+                if event == self.EVENT_SYSTEM_FOREGROUND:
+                    state['foreground'] = hwnd or 0
+                    if state['name_hook']:
+                        user32.UnhookWinEvent(state['name_hook'])
+                    pid = self.window_pid(hwnd) if hwnd else 0
+                    state['name_hook'] = user32.SetWinEventHook(
+                        self.EVENT_OBJECT_NAMECHANGE, self.EVENT_OBJECT_NAMECHANGE,
+                        0, proc, pid, 0, flags
+                    ) if pid else None
+                    callback(hwnd or 0)
+                elif hwnd == state['foreground'] and id_object == 0 and id_child == 0:
+                    # OBJID_WINDOW / CHILDID_SELF: the foreground title changed
+                    callback(hwnd)
+            except Exception as e:
+                logger.error(f"Error handling window event: {e}")
+
+        proc = WinEventProc(on_event)
+        hook = user32.SetWinEventHook(
+            self.EVENT_SYSTEM_FOREGROUND, self.EVENT_SYSTEM_FOREGROUND,
+            0, proc, 0, 0, flags
+        )
+        if not hook:
+            logger.warning("SetWinEventHook failed, falling back to polling")
+            ready.set()
+            return
+
+        self._thread_id = self.kernel32.GetCurrentThreadId()
+        ready.set()
+
+        msg = wintypes.MSG()
+        while user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
+
+        if state['name_hook']:
+            user32.UnhookWinEvent(state['name_hook'])
+        user32.UnhookWinEvent(hook)
+
+
+class ProcessNameCache:
+    """LRU of pid -> executable name, guarded against pid reuse.
+
+    Each entry remembers the process creation time; a pid that has been
+    recycled for a different process has a different creation time and is
+    looked up again instead of returning the old executable name.
+    """
+
+    def __init__(self, backend: WindowBackend, max_size: int = 64):
+        """Initialize the cache.
+
+        Args:
+            backend: Window backend used for process queries
+            max_size: Maximum number of pids to remember
+        """
+        self.backend = backend
+        self.max_size = max(1, max_size)
+        self._entries: 'OrderedDict[int, Tuple[Optional[int], Optional[str]]]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.reused = 0
+
+    def get(self, pid: int) -> Optional[str]:
+        """Get the executable name for a pid.
+
+        Args:
+            pid: Process id
 
         Returns:
-            Window class name or None if unable to get class
+            Executable name (e.g. ``OUTLOOK.EXE``) or None
         """
-        try:
-            user32 = ctypes.windll.user32
-            hwnd = user32.GetForegroundWindow()
+        if not pid:
+            return None
+
+        start_time = self.backend.process_start_time(pid)
+        entry = self._entries.get(pid)
+        if entry is not None:
+            if start_time is not None and entry[0] == start_time:
+                self._entries.move_to_end(pid)
+                self.hits += 1
+                return entry[1]
+            self.reused += 1
+
+        self.misses += 1
+        image = self.backend.process_image(pid)
+        name = image.replace('/', '\\').split('\\')[-1] if image else None
+
+        self._entries[pid] = (start_time, name)
+        self._entries.move_to_end(pid)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return name
+
+    def clear(self) -> None:
+        """Forget all cached pids."""
+        self._entries.clear()
+
+
+class ForegroundContextCache:
+    """Caches the foreground window snapshot between focus changes.
+
+    With an event-capable backend the snapshot is invalidated by focus and
+    title change events, so lookups between changes cost nothing. Otherwise
+    every lookup polls the foreground window handle (one cheap call) and the
+    title is re-read at most every ``max_age`` seconds.
+    """
+
+    def __init__(
+        self,
+        backend: WindowBackend,
+        max_age: float = 0.25,
+        pid_cache_size: int = 64,
+        use_events: bool = True
+    ):
+        """Initialize the cache.
+
+        Args:
+            backend: Window backend to query
+            max_age: Seconds before a polled snapshot's title is re-read
+            pid_cache_size: Number of pid -> executable entries to keep
+            use_events: Subscribe to focus change events when supported
+        """
+        self.backend = backend
+        self.max_age = max_age
+        self.processes = ProcessNameCache(backend, pid_cache_size)
+        self.use_events = use_events
+        self._lock = threading.Lock()
+        self._snapshot: WindowContext = _EMPTY_CONTEXT
+        self._taken_at = 0.0
+        self._generation = 0
+        self._snapshot_generation = -1
+        self._serial = 0
+        self._started = False
+        self.event_driven = False
+
+        self.lookups = 0
+        self.refreshes = 0
+        self.events = 0
+
+    def start(self) -> None:
+        """Subscribe to focus change events (falls back to polling)."""
+        if self._started:
+            return
+        self._started = True
+
+        if self.use_events:
+            try:
+                self.event_driven = self.backend.watch_focus(self.invalidate)
+            except Exception as e:
+                logger.warning(f"Focus change events unavailable: {e}")
+                self.event_driven = False
+
+        mode = "event-driven" if self.event_driven else "polling"
+        logger.info(f"Foreground window cache started ({mode})")
+
+    def stop(self) -> None:
+        """Unsubscribe from focus change events."""
+        if self._started and self.event_driven:
+            self.backend.unwatch_focus()
+        self._started = False
+        self.event_driven = False
+
+    def invalidate(self, hwnd: int = 0) -> None:
+        """Mark the snapshot stale. Called from the focus event source.
+
+        Args:
+            hwnd: Window that gained focus or changed title (unused)
+        """
+        self.events += 1
+        self._generation += 1
+
+    def get(self) -> WindowContext:
+        """Get the current foreground window snapshot.
+
+        Returns:
+            WindowContext shared by all callers until the next change
+        """
+        if not self._started:
+            self.start()
+
+        self.lookups += 1
+        snapshot = self._snapshot
+
+        if self.event_driven:
+            if self._snapshot_generation == self._generation:
+                return snapshot
+            return self._refresh(None)
+
+        hwnd = self.backend.foreground_window()
+        if (hwnd == snapshot.hwnd and self._snapshot_generation == self._generation
+                and time.monotonic() - self._taken_at < self.max_age):
+            return snapshot
+        return self._refresh(hwnd)
+
+    def _refresh(self, hwnd: Optional[int]) -> WindowContext:
+        """Take a new snapshot.
 
+        Args:
+            hwnd: Foreground window handle if already known
+
+        Returns:
+            New (or unchanged) WindowContext
+        """
+        with self._lock:
+            generation = self._generation
+            if hwnd is None:
+                hwnd = self.backend.foreground_window()
+
+            previous = self._snapshot
             if not hwnd:
-                return None
+                snapshot = _EMPTY_CONTEXT
+            elif hwnd == previous.hwnd and previous.pid:
+                # Same window (title may have changed): the process is unchanged
+                title = self.backend.window_title(hwnd)
+                snapshot = previous if title == previous.title else previous._replace(
+                    title=title, serial=self._serial + 1
+                )
+            else:
+                pid = self.backend.window_pid(hwnd)
+                snapshot = WindowContext(
+                    title=self.backend.window_title(hwnd),
+                    process=self.processes.get(pid),
+                    window_class=self.backend.window_class(hwnd),
+                    hwnd=hwnd,
+                    pid=pid,
+                    serial=self._serial + 1
+                )
+
+            if snapshot is not previous:
+                self._serial = snapshot.serial or self._serial
+                self.refreshes += 1
+
+            self._snapshot = snapshot
+            self._snapshot_generation = generation
+            self._taken_at = time.monotonic()
+            return snapshot
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache counters.
 
-            buffer = ctypes.create_unicode_buffer(256)
-            user32.GetClassNameW(hwnd, buffer, 256)
+        Returns:
+            Dictionary of lookup, refresh and pid cache statistics
+        """
+        return {
+            'event_driven': self.event_driven,
+            'lookups': self.lookups,
+            'refreshes': self.refreshes,
+            'events': self.events,
+            'pid_hits': self.processes.hits,
+            'pid_misses': self.processes.misses,
+            'pid_reused': self.processes.reused,
+        }
+
+
+_context_cache: Optional[ForegroundContextCache] = None
+_context_cache_lock = threading.Lock()
 
-            return buffer.value
-        except Exception as e:
-            logger.error(f"Failed to get active window class: {e}")
-            return None
+
+class WindowManager:
+    """Manages window detection and querying for app-specific hotkeys."""
 
     @staticmethod
-    def get_active_process_name() -> Optional[str]:
-        """Get the process name of the currently active window.
+    def get_context_cache() -> ForegroundContextCache:
+        """Get the shared foreground context cache, creating it on first use.
 
         Returns:
-            Process name or None if unable to get process name
+            ForegroundContextCache using the active platform's window
+            backend unless another backend was installed with set_backend()
         """
-        try:
-            user32 = ctypes.windll.user32
-            kernel32 = ctypes.windll.kernel32
+        global _context_cache
+        if _context_cache is None:
+            from ..backends import get_platform
 
-            hwnd = user32.GetForegroundWindow()
-            if not hwnd:
-                return None
+            with _context_cache_lock:
+                if _context_cache is None:
+                    _context_cache = ForegroundContextCache(get_platform().window)
+        return _context_cache
 
-            # Get process ID
-            pid = wintypes.DWORD()
-            user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+    @staticmethod
+    def reset_context_cache() -> None:
+        """Drop the shared cache; the next lookup builds a new one."""
+        global _context_cache
+        with _context_cache_lock:
+            if _context_cache is not None:
+                _context_cache.stop()
+            _context_cache = None
 
-            # Open process
-            PROCESS_QUERY_INFORMATION = 0x0400
-            PROCESS_VM_READ = 0x0010
-            process = kernel32.OpenProcess(
-                PROCESS_QUERY_INFORMATION | PROCESS_VM_READ,
-                False,
-                pid
-            )
+    @staticmethod
+    def set_backend(backend: WindowBackend, **cache_options: Any) -> ForegroundContextCache:
+        """Replace the shared cache with one using a different backend.
 
-            if not process:
-                return None
+        Args:
+            backend: Window backend to use
+            cache_options: Extra ForegroundContextCache arguments
 
-            # Get process name
-            buffer = ctypes.create_unicode_buffer(260)
-            size = wintypes.DWORD(260)
+        Returns:
+            The new ForegroundContextCache
+        """
+        global _context_cache
+        with _context_cache_lock:
+            if _context_cache is not None:
+                _context_cache.stop()
+            _context_cache = ForegroundContextCache(backend, **cache_options)
+        return _context_cache
 
-            if kernel32.QueryFullProcessImageNameW(process, 0, buffer, ctypes.byref(size)):
-                kernel32.CloseHandle(process)
-                # Extract just the process name from full path
-                return buffer.value.split('\\')[-1]
+    @staticmethod
+    def get_active_context() -> WindowContext:
+        """Get a snapshot of the foreground window.
 
-            kernel32.CloseHandle(process)
-            return None
+        Returns:
+            WindowContext; fields are None when they cannot be determined
+        """
+        try:
+            return WindowManager.get_context_cache().get()
         except Exception as e:
-            logger.error(f"Failed to get active process name: {e}")
-            return None
+            logger.error(f"Failed to get active window context: {e}")
+            return _EMPTY_CONTEXT
+
+    @staticmethod
+    def get_active_window_title() -> Optional[str]:
+        """Get the title of the currently active window.
+
+        Returns:
+            Window title string or None if unable to get title
+        """
+        return WindowManager.get_active_context().title
+
+    @staticmethod
+    def get_active_window_class() -> Optional[str]:
+        """Get the class name of the currently active window.
+
+        Returns:
+            Window class name or None if unable to get class
+        """
+        return WindowManager.get_active_context().window_class
+
+    @staticmethod
+    def get_active_process_name() -> Optional[str]:
+        """Get the process name of the currently active window.
+
+        Returns:
+            Process name or None if unable to get process name
+        """
+        return WindowManager.get_active_context().process
 
     @staticmethod
     def matches_window_pattern(pattern: str, case_sensitive: bool = False) -> bool:
@@ -125,12 +588,8 @@ class WindowManager:
         if not title:
             return False
 
-        try:
-            flags = 0 if case_sensitive else re.IGNORECASE
-            return bool(re.search(pattern, title, flags))
-        except re.error as e:
-            logger.error(f"Invalid regex pattern '{pattern}': {e}")
-            return False
+        compiled = _compile_pattern(pattern, 0 if case_sensitive else re.IGNORECASE)
+        return bool(compiled and compiled.search(title))
 
     @staticmethod
     def is_window_active(window_identifier: str) -> bool:
@@ -142,8 +601,8 @@ class WindowManager:
         Returns:
             True if matching window is active
         """
-        title = WindowManager.get_active_window_title()
-        process = WindowManager.get_active_process_name()
+        context = WindowManager.get_active_context()
+        title, process = context.title, context.process
 
         if not title:
             return False
@@ -153,7 +612,8 @@ class WindowManager:
             return True
 
         # Try regex match on title
-        if WindowManager.matches_window_pattern(window_identifier):
+        compiled = _compile_pattern(window_identifier, re.IGNORECASE)
+        if compiled and compiled.search(title):
             return True
 
         # Try process name match
@@ -0,0 +1,67 @@
+"""Tests for the clipboard history."""
+
+from customhk.backends import set_platform
+from customhk.backends.simulator import Simulator
+from customhk.utils.clipboard import ClipboardManager
+from customhk.utils.clipboard_history import ClipboardHistory
+
+
+def test_simulated_copies_are_recorded_once_each():
+    sim = Simulator()
+    set_platform(sim)
+    history = ClipboardManager.configure_history({'enabled': True})
+    try:
+        for text in ["one", "two", "one", ""]:
+            sim.clipboard.text = text
+        assert [entry.preview for entry in history.entries()] == ["one", "two"]
+        assert history.get(1) == "two"
+        stats = history.get_stats()
+        assert (stats['added'], stats['deduplicated']) == (2, 1)
+    finally:
+        ClipboardManager.reset_history()
+    assert ClipboardManager.get_history() is None
+
+
+def test_oldest_entries_spill_and_come_back(tmp_path):
+    spill = tmp_path / 'history.bin'
+    history = ClipboardHistory(max_bytes=2000, compress_threshold=1500,
+                               spill_file=spill, spill_bytes=10000)
+    texts = [str(i) * 1000 for i in range(3)] + ["large " * 500]
+    for text in texts:
+        history.add(text)
+
+    stats = history.get_stats()
+    assert stats['entries'] == 4 and stats['spilled'] >= 2
+    assert stats['memory_bytes'] <= 2000
+    assert [history.get(i) for i in range(4)] == texts[::-1]
+    assert [entry.preview for entry in history.search("111")] == ["1" * 80]
+
+    # Copying a spilled text again brings it back into memory
+    assert not history.add(texts[0])
+    assert history.get(0) == texts[0]
+    assert history.get_stats()['deduplicated'] == 1
+
+    history.close()
+    assert spill.stat().st_size == 0
+
+
+def test_spill_ring_drops_the_entries_it_overwrites(tmp_path):
+    history = ClipboardHistory(max_bytes=2000, compress_threshold=10 ** 9,
+                               spill_file=tmp_path / 'history.bin', spill_bytes=2500)
+    texts = [str(i) * 1000 for i in range(8)]
+    for text in texts:
+        history.add(text)
+
+    # One entry in memory, two in the ring; the rest were overwritten
+    assert len(history) == 3
+    assert [history.get(i) for i in range(3)] == texts[:4:-1]
+    assert history.get(3) is None
+    assert history.get_stats()['evicted'] == 5
+    history.close()
+
+
+def test_max_entries_drops_the_oldest():
+    history = ClipboardHistory(max_entries=2)
+    for text in ["a", "b", "c"]:
+        history.add(text)
+    assert [history.get(i) for i in range(3)] == ["c", "b", None]
@@ -0,0 +1,100 @@
+"""Tests for the clipboard worker's retries and deadlines."""
+
+import threading
+
+from customhk.backends.clipboard_worker import ClipboardWorker
+from customhk.backends.simulator import Simulator
+
+
+def make_worker(sim, settings, delays):
+    def sleep(seconds):
+        delays.append(seconds)
+        sim.sleep(seconds)
+
+    calls = []
+    worker = ClipboardWorker(sim.clipboard, settings, clock=sim.now, sleep=sleep,
+                             observer=lambda *args: calls.append(args))
+    return worker, calls
+
+
+def test_busy_clipboard_is_retried_with_growing_delays():
+    sim = Simulator()
+    sim.clipboard.busy_when = lambda now: now < 0.05
+    delays = []
+    worker, calls = make_worker(sim, {'base_delay': 0.01, 'max_delay': 0.1}, delays)
+    try:
+        assert worker.set_text("copied")
+    finally:
+        worker.stop()
+
+    assert sim.clipboard.text == "copied"
+    assert sim.counts['clipboard_busy'] == len(delays) >= 2
+    assert all(later > earlier for earlier, later in zip(delays, delays[1:]))
+    assert all(delay <= 0.1 for delay in delays)
+    operation, outcome, attempts, _ = calls[0]
+    assert (operation, outcome, attempts) == ('set_text', 'retried', len(delays) + 1)
+    assert worker.get_stats()['outcomes']['retried'] == 1
+
+
+def test_worker_gives_up_after_its_retries_or_deadline():
+    sim = Simulator()
+    sim.clipboard.text = "theirs"
+    sim.clipboard.busy_when = lambda now: True
+    delays = []
+    worker, calls = make_worker(sim, {'retries': 3, 'base_delay': 0.001}, delays)
+    try:
+        assert worker.get_text() is None
+        assert calls[-1][1:3] == ('failed', 4)
+
+        # A deadline shorter than the retries allow ends them early
+        worker.configure({'timeout': 0.05, 'retries': 100, 'base_delay': 0.02})
+        start = sim.now()
+        assert not worker.set_text("mine")
+        assert calls[-1][1] == 'failed' and calls[-1][2] < 10
+        assert sim.now() - start <= 0.05
+    finally:
+        worker.stop()
+    assert sim.clipboard.text == "theirs"
+    assert worker.get_stats()['outcomes']['failed'] == 2
+
+
+class BlockingClipboard:
+    """Clipboard backend whose reads wait until released."""
+
+    def __init__(self):
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def get_text(self):
+        self.entered.set()
+        self.release.wait(5)
+        return "late"
+
+
+def test_waiting_caller_times_out_and_late_requests_expire():
+    sim = Simulator()
+    backend = BlockingClipboard()
+    worker = ClipboardWorker(backend, {'timeout': 0.05}, clock=sim.now)
+    try:
+        # The caller gives up while the backend is still stuck
+        assert worker.get_text() is None
+        assert backend.entered.is_set()
+        assert worker.get_stats()['outcomes']['timeout'] == 1
+
+        # A request whose deadline passed while queued is not attempted
+        worker.configure({'timeout': 2.0})
+        results = []
+        waiter = threading.Thread(target=lambda: results.append(worker.get_text()))
+        waiter.start()
+        while not worker._queue.qsize():
+            waiter.join(0.001)
+        sim.clock.advance(5)
+        backend.release.set()
+        waiter.join(2)
+    finally:
+        worker.stop()
+
+    assert results == [None]
+    stats = worker.get_stats()
+    assert stats['outcomes']['expired'] == 1
+    assert stats['attempts'] == 1
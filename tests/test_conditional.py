@@ -0,0 +1,20 @@
+"""Tests for the compiled conditional hotkey matcher."""
+
+from customhk.conditional import ConditionalMatcher
+
+
+def rule(window_title, action):
+    return {'key': '<ctrl>+k', 'action': action, 'window_title': window_title}
+
+
+def test_backreferences_keep_their_own_groups():
+    matcher = ConditionalMatcher.compile([
+        rule(r'^z+$', 'first'),
+        rule(r'(ab)\1', 'repeated'),
+        rule(r'(?P<word>x+)-(?P=word)', 'named'),
+    ])
+
+    assert matcher.resolve('<ctrl>+k', 'xxababyy', None) == 'repeated'
+    assert matcher.resolve('<ctrl>+k', 'xx-xx', None) == 'named'
+    assert matcher.resolve('<ctrl>+k', 'zzz', None) == 'first'
+    assert matcher.resolve('<ctrl>+k', 'abba', None) is None
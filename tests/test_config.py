@@ -0,0 +1,35 @@
+"""Tests for configuration diffs applied on reload."""
+
+from customhk.config import ConfigDiff
+
+
+def test_signature_change_rebuilds_every_signature_action():
+    actions = {
+        'sign_off': {'type': 'type_signature'},
+        'paste_quoted': {'type': 'paste_transformed'},
+    }
+    old = {'user': {'signature': 'Old'}, 'actions': actions}
+    new = {'user': {'signature': 'New'}, 'actions': actions}
+
+    diff = ConfigDiff(old, new)
+
+    assert {'type_signature', 'sign_off'} <= diff.changed_actions
+    assert 'paste_quoted' not in diff.changed_actions
+    assert not diff.dispatch_changed
+
+
+def test_dispatch_change_is_reported():
+    diff = ConfigDiff({'app': {'dispatch': {'workers': 2}}}, {'app': {'dispatch': {'workers': 4}}})
+
+    assert diff.dispatch_changed
+
+
+def test_macro_change_rebuilds_its_aliases():
+    actions = {'greet_fast': {'type': 'greet', 'speed': 2}, 'other': {'type': 'farewell'}}
+    old = {'macros': {'greet': {'steps': ['a']}, 'farewell': {'steps': ['z']}}, 'actions': actions}
+    new = {'macros': {'greet': {'steps': ['b']}, 'farewell': {'steps': ['z']}}, 'actions': actions}
+
+    diff = ConfigDiff(old, new)
+
+    assert {'greet', 'greet_fast'} <= diff.changed_actions
+    assert not {'farewell', 'other'} & diff.changed_actions
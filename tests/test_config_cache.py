@@ -0,0 +1,68 @@
+"""Tests for the compiled configuration cache."""
+
+from customhk import config_cache
+from customhk.config import Config
+from customhk.config_cache import ConfigCache
+
+
+BODY = """
+include: extra.yaml
+user: {signature: "%s"}
+hotkeys:
+  global:
+    - {key: "<alt>+1", action: type_signature}
+"""
+
+
+def write_config(tmp_path, signature="One", extra="app: {metrics: {enabled: false}}\n"):
+    path = tmp_path / 'config.yaml'
+    path.write_text(BODY % signature)
+    (tmp_path / 'extra.yaml').write_text(extra)
+    return path
+
+
+def test_cache_is_reused_until_a_source_changes(tmp_path):
+    path = write_config(tmp_path)
+    first = Config(path)
+    assert (first.cache.hits, first.cache.misses) == (0, 1)
+    assert first.cache.path.exists()
+
+    second = Config(path)
+    assert (second.cache.hits, second.cache.misses) == (1, 0)
+    assert second.get_user_signature() == "One"
+    assert second.get('app.metrics.enabled') is False
+    assert second.bindings == first.bindings
+    assert sorted(p.name for p in second.source_paths) == ['config.yaml', 'extra.yaml']
+
+    # Changing an included file invalidates the entry too
+    (tmp_path / 'extra.yaml').write_text("app: {metrics: {enabled: true}}\n")
+    third = Config(path)
+    assert third.cache.misses == 1
+    assert third.get('app.metrics.enabled') is True
+
+    path.write_text(BODY % "Two")
+    assert Config(path).get_user_signature() == "Two"
+    assert Config(path).cache.hits == 1
+
+
+def test_schema_change_invalidates_the_cache(tmp_path, monkeypatch):
+    path = write_config(tmp_path)
+    Config(path)
+    monkeypatch.setattr(config_cache, 'SCHEMA_VERSION', config_cache.SCHEMA_VERSION + 1)
+    config = Config(path)
+    assert (config.cache.hits, config.cache.misses) == (0, 1)
+    assert Config(path).cache.hits == 1
+
+
+def test_unreadable_or_uncacheable_entries_fall_back_to_yaml(tmp_path):
+    path = write_config(tmp_path)
+    cache = ConfigCache(path)
+    cache.path.write_bytes(b'not marshal data')
+    assert cache.load() is None and cache.misses == 1
+    assert Config(path).get_user_signature() == "One"
+
+    # marshal cannot store the date YAML parses this into
+    write_config(tmp_path, extra="released: 2024-01-01\n")
+    config = Config(path)
+    assert not config.cache.path.exists()
+    assert Config(path).cache.misses == 1
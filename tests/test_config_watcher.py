@@ -0,0 +1,60 @@
+"""Tests for the configuration file watcher."""
+
+import sys
+import time
+
+import pytest
+
+from customhk.config_watcher import ConfigWatcher
+
+
+def wait_until(condition, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_save_during_reload_triggers_another_reload(tmp_path):
+    path = tmp_path / 'config.yaml'
+    path.write_text('a: 1\n')
+    loaded = []
+
+    def on_change():
+        loaded.append(path.read_text())
+        if len(loaded) == 1:
+            path.write_text('a: 22\n')  # saved while this reload runs
+
+    watcher = ConfigWatcher(lambda: [path], on_change, debounce=0.05,
+                            poll_interval=0.02, use_native=False)
+    watcher.start()
+    try:
+        time.sleep(0.05)
+        path.write_text('a: 3\n')
+        assert wait_until(lambda: len(loaded) >= 2)
+    finally:
+        watcher.stop()
+    assert loaded == ['a: 3\n', 'a: 22\n']
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason="inotify")
+def test_symlinked_config_gets_native_events(tmp_path):
+    target_dir = tmp_path / 'dotfiles'
+    target_dir.mkdir()
+    target = target_dir / 'customhk.yaml'
+    target.write_text('a: 1\n')
+    link = tmp_path / 'config.yaml'
+    link.symlink_to(target)
+
+    watcher = ConfigWatcher(lambda: [link], lambda: None, poll_interval=2)
+    watcher._source = watcher._create_source()
+    if watcher._source.name != 'inotify':
+        pytest.skip("inotify unavailable")
+    try:
+        watcher._snapshot()
+        target.write_text('a: 2\n')
+        assert watcher._source.wait()
+    finally:
+        watcher._source.close()
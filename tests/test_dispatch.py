@@ -0,0 +1,44 @@
+"""Tests for the action dispatcher's preemption and per-action metrics."""
+
+import threading
+
+from customhk import metrics
+from customhk.hotkey_manager import ActionDispatcher
+from customhk.metrics import ActionMetrics
+from customhk.scheduling import checkpoint
+
+
+def test_inline_preempting_job_keeps_its_own_counters():
+    stats = ActionMetrics()
+    dispatcher = ActionDispatcher(workers=1, observer=stats.observe,
+                                  on_schedule=stats.observe_schedule)
+    dispatcher.start()
+
+    started = threading.Event()
+    preempted = threading.Event()
+
+    def bulk():
+        metrics.note_injected(1000)
+        metrics.note_failure()
+        started.set()
+        preempted.wait(2)
+        checkpoint()  # runs the interactive job inline
+        metrics.note_injected(5)
+
+    def quick():
+        metrics.note_injected(1)
+
+    try:
+        assert dispatcher.submit('bulk', bulk, priority='bulk')
+        assert started.wait(2)
+        assert dispatcher.submit('quick', quick, priority='interactive')
+        preempted.set()
+    finally:
+        dispatcher.stop()
+
+    actions = stats.snapshot()['actions']
+    assert actions['quick']['chars_injected']['sum'] == 1
+    assert actions['quick']['failures'] == 0
+    assert actions['bulk']['chars_injected']['sum'] == 1005
+    assert actions['bulk']['failures'] == 1
+    assert stats.decisions[('inline', 'interactive')] == 1
@@ -0,0 +1,36 @@
+"""Tests for streamed text injection."""
+
+from customhk.backends.simulator import Simulator
+from customhk.utils.injection import resolve_settings
+from customhk.utils.keyboard import KeyboardHelper
+
+
+def test_paste_stream_pastes_one_block_at_a_time():
+    sim = Simulator()
+    sim.clipboard.text = "saved"
+    settings = resolve_settings({'strategy': 'paste', 'paste_block': 100})
+    helper = KeyboardHelper(sim.keyboard, settings)
+    helper.injector.platform = sim
+
+    pieces = [f"line {i}\n" for i in range(100)]
+    assert helper.paste_stream(iter(pieces), sum(map(len, pieces)))
+
+    sizes = [event.detail for event in sim.log
+             if event.operation == 'clipboard_set' and event.detail != 'restore']
+    assert sum(sizes) == len(''.join(pieces))
+    assert len(sizes) > 1
+    assert max(sizes) < 100 + len(pieces[-1])
+    assert sim.clipboard.text == "saved"
+
+
+def test_send_stream_chooses_by_output_length():
+    sim = Simulator()
+    helper = KeyboardHelper(sim.keyboard, resolve_settings({'paste_threshold': 50}))
+    helper.injector.platform = sim
+
+    assert helper.send_stream(iter(["short ", "output"]), total=5000)
+    assert sim.typed_text() == "short output"
+    assert sim.counts['clipboard_set'] == 0
+
+    assert helper.send_stream(iter(["x" * 30] * 3), total=10)
+    assert sim.counts['clipboard_set'] == 2  # the text, then the restore
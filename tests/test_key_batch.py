@@ -0,0 +1,67 @@
+"""Tests for batched key injection."""
+
+from customhk.backends.base import KeyInjectionError
+from customhk.backends.simulator import Simulator
+from customhk.utils.keyboard import KeyBatch
+
+
+class FailingKeyboard:
+    """Simulated keyboard that fails on one key, one event at a time."""
+
+    def __init__(self, sim, bad_key):
+        self.sim = sim
+        self.bad_key = bad_key
+
+    def press(self, key):
+        if key == self.bad_key:
+            raise OSError("injection blocked")
+        self.sim.keyboard.press(key)
+
+    def release(self, key):
+        self.sim.keyboard.release(key)
+
+    def type(self, text):
+        self.sim.keyboard.type(text)
+
+
+class PartialSendKeyboard(FailingKeyboard):
+    """Simulated keyboard whose batch submission stops after some events."""
+
+    def __init__(self, sim, limit):
+        super().__init__(sim, None)
+        self.limit = limit
+
+    def send(self, events):
+        self.sim.keyboard.send(events[:self.limit])
+        raise KeyInjectionError("SendInput stopped", self.limit)
+
+
+def released(sim):
+    return [event.detail for event in sim.log if event.operation == 'key_release']
+
+
+def test_failed_batch_releases_the_keys_it_pressed():
+    sim = Simulator()
+    batch = KeyBatch(FailingKeyboard(sim, 'v'))
+    batch.press('<ctrl>', '<shift>').tap('a').press('v').release('<shift>', '<ctrl>')
+    assert not batch.flush()
+    assert len(batch) == 0
+
+    # Held in press order, released in reverse; "a" was already released
+    assert released(sim) == ['a', '<shift>', '<ctrl>']
+
+
+def test_partial_submission_releases_only_what_was_sent():
+    sim = Simulator()
+    batch = KeyBatch(PartialSendKeyboard(sim, 3))
+    batch.press('<alt>').tap('x').press('<ctrl>').tap('y').release('<ctrl>', '<alt>')
+    assert not batch.flush()
+    # <alt> down, x down, x up were sent; <ctrl> never was
+    assert released(sim) == ['x', '<alt>']
+
+    sim.reset()
+    batch = KeyBatch(sim.keyboard)
+    batch.press('<ctrl>').tap('c').release('<ctrl>')
+    assert batch.flush()
+    assert sim.counts['key_submit'] == 1
+    assert released(sim) == ['c', '<ctrl>']
@@ -0,0 +1,103 @@
+"""Tests for macro playback."""
+
+import threading
+import time
+
+from customhk.actions.macro import MacroAction
+from customhk.backends import set_platform
+from customhk.backends.simulator import Simulator
+from customhk.config import Config
+from customhk.hotkey_manager import ActionDispatcher, HotkeyManager
+from customhk.macros import compile_macros
+from customhk.metrics import ActionMetrics
+
+
+STEPS = [
+    {'type': 'type_text', 'text': 'a'},
+    {'type': 'wait', 'duration': 1},
+    {'type': 'type_text', 'text': 'b'},
+]
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.005)
+
+
+def test_macro_run_resumes_on_the_dispatcher_and_counts_once():
+    sim = Simulator()
+    set_platform(sim)
+    macros, warnings = compile_macros({'greet': {'steps': STEPS}})
+    assert not warnings
+    action = MacroAction({'macro': macros['greet'], 'name': 'greet'}, sim.keyboard)
+
+    stats = ActionMetrics()
+    threads = []
+
+    def observe(*args):
+        threads.append(threading.current_thread().name)
+        stats.observe(*args)
+
+    dispatcher = ActionDispatcher(workers=1, observer=observe)
+    dispatcher.start()
+    try:
+        dispatcher.submit('greet', action, '<alt>+g', 'bulk')
+        wait_until(lambda: sim.typed_text() == 'a' and dispatcher.get_stats()['completed'] == 1)
+        assert action.is_running() and not threads
+
+        time.sleep(0.05)
+        sim.sleep(1)  # fires the timer on this thread, which queues the rest
+        wait_until(lambda: not action.is_running())
+        wait_until(lambda: threads)
+    finally:
+        dispatcher.stop()
+
+    assert sim.typed_text() == 'ab'
+    assert dispatcher.get_stats()['completed'] == 2
+    assert threads == ['customhk-dispatch-0']
+    greet = stats.snapshot()['actions']['greet']
+    assert greet['runs'] == 1
+    assert greet['chars_injected']['sum'] == 2
+    assert greet['run_seconds']['sum'] >= 0.05
+
+
+def test_waiting_macro_survives_a_dispatch_change(tmp_path):
+    sim = Simulator()
+    set_platform(sim)
+    path = tmp_path / 'config.yaml'
+    body = """
+app:
+  metrics: {enabled: false}
+  dispatch: {workers: %d}
+hotkeys:
+  global:
+    - {key: "<alt>+g", action: greet}
+macros:
+  greet:
+    steps:
+      - {type: type_text, text: "a"}
+      - {type: wait, duration: 1}
+      - {type: type_text, text: "b"}
+"""
+    path.write_text(body % 1)
+    config = Config(path, use_cache=False)
+    manager = HotkeyManager(config)
+    manager.start()
+    try:
+        sim.tap('<alt>+g')
+        wait_until(lambda: sim.typed_text() == 'a')
+        old = manager.dispatcher
+
+        path.write_text(body % 2)
+        manager.reload(config.reload())
+        assert manager.dispatcher is not old and manager.dispatcher.num_workers == 2
+        wait_until(lambda: not old.is_running())
+
+        sim.sleep(1)
+        wait_until(lambda: sim.typed_text() == 'ab')
+        assert not manager.action_instances['greet'].is_running()
+    finally:
+        manager.shutdown()
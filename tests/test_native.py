@@ -0,0 +1,27 @@
+"""Tests for the Windows SendInput translation (no Windows needed)."""
+
+from customhk.backends.native import SendInputBatch
+
+
+# VkKeyScanW results on a US layout, plus AltGr+Q for '@' on a German one
+LAYOUT = {'a': 0x41, 'A': 0x141, '1': 0x31, '!': 0x131, '@': 0x651}
+
+
+class FakeUser32:
+    def VkKeyScanW(self, char):
+        return LAYOUT.get(char, -1)
+
+
+def test_characters_needing_modifiers_are_sent_as_unicode():
+    batch = SendInputBatch.__new__(SendInputBatch)  # skips loading user32
+    batch._user32 = FakeUser32()
+    batch._keys = {}
+    up = SendInputBatch.KEYEVENTF_KEYUP
+    unicode = SendInputBatch.KEYEVENTF_UNICODE
+
+    assert batch._key('a', up=False) == (0x41, 0, 0)
+    assert batch._key('1', up=True) == (0x31, 0, up)
+    assert batch._key('!', up=False) == (0, ord('!'), unicode)
+    assert batch._key('A', up=True) == (0, ord('A'), unicode | up)
+    assert batch._key('@', up=False) == (0, ord('@'), unicode)
+    assert batch._key('é', up=False) == (0, 0xE9, unicode)
@@ -0,0 +1,83 @@
+"""Tests for macro recording."""
+
+import pytest
+
+from customhk.backends.base import PRESS, RELEASE
+from customhk.backends.simulator import Simulator
+from customhk.macros import KeyLog
+from customhk.recorder import MacroRecorder, _insert_entry, save_recording
+
+
+ENTRY = ["new:\n", "\tspeed: 1\n"]
+
+
+def record(sim, keys):
+    recorder = MacroRecorder(sim)
+    recorder.start()
+    for key in keys:
+        sim.sleep(0.25)
+        sim.tap(key)
+    return recorder
+
+
+def test_stop_drops_the_chord_that_ended_the_recording():
+    sim = Simulator()
+    recorder = record(sim, ['a', '<shift>+b'])
+    # The stop hotkey is still held when stop() runs
+    sim.sleep(0.5)
+    sim.events.press('<ctrl>')
+    sim.events.press('r')
+    log = recorder.stop()
+    assert not recorder.recording
+
+    assert [(kind, key) for kind, key, _ in log] == [
+        (PRESS, 'a'), (RELEASE, 'a'),
+        (PRESS, '<shift>'), (PRESS, 'b'), (RELEASE, 'b'), (RELEASE, '<shift>'),
+    ]
+    assert [delay for _, _, delay in log] == [0.0, 0.0, 0.25, 0.0, 0.0, 0.0]
+
+    # Released before stop() or not, the last chord goes
+    sim.events.release('r')
+    sim.events.release('<ctrl>')
+    recorder = record(sim, ['x', '<ctrl>+r'])
+    assert [key for _, key, _ in recorder.stop()] == ['x', 'x']
+
+
+def test_keys_held_at_start_are_ignored():
+    sim = Simulator()
+    sim.events.press('<alt>')
+    recorder = MacroRecorder(sim)
+    recorder.start()
+    sim.events.release('<alt>')
+    sim.tap('q')
+    sim.tap('<ctrl>+s')
+    assert [key for _, key, _ in recorder.stop()] == ['q', 'q']
+
+
+def test_insert_entry_follows_the_section_indentation():
+    text = "user: {}\nmacros:  # recorded below\n    # old one\n    old:\n        speed: 2\n"
+    assert _insert_entry(text, ENTRY) == (
+        "user: {}\nmacros:  # recorded below\n    new:\n        speed: 1\n"
+        "    # old one\n    old:\n        speed: 2\n"
+    )
+
+    # No section yet: one is appended, after a missing final newline
+    assert _insert_entry("user: {}", ENTRY) == "user: {}\nmacros:\n  new:\n    speed: 1\n"
+    assert _insert_entry("", ENTRY) == "macros:\n  new:\n    speed: 1\n"
+
+    with pytest.raises(ValueError):
+        _insert_entry("macros: {}\n", ENTRY)
+
+
+def test_save_recording_falls_back_to_a_separate_file(tmp_path):
+    log = KeyLog()
+    log.append(PRESS, 'a', 0)
+    log.append(RELEASE, 'a', 0.1)
+    config = tmp_path / 'config.yaml'
+    config.write_text("macros: {}\n")
+
+    assert save_recording(config, log, name='typed_a') == 'typed_a'
+    assert config.read_text() == "macros: {}\n"
+    saved = (tmp_path / 'recorded_macros.yaml').read_text()
+    assert saved.startswith("macros:\n  typed_a:\n")
+    assert f'recording: "{log.encode()}"' in saved
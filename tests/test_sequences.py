@@ -0,0 +1,90 @@
+"""Tests for key sequences and the leader key."""
+
+import threading
+import time
+
+from customhk.backends import set_platform
+from customhk.backends.simulator import Simulator
+from customhk.config import Config
+from customhk.hotkey_manager import HotkeyManager, SequenceMatcher
+
+
+def matcher(**kwargs):
+    fired = []
+    sequences = SequenceMatcher(lambda name, keys: fired.append((name, keys)), **kwargs)
+    return sequences, fired
+
+
+def test_sequence_fires_only_within_its_timeout():
+    sequences, fired = matcher(default_timeout=1.0)
+    assert sequences.add(['<ctrl>+k', 's'], 'save')
+    assert sequences.add(['<ctrl>+k', 'n'], 'notes', timeout=3.0)
+    assert not sequences.add(['<ctrl>+k', 's'], 'other')
+
+    assert not sequences.feed('s', now=0.0)
+    assert sequences.feed('<ctrl>+k', now=1.0)
+    assert sequences.feed('s', now=1.5)
+    assert fired == [('save', '<ctrl>+k, s')]
+
+    # Too slow for "save", but "notes" allows three seconds
+    sequences.feed('<ctrl>+k', now=10.0)
+    sequences.feed('s', now=12.0)
+    sequences.feed('<ctrl>+k', now=20.0)
+    sequences.feed('n', now=22.0)
+    assert fired == [('save', '<ctrl>+k, s'), ('notes', '<ctrl>+k, n')]
+
+
+def test_ambiguous_prefix_fires_when_ruled_out_or_after_waiting():
+    sequences, fired = matcher(ambiguity_timeout=0.05)
+    sequences.add(['<ctrl>+k'], 'short')
+    sequences.add(['<ctrl>+k', 's'], 'long')
+
+    sequences.feed('<ctrl>+k', now=0.0)
+    sequences.feed('s', now=0.1)
+    assert fired == [('long', '<ctrl>+k, s')]
+
+    # The next chord rules out the longer sequence and starts afresh
+    sequences.feed('<ctrl>+k', now=5.0)
+    assert not sequences.feed('x', now=5.1)
+    assert fired[-1] == ('short', '<ctrl>+k')
+
+    done = threading.Event()
+
+    def on_match(name, keys):
+        fired.append((name, keys))
+        done.set()
+
+    sequences.on_match = on_match
+    sequences.feed('<ctrl>+k')
+    assert done.wait(2)
+    assert fired[-1] == ('short', '<ctrl>+k')
+    assert len(fired) == 3
+
+
+def test_leader_sequence_runs_its_action(tmp_path):
+    sim = Simulator()
+    set_platform(sim)
+    path = tmp_path / 'config.yaml'
+    path.write_text("""
+app:
+  metrics: {enabled: false}
+user: {signature: "Sig"}
+hotkeys:
+  leader: "<ctrl>+<space>"
+  sequences:
+    - {keys: "<leader>, s", action: type_signature}
+""")
+    manager = HotkeyManager(Config(path, use_cache=False))
+    manager.start()
+    try:
+        assert manager.sequences.first_chords() == ['<ctrl>+<space>']
+        sim.tap('<ctrl>+<space>')
+        sim.tap('x')
+        sim.tap('<ctrl>+<space>')
+        sim.tap('s')
+        deadline = time.monotonic() + 2
+        while sim.typed_text() != "Sig" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert sim.typed_text() == "Sig"
+    finally:
+        manager.shutdown()
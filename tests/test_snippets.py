@@ -0,0 +1,71 @@
+"""Tests for snippet expansion."""
+
+from customhk.backends.simulator import Simulator
+from customhk.snippets import SnippetExpander, SnippetMatcher, compile_snippets
+
+
+def feed_all(matcher, text):
+    return [matcher.feed(char) for char in text]
+
+
+def test_automaton_prefers_the_longest_match_and_follows_suffixes():
+    automaton, warnings = compile_snippets({
+        'he': 'HE',
+        'she': 'SHE',
+        'his': 'HIS',
+        ';off': {'text': 'x', 'enabled': False},
+        '': 'empty',
+    })
+    assert warnings == ["Snippet '' ignored: the abbreviation must be typed on one line"]
+    assert [abbreviation for abbreviation, _ in automaton['snippets']] == ['he', 'she', 'his']
+
+    matcher = SnippetMatcher(automaton)
+    assert feed_all(matcher, 'ushe')[-1] == ('she', 'SHE')
+    matcher.reset()
+    # After "sh" fails on "i", the failure link keeps the "h" for "his"
+    assert feed_all(matcher, 'shis')[-1] == ('his', 'HIS')
+
+
+def test_shadowed_abbreviation_is_reported():
+    _, warnings = compile_snippets({';s': 'short', ';sig': 'long'})
+    assert warnings == ["Snippet ';sig' never expands: typing it expands ';s' first"]
+
+
+def test_backspace_undoes_typed_characters():
+    automaton, _ = compile_snippets({';sig': 'Sig'})
+    matcher = SnippetMatcher(automaton)
+    assert feed_all(matcher, ';sx') == [None, None, None]
+    matcher.backspace()
+    assert feed_all(matcher, 'ig') == [None, (';sig', 'Sig')]
+
+    # Backspacing past the start is harmless
+    matcher.reset()
+    matcher.backspace()
+    assert feed_all(matcher, ';sig')[-1] == (';sig', 'Sig')
+
+
+def test_expander_erases_the_abbreviation_and_types_the_text():
+    sim = Simulator()
+    automaton, _ = compile_snippets({';sig': 'Best'})
+    submitted = []
+
+    def submit(name, expand, trigger, priority):
+        submitted.append((name, trigger, priority))
+        expand()
+        return True
+
+    expander = SnippetExpander(automaton, sim.keyboard, submit, platform=sim)
+    expander.start()
+    try:
+        for key in [';', 's', 'x', '<backspace>', 'i', 'g']:
+            sim.tap(key)
+        # Shortcuts end the word, so this never completes
+        for key in [';', 's', 'i', '<ctrl>+c', 'g']:
+            sim.tap(key)
+    finally:
+        expander.stop()
+
+    assert submitted == [('snippets', ';sig', 'normal')]
+    assert expander.expansions == 1
+    pressed = [event.detail for event in sim.log if event.operation == 'key_press']
+    assert pressed == ['<backspace>'] * 4 + list('Best')
@@ -0,0 +1,21 @@
+"""Tests for the shared timer thread."""
+
+import threading
+
+from customhk.utils.timers import TimerThread
+
+
+def test_restart_after_stop_leaves_one_thread():
+    timers = TimerThread(name='test-timers')
+    fired = threading.Event()
+    timers.call_later(60, fired.set)
+    old = timers._thread
+
+    timers.stop(timeout=0)
+    timers.call_later(0, fired.set)
+
+    assert fired.wait(2)
+    old.join(2)
+    assert not old.is_alive()
+    assert timers._thread.is_alive()
+    timers.stop()
@@ -0,0 +1,21 @@
+"""Tests for text transform pipelines."""
+
+import pytest
+
+from customhk.transforms import TransformMemo, compile_pipeline
+
+
+@pytest.mark.parametrize('step', [
+    {'number': 5}, {'prefix': 5}, {'quote': 5}, {'suffix': True}, {'trim': 5},
+    {'replace': {'old': 1, 'new': 'x'}}, {'number': {'start': 'one'}},
+])
+def test_non_text_options_fail_at_compile_time(step):
+    with pytest.raises(ValueError):
+        compile_pipeline([step])
+
+
+def test_text_options_apply():
+    pipeline = compile_pipeline([{'trim': 'x'}, {'number': '{n}) '}, {'suffix': ';'}])
+    pipeline.memo = TransformMemo()
+
+    assert pipeline.apply("xax\n\nb") == "1) a;\n;\n2) b;"
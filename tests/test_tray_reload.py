@@ -0,0 +1,54 @@
+"""Tests for reloading the configuration from the tray."""
+
+import time
+
+from customhk.backends import set_platform
+from customhk.backends.simulator import Simulator
+from customhk.config import Config
+from customhk.hotkey_manager import HotkeyManager
+from customhk.tray_icon import TrayIconManager
+
+
+BODY = """
+app:
+  metrics: {enabled: false}
+user: {signature: "%s"}
+hotkeys:
+  global:
+    - {key: "<alt>+1", action: type_signature}
+"""
+
+
+def test_failed_apply_restores_the_previous_configuration(tmp_path):
+    sim = Simulator()
+    set_platform(sim)
+    path = tmp_path / 'config.yaml'
+    path.write_text(BODY % "Old")
+    config = Config(path, use_cache=False)
+    manager = HotkeyManager(config)
+    manager.start()
+    tray = TrayIconManager(config, manager)
+    apply = manager.reload
+    calls = []
+
+    def failing_reload(diff=None):
+        calls.append(diff)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        return apply(diff)
+
+    manager.reload = failing_reload
+    try:
+        path.write_text(BODY % "New")
+        assert not tray.reload_config()
+        assert tray.last_reload_error == "boom"
+        assert config.get_user_signature() == "Old"
+        assert len(calls) == 2
+
+        sim.tap('<alt>+1')
+        deadline = time.monotonic() + 2
+        while sim.typed_text() != "Old" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert sim.typed_text() == "Old"
+    finally:
+        manager.shutdown()
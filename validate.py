@@ -50,6 +50,7 @@ def validate():
     print("\n✓ Testing package imports...")
     try:
         import customhk
+        import customhk.main  # the package itself imports lazily
         print(f"  customhk v{customhk.__version__} - OK")
     except ImportError as e:
         errors.append(f"Cannot import customhk: {e}")